@@ -30,7 +30,11 @@ const CollectionValueChartModal = ({ isOpen, onClose }) => {
 			setLoading(true);
 			setError(false);
 			try {
-				const response = await getMyCollectionValueHistory();
+				// Raw points older than the retention window are compacted into
+				// rollups; the chart never plots finer than a day anyway
+				const response = await getMyCollectionValueHistory({
+					resolution: "daily",
+				});
 				if (isCancelled) return;
 				setHistory(Array.isArray(response?.results) ? response.results : []);
 			} catch (loadError) {
@@ -79,6 +79,8 @@ const AdminReportsPage = () => {
 	const [queryInput, setQueryInput] = useState("");
 	const [appliedQuery, setAppliedQuery] = useState("");
 	const [reportGroups, setReportGroups] = useState([]);
+	const [nextCursor, setNextCursor] = useState(null);
+	const [loadingMore, setLoadingMore] = useState(false);
 	const [expandedId, setExpandedId] = useState(null);
 	const [detailsById, setDetailsById] = useState({});
 	const [busyById, setBusyById] = useState({});
@@ -92,7 +94,8 @@ const AdminReportsPage = () => {
 					status,
 					query,
 				});
-				setReportGroups(Array.isArray(response) ? response : []);
+				setReportGroups(Array.isArray(response?.results) ? response.results : []);
+				setNextCursor(response?.has_more ? response.next_cursor : null);
 			} catch (loadError) {
 				console.error("Failed to load kit reports", loadError);
 				setError(t("moderation.reports.loadError"));
@@ -103,6 +106,29 @@ const AdminReportsPage = () => {
 		[activeStatus, appliedQuery, t],
 	);
 
+	const handleLoadMore = async () => {
+		if (!nextCursor || loadingMore) return;
+		setLoadingMore(true);
+		try {
+			const response = await getAdminKitReports({
+				status: activeStatus,
+				query: appliedQuery,
+				cursor: nextCursor,
+			});
+			const results = Array.isArray(response?.results) ? response.results : [];
+			setReportGroups((current) => [
+				...current,
+				...results.filter((group) => !current.some((item) => item.id === group.id)),
+			]);
+			setNextCursor(response?.has_more ? response.next_cursor : null);
+		} catch (loadError) {
+			console.error("Failed to load more kit reports", loadError);
+			Swal.fire(t("common.error"), t("moderation.reports.loadError"), "error");
+		} finally {
+			setLoadingMore(false);
+		}
+	};
+
 	const loadDetail = useCallback(
 		async (id) => {
 			const detail = await getAdminKitReportDetail(id);
@@ -486,6 +512,18 @@ const AdminReportsPage = () => {
 							</article>
 						);
 					})}
+					{nextCursor ? (
+						<div className="text-center">
+							<button
+								type="button"
+								className="btn btn-outline-primary btn-sm"
+								onClick={handleLoadMore}
+								disabled={loadingMore}
+							>
+								{loadingMore ? t("common.loading") : t("moderation.reports.loadMore")}
+							</button>
+						</div>
+					) : null}
 				</div>
 			)}
 		</section>
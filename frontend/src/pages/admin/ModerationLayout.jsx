@@ -21,9 +21,17 @@ const ModerationLayout = ({ user }) => {
 	}, []);
 
 	useEffect(() => {
-		if (canAccess) {
-			refreshModerationSummary();
+		if (!canAccess) {
+			return;
 		}
+
+		refreshModerationSummary();
+
+		const intervalId = window.setInterval(() => {
+			refreshModerationSummary();
+		}, 30000);
+
+		return () => window.clearInterval(intervalId);
 	}, [canAccess, refreshModerationSummary]);
 
 	if (!canAccess) {
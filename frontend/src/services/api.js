@@ -86,8 +86,10 @@ export const getUserStats = async (username) => {
 	}
 };
 
-export const getMyCollectionValueHistory = async () => {
-	const response = await api.get("/me/collection-value-history/");
+export const getMyCollectionValueHistory = async ({ resolution } = {}) => {
+	const response = await api.get("/me/collection-value-history/", {
+		params: resolution ? { resolution } : undefined,
+	});
 	return response.data;
 };
 
@@ -415,12 +417,16 @@ export const getAdminKitReports = async ({
 	status = "pending",
 	reason,
 	query,
+	cursor,
+	limit,
 } = {}) => {
 	const response = await api.get("/admin/reports/", {
 		params: {
 			status,
 			...(reason ? { reason } : {}),
 			...(query ? { q: query } : {}),
+			...(cursor ? { cursor } : {}),
+			...(limit ? { limit } : {}),
 		},
 	});
 	return response.data;
@@ -2,6 +2,9 @@
 ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve the app through it (e.g. ``uvicorn core.asgi:application``) so the
+long-lived ``unread-counts/stream/`` responses run on the event loop instead of
+holding a worker thread each.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
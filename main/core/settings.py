@@ -137,6 +137,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
+    'kits.query_budget.QueryBudgetMiddleware',  # Only active with QUERY_BUDGET_ENABLED
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -170,6 +171,47 @@ DATABASES = {
 }
 
 
+# Cache
+# Defaults to per-process memory. Point CACHE_BACKEND/CACHE_LOCATION at
+# django.core.cache.backends.filebased.FileBasedCache or
+# django.core.cache.backends.redis.RedisCache to share it between workers.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'worn11-default'),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', '300')),
+    }
+}
+
+# Catalog endpoints (options, leagues, countries, teams) are cached per resource version
+CATALOG_CACHE_ALIAS = 'default'
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CACHE_TIMEOUT', '3600'))
+
+# Adds X-Query-Count / X-Query-Time-Ms headers and logs views over their budget in kits/query_budget.py
+QUERY_BUDGET_ENABLED = os.environ.get('QUERY_BUDGET_ENABLED', '').lower() in ('1', 'true')
+
+# Background jobs (kits/jobs.py) run inline unless a `manage.py run_jobs` worker is deployed
+BACKGROUND_JOBS_EAGER = os.environ.get('BACKGROUND_JOBS_EAGER', 'true').lower() in ('1', 'true')
+BACKGROUND_JOBS_MAX_ATTEMPTS = 5
+BACKGROUND_JOBS_RETRY_BASE_SECONDS = 30
+BACKGROUND_JOBS_RETRY_MAX_SECONDS = 3600
+BACKGROUND_JOBS_STALE_AFTER_SECONDS = 600
+
+# Finished collection export files (MEDIA_ROOT/collection_exports/) can be downloaded this long
+COLLECTION_EXPORT_JOB_TTL_SECONDS = 24 * 60 * 60
+
+# Collection exports still pending/running this long after the request are marked failed
+COLLECTION_EXPORT_JOB_TIMEOUT_SECONDS = 2 * 60 * 60
+
+# compact_collection_value_history folds raw value snapshots older than this into rollups
+COLLECTION_VALUE_HISTORY_RAW_RETENTION_DAYS = 90
+
+# Every this many delta-derived value snapshots are re-checked against a full aggregate (0 disables)
+COLLECTION_VALUE_RECOUNT_EVERY = 50
+
+# Uploads deleted per transaction by chunked team deletions
+TEAM_DELETION_BATCH_SIZE = 200
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
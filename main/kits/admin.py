@@ -4,6 +4,8 @@ from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import User
 
 from .models import (
+    BackgroundJob,
+    CollectionExportJob,
     Conversation,
     Country,
     Kit,
@@ -15,6 +17,7 @@ from .models import (
     Profile,
     ShirtVersion,
     Team,
+    TeamDeletionJob,
     TeamSeasonKitType,
     UserKit,
     UserKitImage,
@@ -159,6 +162,27 @@ class ConversationAdmin(admin.ModelAdmin):
     search_fields = ('participant_one__username', 'participant_two__username')
 
 
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'max_attempts', 'run_after', 'locked_by', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'last_error')
+    readonly_fields = ('created_at', 'finished_at', 'locked_at', 'locked_by', 'last_error')
+
+
+class CollectionExportJobAdmin(admin.ModelAdmin):
+    list_display = ('user', 'export_format', 'include_sold', 'status', 'row_count', 'created_at', 'expires_at')
+    list_filter = ('status', 'export_format')
+    search_fields = ('user__username', 'filename')
+    readonly_fields = ('created_at', 'finished_at', 'expires_at', 'row_count', 'error')
+
+
+class TeamDeletionJobAdmin(admin.ModelAdmin):
+    list_display = ('team_name', 'actor', 'reason', 'status', 'created_at', 'finished_at')
+    list_filter = ('status', 'reason')
+    search_fields = ('team_name', 'actor__username')
+    readonly_fields = ('last_userkit_id', 'last_kit_id', 'summary', 'moderation_action', 'error', 'created_at', 'updated_at', 'finished_at')
+
+
 class MessageAdmin(admin.ModelAdmin):
     list_display = ('conversation', 'sender', 'body_preview', 'created_at', 'read_at')
     list_filter = ('created_at', 'read_at')
@@ -184,6 +208,9 @@ admin.site.register(ShirtVersion, ShirtVersionAdmin)
 admin.site.register(KitReport, KitReportAdmin)
 admin.site.register(Conversation, ConversationAdmin)
 admin.site.register(Message, MessageAdmin)
+admin.site.register(BackgroundJob, BackgroundJobAdmin)
+admin.site.register(CollectionExportJob, CollectionExportJobAdmin)
+admin.site.register(TeamDeletionJob, TeamDeletionJobAdmin)
 admin.site.unregister(User)
 admin.site.register(User, CustomUserAdmin)
 admin.site.register(Country, CountryAdmin)
@@ -0,0 +1,101 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+
+CATALOG_COUNTRIES = 'countries'
+CATALOG_LEAGUES = 'leagues'
+CATALOG_TEAMS = 'teams'
+CATALOG_KIT_TYPES = 'kit_types'
+CATALOG_SHIRT_VERSIONS = 'shirt_versions'
+CATALOG_TEAM_SEASON_KIT_TYPES = 'team_season_kit_types'
+# Public kit cards: images, owner details and values not covered by KitRanking
+CATALOG_PUBLIC_KITS = 'public_kits'
+
+CATALOG_VERSION_KEY_PREFIX = 'catalog-version'
+CATALOG_PAYLOAD_KEY_PREFIX = 'catalog-payload'
+
+
+def get_catalog_cache():
+    return caches[getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')]
+
+
+def get_catalog_cache_timeout():
+    return getattr(settings, 'CATALOG_CACHE_TIMEOUT', 3600)
+
+
+def build_catalog_version_key(resource):
+    return f'{CATALOG_VERSION_KEY_PREFIX}:{resource}'
+
+
+def build_initial_catalog_version():
+    # Seed from the clock so an evicted version key never reuses an older number
+    return int(time.time() * 1000)
+
+
+def get_catalog_versions(resources):
+    cache = get_catalog_cache()
+    keys = {resource: build_catalog_version_key(resource) for resource in resources}
+    stored = cache.get_many(keys.values())
+
+    versions = {}
+    missing = {}
+    for resource, key in keys.items():
+        if key in stored:
+            versions[resource] = stored[key]
+        else:
+            missing[key] = build_initial_catalog_version()
+            versions[resource] = missing[key]
+
+    if missing:
+        cache.set_many(missing, timeout=None)
+    return versions
+
+
+def _bump_catalog_versions(resources):
+    cache = get_catalog_cache()
+    for resource in resources:
+        key = build_catalog_version_key(resource)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, build_initial_catalog_version(), timeout=None)
+
+
+def bump_catalog_versions(*resources):
+    # Bump now for this request, and again after commit so a reader that cached
+    # pre-commit rows under the first bump is invalidated too.
+    _bump_catalog_versions(resources)
+    transaction.on_commit(lambda: _bump_catalog_versions(resources))
+
+
+def get_cached_catalog_payload(resources, key_parts, build_payload):
+    versions = get_catalog_versions(resources)
+    version_token = '.'.join(f'{resource}={versions[resource]}' for resource in sorted(versions))
+    key = ':'.join([CATALOG_PAYLOAD_KEY_PREFIX, *[str(part) for part in key_parts], version_token])
+
+    cache = get_catalog_cache()
+    payload = cache.get(key)
+    if payload is None:
+        payload = build_payload()
+        cache.set(key, payload, timeout=get_catalog_cache_timeout())
+    return payload
+
+
+class CatalogCacheMixin:
+    catalog_cache_resources = ()
+
+    def get_catalog_cache_key_parts(self):
+        # Serialized payloads embed absolute media URLs, so the host is part of the key
+        return [self.request.build_absolute_uri('/'), self.request.get_full_path()]
+
+    def list(self, request, *args, **kwargs):
+        payload = get_cached_catalog_payload(
+            self.catalog_cache_resources,
+            self.get_catalog_cache_key_parts(),
+            lambda: super(CatalogCacheMixin, self).list(request, *args, **kwargs).data,
+        )
+        return Response(payload)
@@ -0,0 +1,36 @@
+import hashlib
+
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def build_weak_etag(*parts):
+    digest = hashlib.md5(repr(parts).encode('utf-8'), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def strip_weak_etag_prefix(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def request_etag_matches(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+
+    # If-None-Match always uses the weak comparison function (RFC 9110 13.1.2)
+    candidates = parse_etags(header)
+    if '*' in candidates:
+        return True
+    expected = strip_weak_etag_prefix(etag)
+    return any(strip_weak_etag_prefix(candidate) == expected for candidate in candidates)
+
+
+def get_conditional_response(request, validator_parts, build_payload):
+    # validator_parts must change whenever the payload would, and be cheaper to
+    # compute than build_payload; a match skips serialization entirely.
+    etag = build_weak_etag(*validator_parts)
+    if request_etag_matches(request, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return Response(build_payload(), headers={'ETag': etag})
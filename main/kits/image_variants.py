@@ -0,0 +1,151 @@
+import io
+import logging
+import os
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps
+
+
+logger = logging.getLogger(__name__)
+
+
+# Fixed widths served to grids, previews and detail views
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+IMAGE_VARIANT_FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+}
+IMAGE_VARIANT_QUALITY = 80
+# Formats Pillow can re-encode in place when stripping metadata from originals
+METADATA_STRIPPABLE_FORMATS = {'JPEG', 'PNG', 'WEBP'}
+
+
+def build_image_variant_name(original_name, width, extension):
+    stem, _extension = os.path.splitext(original_name)
+    return f'{stem}-{width}w.{extension}'
+
+
+def _flatten_to_rgb(image):
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _render_image_variant(image, width, pillow_format):
+    height = max(1, round(image.height * width / image.width))
+    resized = image.resize((width, height), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    resized.save(buffer, format=pillow_format, quality=IMAGE_VARIANT_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def delete_image_variants(userkit_image):
+    storage = userkit_image.image.storage
+    for formats in (userkit_image.variants or {}).values():
+        for name in formats.values():
+            storage.delete(name)
+
+
+def generate_image_variants(userkit_image, *, save=True):
+    field_file = userkit_image.image
+    storage = field_file.storage
+
+    try:
+        field_file.open('rb')
+        try:
+            with Image.open(field_file) as source:
+                image = _flatten_to_rgb(ImageOps.exif_transpose(source))
+        finally:
+            field_file.close()
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning('Could not generate variants for user kit image %s', userkit_image.pk, exc_info=True)
+        return {}
+
+    delete_image_variants(userkit_image)
+
+    variants = {}
+    # Never upscale; clients fall back to the original for missing widths
+    for width in IMAGE_VARIANT_WIDTHS:
+        if width >= image.width:
+            continue
+        variants[str(width)] = {
+            format_key: storage.save(
+                build_image_variant_name(field_file.name, width, extension),
+                ContentFile(_render_image_variant(image, width, pillow_format)),
+            )
+            for format_key, (pillow_format, extension) in IMAGE_VARIANT_FORMATS.items()
+        }
+
+    userkit_image.variants = variants
+    if save:
+        userkit_image.save(update_fields=['variants'])
+    return variants
+
+
+def strip_image_metadata(userkit_image):
+    # Uploads can carry GPS and device EXIF; bake in the orientation and drop the rest
+    field_file = userkit_image.image
+
+    try:
+        field_file.open('rb')
+        try:
+            with Image.open(field_file) as source:
+                image_format = source.format
+                if image_format not in METADATA_STRIPPABLE_FORMATS or not source.getexif():
+                    return False
+                icc_profile = source.info.get('icc_profile')
+                image = ImageOps.exif_transpose(source)
+                image.load()
+        finally:
+            field_file.close()
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning('Could not strip metadata from user kit image %s', userkit_image.pk, exc_info=True)
+        return False
+
+    save_kwargs = {'format': image_format}
+    if icc_profile:
+        save_kwargs['icc_profile'] = icc_profile
+    if image_format in ('JPEG', 'WEBP'):
+        save_kwargs['quality'] = 95
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    buffer = io.BytesIO()
+    image.save(buffer, **save_kwargs)
+
+    storage = field_file.storage
+    original_name = field_file.name
+    # Write the clean copy under a new name first so a failed save never loses the upload
+    saved_name = storage.save(original_name, ContentFile(buffer.getvalue()))
+    userkit_image.image.name = saved_name
+    userkit_image.save(update_fields=['image'])
+    if saved_name != original_name:
+        transaction.on_commit(lambda: storage.delete(original_name))
+    return True
+
+
+def process_uploaded_image(userkit_image):
+    strip_image_metadata(userkit_image)
+    return generate_image_variants(userkit_image)
+
+
+def get_image_variant_urls(userkit_image, request=None):
+    storage = userkit_image.image.storage
+    variant_urls = {
+        width: {format_key: storage.url(name) for format_key, name in formats.items()}
+        for width, formats in (userkit_image.variants or {}).items()
+    }
+    return build_absolute_image_variant_urls(variant_urls, request)
+
+
+def build_absolute_image_variant_urls(variant_urls, request=None):
+    if request is None or not variant_urls:
+        return variant_urls or {}
+    return {
+        width: {format_key: request.build_absolute_uri(url) for format_key, url in formats.items()}
+        for width, formats in variant_urls.items()
+    }
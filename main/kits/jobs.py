@@ -0,0 +1,356 @@
+import logging
+import threading
+import traceback
+from contextlib import nullcontext
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .image_variants import process_uploaded_image
+from .models import (
+    BackgroundJob,
+    CollectionExportJob,
+    Follow,
+    KitComment,
+    KitCommentLike,
+    Notification,
+    UserKit,
+    UserKitImage,
+    record_collection_value_snapshot,
+    revalue_userkits,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+JOB_PROCESS_USERKIT_IMAGE = 'process_userkit_image'
+JOB_RECORD_COLLECTION_VALUE_SNAPSHOT = 'record_collection_value_snapshot'
+JOB_DELIVER_NOTIFICATION = 'deliver_notification'
+JOB_BUILD_COLLECTION_EXPORT = 'build_collection_export'
+JOB_REVALUE_USERKITS = 'revalue_userkits'
+JOB_DELETE_TEAM_CONTENT = 'delete_team_content'
+
+_job_handlers = {}
+_job_stale_windows = {}
+_running_job = threading.local()
+
+
+def register_job(name, *, atomic=True, stale_after_seconds=None):
+    # Non-atomic handlers manage their own transactions, e.g. to commit in batches.
+    # stale_after_seconds overrides BACKGROUND_JOBS_STALE_AFTER_SECONDS for slow jobs.
+    def decorator(handler):
+        handler.run_atomically = atomic
+        _job_handlers[name] = handler
+        if stale_after_seconds is not None:
+            _job_stale_windows[name] = stale_after_seconds
+        return handler
+    return decorator
+
+
+def jobs_run_eagerly():
+    # Eager by default so a deployment without a worker behaves like before
+    return getattr(settings, 'BACKGROUND_JOBS_EAGER', True)
+
+
+def get_job_retry_delay(attempts):
+    base_seconds = getattr(settings, 'BACKGROUND_JOBS_RETRY_BASE_SECONDS', 30)
+    max_seconds = getattr(settings, 'BACKGROUND_JOBS_RETRY_MAX_SECONDS', 3600)
+    return timedelta(seconds=min(base_seconds * 2 ** max(attempts - 1, 0), max_seconds))
+
+
+def enqueue_job(name, payload=None, *, max_attempts=None, delay=None):
+    if name not in _job_handlers:
+        raise ValueError(f'Unknown background job: {name}')
+
+    payload = payload or {}
+    if jobs_run_eagerly():
+        _job_handlers[name](**payload)
+        return None
+
+    # Created in the caller's transaction, so workers only see it after commit
+    return BackgroundJob.objects.create(
+        name=name,
+        payload=payload,
+        max_attempts=max_attempts or getattr(settings, 'BACKGROUND_JOBS_MAX_ATTEMPTS', 5),
+        run_after=timezone.now() + (delay or timedelta()),
+    )
+
+
+def requeue_stale_jobs(*, now=None):
+    # A worker that died mid-job leaves it running; hand it to the next worker
+    now = now or timezone.now()
+    default_window = getattr(settings, 'BACKGROUND_JOBS_STALE_AFTER_SECONDS', 600)
+    stale = Q(~Q(name__in=_job_stale_windows), locked_at__lt=now - timedelta(seconds=default_window))
+    for name, seconds in _job_stale_windows.items():
+        stale |= Q(name=name, locked_at__lt=now - timedelta(seconds=seconds))
+    stale_jobs = BackgroundJob.objects.filter(stale, status=BackgroundJob.STATUS_RUNNING)
+
+    failed = stale_jobs.filter(attempts__gte=F('max_attempts')).update(
+        status=BackgroundJob.STATUS_FAILED,
+        locked_at=None,
+        locked_by='',
+        last_error='Worker stopped before the job finished.',
+        finished_at=now,
+    )
+    requeued = stale_jobs.update(
+        status=BackgroundJob.STATUS_PENDING,
+        locked_at=None,
+        locked_by='',
+        run_after=now,
+    )
+    return requeued + failed
+
+
+def claim_next_job(worker_id, *, now=None):
+    now = now or timezone.now()
+    while True:
+        job = BackgroundJob.objects.filter(
+            status=BackgroundJob.STATUS_PENDING,
+            run_after__lte=now,
+        ).order_by('run_after', 'id').first()
+        if job is None:
+            return None
+
+        # Conditional update instead of row locks so SQLite and Postgres behave the same
+        claimed = BackgroundJob.objects.filter(
+            pk=job.pk,
+            status=BackgroundJob.STATUS_PENDING,
+        ).update(
+            status=BackgroundJob.STATUS_RUNNING,
+            attempts=F('attempts') + 1,
+            locked_at=now,
+            locked_by=worker_id,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def heartbeat_running_job():
+    # Long non-atomic handlers call this between batches so the job is not
+    # mistaken for one a dead worker left behind
+    job_id = getattr(_running_job, 'id', None)
+    if job_id is None:
+        return False
+    return bool(BackgroundJob.objects.filter(
+        pk=job_id,
+        status=BackgroundJob.STATUS_RUNNING,
+        locked_by=_running_job.worker_id,
+    ).update(locked_at=timezone.now()))
+
+
+def run_job(job):
+    handler = _job_handlers.get(job.name)
+    _running_job.id = job.pk
+    _running_job.worker_id = job.locked_by
+    try:
+        if handler is None:
+            raise LookupError(f'Unknown background job: {job.name}')
+        with transaction.atomic() if getattr(handler, 'run_atomically', True) else nullcontext():
+            handler(**job.payload)
+    except Exception:
+        now = timezone.now()
+        job.last_error = traceback.format_exc()
+        job.locked_at = None
+        job.locked_by = ''
+        if job.attempts >= job.max_attempts:
+            job.status = BackgroundJob.STATUS_FAILED
+            job.finished_at = now
+            logger.exception('Background job %s #%s failed permanently', job.name, job.pk)
+        else:
+            job.status = BackgroundJob.STATUS_PENDING
+            job.run_after = now + get_job_retry_delay(job.attempts)
+            logger.warning('Background job %s #%s failed, retrying at %s', job.name, job.pk, job.run_after, exc_info=True)
+        job.save(update_fields=['status', 'run_after', 'last_error', 'locked_at', 'locked_by', 'finished_at'])
+        return False
+    finally:
+        _running_job.id = None
+
+    job.status = BackgroundJob.STATUS_SUCCEEDED
+    job.finished_at = timezone.now()
+    job.locked_at = None
+    job.locked_by = ''
+    job.last_error = ''
+    job.save(update_fields=['status', 'finished_at', 'locked_at', 'locked_by', 'last_error'])
+    return True
+
+
+def run_pending_jobs(worker_id, *, max_jobs=None):
+    requeue_stale_jobs()
+
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        job = claim_next_job(worker_id)
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
+
+
+@register_job(JOB_PROCESS_USERKIT_IMAGE)
+def process_userkit_image(image_id):
+    userkit_image = UserKitImage.objects.filter(pk=image_id).first()
+    if userkit_image is not None:
+        process_uploaded_image(userkit_image)
+
+
+@register_job(JOB_RECORD_COLLECTION_VALUE_SNAPSHOT)
+def record_collection_value_snapshot_for_user(user_id, reason, related_userkit_id=None, value_delta=None, count_delta=None):
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+
+    related_userkit = None
+    if related_userkit_id is not None:
+        related_userkit = UserKit.objects.filter(pk=related_userkit_id).first()
+    record_collection_value_snapshot(
+        user,
+        reason,
+        related_userkit=related_userkit,
+        value_delta=Decimal(value_delta) if value_delta is not None else None,
+        count_delta=count_delta,
+    )
+
+
+def notification_trigger_exists(*, recipient_id, actor_id, type, kit_id=None, comment_id=None):
+    # A queued notification must not outlive an unlike/unfollow/delete that ran first
+    if type == 'kit_like':
+        return UserKit.likes.through.objects.filter(userkit_id=kit_id, user_id=actor_id).exists()
+    if type == 'comment_like':
+        return KitCommentLike.objects.filter(comment_id=comment_id, user_id=actor_id).exists()
+    if type == 'follow':
+        return Follow.objects.filter(follower_id=actor_id, following_id=recipient_id).exists()
+    return KitComment.objects.filter(pk=comment_id).exists()
+
+
+@register_job(JOB_DELIVER_NOTIFICATION)
+def deliver_notification(recipient_id, actor_id, type, kit_id=None, comment_id=None):
+    trigger = {
+        'recipient_id': recipient_id,
+        'actor_id': actor_id,
+        'type': type,
+        'kit_id': kit_id,
+        'comment_id': comment_id,
+    }
+    if notification_trigger_exists(**trigger):
+        Notification.objects.get_or_create(**trigger)
+
+
+@register_job(JOB_BUILD_COLLECTION_EXPORT, atomic=False)
+def build_collection_export(export_job_id):
+    # views imports this module, so the export writers are imported lazily
+    from .views import build_collection_export_artifact
+
+    # Commit the RUNNING transition on its own and build the file outside any
+    # transaction, so the export never holds the SQLite write lock while it runs
+    claimed = CollectionExportJob.objects.filter(
+        pk=export_job_id,
+        status__in=CollectionExportJob.ACTIVE_STATUSES,
+    ).update(status=CollectionExportJob.STATUS_RUNNING)
+    if not claimed:
+        return
+    export_job = CollectionExportJob.objects.select_related('user').get(pk=export_job_id)
+
+    try:
+        row_count = build_collection_export_artifact(export_job, on_progress=heartbeat_running_job)
+    except Exception:
+        # Export failures are not transient; report them instead of retrying
+        logger.exception('Collection export #%s failed', export_job.pk)
+        export_job.delete_artifact()
+        export_job.file = ''
+        export_job.row_count = None
+        export_job.status = CollectionExportJob.STATUS_FAILED
+        export_job.error = 'The export could not be generated.'
+    else:
+        export_job.row_count = row_count
+        export_job.status = CollectionExportJob.STATUS_SUCCEEDED
+        export_job.error = ''
+
+    finished_at = timezone.now()
+    with transaction.atomic():
+        # Only a job that is still ours; fail_abandoned_collection_exports may
+        # have given up on it while the file was being written
+        finished = CollectionExportJob.objects.filter(
+            pk=export_job.pk,
+            status=CollectionExportJob.STATUS_RUNNING,
+        ).update(
+            file=export_job.file.name or '',
+            filename=export_job.filename,
+            row_count=export_job.row_count,
+            status=export_job.status,
+            error=export_job.error,
+            finished_at=finished_at,
+            expires_at=finished_at + timedelta(
+                seconds=getattr(settings, 'COLLECTION_EXPORT_JOB_TTL_SECONDS', 24 * 60 * 60),
+            ),
+        )
+    if not finished:
+        export_job.delete_artifact()
+
+
+@register_job(JOB_REVALUE_USERKITS)
+def revalue_userkits_for_catalog_change(kit_ids=None, shirt_version_ids=None):
+    if not kit_ids and not shirt_version_ids:
+        return
+    revalue_userkits(UserKit.objects.filter(
+        Q(kit_id__in=kit_ids or []) | Q(shirt_version_id__in=shirt_version_ids or []),
+    ))
+
+
+@register_job(JOB_DELETE_TEAM_CONTENT, atomic=False)
+def delete_team_content(deletion_job_id):
+    # team_moderation imports this module, so the deletion engine is imported lazily
+    from .team_moderation import run_team_deletion
+
+    run_team_deletion(deletion_job_id)
+
+
+def enqueue_collection_value_snapshot(user, reason, related_userkit=None, *, delta=None):
+    payload = {
+        'user_id': user.id,
+        'reason': reason,
+        'related_userkit_id': related_userkit.id if related_userkit is not None else None,
+    }
+    # A delta is only exact against the snapshot that is latest right now, so
+    # deferred jobs re-aggregate in the worker instead
+    if delta is not None and jobs_run_eagerly():
+        payload['value_delta'] = str(delta[0])
+        payload['count_delta'] = delta[1]
+    return enqueue_job(JOB_RECORD_COLLECTION_VALUE_SNAPSHOT, payload)
+
+
+def enqueue_notification(*, recipient, actor, type, kit=None, comment=None):
+    return enqueue_job(JOB_DELIVER_NOTIFICATION, {
+        'recipient_id': recipient.id,
+        'actor_id': actor.id,
+        'type': type,
+        'kit_id': kit.id if kit is not None else None,
+        'comment_id': comment.id if comment is not None else None,
+    })
+
+
+def enqueue_userkit_revaluation(*, kit_ids=None, shirt_version_ids=None):
+    return enqueue_job(JOB_REVALUE_USERKITS, {
+        'kit_ids': list(kit_ids or []),
+        'shirt_version_ids': list(shirt_version_ids or []),
+    })
+
+
+def enqueue_collection_export(export_job):
+    if jobs_run_eagerly():
+        # Without a worker the build still runs in this process, but only after
+        # the request's transaction has committed and released the write lock
+        transaction.on_commit(lambda: enqueue_job(JOB_BUILD_COLLECTION_EXPORT, {'export_job_id': export_job.id}))
+        return None
+    return enqueue_job(JOB_BUILD_COLLECTION_EXPORT, {'export_job_id': export_job.id})
+
+
+def enqueue_team_deletion(deletion_job):
+    return enqueue_job(JOB_DELETE_TEAM_CONTENT, {'deletion_job_id': deletion_job.id})
@@ -0,0 +1,115 @@
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from kits.views import (
+    CollectionExportSummary,
+    iter_collection_export_csv,
+    write_collection_export_xlsx,
+)
+
+
+BENCHMARK_TEAMS = [f'Benchmark Team {index}' for index in range(200)]
+BENCHMARK_CONDITIONS = ['Brand new with tags', 'Excellent', 'Very good', 'Good', 'Worn']
+
+
+class _SyntheticUserKit:
+    def __init__(self, row):
+        self.in_the_collection = row['Status'] == 'In collection'
+        self.final_value = row['Value']
+        self.purchase_price = row['Purchase price']
+        self._profit_loss = row['Profit / loss']
+
+    def get_profit_loss(self):
+        return self._profit_loss
+
+
+def iter_benchmark_export_rows(row_count, summary=None):
+    added_at = date(2024, 1, 1)
+    for index in range(row_count):
+        value = Decimal(40 + index % 160).quantize(Decimal('0.01'))
+        purchase_price = Decimal(30 + index % 90).quantize(Decimal('0.01'))
+        profit_loss = value - purchase_price
+        row = {
+            'Team': BENCHMARK_TEAMS[index % len(BENCHMARK_TEAMS)],
+            'Season': f'{1990 + index % 35}/{1991 + index % 35}',
+            'Kit type': 'Home' if index % 3 else 'Away',
+            'Size': 'L',
+            'Condition': BENCHMARK_CONDITIONS[index % len(BENCHMARK_CONDITIONS)],
+            'Technology': 'Replica',
+            'Status': 'Sold' if index % 10 == 0 else 'In collection',
+            'In collection': 'No' if index % 10 == 0 else 'Yes',
+            'For sale': 'No',
+            'External URL': f'https://example.com/listing/{index}' if index % 4 == 0 else '',
+            'Value': value,
+            'Purchase price': purchase_price,
+            'Purchase date': added_at - timedelta(days=index % 365),
+            'Profit / loss': profit_loss,
+            'ROI %': None,
+            'ROI ratio': (profit_loss / purchase_price).quantize(Decimal('0.0001')),
+            'Added at': added_at,
+        }
+        if summary is not None:
+            summary.add(_SyntheticUserKit(row))
+        yield row
+
+
+class Command(BaseCommand):
+    help = 'Benchmark collection export speed, size and peak memory on synthetic rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            action='append',
+            type=int,
+            dest='row_counts',
+            help='Number of rows to export. Can be repeated. Defaults to 10000 and 100000.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'xlsx'],
+            action='append',
+            dest='formats',
+            help='Export format to benchmark. Can be repeated. Defaults to both.',
+        )
+        parser.add_argument(
+            '--trace-memory',
+            action='store_true',
+            help='Also report peak Python memory. Slows the export down noticeably.',
+        )
+
+    def handle(self, *args, **options):
+        row_counts = options['row_counts'] or [10000, 100000]
+        formats = options['formats'] or ['csv', 'xlsx']
+
+        for export_format in formats:
+            for row_count in row_counts:
+                if options['trace_memory']:
+                    tracemalloc.start()
+                started = time.perf_counter()
+                size = self._export(export_format, row_count)
+                elapsed = time.perf_counter() - started
+                result = f'{export_format} {row_count} rows: {elapsed:.2f}s, {size / 1024:.0f} KiB'
+                if options['trace_memory']:
+                    _current, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    result += f', peak Python memory {peak / 1024:.0f} KiB'
+                self.stdout.write(result)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished.'))
+
+    def _export(self, export_format, row_count):
+        # Write to disk so the output itself does not count as Python memory
+        with tempfile.TemporaryFile() as output:
+            if export_format == 'csv':
+                for chunk in iter_collection_export_csv(iter_benchmark_export_rows(row_count)):
+                    output.write(chunk.encode())
+            else:
+                summary = CollectionExportSummary()
+                write_collection_export_xlsx(output, iter_benchmark_export_rows(row_count, summary), summary)
+            output.seek(0, 2)
+            return output.tell()
@@ -0,0 +1,98 @@
+import time
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from kits.models import Kit, Team, UserKit, WishlistItem
+from kits.query_budget import record_queries
+from kits.team_moderation import merge_teams_safely
+
+
+BENCHMARK_SEASONS = [f'{year}/{year + 1}' for year in range(1990, 2025)]
+BENCHMARK_KIT_TYPES = ['Home', 'Away', 'Third']
+
+
+class _Rollback(Exception):
+    pass
+
+
+def seed_team_merge_benchmark(kit_count, *, label='benchmark'):
+    """Create a verified target team and an unverified duplicate with kit_count uploads.
+
+    Every other source kit duplicates a target kit, so the merge exercises both
+    the move and the reconcile paths. Returns (source_team, target_team, actor).
+    """
+    actor = User.objects.create_user(username=f'{label}_merge_actor', is_staff=True)
+    owner = User.objects.create_user(username=f'{label}_merge_owner')
+    target_team = Team.objects.create(name=f'{label} Merge Target FC', is_verified=True)
+    source_team = Team.objects.create(name=f'{label} Merge Source FC', is_verified=False)
+
+    variants = [
+        (season, kit_type)
+        for season in BENCHMARK_SEASONS
+        for kit_type in BENCHMARK_KIT_TYPES
+    ]
+    source_variants = [variants[index % len(variants)] + (index,) for index in range(kit_count)]
+    Kit.objects.bulk_create([
+        Kit(team=target_team, season=season, kit_type=kit_type, estimated_price=Decimal('0'))
+        for season, kit_type, index in source_variants
+        if index % 2 == 0
+    ], ignore_conflicts=True)
+    source_kits = Kit.objects.bulk_create([
+        Kit(
+            team=source_team,
+            season=f'{season} #{index}' if index % 2 else season,
+            kit_type=kit_type,
+            estimated_price=Decimal('80.00'),
+        )
+        for season, kit_type, index in source_variants
+    ])
+    UserKit.objects.bulk_create([
+        UserKit(user=owner, kit=kit, shirt_technology='REPLICA', size='L', condition='VERY_GOOD')
+        for kit in source_kits
+    ])
+    WishlistItem.objects.bulk_create([
+        WishlistItem(user=owner, team=team, season=kit.season, kit_type=kit.kit_type)
+        for kit in source_kits
+        for team in (source_team, target_team)
+    ], ignore_conflicts=True)
+    return source_team, target_team, actor
+
+
+class Command(BaseCommand):
+    help = 'Benchmark team merges on synthetic duplicates. All changes are rolled back.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kits',
+            action='append',
+            type=int,
+            dest='kit_counts',
+            help='Number of uploads on the duplicate team. Can be repeated. Defaults to 100 and 1000.',
+        )
+
+    def handle(self, *args, **options):
+        for kit_count in options['kit_counts'] or [100, 1000]:
+            try:
+                with transaction.atomic():
+                    source_team, target_team, actor = seed_team_merge_benchmark(kit_count)
+                    with record_queries() as recorder:
+                        started = time.perf_counter()
+                        _team, _action, summary = merge_teams_safely(
+                            source_team_id=source_team.id,
+                            target_team_id=target_team.id,
+                            actor=actor,
+                        )
+                        elapsed = time.perf_counter() - started
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+            self.stdout.write(
+                f'{kit_count} kits: {elapsed:.2f}s in the merge transaction, {recorder.count} queries, '
+                f'{summary["moved_kits"]} moved, {summary["merged_duplicate_kits"]} merged'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished.'))
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from kits.models import CollectionValueSnapshot, compact_collection_value_history
+
+
+class Command(BaseCommand):
+    help = 'Fold old raw collection value snapshots into daily, weekly and monthly rollups.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days',
+            type=int,
+            default=None,
+            help='Compact snapshots older than this many days. Defaults to COLLECTION_VALUE_HISTORY_RAW_RETENTION_DAYS.',
+        )
+        parser.add_argument(
+            '--user-id',
+            action='append',
+            type=int,
+            dest='user_ids',
+            help='Only compact the history of this user. Can be repeated.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many snapshots would be compacted.',
+        )
+
+    def handle(self, *args, **options):
+        older_than_days = options['older_than_days']
+        if older_than_days is None:
+            older_than_days = getattr(settings, 'COLLECTION_VALUE_HISTORY_RAW_RETENTION_DAYS', 90)
+        cutoff = timezone.now() - timedelta(days=older_than_days)
+
+        old_snapshots = CollectionValueSnapshot.objects.filter(created_at__lt=cutoff)
+        if options['user_ids']:
+            old_snapshots = old_snapshots.filter(user_id__in=options['user_ids'])
+        user_ids = old_snapshots.order_by('user_id').values_list('user_id', flat=True).distinct()
+
+        compacted = 0
+        users = 0
+        for user_id in list(user_ids):
+            removed = compact_collection_value_history(user_id, cutoff, dry_run=options['dry_run'])
+            if removed:
+                compacted += removed
+                users += 1
+
+        if options['dry_run']:
+            self.stdout.write(f'{compacted} snapshot(s) of {users} user(s) would be compacted.')
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'Compacted {compacted} snapshot(s) of {users} user(s).'))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from kits.image_variants import generate_image_variants
+from kits.models import UserKitImage
+
+
+class Command(BaseCommand):
+    help = 'Generate resized WebP/JPEG variants for uploaded kit images that do not have them yet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many images would be processed.',
+        )
+        parser.add_argument(
+            '--image-id',
+            action='append',
+            type=int,
+            dest='image_ids',
+            help='Limit generation to the given image id. Can be repeated.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate variants for images that already have them.',
+        )
+
+    def handle(self, *args, **options):
+        queryset = UserKitImage.objects.order_by('id')
+        if options['image_ids']:
+            queryset = queryset.filter(pk__in=options['image_ids'])
+        if not options['force']:
+            queryset = queryset.filter(variants={})
+
+        if options['dry_run']:
+            self.stdout.write(f'{queryset.count()} image(s) need variants.')
+            return
+
+        processed = 0
+        for userkit_image in queryset.iterator():
+            if generate_image_variants(userkit_image):
+                processed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Generated variants for {processed} image(s).'))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from kits.models import CollectionExportJob, fail_abandoned_collection_exports
+
+
+class Command(BaseCommand):
+    help = 'Delete expired collection export jobs and their files from MEDIA_ROOT.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many exports have expired.',
+        )
+
+    def handle(self, *args, **options):
+        if not options['dry_run']:
+            # Abandoned builds are failed with an immediate expiry, so they are purged below
+            fail_abandoned_collection_exports()
+
+        expired = CollectionExportJob.objects.filter(expires_at__lte=timezone.now())
+
+        if options['dry_run']:
+            self.stdout.write(f'{expired.count()} collection export(s) have expired.')
+            return
+
+        purged = 0
+        # Delete one by one so the post_delete signal removes each file
+        for export_job in expired.iterator():
+            export_job.delete()
+            purged += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Purged {purged} collection export(s).'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from kits.models import rebuild_following_feed
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized following feed from the Follow and UserKit rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--follower-id',
+            action='append',
+            type=int,
+            dest='follower_ids',
+            help='Only rebuild the feed of the given user id. Can be repeated.',
+        )
+
+    def handle(self, *args, **options):
+        created = rebuild_following_feed(options['follower_ids'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {created} following feed entries.'))
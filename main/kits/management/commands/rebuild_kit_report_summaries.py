@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from kits.models import KitReport, KitReportSummary, refresh_kit_report_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the report summaries and search index behind the admin report queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of reported kits to summarize per batch.',
+        )
+
+    def handle(self, *args, **options):
+        reported_ids = set(KitReport.objects.values_list('kit_id', flat=True).distinct())
+        # Summaries left behind for kits whose reports are all gone are removed too
+        userkit_ids = sorted(reported_ids | set(KitReportSummary.objects.values_list('userkit_id', flat=True)))
+
+        batch_size = max(options['batch_size'], 1)
+        summarized = 0
+        for start in range(0, len(userkit_ids), batch_size):
+            summarized += refresh_kit_report_summaries(userkit_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f'Summarized reports for {summarized} kit(s).'))
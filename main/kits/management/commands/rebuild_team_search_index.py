@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from kits.models import Team, reindex_team_search_trigrams
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the trigram index used to match team names in kit search suggestions.'
+
+    def handle(self, *args, **options):
+        indexed = reindex_team_search_trigrams(Team.objects.only('id', 'name', 'is_verified'))
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} team name trigram(s).'))
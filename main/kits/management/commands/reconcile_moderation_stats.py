@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from kits.models import reconcile_moderation_stats
+
+
+class Command(BaseCommand):
+    help = 'Recount the moderation dashboard counters from the suggestion, team and report rows and fix any drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report which counters have drifted.',
+        )
+
+    def handle(self, *args, **options):
+        drifted = reconcile_moderation_stats(dry_run=options['dry_run'])
+
+        if options['dry_run']:
+            self.stdout.write(f'{len(drifted)} moderation counter(s) have drifted.')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Reconciled {len(drifted)} moderation counter(s).'))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from kits.models import reconcile_unread_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-user and per-conversation unread counters from the message and notification rows and fix any drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many counters have drifted.',
+        )
+        parser.add_argument(
+            '--user-id',
+            action='append',
+            type=int,
+            dest='user_ids',
+            help='Limit reconciliation to the given user id. Can be repeated.',
+        )
+
+    def handle(self, *args, **options):
+        drifted = reconcile_unread_counters(options['user_ids'], dry_run=options['dry_run'])
+
+        if options['dry_run']:
+            self.stdout.write(f'{drifted} unread counter(s) have drifted.')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Reconciled {drifted} unread counter(s).'))
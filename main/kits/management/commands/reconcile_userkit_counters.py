@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from kits.models import UserKit, reconcile_userkit_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute UserKit likes_count/comments_count from the like and comment rows and fix any drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many kits have drifted counters.',
+        )
+        parser.add_argument(
+            '--userkit-id',
+            action='append',
+            type=int,
+            dest='userkit_ids',
+            help='Limit reconciliation to the given kit id. Can be repeated.',
+        )
+
+    def handle(self, *args, **options):
+        queryset = UserKit.objects.all()
+        if options['userkit_ids']:
+            queryset = queryset.filter(pk__in=options['userkit_ids'])
+
+        drifted = reconcile_userkit_counters(queryset, dry_run=options['dry_run'])
+
+        if options['dry_run']:
+            self.stdout.write(f'{drifted} kit(s) have drifted counters.')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Reconciled counters on {drifted} kit(s).'))
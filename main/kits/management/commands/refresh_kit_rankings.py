@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from kits.models import refresh_kit_rankings
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the explore ranking rows for every publicly visible kit.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of ranking rows written per batch.',
+        )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_kit_rankings(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Refreshed {refreshed} kit ranking(s).'))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from kits.models import TeamDeletionJob
+from kits.team_moderation import run_team_deletion
+
+
+class Command(BaseCommand):
+    help = 'Resume chunked team deletions that stopped before finishing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--deletion-job-id',
+            action='append',
+            type=int,
+            dest='deletion_job_ids',
+            help='Only resume this deletion job. Can be repeated.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only list the unfinished deletions.',
+        )
+
+    def handle(self, *args, **options):
+        deletion_jobs = TeamDeletionJob.objects.filter(
+            status__in=TeamDeletionJob.ACTIVE_STATUSES,
+        ).order_by('id')
+        if options['deletion_job_ids']:
+            deletion_jobs = deletion_jobs.filter(pk__in=options['deletion_job_ids'])
+
+        if options['dry_run']:
+            for deletion_job in deletion_jobs:
+                self.stdout.write(
+                    f'#{deletion_job.id} {deletion_job.team_name}: '
+                    f'{deletion_job.summary.get("deleted_userkits", 0)} upload(s) deleted so far'
+                )
+            return
+
+        resumed = 0
+        for deletion_job in list(deletion_jobs):
+            run_team_deletion(deletion_job.id)
+            resumed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Resumed {resumed} team deletion(s).'))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from kits.models import UserKit, revalue_userkits
+
+
+class Command(BaseCommand):
+    help = 'Recompute automatic kit values from current catalog prices and shirt version multipliers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many kits would be repriced.',
+        )
+        parser.add_argument(
+            '--kit-id',
+            action='append',
+            type=int,
+            dest='kit_ids',
+            help='Limit revaluation to user kits of the given catalog kit id. Can be repeated.',
+        )
+        parser.add_argument(
+            '--shirt-version-id',
+            action='append',
+            type=int,
+            dest='shirt_version_ids',
+            help='Limit revaluation to user kits of the given shirt version id. Can be repeated.',
+        )
+
+    def handle(self, *args, **options):
+        queryset = UserKit.objects.all()
+        if options['kit_ids'] or options['shirt_version_ids']:
+            queryset = queryset.filter(
+                Q(kit_id__in=options['kit_ids'] or [])
+                | Q(shirt_version_id__in=options['shirt_version_ids'] or [])
+            )
+
+        repriced = revalue_userkits(queryset, dry_run=options['dry_run'])
+
+        if options['dry_run']:
+            self.stdout.write(f'{repriced} kit value(s) are out of date.')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Repriced {repriced} kit value(s).'))
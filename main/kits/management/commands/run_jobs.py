@@ -0,0 +1,46 @@
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+
+from kits.jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (image processing, value snapshots, notifications).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the jobs that are due now and exit instead of polling.',
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            default=None,
+            help='Stop after running this many jobs.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between polls when the queue is empty.',
+        )
+
+    def handle(self, *args, **options):
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        max_jobs = options['max_jobs']
+        processed = 0
+
+        while max_jobs is None or processed < max_jobs:
+            remaining = None if max_jobs is None else max_jobs - processed
+            ran = run_pending_jobs(worker_id, max_jobs=remaining)
+            processed += ran
+            if options['once']:
+                break
+            if not ran:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} job(s).'))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.9 on 2026-10-17 09:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_userkit_counters(apps, schema_editor):
+    UserKit = apps.get_model('kits', 'UserKit')
+    KitComment = apps.get_model('kits', 'KitComment')
+    UserKitLikes = UserKit.likes.through
+
+    likes_subquery = UserKitLikes.objects.filter(
+        userkit_id=OuterRef('pk'),
+    ).order_by().values('userkit_id').annotate(total=Count('id')).values('total')
+    comments_subquery = KitComment.objects.filter(
+        kit_id=OuterRef('pk'),
+    ).order_by().values('kit_id').annotate(total=Count('id')).values('total')
+
+    UserKit.objects.update(
+        likes_count=Coalesce(Subquery(likes_subquery), Value(0)),
+        comments_count=Coalesce(Subquery(comments_subquery), Value(0)),
+    )
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0037_userkit_purchase_date_userkit_purchase_price'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userkit',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userkit',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_userkit_counters, noop_reverse),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:52
+
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# Frozen copy of kits.models.calculate_trending_score as of this migration
+TRENDING_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+TRENDING_HALF_LIFE = timedelta(days=3)
+TRENDING_COMMENT_WEIGHT = 2
+
+
+def calculate_trending_score(likes_count, comments_count, added_at):
+    engagement = (likes_count or 0) + (comments_count or 0) * TRENDING_COMMENT_WEIGHT
+    age_seconds = (added_at - TRENDING_EPOCH).total_seconds()
+    decay_rate = math.log(2) / TRENDING_HALF_LIFE.total_seconds()
+    return math.log1p(engagement) + age_seconds * decay_rate
+
+
+def backfill_kit_rankings(apps, schema_editor):
+    UserKit = apps.get_model('kits', 'UserKit')
+    KitRanking = apps.get_model('kits', 'KitRanking')
+
+    now = timezone.now()
+    rows = UserKit.objects.filter(
+        in_the_collection=True,
+        is_hidden_by_moderation=False,
+    ).values_list('id', 'likes_count', 'comments_count', 'added_at').order_by('id')
+
+    batch = []
+    for userkit_id, likes_count, comments_count, added_at in rows.iterator(chunk_size=500):
+        batch.append(KitRanking(
+            userkit_id=userkit_id,
+            likes_count=likes_count,
+            comments_count=comments_count,
+            added_at=added_at,
+            trending_score=calculate_trending_score(likes_count, comments_count, added_at),
+            refreshed_at=now,
+        ))
+        if len(batch) >= 500:
+            KitRanking.objects.bulk_create(batch)
+            batch = []
+
+    if batch:
+        KitRanking.objects.bulk_create(batch)
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0038_userkit_likes_count_userkit_comments_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KitRanking',
+            fields=[
+                ('userkit', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='kits.userkit')),
+                ('likes_count', models.PositiveIntegerField(default=0)),
+                ('comments_count', models.PositiveIntegerField(default=0)),
+                ('added_at', models.DateTimeField()),
+                ('trending_score', models.FloatField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='userkit',
+            index=models.Index(fields=['in_the_collection', 'is_hidden_by_moderation', '-added_at'], name='kits_userki_in_the__a04970_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userkit',
+            index=models.Index(fields=['for_sale', '-added_at'], name='kits_userki_for_sal_572825_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kitranking',
+            index=models.Index(fields=['-trending_score', '-added_at'], name='kits_kitran_trendin_1fc745_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kitranking',
+            index=models.Index(fields=['-likes_count', '-comments_count', '-added_at'], name='kits_kitran_likes_c_25318f_idx'),
+        ),
+        migrations.RunPython(backfill_kit_rankings, noop_reverse),
+    ]
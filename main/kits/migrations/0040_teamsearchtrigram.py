@@ -0,0 +1,48 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Frozen copy of kits.models.build_search_trigrams as of this migration
+def build_search_trigrams(value):
+    lowered = (value or '').lower()
+    return {lowered[index:index + 3] for index in range(len(lowered) - 2)}
+
+
+def backfill_team_search_trigrams(apps, schema_editor):
+    Team = apps.get_model('kits', 'Team')
+    TeamSearchTrigram = apps.get_model('kits', 'TeamSearchTrigram')
+
+    rows = [
+        TeamSearchTrigram(team_id=team_id, trigram=trigram)
+        for team_id, name in Team.objects.filter(is_verified=True).values_list('id', 'name').iterator()
+        for trigram in sorted(build_search_trigrams(name))
+    ]
+    TeamSearchTrigram.objects.bulk_create(rows, batch_size=1000)
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0039_kitranking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamSearchTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_trigrams', to='kits.team')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('trigram', 'team'), name='unique_team_search_trigram')],
+            },
+        ),
+        migrations.RunPython(backfill_team_search_trigrams, noop_reverse),
+    ]
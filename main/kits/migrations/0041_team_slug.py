@@ -0,0 +1,48 @@
+# Generated by Django 5.2.9 on 2026-10-17 13:40
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def backfill_team_slugs(apps, schema_editor):
+    Team = apps.get_model('kits', 'Team')
+
+    # Oldest team keeps the bare slug, matching the previous first-by-id resolution
+    taken_slugs = set()
+    teams = list(Team.objects.order_by('id').only('id', 'name'))
+    for team in teams:
+        base_slug = slugify(team.name or '')[:110] or 'team'
+        slug = base_slug
+        suffix = 2
+        while slug in taken_slugs:
+            slug = f'{base_slug}-{suffix}'
+            suffix += 1
+        taken_slugs.add(slug)
+        team.slug = slug
+
+    Team.objects.bulk_update(teams, ['slug'], batch_size=500)
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0040_teamsearchtrigram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='slug',
+            field=models.SlugField(max_length=120, null=True),
+        ),
+        migrations.RunPython(backfill_team_slugs, noop_reverse),
+        migrations.AlterField(
+            model_name='team',
+            name='slug',
+            field=models.SlugField(max_length=120, unique=True),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.9 on 2026-10-17 13:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, Count, F, When
+
+
+def backfill_unread_counters(apps, schema_editor):
+    Message = apps.get_model('kits', 'Message')
+    Notification = apps.get_model('kits', 'Notification')
+    ConversationUnreadCounter = apps.get_model('kits', 'ConversationUnreadCounter')
+    UserUnreadCounter = apps.get_model('kits', 'UserUnreadCounter')
+
+    recipient = Case(
+        When(sender_id=F('conversation__participant_one_id'), then=F('conversation__participant_two_id')),
+        default=F('conversation__participant_one_id'),
+    )
+    message_rows = Message.objects.filter(
+        read_at__isnull=True,
+    ).annotate(
+        recipient_id=recipient,
+    ).order_by().values('recipient_id', 'conversation_id').annotate(total=Count('id'))
+
+    totals = {}
+    conversation_counters = []
+    for row in message_rows:
+        conversation_counters.append(ConversationUnreadCounter(
+            user_id=row['recipient_id'],
+            conversation_id=row['conversation_id'],
+            unread_count=row['total'],
+        ))
+        totals.setdefault(row['recipient_id'], [0, 0])[0] += row['total']
+    ConversationUnreadCounter.objects.bulk_create(conversation_counters, batch_size=500)
+
+    notification_rows = Notification.objects.filter(
+        read_at__isnull=True,
+    ).order_by().values('recipient_id').annotate(total=Count('id'))
+    for row in notification_rows:
+        totals.setdefault(row['recipient_id'], [0, 0])[1] = row['total']
+
+    UserUnreadCounter.objects.bulk_create(
+        [
+            UserUnreadCounter(
+                user_id=user_id,
+                messages_unread_count=messages_count,
+                notifications_unread_count=notifications_count,
+            )
+            for user_id, (messages_count, notifications_count) in totals.items()
+        ],
+        batch_size=500,
+    )
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('kits', '0041_team_slug'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserUnreadCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='unread_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('messages_unread_count', models.PositiveIntegerField(default=0)),
+                ('notifications_unread_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ConversationUnreadCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('conversation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='unread_counters', to='kits.conversation')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conversation_unread_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'conversation'), name='unique_conversation_unread_counter')],
+            },
+        ),
+        migrations.RunPython(backfill_unread_counters, noop_reverse),
+    ]
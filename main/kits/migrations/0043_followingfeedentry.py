@@ -0,0 +1,59 @@
+# Generated by Django 5.2.9 on 2026-10-17 13:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_following_feed_entries(apps, schema_editor):
+    Follow = apps.get_model('kits', 'Follow')
+    UserKit = apps.get_model('kits', 'UserKit')
+    FollowingFeedEntry = apps.get_model('kits', 'FollowingFeedEntry')
+
+    followers_by_user = {}
+    for follower_id, following_id in Follow.objects.values_list('follower_id', 'following_id'):
+        if follower_id != following_id:
+            followers_by_user.setdefault(following_id, []).append(follower_id)
+
+    batch = []
+    userkits = UserKit.objects.filter(
+        user_id__in=list(followers_by_user),
+        is_hidden_by_moderation=False,
+    ).values_list('id', 'user_id', 'added_at').order_by('id')
+    for userkit_id, user_id, added_at in userkits.iterator(chunk_size=1000):
+        for follower_id in followers_by_user[user_id]:
+            batch.append(FollowingFeedEntry(follower_id=follower_id, userkit_id=userkit_id, added_at=added_at))
+        if len(batch) >= 1000:
+            FollowingFeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        FollowingFeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0042_unread_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FollowingFeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('added_at', models.DateTimeField()),
+                ('follower', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following_feed_entries', to=settings.AUTH_USER_MODEL)),
+                ('userkit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following_feed_entries', to='kits.userkit')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['follower', '-added_at', '-userkit'], name='kits_follow_followe_8a6ecb_idx')],
+                'constraints': [models.UniqueConstraint(fields=('follower', 'userkit'), name='unique_following_feed_entry')],
+            },
+        ),
+        migrations.RunPython(backfill_following_feed_entries, noop_reverse),
+    ]
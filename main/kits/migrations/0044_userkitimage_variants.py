@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-17 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0043_followingfeedentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userkitimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-17 13:39
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0046_collectionexportjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='collectionvaluesnapshot',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
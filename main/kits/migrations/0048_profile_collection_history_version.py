@@ -0,0 +1,37 @@
+# Generated by Django 5.2.9 on 2026-10-17 13:43
+
+from django.db import migrations, models
+
+
+def mark_histories_with_hidden_kits_stale(apps, schema_editor):
+    # The old per-request check rebuilt these histories; let the first view do it once
+    Profile = apps.get_model('kits', 'Profile')
+    UserKit = apps.get_model('kits', 'UserKit')
+    Profile.objects.filter(
+        user_id__in=UserKit.objects.filter(is_hidden_by_moderation=True).values('user_id'),
+    ).update(collection_history_version=1)
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0047_collectionvaluesnapshot_created_at_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='collection_history_rebuilt_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='collection_history_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(mark_histories_with_hidden_kits_stale, noop_reverse),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-17 13:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0048_profile_collection_history_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectionValueRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly')], max_length=16)),
+                ('bucket_start', models.DateField()),
+                ('last_snapshot_at', models.DateTimeField()),
+                ('total_value', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('kits_count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='collection_value_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['bucket_start'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'resolution', 'bucket_start'), name='unique_collection_value_rollup_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-17 13:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0049_collectionvaluerollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamDeletionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('team_id_snapshot', models.IntegerField()),
+                ('team_name', models.CharField(max_length=100)),
+                ('reason', models.CharField(max_length=32)),
+                ('note', models.TextField(blank=True, default='')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('last_userkit_id', models.PositiveBigIntegerField(default=0)),
+                ('last_kit_id', models.PositiveBigIntegerField(default=0)),
+                ('previous_state', models.JSONField(blank=True, default=dict)),
+                ('summary', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='team_deletion_jobs', to=settings.AUTH_USER_MODEL)),
+                ('moderation_action', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='kits.teammoderationaction')),
+                ('team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deletion_jobs', to='kits.team')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running'])), fields=('team',), name='unique_active_team_deletion_job')],
+            },
+        ),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 5.2.9 on 2026-10-17 14:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Frozen copies of the kits.models summary helpers as of this migration
+KIT_REPORT_SUMMARY_REPORT_FIELDS = ('kit_id', 'status', 'reason', 'created_at', 'reporter__username', 'description')
+KIT_REPORT_SUMMARY_USERKIT_FIELDS = ('id', 'user__username', 'kit__team__name', 'kit__season', 'kit__kit_type')
+STATUS_COUNT_FIELDS = {
+    'pending': 'pending_count',
+    'resolved': 'resolved_count',
+    'dismissed': 'dismissed_count',
+}
+
+
+def build_search_trigrams(value):
+    lowered = (value or '').lower()
+    return {lowered[index:index + 3] for index in range(len(lowered) - 2)}
+
+
+def summarize_kit_reports(report_rows, userkit_rows):
+    summaries = {}
+    search_values = {}
+    for kit_id, report_status, reason, created_at, reporter_username, description in report_rows:
+        summary = summaries.get(kit_id)
+        if summary is None:
+            summary = summaries[kit_id] = {
+                'report_count': 0,
+                'pending_count': 0,
+                'resolved_count': 0,
+                'dismissed_count': 0,
+                'latest_report_at': created_at,
+                'reasons': [],
+            }
+            search_values[kit_id] = []
+        summary['report_count'] += 1
+        count_field = STATUS_COUNT_FIELDS.get(report_status)
+        if count_field is not None:
+            summary[count_field] += 1
+        if reason not in summary['reasons']:
+            summary['reasons'].append(reason)
+        search_values[kit_id].extend([reporter_username, description])
+
+    for userkit_id, *kit_values in userkit_rows:
+        summary = summaries.get(userkit_id)
+        if summary is None:
+            continue
+        summary['reasons'] = f",{','.join(summary['reasons'])},"
+        summary['search_text'] = '\n'.join(
+            value.lower() for value in [*kit_values, *search_values[userkit_id]] if value
+        )
+    return summaries
+
+
+def backfill_kit_report_summaries(apps, schema_editor):
+    KitReport = apps.get_model('kits', 'KitReport')
+    UserKit = apps.get_model('kits', 'UserKit')
+    KitReportSummary = apps.get_model('kits', 'KitReportSummary')
+    KitReportSearchTrigram = apps.get_model('kits', 'KitReportSearchTrigram')
+
+    userkit_ids = list(KitReport.objects.order_by('kit_id').values_list('kit_id', flat=True).distinct())
+    for start in range(0, len(userkit_ids), 500):
+        chunk = userkit_ids[start:start + 500]
+        summaries = summarize_kit_reports(
+            KitReport.objects.filter(kit_id__in=chunk).order_by('-created_at', '-id').values_list(
+                *KIT_REPORT_SUMMARY_REPORT_FIELDS,
+            ),
+            UserKit.objects.filter(pk__in=chunk).values_list(*KIT_REPORT_SUMMARY_USERKIT_FIELDS),
+        )
+        KitReportSummary.objects.bulk_create([
+            KitReportSummary(userkit_id=userkit_id, **fields)
+            for userkit_id, fields in summaries.items()
+        ])
+        KitReportSearchTrigram.objects.bulk_create([
+            KitReportSearchTrigram(summary_id=userkit_id, trigram=trigram)
+            for userkit_id, fields in summaries.items()
+            for trigram in sorted(build_search_trigrams(fields['search_text']))
+        ], batch_size=1000)
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0050_teamdeletionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KitReportSummary',
+            fields=[
+                ('userkit', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='report_summary', serialize=False, to='kits.userkit')),
+                ('report_count', models.PositiveIntegerField(default=0)),
+                ('pending_count', models.PositiveIntegerField(default=0)),
+                ('resolved_count', models.PositiveIntegerField(default=0)),
+                ('dismissed_count', models.PositiveIntegerField(default=0)),
+                ('latest_report_at', models.DateTimeField()),
+                ('reasons', models.CharField(blank=True, default='', max_length=255)),
+                ('search_text', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-latest_report_at', '-userkit'], name='kit_report_summary_latest'), models.Index(condition=models.Q(('pending_count__gt', 0)), fields=['-latest_report_at', '-userkit'], name='kit_report_summary_pending')],
+            },
+        ),
+        migrations.CreateModel(
+            name='KitReportSearchTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('summary', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_trigrams', to='kits.kitreportsummary')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('trigram', 'summary'), name='unique_kit_report_search_trigram')],
+            },
+        ),
+        migrations.RunPython(backfill_kit_report_summaries, noop_reverse),
+    ]
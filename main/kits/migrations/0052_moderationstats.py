@@ -0,0 +1,47 @@
+# Generated by Django 5.2.9 on 2026-10-17 14:10
+
+from django.db import migrations, models
+
+
+def seed_moderation_stats(apps, schema_editor):
+    TeamSeasonKitType = apps.get_model('kits', 'TeamSeasonKitType')
+    Team = apps.get_model('kits', 'Team')
+    KitReportSummary = apps.get_model('kits', 'KitReportSummary')
+    ModerationStats = apps.get_model('kits', 'ModerationStats')
+
+    ModerationStats.objects.update_or_create(pk=1, defaults={
+        'kit_type_suggestions_pending': TeamSeasonKitType.objects.filter(
+            status='pending',
+            team__is_verified=True,
+        ).count(),
+        'team_verification_pending': Team.objects.filter(is_verified=False).count(),
+        'kit_report_groups_pending': KitReportSummary.objects.filter(pending_count__gt=0).count(),
+    })
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0051_kitreportsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModerationStats',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, editable=False, primary_key=True, serialize=False)),
+                ('kit_type_suggestions_pending', models.PositiveIntegerField(default=0)),
+                ('team_verification_pending', models.PositiveIntegerField(default=0)),
+                ('kit_report_groups_pending', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'moderation stats',
+            },
+        ),
+        migrations.RunPython(seed_moderation_stats, noop_reverse),
+    ]
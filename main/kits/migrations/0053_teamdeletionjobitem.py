@@ -0,0 +1,55 @@
+# Generated by Django 5.2.9 on 2026-10-17 15:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def move_active_job_lists_to_items(apps, schema_editor):
+    TeamDeletionJob = apps.get_model('kits', 'TeamDeletionJob')
+    TeamDeletionJobItem = apps.get_model('kits', 'TeamDeletionJobItem')
+
+    for deletion_job in TeamDeletionJob.objects.filter(status__in=['pending', 'running']):
+        summary = deletion_job.summary
+        items = [
+            TeamDeletionJobItem(deletion_job=deletion_job, kind=kind, object_id=object_id)
+            for kind, key in (
+                ('userkit', 'deleted_userkit_ids'),
+                ('kit', 'deleted_kit_ids'),
+                ('affected_user', 'affected_user_ids'),
+            )
+            for object_id in summary.pop(key, [])
+        ]
+        items.extend(
+            TeamDeletionJobItem(deletion_job=deletion_job, kind='report', object_id=snapshot['id'], payload=snapshot)
+            for snapshot in summary.pop('report_snapshots', [])
+        )
+        TeamDeletionJobItem.objects.bulk_create(items, ignore_conflicts=True)
+        deletion_job.save(update_fields=['summary'])
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0052_moderationstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamDeletionJobItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('userkit', 'Deleted upload'), ('kit', 'Deleted kit'), ('report', 'Deleted report'), ('affected_user', 'Affected user')], max_length=16)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('deletion_job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='kits.teamdeletionjob')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('deletion_job', 'kind', 'object_id'), name='unique_team_deletion_job_item')],
+            },
+        ),
+        migrations.RunPython(move_active_job_lists_to_items, noop_reverse),
+    ]
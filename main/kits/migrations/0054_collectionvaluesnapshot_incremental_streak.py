@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-17 15:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kits', '0053_teamdeletionjobitem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collectionvaluesnapshot',
+            name='incremental_streak',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -1,15 +1,36 @@
+import logging
+import math
+import re
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
 from decimal import Decimal
-from django.db import models
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.validators import MinValueValidator
-from django.db.models import Q, Sum, Count
-from django.db.models.functions import Lower
+from django.db.models import Case, Q, Sum, Count, F, Func, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest, Lower
 from django.utils import timezone
 from django.utils.text import slugify
 
+from .catalog_cache import (
+    CATALOG_COUNTRIES,
+    CATALOG_KIT_TYPES,
+    CATALOG_LEAGUES,
+    CATALOG_PUBLIC_KITS,
+    CATALOG_SHIRT_VERSIONS,
+    CATALOG_TEAM_SEASON_KIT_TYPES,
+    CATALOG_TEAMS,
+    bump_catalog_versions,
+)
+from .image_variants import delete_image_variants
+from .realtime import UNREAD_COUNTER_MESSAGES, UNREAD_COUNTER_NOTIFICATIONS, publish_unread_delta
+
+logger = logging.getLogger(__name__)
+
 SHIRT_TECHNOLOGIES = [
     ('PLAYER_ISSUE', 'Player Issue'),
     ('REPLICA', 'Replica'),
@@ -142,6 +163,36 @@ def build_team_slug(team_name):
     return slugify(team_name or "")
 
 
+def get_team_slug(team):
+    return team.slug or build_team_slug(team.name)
+
+
+def generate_unique_team_slug(team_name, exclude_pk=None):
+    base_slug = build_team_slug(team_name)[:110] or 'team'
+    # Only the bare slug and its numbered variants, not every slug sharing the prefix
+    taken_slugs = set(
+        Team.objects.filter(slug__regex=rf'^{re.escape(base_slug)}(-[0-9]+)?$')
+        .exclude(pk=exclude_pk)
+        .values_list('slug', flat=True)
+    )
+    if base_slug not in taken_slugs:
+        return base_slug
+
+    suffix = 2
+    while f'{base_slug}-{suffix}' in taken_slugs:
+        suffix += 1
+    return f'{base_slug}-{suffix}'
+
+
+def team_slug_matches_name(slug, team_name):
+    base_slug = build_team_slug(team_name)[:110] or 'team'
+    return slug == base_slug or re.fullmatch(rf'{re.escape(base_slug)}-\d+', slug or '') is not None
+
+
+# Concurrent creates or renames to the same slug retry with the next free suffix
+TEAM_SLUG_SAVE_ATTEMPTS = 5
+
+
 def normalize_wishlist_kit_type(kit_type):
     cleaned = ' '.join((kit_type or '').strip().split())
     if not cleaned:
@@ -201,6 +252,24 @@ class Profile(models.Model):
     depop_link = models.URLField(max_length=2048, null=True, blank=True)
     website_link = models.URLField(max_length=2048, null=True, blank=True)
 
+    # Bumped when moderation changes which kits count towards the value history;
+    # the history is rebuilt whenever the rebuilt version lags behind
+    collection_history_version = models.PositiveIntegerField(default=0, editable=False)
+    collection_history_rebuilt_version = models.PositiveIntegerField(default=0, editable=False)
+
+    HISTORY_VERSION_FIELDS = ('collection_history_version', 'collection_history_rebuilt_version')
+
+    def save(self, *args, **kwargs):
+        # Versions are maintained with F() updates, so a stale instance must not overwrite them
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.HISTORY_VERSION_FIELDS
+            ]
+
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.user.username} Profile"
 
@@ -294,10 +363,102 @@ class Team(models.Model):
 
     is_verified = models.BooleanField(default=False) # Admin can verify teams to avoid duplicates
 
+    # Persisted URL identifier, only regenerated when the name changes so shared links keep working
+    slug = models.SlugField(max_length=120, unique=True)
+
+    def _slug_is_current(self):
+        if not self.slug:
+            return False
+        loaded_name = self.__dict__.get('_loaded_name')
+        if self._state.adding or loaded_name is None:
+            return team_slug_matches_name(self.slug, self.name)
+        return loaded_name == self.name
+
+    def save(self, *args, **kwargs):
+        if self._slug_is_current():
+            super().save(*args, **kwargs)
+            self._loaded_name = self.name
+            return
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'slug' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'slug']
+        for attempt in range(TEAM_SLUG_SAVE_ATTEMPTS):
+            self.slug = generate_unique_team_slug(self.name, exclude_pk=self.pk)
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+            except IntegrityError:
+                # Only a slug taken by a concurrent writer is retried
+                slug_taken = Team.objects.filter(slug=self.slug).exclude(pk=self.pk).exists()
+                if not slug_taken or attempt == TEAM_SLUG_SAVE_ATTEMPTS - 1:
+                    raise
+            else:
+                self._loaded_name = self.name
+                return
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Compared on save to move the moderation counters when verification flips
+        instance._loaded_is_verified = instance.__dict__.get('is_verified')
+        # Compared on save so only a rename regenerates the slug
+        instance._loaded_name = instance.__dict__.get('name')
+        return instance
+
     def __str__(self):
         return self.name
 
 
+def build_search_trigrams(value):
+    lowered = (value or '').lower()
+    return {lowered[index:index + 3] for index in range(len(lowered) - 2)}
+
+
+# Trigram index over verified team names, used by kit search suggestions
+class TeamSearchTrigram(models.Model):
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='search_trigrams')
+    trigram = models.CharField(max_length=3)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['trigram', 'team'], name='unique_team_search_trigram'),
+        ]
+
+    def __str__(self):
+        return f'{self.trigram} -> {self.team_id}'
+
+
+def reindex_team_search_trigrams(teams):
+    teams = list(teams)
+    if not teams:
+        return 0
+
+    TeamSearchTrigram.objects.filter(team_id__in=[team.pk for team in teams]).delete()
+    rows = [
+        TeamSearchTrigram(team_id=team.pk, trigram=trigram)
+        for team in teams
+        if team.is_verified
+        for trigram in sorted(build_search_trigrams(team.name))
+    ]
+    TeamSearchTrigram.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def get_team_search_candidate_ids(text):
+    trigrams = build_search_trigrams(text)
+    if not trigrams:
+        return None
+
+    return TeamSearchTrigram.objects.filter(
+        trigram__in=trigrams,
+    ).values('team_id').annotate(
+        matched_trigrams=Count('trigram', distinct=True),
+    ).filter(
+        matched_trigrams=len(trigrams),
+    ).values('team_id')
+
+
 class KitType(models.Model):
     CATEGORY_OUTFIELD = 'outfield'
     CATEGORY_GOALKEEPER = 'goalkeeper'
@@ -421,6 +582,12 @@ class ShirtVersion(models.Model):
     class Meta:
         ordering = ['sort_order', 'name', 'id']
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_valuation_multiplier = instance.__dict__.get('valuation_multiplier')
+        return instance
+
     def __str__(self):
         return self.name
 
@@ -475,6 +642,14 @@ class TeamSeasonKitType(models.Model):
             ),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Compared on save to move the pending suggestions counter
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_team_id = instance.__dict__.get('team_id')
+        return instance
+
     def __str__(self):
         return f'{self.team.name} {self.season} {self.kit_type.name}'
 
@@ -599,6 +774,102 @@ class TeamModerationAction(models.Model):
         return f'{self.get_action_type_display()} team action by {self.actor.username} at {self.created_at}'
 
 
+# Progress of a chunked team deletion, so a large purge can resume after a crash
+class TeamDeletionJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    ACTIVE_STATUSES = (STATUS_PENDING, STATUS_RUNNING)
+
+    team = models.ForeignKey(
+        Team,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='deletion_jobs',
+    )
+    team_id_snapshot = models.IntegerField()
+    team_name = models.CharField(max_length=100)
+    actor = models.ForeignKey(
+        User,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='team_deletion_jobs',
+    )
+    reason = models.CharField(max_length=32)
+    note = models.TextField(blank=True, default='')
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    # Cursors and running totals are committed with each batch
+    last_userkit_id = models.PositiveBigIntegerField(default=0)
+    last_kit_id = models.PositiveBigIntegerField(default=0)
+    previous_state = models.JSONField(default=dict, blank=True)
+    summary = models.JSONField(default=dict, blank=True)
+    moderation_action = models.ForeignKey(
+        TeamModerationAction,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+    )
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['team'],
+                condition=Q(status__in=['pending', 'running']),
+                name='unique_active_team_deletion_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f'Deletion of {self.team_name} #{self.pk} ({self.status})'
+
+
+# Ids and report snapshots collected per batch, folded into the summary once the
+# job finishes so batches do not rewrite an ever-growing JSON blob
+class TeamDeletionJobItem(models.Model):
+    KIND_USERKIT = 'userkit'
+    KIND_KIT = 'kit'
+    KIND_REPORT = 'report'
+    KIND_AFFECTED_USER = 'affected_user'
+    KIND_CHOICES = [
+        (KIND_USERKIT, 'Deleted upload'),
+        (KIND_KIT, 'Deleted kit'),
+        (KIND_REPORT, 'Deleted report'),
+        (KIND_AFFECTED_USER, 'Affected user'),
+    ]
+
+    deletion_job = models.ForeignKey(TeamDeletionJob, on_delete=models.CASCADE, related_name='items')
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    payload = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['deletion_job', 'kind', 'object_id'],
+                name='unique_team_deletion_job_item',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id} of deletion #{self.deletion_job_id}'
+
+
 # Football Kits (ex. Arsenal Home 2021/2022)
 class Kit(models.Model):
     team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='kits')
@@ -618,9 +889,31 @@ class Kit(models.Model):
     # Only one image for context
     main_image = models.ImageField(upload_to='kit_images/', null=True, blank=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Compared on save to reprice owned kits when the estimate changes
+        instance._loaded_estimated_price = instance.__dict__.get('estimated_price')
+        return instance
+
     def __str__(self):
         return f"{self.team.name} {self.kit_type} {self.season}"
 
+def calculate_userkit_value(base_price, size, condition, version_multiplier, shirt_technology):
+    if base_price is None or base_price <= 0:
+        return Decimal('0.00')
+
+    size_multiplier = SIZE_MULTIPLIERS.get(size, Decimal('1.0'))
+    condition_multiplier = CONDITION_MULTIPLIERS.get(condition, Decimal('1.0'))
+    if version_multiplier is not None:
+        technology_multiplier = version_multiplier
+    else:
+        technology_multiplier = TECHNOLOGIE_MULTIPLIERS.get(shirt_technology, Decimal('1.0'))
+
+    calculated_value = base_price * size_multiplier * condition_multiplier * technology_multiplier
+    return calculated_value.quantize(Decimal('0.01'))  # Round to 2 decimal places
+
+
 # Users' Football Kits
 class UserKit(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='collection')
@@ -650,6 +943,11 @@ class UserKit(models.Model):
     def total_likes(self):
         return self.likes.count()
 
+    # Denormalized counters kept in sync on write (see signals below)
+    COUNTER_FIELDS = ('likes_count', 'comments_count')
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+
     # When was added to the collection
     added_at = models.DateTimeField(auto_now_add=True)
 
@@ -695,6 +993,15 @@ class UserKit(models.Model):
 
         return None
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Compared on save to mark the value history stale when moderation hides or restores the kit
+        instance._loaded_is_hidden_by_moderation = instance.__dict__.get('is_hidden_by_moderation')
+        # Compared on save to reindex the report summary when the kit is reassigned
+        instance._loaded_kit_id = instance.__dict__.get('kit_id')
+        return instance
+
     def get_profit_loss(self):
         if self.purchase_price is None or self.purchase_price <= 0 or self.final_value is None:
             return None
@@ -713,30 +1020,311 @@ class UserKit(models.Model):
             self.final_value = self.manual_value
         else:
             # Calculate based on multipliers
-            base_price = getattr(self.kit, 'estimated_price', None)
-
-            if base_price is not None and base_price > 0:
-                size_multiplier = SIZE_MULTIPLIERS.get(self.size, Decimal('1.0'))
-                condition_multiplier = CONDITION_MULTIPLIERS.get(self.condition, Decimal('1.0'))
-                if self.shirt_version_id:
-                    technology_multiplier = self.shirt_version.valuation_multiplier
-                else:
-                    technology_multiplier = TECHNOLOGIE_MULTIPLIERS.get(
-                        self.shirt_technology,
-                        Decimal('1.0'),
-                    )
+            self.final_value = calculate_userkit_value(
+                getattr(self.kit, 'estimated_price', None),
+                self.size,
+                self.condition,
+                self.shirt_version.valuation_multiplier if self.shirt_version_id else None,
+                self.shirt_technology,
+            )
+
+        # Counters are maintained with F() updates, so a stale instance must not overwrite them
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
 
-                calculated_value = base_price * size_multiplier * condition_multiplier * technology_multiplier
-                self.final_value = calculated_value.quantize(Decimal('0.01'))  # Round to 2 decimal places
-            else:
-                self.final_value = Decimal('0.00')
-        
         super().save(*args, **kwargs)
-    
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['in_the_collection', 'is_hidden_by_moderation', '-added_at']),
+            models.Index(fields=['for_sale', '-added_at']),
+        ]
+
     def __str__(self):
         return f"{self.user.username}'s {self.kit} ({self.size}, {self.condition})"
 
 
+def adjust_userkit_counter(userkit_ids, field_name, delta):
+    if not userkit_ids or not delta:
+        return 0
+
+    updated = UserKit.objects.filter(pk__in=userkit_ids).update(**{
+        field_name: Greatest(F(field_name) + delta, Value(0)),
+    })
+    rescore_kit_rankings(userkit_ids)
+    return updated
+
+
+def get_userkit_counter_drift_queryset(queryset=None):
+    if queryset is None:
+        queryset = UserKit.objects.all()
+
+    likes_subquery = UserKit.likes.through.objects.filter(
+        userkit_id=OuterRef('pk'),
+    ).order_by().values('userkit_id').annotate(total=Count('id')).values('total')
+    comments_subquery = KitComment.objects.filter(
+        kit_id=OuterRef('pk'),
+    ).order_by().values('kit_id').annotate(total=Count('id')).values('total')
+
+    return queryset.annotate(
+        actual_likes_count=Coalesce(Subquery(likes_subquery), Value(0)),
+        actual_comments_count=Coalesce(Subquery(comments_subquery), Value(0)),
+    ).filter(
+        ~Q(likes_count=F('actual_likes_count')) | ~Q(comments_count=F('actual_comments_count'))
+    )
+
+
+def reconcile_userkit_counters(queryset=None, *, dry_run=False):
+    drifted = list(
+        get_userkit_counter_drift_queryset(queryset).only(
+            'id',
+            'likes_count',
+            'comments_count',
+        ).order_by('id')
+    )
+    if dry_run or not drifted:
+        return len(drifted)
+
+    for userkit in drifted:
+        userkit.likes_count = userkit.actual_likes_count
+        userkit.comments_count = userkit.actual_comments_count
+
+    UserKit.objects.bulk_update(drifted, ['likes_count', 'comments_count'], batch_size=500)
+    rescore_kit_rankings([userkit.id for userkit in drifted])
+    return len(drifted)
+
+
+# Trending decays exponentially with age. Scoring against a fixed epoch keeps the
+# decay order-stable, so rows only need rescoring when their engagement changes.
+TRENDING_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+TRENDING_HALF_LIFE = timedelta(days=3)
+TRENDING_COMMENT_WEIGHT = 2
+
+
+def calculate_trending_score(likes_count, comments_count, added_at):
+    engagement = (likes_count or 0) + (comments_count or 0) * TRENDING_COMMENT_WEIGHT
+    age_seconds = (added_at - TRENDING_EPOCH).total_seconds()
+    decay_rate = math.log(2) / TRENDING_HALF_LIFE.total_seconds()
+    return math.log1p(engagement) + age_seconds * decay_rate
+
+
+# Ranking rows for publicly visible kits, read by the explore feed
+class KitRanking(models.Model):
+    userkit = models.OneToOneField(
+        UserKit,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='ranking',
+    )
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+    added_at = models.DateTimeField()
+    trending_score = models.FloatField(default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-trending_score', '-added_at']),
+            models.Index(fields=['-likes_count', '-comments_count', '-added_at']),
+        ]
+
+    def __str__(self):
+        return f'Ranking for kit {self.userkit_id} ({self.trending_score:.4f})'
+
+
+def refresh_kit_rankings(userkit_ids=None, *, batch_size=500):
+    queryset = UserKit.objects.all()
+    if userkit_ids is not None:
+        userkit_ids = list(userkit_ids)
+        if not userkit_ids:
+            return 0
+        queryset = queryset.filter(pk__in=userkit_ids)
+
+    public_filter = Q(in_the_collection=True, is_hidden_by_moderation=False)
+    stale_rankings = KitRanking.objects.exclude(userkit__in=UserKit.objects.filter(public_filter))
+    if userkit_ids is not None:
+        stale_rankings = stale_rankings.filter(userkit_id__in=userkit_ids)
+    stale_rankings.delete()
+
+    rows = queryset.filter(public_filter).values_list(
+        'id',
+        'likes_count',
+        'comments_count',
+        'added_at',
+    ).order_by('id')
+
+    refreshed = 0
+    batch = []
+    now = timezone.now()
+    for userkit_id, likes_count, comments_count, added_at in rows.iterator(chunk_size=batch_size):
+        batch.append(KitRanking(
+            userkit_id=userkit_id,
+            likes_count=likes_count,
+            comments_count=comments_count,
+            added_at=added_at,
+            trending_score=calculate_trending_score(likes_count, comments_count, added_at),
+            refreshed_at=now,
+        ))
+        if len(batch) >= batch_size:
+            refreshed += _upsert_kit_rankings(batch)
+            batch = []
+
+    if batch:
+        refreshed += _upsert_kit_rankings(batch)
+    return refreshed
+
+
+def rescore_kit_rankings(userkit_ids):
+    # Update-only: counter changes can fire while a kit is mid-cascade-delete,
+    # so never recreate a ranking row from here.
+    rankings = list(
+        KitRanking.objects.filter(userkit_id__in=list(userkit_ids)).select_related('userkit').only(
+            'userkit_id',
+            'userkit__likes_count',
+            'userkit__comments_count',
+            'userkit__added_at',
+        )
+    )
+    if not rankings:
+        return 0
+
+    now = timezone.now()
+    for ranking in rankings:
+        ranking.likes_count = ranking.userkit.likes_count
+        ranking.comments_count = ranking.userkit.comments_count
+        ranking.added_at = ranking.userkit.added_at
+        ranking.trending_score = calculate_trending_score(
+            ranking.likes_count,
+            ranking.comments_count,
+            ranking.added_at,
+        )
+        ranking.refreshed_at = now
+
+    KitRanking.objects.bulk_update(
+        rankings,
+        ['likes_count', 'comments_count', 'added_at', 'trending_score', 'refreshed_at'],
+    )
+    return len(rankings)
+
+
+def _upsert_kit_rankings(rankings):
+    KitRanking.objects.bulk_create(
+        rankings,
+        update_conflicts=True,
+        unique_fields=['userkit'],
+        update_fields=['likes_count', 'comments_count', 'added_at', 'trending_score', 'refreshed_at'],
+    )
+    return len(rankings)
+
+
+# Materialized following feed: one row per (follower, visible kit of someone they follow)
+class FollowingFeedEntry(models.Model):
+    follower = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following_feed_entries',
+    )
+    userkit = models.ForeignKey(
+        UserKit,
+        on_delete=models.CASCADE,
+        related_name='following_feed_entries',
+    )
+    # Copy of UserKit.added_at (set once on create) so a page is a single index range scan
+    added_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['follower', 'userkit'],
+                name='unique_following_feed_entry',
+            )
+        ]
+        indexes = [
+            models.Index(fields=['follower', '-added_at', '-userkit']),
+        ]
+
+    def __str__(self):
+        return f'Feed entry for {self.follower_id}: kit {self.userkit_id}'
+
+
+def sync_following_feed_entries(userkit_ids, *, batch_size=1000):
+    userkits = list(
+        UserKit.objects.filter(pk__in=list(userkit_ids)).only('id', 'user_id', 'added_at', 'is_hidden_by_moderation')
+    )
+    hidden_ids = [userkit.id for userkit in userkits if userkit.is_hidden_by_moderation]
+    if hidden_ids:
+        FollowingFeedEntry.objects.filter(userkit_id__in=hidden_ids).delete()
+
+    visible_userkits = [userkit for userkit in userkits if not userkit.is_hidden_by_moderation]
+    if not visible_userkits:
+        return 0
+
+    owner_ids = {userkit.user_id for userkit in visible_userkits}
+    followers_by_owner = {}
+    for follower_id, following_id in Follow.objects.filter(following_id__in=owner_ids).values_list('follower_id', 'following_id'):
+        followers_by_owner.setdefault(following_id, []).append(follower_id)
+
+    entries = [
+        FollowingFeedEntry(follower_id=follower_id, userkit_id=userkit.id, added_at=userkit.added_at)
+        for userkit in visible_userkits
+        for follower_id in followers_by_owner.get(userkit.user_id, ())
+        if follower_id != userkit.user_id
+    ]
+    FollowingFeedEntry.objects.bulk_create(entries, batch_size=batch_size, ignore_conflicts=True)
+    return len(entries)
+
+
+def backfill_following_feed_for_follow(follower_id, following_id, *, batch_size=1000):
+    if follower_id == following_id:
+        return 0
+
+    userkits = UserKit.objects.filter(
+        user_id=following_id,
+        is_hidden_by_moderation=False,
+    ).values_list('id', 'added_at').order_by('id')
+
+    created = 0
+    batch = []
+    for userkit_id, added_at in userkits.iterator(chunk_size=batch_size):
+        batch.append(FollowingFeedEntry(follower_id=follower_id, userkit_id=userkit_id, added_at=added_at))
+        if len(batch) >= batch_size:
+            FollowingFeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            created += len(batch)
+            batch = []
+    if batch:
+        FollowingFeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        created += len(batch)
+    return created
+
+
+def prune_following_feed_for_unfollow(follower_id, following_id):
+    deleted, _details = FollowingFeedEntry.objects.filter(
+        follower_id=follower_id,
+        userkit__user_id=following_id,
+    ).delete()
+    return deleted
+
+
+def rebuild_following_feed(follower_ids=None, *, batch_size=1000):
+    follows = Follow.objects.all()
+    entries = FollowingFeedEntry.objects.all()
+    if follower_ids is not None:
+        follower_ids = list(follower_ids)
+        follows = follows.filter(follower_id__in=follower_ids)
+        entries = entries.filter(follower_id__in=follower_ids)
+
+    with transaction.atomic():
+        entries.delete()
+        created = 0
+        for follower_id, following_id in follows.values_list('follower_id', 'following_id').order_by('id').iterator():
+            created += backfill_following_feed_for_follow(follower_id, following_id, batch_size=batch_size)
+    return created
+
+
 def calculate_collection_total_value(user):
     stats = UserKit.objects.filter(
         user=user,
@@ -785,7 +1373,10 @@ class CollectionValueSnapshot(models.Model):
         blank=True,
         on_delete=models.SET_NULL,
     )
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Snapshots derived from deltas since the last full aggregate
+    incremental_streak = models.PositiveIntegerField(default=0)
+    # Not auto_now_add so history rebuilds can bulk_create backdated points
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ['created_at', 'id']
@@ -798,98 +1389,358 @@ class CollectionValueSnapshot(models.Model):
         return f'{self.user.username} {self.total_value} ({self.reason})'
 
 
-def record_collection_value_snapshot(user, reason, related_userkit=None):
-    total_value, kits_count = calculate_collection_total_value(user)
-    return CollectionValueSnapshot.objects.create(
-        user=user,
-        total_value=total_value,
-        kits_count=kits_count,
-        reason=reason,
-        related_userkit=related_userkit,
+# Last collection value per day/week/month, kept after old raw snapshots are compacted away
+class CollectionValueRollup(models.Model):
+    RESOLUTION_DAILY = 'daily'
+    RESOLUTION_WEEKLY = 'weekly'
+    RESOLUTION_MONTHLY = 'monthly'
+
+    RESOLUTION_CHOICES = [
+        (RESOLUTION_DAILY, 'Daily'),
+        (RESOLUTION_WEEKLY, 'Weekly'),
+        (RESOLUTION_MONTHLY, 'Monthly'),
+    ]
+    RESOLUTIONS = [value for value, _label in RESOLUTION_CHOICES]
+
+    user = models.ForeignKey(
+        User,
+        related_name='collection_value_rollups',
+        on_delete=models.CASCADE,
     )
+    resolution = models.CharField(max_length=16, choices=RESOLUTION_CHOICES)
+    bucket_start = models.DateField()
+    last_snapshot_at = models.DateTimeField()
+    total_value = models.DecimalField(max_digits=12, decimal_places=2)
+    kits_count = models.PositiveIntegerField(default=0)
 
+    class Meta:
+        ordering = ['bucket_start']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'resolution', 'bucket_start'],
+                name='unique_collection_value_rollup_bucket',
+            ),
+        ]
 
-def rebuild_collection_value_history(user):
-    visible_kits = list(
-        UserKit.objects.filter(
+    def __str__(self):
+        return f'{self.user.username} {self.resolution} {self.bucket_start}: {self.total_value}'
+
+
+def get_collection_value_contribution(userkit):
+    if userkit is None or not userkit.in_the_collection or userkit.is_hidden_by_moderation:
+        return Decimal('0.00'), 0
+    return userkit.final_value or Decimal('0.00'), 1
+
+
+def get_incremental_collection_totals(user, value_delta, count_delta):
+    previous = CollectionValueSnapshot.objects.filter(user=user).order_by(
+        '-created_at',
+        '-id',
+    ).values_list('total_value', 'kits_count', 'incremental_streak').first()
+    if previous is None:
+        return None
+
+    total_value = (previous[0] + Decimal(value_delta)).quantize(Decimal('0.01'))
+    kits_count = previous[1] + count_delta
+    # Impossible totals mean the baseline drifted; do not compound it
+    if kits_count < 0 or (kits_count == 0 and total_value != 0):
+        return None
+    return total_value, kits_count, previous[2] + 1
+
+
+def record_collection_value_snapshot(user, reason, related_userkit=None, *, value_delta=None, count_delta=None):
+    """Record the user's current collection value.
+
+    With ``value_delta``/``count_delta`` (the change to the collection since the
+    latest snapshot) the totals are derived from that snapshot; otherwise, or
+    when the baseline looks wrong, the whole collection is re-aggregated. Every
+    ``COLLECTION_VALUE_RECOUNT_EVERY`` derived snapshots are checked against a
+    full aggregate so drift cannot compound.
+    """
+    with transaction.atomic():
+        # Serialize per user so concurrent writers never derive from the same baseline
+        list(Profile.objects.select_for_update().filter(user=user).values_list('pk', flat=True))
+        totals = None
+        if value_delta is not None and count_delta is not None:
+            totals = get_incremental_collection_totals(user, value_delta, count_delta)
+        incremental_streak = 0
+        if totals is not None:
+            total_value, kits_count, incremental_streak = totals
+            recount_every = getattr(settings, 'COLLECTION_VALUE_RECOUNT_EVERY', 50)
+            if recount_every and incremental_streak >= recount_every:
+                actual_totals = calculate_collection_total_value(user)
+                if actual_totals != (total_value, kits_count):
+                    logger.warning(
+                        'Collection value of user %s drifted: derived %s/%s, actual %s/%s',
+                        user.pk,
+                        total_value,
+                        kits_count,
+                        *actual_totals,
+                    )
+                total_value, kits_count = actual_totals
+                incremental_streak = 0
+        else:
+            total_value, kits_count = calculate_collection_total_value(user)
+        return CollectionValueSnapshot.objects.create(
             user=user,
-            is_hidden_by_moderation=False,
-            in_the_collection=True,
-        ).order_by('added_at', 'id')
-    )
+            total_value=total_value,
+            kits_count=kits_count,
+            reason=reason,
+            related_userkit=related_userkit,
+            incremental_streak=incremental_streak,
+        )
 
-    user.collection_value_snapshots.all().delete()
 
-    if not visible_kits:
-        return [
-            CollectionValueSnapshot.objects.create(
-                user=user,
-                total_value=Decimal('0.00'),
-                kits_count=0,
-                reason=CollectionValueSnapshot.REASON_INITIAL,
+def record_collection_value_snapshots(user_ids, reason, *, batch_size=500):
+    # One grouped aggregate and one insert per batch instead of two queries per user
+    user_ids = sorted(set(user_ids))
+    created = 0
+    for start in range(0, len(user_ids), batch_size):
+        batch_ids = user_ids[start:start + batch_size]
+        totals = {
+            row['user_id']: row
+            for row in UserKit.objects.filter(
+                user_id__in=batch_ids,
+                in_the_collection=True,
+                is_hidden_by_moderation=False,
+            ).values('user_id').annotate(
+                total_value=Sum('final_value'),
+                kits_count=Count('id'),
+            ).order_by()
+        }
+        snapshots = [
+            CollectionValueSnapshot(
+                user_id=user_id,
+                total_value=(totals.get(user_id) or {}).get('total_value') or Decimal('0.00'),
+                kits_count=(totals.get(user_id) or {}).get('kits_count') or 0,
+                reason=reason,
             )
+            for user_id in batch_ids
         ]
+        CollectionValueSnapshot.objects.bulk_create(snapshots)
+        created += len(snapshots)
+    return created
+
+
+USERKIT_REVALUATION_BATCH_SIZE = 500
+
+
+def revalue_userkits(queryset, *, batch_size=USERKIT_REVALUATION_BATCH_SIZE, dry_run=False, record_snapshots=True):
+    """Recompute ``final_value`` for the automatically valued kits in ``queryset``.
+
+    Rows are read in primary-key batches and only changed values are written,
+    one bulk UPDATE per batch. Returns the number of repriced kits.
+    """
+    candidates = queryset.filter(
+        Q(manual_value__isnull=True) | Q(manual_value=0),
+    ).order_by('id').values_list(
+        'id',
+        'user_id',
+        'in_the_collection',
+        'is_hidden_by_moderation',
+        'final_value',
+        'kit__estimated_price',
+        'size',
+        'condition',
+        'shirt_version_id',
+        'shirt_version__valuation_multiplier',
+        'shirt_technology',
+    )
 
+    repriced = 0
+    affected_user_ids = set()
+    last_id = 0
+    while True:
+        batch = list(candidates.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1][0]
+
+        changed = []
+        for (
+            userkit_id,
+            user_id,
+            in_the_collection,
+            is_hidden,
+            final_value,
+            base_price,
+            size,
+            condition,
+            shirt_version_id,
+            version_multiplier,
+            shirt_technology,
+        ) in batch:
+            value = calculate_userkit_value(
+                base_price,
+                size,
+                condition,
+                version_multiplier if shirt_version_id else None,
+                shirt_technology,
+            )
+            if value == final_value:
+                continue
+            changed.append(UserKit(pk=userkit_id, final_value=value))
+            if in_the_collection and not is_hidden:
+                affected_user_ids.add(user_id)
+
+        if changed and not dry_run:
+            UserKit.objects.bulk_update(changed, ['final_value'])
+            bump_catalog_versions(CATALOG_PUBLIC_KITS)
+        repriced += len(changed)
+
+    if record_snapshots and affected_user_ids and not dry_run:
+        record_collection_value_snapshots(affected_user_ids, CollectionValueSnapshot.REASON_VALUE_UPDATED)
+    return repriced
+
+
+def rebuild_collection_value_history(user):
+    visible_kits = UserKit.objects.filter(
+        user=user,
+        is_hidden_by_moderation=False,
+        in_the_collection=True,
+    ).order_by('added_at', 'id').values_list('id', 'added_at', 'final_value')
+
+    # One point per distinct added_at, stamped with that time, inserted in one query
     snapshots = []
     running_total = Decimal('0.00')
     running_count = 0
-    grouped_kits = {}
-
-    for userkit in visible_kits:
-        grouped_kits.setdefault(userkit.added_at, []).append(userkit)
-
-    for index, added_at in enumerate(sorted(grouped_kits.keys())):
-        kits_added_at_timestamp = grouped_kits[added_at]
-        for userkit in kits_added_at_timestamp:
-            running_total += userkit.final_value or Decimal('0.00')
-            running_count += 1
+    for userkit_id, added_at, final_value in visible_kits.iterator():
+        running_total += final_value or Decimal('0.00')
+        running_count += 1
+        if snapshots and snapshots[-1].created_at == added_at:
+            snapshot = snapshots[-1]
+        else:
+            snapshot = CollectionValueSnapshot(
+                user=user,
+                reason=CollectionValueSnapshot.REASON_INITIAL
+                if not snapshots
+                else CollectionValueSnapshot.REASON_KIT_ADDED,
+                created_at=added_at,
+            )
+            snapshots.append(snapshot)
+        snapshot.total_value = running_total.quantize(Decimal('0.01'))
+        snapshot.kits_count = running_count
+        snapshot.related_userkit_id = userkit_id
 
-        snapshot = CollectionValueSnapshot.objects.create(
+    if not snapshots:
+        snapshots.append(CollectionValueSnapshot(
             user=user,
-            total_value=running_total.quantize(Decimal('0.01')),
-            kits_count=running_count,
-            reason=CollectionValueSnapshot.REASON_INITIAL
-            if index == 0
-            else CollectionValueSnapshot.REASON_KIT_ADDED,
-            related_userkit=kits_added_at_timestamp[-1],
-        )
-        CollectionValueSnapshot.objects.filter(pk=snapshot.pk).update(created_at=added_at)
-        snapshot.created_at = added_at
-        snapshots.append(snapshot)
+            total_value=Decimal('0.00'),
+            kits_count=0,
+            reason=CollectionValueSnapshot.REASON_INITIAL,
+        ))
 
+    user.collection_value_snapshots.all().delete()
+    user.collection_value_rollups.all().delete()
+    snapshots = CollectionValueSnapshot.objects.bulk_create(snapshots)
+    Profile.objects.filter(user=user).update(
+        collection_history_rebuilt_version=F('collection_history_version'),
+    )
     return snapshots
 
 
-def collection_value_history_needs_hidden_kit_rebuild(user):
-    hidden_kits_exist = UserKit.objects.filter(
+def mark_collection_value_history_stale(user_ids):
+    user_ids = list(user_ids)
+    if not user_ids:
+        return 0
+    return Profile.objects.filter(user_id__in=user_ids).update(
+        collection_history_version=F('collection_history_version') + 1,
+    )
+
+
+def collection_value_history_is_stale(user):
+    # Queried rather than read from user.profile, which may be cached from before a bump
+    return Profile.objects.filter(
         user=user,
-        is_hidden_by_moderation=True,
+        collection_history_rebuilt_version__lt=F('collection_history_version'),
     ).exists()
-    if not hidden_kits_exist:
-        return False
 
-    snapshots = list(user.collection_value_snapshots.order_by('created_at', 'id'))
-    if not snapshots:
-        return True
 
-    current_total_value, current_kits_count = calculate_collection_total_value(user)
-    latest_snapshot = snapshots[-1]
-    if latest_snapshot.total_value != current_total_value or latest_snapshot.kits_count != current_kits_count:
-        return True
+def get_collection_value_bucket_start(value, resolution):
+    day = timezone.localtime(value).date()
+    if resolution == CollectionValueRollup.RESOLUTION_WEEKLY:
+        return day - timedelta(days=day.weekday())
+    if resolution == CollectionValueRollup.RESOLUTION_MONTHLY:
+        return day.replace(day=1)
+    return day
+
+
+def bucket_collection_value_points(points, resolution):
+    # points are (created_at, total_value, kits_count) in time order; the last one per bucket wins
+    buckets = {}
+    for created_at, total_value, kits_count in points:
+        buckets[get_collection_value_bucket_start(created_at, resolution)] = (created_at, total_value, kits_count)
+    return buckets
+
+
+def get_collection_value_history_buckets(user, resolution, *, since=None):
+    rollups = CollectionValueRollup.objects.filter(user=user, resolution=resolution)
+    snapshots = user.collection_value_snapshots.all()
+    if since is not None:
+        rollups = rollups.filter(last_snapshot_at__gte=since)
+        snapshots = snapshots.filter(created_at__gte=since)
+
+    buckets = {
+        rollup.bucket_start: (rollup.last_snapshot_at, rollup.total_value, rollup.kits_count)
+        for rollup in rollups
+    }
+    # Raw snapshots are newer than anything compacted, so they win shared buckets
+    buckets.update(bucket_collection_value_points(
+        snapshots.order_by('created_at', 'id').values_list('created_at', 'total_value', 'kits_count').iterator(),
+        resolution,
+    ))
+    return [
+        {
+            'bucket_start': bucket_start,
+            'created_at': created_at,
+            'total_value': total_value,
+            'kits_count': kits_count,
+        }
+        for bucket_start, (created_at, total_value, kits_count) in sorted(buckets.items())
+    ]
 
-    visible_added_at_values = list(
-        UserKit.objects.filter(
-            user=user,
-            is_hidden_by_moderation=False,
-            in_the_collection=True,
-        ).values_list('added_at', flat=True)
-    )
-    expected_snapshot_dates = sorted(set(visible_added_at_values))
-    if not expected_snapshot_dates:
-        return len(snapshots) != 1
 
-    snapshot_dates = [snapshot.created_at for snapshot in snapshots]
-    return snapshot_dates != expected_snapshot_dates
+def compact_collection_value_history(user_id, cutoff, *, dry_run=False):
+    """Fold raw snapshots older than cutoff into rollups and delete them.
+
+    The latest snapshot is always kept because new snapshots are derived from
+    it. Returns the number of raw snapshots removed.
+    """
+    latest_id = CollectionValueSnapshot.objects.filter(user_id=user_id).order_by(
+        '-created_at', '-id',
+    ).values_list('id', flat=True).first()
+    old_snapshots = list(
+        CollectionValueSnapshot.objects.filter(
+            user_id=user_id,
+            created_at__lt=cutoff,
+        ).order_by('created_at', 'id').values_list('id', 'created_at', 'total_value', 'kits_count')
+    )
+    removable_ids = [snapshot_id for snapshot_id, *_point in old_snapshots if snapshot_id != latest_id]
+    if not removable_ids or dry_run:
+        return len(removable_ids)
+
+    points = [point for _snapshot_id, *point in old_snapshots]
+    rollups = [
+        CollectionValueRollup(
+            user_id=user_id,
+            resolution=resolution,
+            bucket_start=bucket_start,
+            last_snapshot_at=created_at,
+            total_value=total_value,
+            kits_count=kits_count,
+        )
+        for resolution in CollectionValueRollup.RESOLUTIONS
+        for bucket_start, (created_at, total_value, kits_count) in bucket_collection_value_points(points, resolution).items()
+    ]
+    with transaction.atomic():
+        CollectionValueRollup.objects.bulk_create(
+            rollups,
+            update_conflicts=True,
+            unique_fields=['user', 'resolution', 'bucket_start'],
+            update_fields=['last_snapshot_at', 'total_value', 'kits_count'],
+        )
+        CollectionValueSnapshot.objects.filter(id__in=removable_ids).delete()
+    return len(removable_ids)
 
 
 class WishlistItem(models.Model):
@@ -1054,6 +1905,180 @@ class KitReport(models.Model):
         return f'{self.reporter.username} reported kit {self.kit_id} ({self.reason})'
 
 
+# Per-kit view of its reports for the admin queue, kept in sync by
+# refresh_kit_report_summaries so the queue can filter and page without joins
+class KitReportSummary(models.Model):
+    STATUS_COUNT_FIELDS = {
+        'pending': 'pending_count',
+        'resolved': 'resolved_count',
+        'dismissed': 'dismissed_count',
+    }
+
+    userkit = models.OneToOneField(
+        UserKit,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='report_summary',
+    )
+    report_count = models.PositiveIntegerField(default=0)
+    pending_count = models.PositiveIntegerField(default=0)
+    resolved_count = models.PositiveIntegerField(default=0)
+    dismissed_count = models.PositiveIntegerField(default=0)
+    latest_report_at = models.DateTimeField()
+    # Comma-wrapped reason set, e.g. ",spam,other,", so one reason matches with contains
+    reasons = models.CharField(max_length=255, blank=True, default='')
+    search_text = models.TextField(blank=True, default='')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-latest_report_at', '-userkit'], name='kit_report_summary_latest'),
+            models.Index(
+                fields=['-latest_report_at', '-userkit'],
+                condition=Q(pending_count__gt=0),
+                name='kit_report_summary_pending',
+            ),
+        ]
+
+    def __str__(self):
+        return f'Reports for kit {self.userkit_id}'
+
+
+# Trigram index over report summary search text, used by the admin report queue
+class KitReportSearchTrigram(models.Model):
+    summary = models.ForeignKey(KitReportSummary, on_delete=models.CASCADE, related_name='search_trigrams')
+    trigram = models.CharField(max_length=3)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['trigram', 'summary'], name='unique_kit_report_search_trigram'),
+        ]
+
+    def __str__(self):
+        return f'{self.trigram} -> {self.summary_id}'
+
+
+KIT_REPORT_SUMMARY_REPORT_FIELDS = ('kit_id', 'status', 'reason', 'created_at', 'reporter__username', 'description')
+KIT_REPORT_SUMMARY_USERKIT_FIELDS = ('id', 'user__username', 'kit__team__name', 'kit__season', 'kit__kit_type')
+
+
+def summarize_kit_reports(report_rows, userkit_rows):
+    # report_rows are KIT_REPORT_SUMMARY_REPORT_FIELDS newest first, userkit_rows
+    # are KIT_REPORT_SUMMARY_USERKIT_FIELDS; returns summary fields per userkit id
+    summaries = {}
+    search_values = {}
+    for kit_id, report_status, reason, created_at, reporter_username, description in report_rows:
+        summary = summaries.get(kit_id)
+        if summary is None:
+            summary = summaries[kit_id] = {
+                'report_count': 0,
+                'pending_count': 0,
+                'resolved_count': 0,
+                'dismissed_count': 0,
+                'latest_report_at': created_at,
+                'reasons': [],
+            }
+            search_values[kit_id] = []
+        summary['report_count'] += 1
+        count_field = KitReportSummary.STATUS_COUNT_FIELDS.get(report_status)
+        if count_field is not None:
+            summary[count_field] += 1
+        if reason not in summary['reasons']:
+            summary['reasons'].append(reason)
+        search_values[kit_id].extend([reporter_username, description])
+
+    for userkit_id, *kit_values in userkit_rows:
+        summary = summaries.get(userkit_id)
+        if summary is None:
+            continue
+        summary['reasons'] = f",{','.join(summary['reasons'])},"
+        summary['search_text'] = '\n'.join(
+            value.lower() for value in [*kit_values, *search_values[userkit_id]] if value
+        )
+    return summaries
+
+
+def refresh_kit_report_summaries(userkit_ids):
+    userkit_ids = set(userkit_ids)
+    if not userkit_ids:
+        return 0
+
+    with transaction.atomic(savepoint=False):
+        return _refresh_kit_report_summaries(userkit_ids)
+
+
+def _refresh_kit_report_summaries(userkit_ids):
+    # Lock the kits, not their summaries: a first report has no summary row to
+    # lock, and concurrent first reports must not each upsert a partial view.
+    # NO KEY UPDATE leaves the FK share locks taken by new reports alone.
+    list(
+        UserKit.objects.select_for_update(no_key=True).filter(pk__in=userkit_ids).order_by('pk').values_list('pk', flat=True)
+    )
+    previously_pending = set(
+        KitReportSummary.objects.filter(
+            userkit_id__in=userkit_ids,
+            pending_count__gt=0,
+        ).values_list('userkit_id', flat=True)
+    )
+    summaries = summarize_kit_reports(
+        KitReport.objects.filter(kit_id__in=userkit_ids).order_by('-created_at', '-id').values_list(
+            *KIT_REPORT_SUMMARY_REPORT_FIELDS,
+        ),
+        UserKit.objects.filter(pk__in=userkit_ids).values_list(*KIT_REPORT_SUMMARY_USERKIT_FIELDS),
+    )
+    now_pending = {userkit_id for userkit_id, fields in summaries.items() if fields['pending_count']}
+    # Safe under the kit locks: a concurrent first report waits and then sees this group as pending
+    adjust_moderation_stats(kit_report_groups_pending=len(now_pending) - len(previously_pending))
+
+    stale_ids = userkit_ids - set(summaries)
+    if stale_ids:
+        KitReportSummary.objects.filter(userkit_id__in=stale_ids).delete()
+    if not summaries:
+        return 0
+
+    KitReportSummary.objects.bulk_create(
+        [KitReportSummary(userkit_id=userkit_id, **fields) for userkit_id, fields in summaries.items()],
+        update_conflicts=True,
+        unique_fields=['userkit'],
+        update_fields=[
+            'report_count',
+            'pending_count',
+            'resolved_count',
+            'dismissed_count',
+            'latest_report_at',
+            'reasons',
+            'search_text',
+        ],
+    )
+    KitReportSearchTrigram.objects.filter(summary_id__in=list(summaries)).delete()
+    KitReportSearchTrigram.objects.bulk_create([
+        KitReportSearchTrigram(summary_id=userkit_id, trigram=trigram)
+        for userkit_id, fields in summaries.items()
+        for trigram in sorted(build_search_trigrams(fields['search_text']))
+    ], batch_size=1000)
+    return len(summaries)
+
+
+def refresh_kit_report_summaries_matching(condition):
+    # For renames that change the search text of every reported kit they touch
+    return refresh_kit_report_summaries(
+        KitReportSummary.objects.filter(condition).values_list('userkit_id', flat=True).distinct()
+    )
+
+
+def get_kit_report_search_candidate_ids(text):
+    trigrams = build_search_trigrams(text)
+    if not trigrams:
+        return None
+
+    return KitReportSearchTrigram.objects.filter(
+        trigram__in=trigrams,
+    ).values('summary_id').annotate(
+        matched_trigrams=Count('trigram', distinct=True),
+    ).filter(
+        matched_trigrams=len(trigrams),
+    ).values('summary_id')
+
+
 class KitReportModerationAction(models.Model):
     ACTION_DISMISS = 'dismiss'
     ACTION_REMOVE_KIT = 'remove_kit'
@@ -1103,6 +2128,117 @@ class KitReportModerationAction(models.Model):
         return f'{self.get_action_type_display()} by {self.actor.username} at {self.created_at}'
 
 
+# Single-row moderation dashboard counters, so the summary endpoint is one row
+# read. Writers move them by F() deltas from the change they already know about
+# (adjust_moderation_stats) and only team merges recount; a missing row is
+# rebuilt from full counts on the first read.
+class ModerationStats(models.Model):
+    SINGLETON_ID = 1
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=SINGLETON_ID, editable=False)
+    kit_type_suggestions_pending = models.PositiveIntegerField(default=0)
+    team_verification_pending = models.PositiveIntegerField(default=0)
+    kit_report_groups_pending = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'moderation stats'
+
+    def __str__(self):
+        return 'Moderation stats'
+
+
+MODERATION_STATS_FIELDS = (
+    'kit_type_suggestions_pending',
+    'team_verification_pending',
+    'kit_report_groups_pending',
+)
+
+
+def get_moderation_stat_querysets():
+    return {
+        'kit_type_suggestions_pending': TeamSeasonKitType.objects.filter(
+            status=TeamSeasonKitType.STATUS_PENDING,
+            team__is_verified=True,
+        ),
+        'team_verification_pending': Team.objects.filter(is_verified=False),
+        'kit_report_groups_pending': KitReportSummary.objects.filter(pending_count__gt=0),
+    }
+
+
+def _count_subquery(queryset):
+    # A bare COUNT(*) is not an aggregate to the ORM, so no GROUP BY is added
+    return Subquery(
+        queryset.order_by().annotate(total=Func(Value(1), function='COUNT')).values('total')[:1],
+        output_field=models.PositiveIntegerField(),
+    )
+
+
+def get_actual_moderation_stats():
+    return {
+        field_name: queryset.count()
+        for field_name, queryset in get_moderation_stat_querysets().items()
+    }
+
+
+def refresh_moderation_stats(*field_names):
+    field_names = field_names or MODERATION_STATS_FIELDS
+    querysets = get_moderation_stat_querysets()
+    stats = ModerationStats.objects.filter(pk=ModerationStats.SINGLETON_ID)
+    # Lock before counting so a concurrent writer's rows are visible to the
+    # recount once it commits, instead of overwriting its count with ours
+    if list(stats.select_for_update().values_list('pk', flat=True)):
+        stats.update(updated_at=timezone.now(), **{
+            field_name: _count_subquery(querysets[field_name])
+            for field_name in field_names
+        })
+        return
+
+    try:
+        with transaction.atomic():
+            ModerationStats.objects.create(pk=ModerationStats.SINGLETON_ID, **get_actual_moderation_stats())
+    except IntegrityError:
+        # Another writer created the row first
+        refresh_moderation_stats(*field_names)
+
+
+def adjust_moderation_stats(**deltas):
+    # Write paths that know the change move the counters instead of recounting;
+    # a missing row is built from full counts on first read
+    deltas = {field_name: delta for field_name, delta in deltas.items() if delta}
+    if not deltas:
+        return 0
+    return ModerationStats.objects.filter(pk=ModerationStats.SINGLETON_ID).update(updated_at=timezone.now(), **{
+        field_name: Greatest(F(field_name) + delta, Value(0))
+        for field_name, delta in deltas.items()
+    })
+
+
+def is_counted_suggestion(status, team_id):
+    return status == TeamSeasonKitType.STATUS_PENDING and Team.objects.filter(pk=team_id, is_verified=True).exists()
+
+
+def get_moderation_stats():
+    stats = ModerationStats.objects.filter(pk=ModerationStats.SINGLETON_ID).values(*MODERATION_STATS_FIELDS).first()
+    if stats is None:
+        refresh_moderation_stats()
+        stats = ModerationStats.objects.filter(pk=ModerationStats.SINGLETON_ID).values(*MODERATION_STATS_FIELDS).get()
+    return stats
+
+
+def reconcile_moderation_stats(*, dry_run=False):
+    stored = ModerationStats.objects.filter(pk=ModerationStats.SINGLETON_ID).values(*MODERATION_STATS_FIELDS).first()
+    actual = get_actual_moderation_stats()
+    drifted = [
+        field_name
+        for field_name in MODERATION_STATS_FIELDS
+        if stored is None or stored[field_name] != actual[field_name]
+    ]
+    if drifted and not dry_run:
+        ModerationStats.objects.update_or_create(pk=ModerationStats.SINGLETON_ID, defaults=actual)
+    return drifted
+
+
 class Conversation(models.Model):
     participant_one = models.ForeignKey(
         User,
@@ -1205,10 +2341,19 @@ class Message(models.Model):
     def save(self, *args, **kwargs):
         self.body = (self.body or '').strip()
         self.full_clean()
+        creating = self._state.adding
         result = super().save(*args, **kwargs)
         Conversation.objects.filter(pk=self.conversation_id).update(updated_at=timezone.now())
+        if creating and self.read_at is None:
+            adjust_unread_message_counters(self.get_recipient_id(), self.conversation_id, 1)
         return result
 
+    def get_recipient_id(self):
+        conversation = self.conversation
+        if self.sender_id == conversation.participant_one_id:
+            return conversation.participant_two_id
+        return conversation.participant_one_id
+
     def __str__(self):
         return f'Message {self.id} in conversation {self.conversation_id}'
 
@@ -1273,10 +2418,202 @@ class Notification(models.Model):
         return f'{self.actor.username} -> {self.recipient.username} ({self.type})'
 
 
+# Unread badge counters, kept in step with Message/Notification writes
+class UserUnreadCounter(models.Model):
+    user = models.OneToOneField(
+        User,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='unread_counter',
+    )
+    messages_unread_count = models.PositiveIntegerField(default=0)
+    notifications_unread_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'Unread counters for {self.user_id}'
+
+
+class ConversationUnreadCounter(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='conversation_unread_counters',
+    )
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name='unread_counters',
+    )
+    unread_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'conversation'],
+                name='unique_conversation_unread_counter',
+            )
+        ]
+
+    def __str__(self):
+        return f'Unread counter for {self.user_id} in conversation {self.conversation_id}'
+
+
+def _adjust_counter_row(model, lookup, deltas):
+    updates = {
+        field_name: Greatest(F(field_name) + delta, Value(0))
+        for field_name, delta in deltas.items()
+    }
+    if model.objects.filter(**lookup).update(**updates):
+        return
+    if all(delta <= 0 for delta in deltas.values()):
+        # Never create rows from a decrement: it can run while the user or
+        # conversation is being cascade-deleted.
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **{
+                field_name: max(delta, 0)
+                for field_name, delta in deltas.items()
+            })
+    except IntegrityError:
+        # Another writer created the row first
+        model.objects.filter(**lookup).update(**updates)
+
+
+def adjust_unread_message_counters(user_id, conversation_id, delta):
+    if not user_id or not delta:
+        return
+
+    _adjust_counter_row(
+        ConversationUnreadCounter,
+        {'user_id': user_id, 'conversation_id': conversation_id},
+        {'unread_count': delta},
+    )
+    _adjust_counter_row(UserUnreadCounter, {'user_id': user_id}, {'messages_unread_count': delta})
+    publish_unread_delta(user_id, UNREAD_COUNTER_MESSAGES, delta)
+
+
+def adjust_unread_notification_counter(user_id, delta):
+    if not user_id or not delta:
+        return
+
+    _adjust_counter_row(UserUnreadCounter, {'user_id': user_id}, {'notifications_unread_count': delta})
+    publish_unread_delta(user_id, UNREAD_COUNTER_NOTIFICATIONS, delta)
+
+
+def get_unread_counts(user):
+    counter = UserUnreadCounter.objects.filter(user=user).values(
+        'messages_unread_count',
+        'notifications_unread_count',
+    ).first()
+    return counter or {'messages_unread_count': 0, 'notifications_unread_count': 0}
+
+
+def get_actual_unread_message_counts(user_ids=None):
+    recipient = Case(
+        When(sender_id=F('conversation__participant_one_id'), then=F('conversation__participant_two_id')),
+        default=F('conversation__participant_one_id'),
+    )
+    queryset = Message.objects.filter(read_at__isnull=True).annotate(recipient_id=recipient)
+    if user_ids is not None:
+        queryset = queryset.filter(recipient_id__in=user_ids)
+
+    rows = queryset.order_by().values('recipient_id', 'conversation_id').annotate(total=Count('id'))
+    return {(row['recipient_id'], row['conversation_id']): row['total'] for row in rows}
+
+
+def get_actual_unread_notification_counts(user_ids=None):
+    queryset = Notification.objects.filter(read_at__isnull=True)
+    if user_ids is not None:
+        queryset = queryset.filter(recipient_id__in=user_ids)
+
+    rows = queryset.order_by().values('recipient_id').annotate(total=Count('id'))
+    return {row['recipient_id']: row['total'] for row in rows}
+
+
+def reconcile_unread_counters(user_ids=None, *, dry_run=False):
+    if user_ids is not None:
+        user_ids = list(user_ids)
+
+    actual_conversation_counts = get_actual_unread_message_counts(user_ids)
+    actual_notification_counts = get_actual_unread_notification_counts(user_ids)
+
+    conversation_counters = ConversationUnreadCounter.objects.all()
+    user_counters = UserUnreadCounter.objects.all()
+    users = User.objects.all()
+    if user_ids is not None:
+        conversation_counters = conversation_counters.filter(user_id__in=user_ids)
+        user_counters = user_counters.filter(user_id__in=user_ids)
+        users = users.filter(pk__in=user_ids)
+
+    stored_conversation_counters = {
+        (counter.user_id, counter.conversation_id): counter
+        for counter in conversation_counters
+    }
+    drifted_conversation_counters = []
+    new_conversation_counters = []
+    for key in stored_conversation_counters.keys() | actual_conversation_counts.keys():
+        actual = actual_conversation_counts.get(key, 0)
+        counter = stored_conversation_counters.get(key)
+        if counter is None:
+            new_conversation_counters.append(
+                ConversationUnreadCounter(user_id=key[0], conversation_id=key[1], unread_count=actual)
+            )
+        elif counter.unread_count != actual:
+            counter.unread_count = actual
+            drifted_conversation_counters.append(counter)
+
+    actual_message_totals = {}
+    for (user_id, _conversation_id), total in actual_conversation_counts.items():
+        actual_message_totals[user_id] = actual_message_totals.get(user_id, 0) + total
+
+    stored_user_counters = {counter.user_id: counter for counter in user_counters}
+    drifted_user_counters = []
+    new_user_counters = []
+    for user_id in users.values_list('pk', flat=True).order_by('pk').iterator():
+        messages_count = actual_message_totals.get(user_id, 0)
+        notifications_count = actual_notification_counts.get(user_id, 0)
+        counter = stored_user_counters.get(user_id)
+        if counter is None:
+            if messages_count or notifications_count:
+                new_user_counters.append(UserUnreadCounter(
+                    user_id=user_id,
+                    messages_unread_count=messages_count,
+                    notifications_unread_count=notifications_count,
+                ))
+        elif (counter.messages_unread_count, counter.notifications_unread_count) != (messages_count, notifications_count):
+            counter.messages_unread_count = messages_count
+            counter.notifications_unread_count = notifications_count
+            drifted_user_counters.append(counter)
+
+    drifted = (
+        len(drifted_conversation_counters)
+        + len(new_conversation_counters)
+        + len(drifted_user_counters)
+        + len(new_user_counters)
+    )
+    if dry_run or not drifted:
+        return drifted
+
+    with transaction.atomic():
+        ConversationUnreadCounter.objects.bulk_update(drifted_conversation_counters, ['unread_count'], batch_size=500)
+        ConversationUnreadCounter.objects.bulk_create(new_conversation_counters, batch_size=500)
+        UserUnreadCounter.objects.bulk_update(
+            drifted_user_counters,
+            ['messages_unread_count', 'notifications_unread_count'],
+            batch_size=500,
+        )
+        UserUnreadCounter.objects.bulk_create(new_user_counters, batch_size=500)
+    return drifted
+
+
 # Kit Images (multiple images per kit)
 class UserKitImage(models.Model):
     user_kit = models.ForeignKey(UserKit, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='user_kits/')
+    # Resized copies stored next to the original: {"320": {"webp": name, "jpeg": name}, ...}
+    variants = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     order = models.PositiveIntegerField(default=0)
 
@@ -1288,6 +2625,127 @@ class UserKitImage(models.Model):
 
 
 
+# Deferred work picked up by `manage.py run_jobs`; see kits/jobs.py
+class BackgroundJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=255, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
+
+
+
+def collection_export_upload_to(instance, filename):
+    # Random directory so artifacts are not guessable if MEDIA_URL is served publicly
+    return f'collection_exports/{uuid.uuid4().hex}/{filename}'
+
+
+class CollectionExportJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    ACTIVE_STATUSES = (STATUS_PENDING, STATUS_RUNNING)
+
+    FORMAT_CSV = 'csv'
+    FORMAT_XLSX = 'xlsx'
+
+    FORMAT_CHOICES = [
+        (FORMAT_CSV, 'CSV'),
+        (FORMAT_XLSX, 'XLSX'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='collection_export_jobs')
+    export_format = models.CharField(max_length=4, choices=FORMAT_CHOICES)
+    include_sold = models.BooleanField(default=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    file = models.FileField(upload_to=collection_export_upload_to, blank=True)
+    filename = models.CharField(max_length=255, blank=True)
+    row_count = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        constraints = [
+            # Identical exports requested while one is still building share that job
+            models.UniqueConstraint(
+                fields=['user', 'export_format', 'include_sold'],
+                condition=Q(status__in=['pending', 'running']),
+                name='unique_active_collection_export_job',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.user} {self.export_format} export #{self.pk} ({self.status})'
+
+    @property
+    def is_expired(self):
+        return self.expires_at is not None and self.expires_at <= timezone.now()
+
+    def delete_artifact(self):
+        if self.file:
+            self.file.delete(save=False)
+
+
+def fail_abandoned_collection_exports(*, user=None, now=None):
+    # An export whose background job failed for good would stay active forever,
+    # blocking identical requests and never expiring, so give up on it instead
+    now = now or timezone.now()
+    timeout = getattr(settings, 'COLLECTION_EXPORT_JOB_TIMEOUT_SECONDS', 2 * 60 * 60)
+    abandoned = CollectionExportJob.objects.filter(
+        status__in=CollectionExportJob.ACTIVE_STATUSES,
+        created_at__lt=now - timedelta(seconds=timeout),
+    )
+    if user is not None:
+        abandoned = abandoned.filter(user=user)
+    return abandoned.update(
+        status=CollectionExportJob.STATUS_FAILED,
+        error='The export did not finish in time. Start a new export.',
+        finished_at=now,
+        expires_at=now,
+    )
+
+
 # SIGNALS
 
 # Create or update user profile on User creation
@@ -1303,3 +2761,295 @@ def save_user_profile(sender, instance, **kwargs):
     except ObjectDoesNotExist:
         # Create profile if it does not exist
         Profile.objects.create(user=instance)
+
+
+# Keep UserKit like/comment counters in sync with the rows they count
+@receiver(m2m_changed, sender=UserKit.likes.through)
+def sync_userkit_likes_count(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._cleared_liked_kit_ids = list(instance.liked_kits.values_list('pk', flat=True))
+    elif action == 'post_add' and pk_set:
+        if reverse:
+            adjust_userkit_counter(list(pk_set), 'likes_count', 1)
+        else:
+            adjust_userkit_counter([instance.pk], 'likes_count', len(pk_set))
+    elif action in ('post_remove', 'post_clear'):
+        # Removed ids are not guaranteed to have been liked, so recount the touched rows
+        if not reverse:
+            userkit_ids = [instance.pk]
+        elif action == 'post_clear':
+            userkit_ids = getattr(instance, '_cleared_liked_kit_ids', [])
+        else:
+            userkit_ids = list(pk_set or [])
+        if userkit_ids:
+            reconcile_userkit_counters(UserKit.objects.filter(pk__in=userkit_ids))
+
+
+@receiver(pre_delete, sender=User)
+def release_user_kit_likes(sender, instance, **kwargs):
+    adjust_userkit_counter(
+        list(instance.liked_kits.values_list('pk', flat=True)),
+        'likes_count',
+        -1,
+    )
+
+
+# Invalidate cached catalog reads whenever a catalog row changes
+CATALOG_CACHE_RESOURCES_BY_MODEL = {
+    Country: CATALOG_COUNTRIES,
+    League: CATALOG_LEAGUES,
+    Team: CATALOG_TEAMS,
+    KitType: CATALOG_KIT_TYPES,
+    ShirtVersion: CATALOG_SHIRT_VERSIONS,
+    TeamSeasonKitType: CATALOG_TEAM_SEASON_KIT_TYPES,
+}
+
+
+def bump_catalog_cache_for_instance(sender, raw=False, **kwargs):
+    if not raw:
+        bump_catalog_versions(CATALOG_CACHE_RESOURCES_BY_MODEL[sender])
+
+
+for catalog_model in CATALOG_CACHE_RESOURCES_BY_MODEL:
+    post_save.connect(bump_catalog_cache_for_instance, sender=catalog_model, dispatch_uid=f'catalog-cache-save-{catalog_model.__name__}')
+    post_delete.connect(bump_catalog_cache_for_instance, sender=catalog_model, dispatch_uid=f'catalog-cache-delete-{catalog_model.__name__}')
+
+
+@receiver(post_save, sender=Team)
+def reindex_team_search(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not {'name', 'is_verified'} & set(update_fields):
+        return
+    reindex_team_search_trigrams([instance])
+
+
+@receiver(post_save, sender=UserKit)
+def refresh_userkit_ranking(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_kit_rankings([instance.pk])
+
+
+@receiver(post_save, sender=UserKit)
+def sync_userkit_following_feed(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    # Edits that leave visibility alone cannot add or remove feed rows
+    if created or update_fields is None or 'is_hidden_by_moderation' in update_fields:
+        sync_following_feed_entries([instance.pk])
+
+
+@receiver(post_save, sender=UserKit)
+def mark_value_history_stale_on_visibility_change(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and 'is_hidden_by_moderation' not in update_fields:
+        return
+    previous_hidden = instance.__dict__.get('_loaded_is_hidden_by_moderation')
+    instance._loaded_is_hidden_by_moderation = instance.is_hidden_by_moderation
+    if created:
+        changed = instance.is_hidden_by_moderation
+    else:
+        changed = previous_hidden is not None and previous_hidden != instance.is_hidden_by_moderation
+    if changed:
+        mark_collection_value_history_stale([instance.user_id])
+
+
+@receiver(post_save, sender=UserKit)
+def refresh_report_summary_on_kit_change(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is not None and 'kit' not in update_fields:
+        return
+    previous_kit_id = instance.__dict__.get('_loaded_kit_id')
+    instance._loaded_kit_id = instance.kit_id
+    if previous_kit_id is not None and previous_kit_id != instance.kit_id:
+        refresh_kit_report_summaries_matching(Q(userkit=instance))
+
+
+@receiver(post_save, sender=KitReport)
+def refresh_report_summary_on_report_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_kit_report_summaries([instance.kit_id])
+
+
+@receiver(post_delete, sender=KitReport)
+def refresh_report_summary_on_report_delete(sender, instance, **kwargs):
+    refresh_kit_report_summaries([instance.kit_id])
+
+
+@receiver(post_save, sender=Team)
+def refresh_report_summaries_on_team_rename(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is None or 'name' in update_fields:
+        refresh_kit_report_summaries_matching(Q(userkit__kit__team=instance))
+
+
+@receiver(post_save, sender=Kit)
+def refresh_report_summaries_on_kit_edit(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is None or {'team', 'season', 'kit_type'} & set(update_fields):
+        refresh_kit_report_summaries_matching(Q(userkit__kit=instance))
+
+
+@receiver(post_save, sender=User)
+def refresh_report_summaries_on_username_change(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is None or 'username' in update_fields:
+        refresh_kit_report_summaries_matching(Q(userkit__user=instance) | Q(userkit__reports__reporter=instance))
+
+
+@receiver(post_save, sender=Team)
+def adjust_moderation_stats_on_team_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'is_verified' not in update_fields):
+        return
+    previous_verified = instance.__dict__.get('_loaded_is_verified')
+    instance._loaded_is_verified = instance.is_verified
+    if created:
+        adjust_moderation_stats(team_verification_pending=0 if instance.is_verified else 1)
+    elif previous_verified is None:
+        refresh_moderation_stats('team_verification_pending', 'kit_type_suggestions_pending')
+    elif previous_verified != instance.is_verified:
+        sign = 1 if instance.is_verified else -1
+        adjust_moderation_stats(
+            team_verification_pending=-sign,
+            kit_type_suggestions_pending=sign * instance.season_kit_types.filter(
+                status=TeamSeasonKitType.STATUS_PENDING,
+            ).count(),
+        )
+
+
+@receiver(post_delete, sender=Team)
+def adjust_moderation_stats_on_team_delete(sender, instance, **kwargs):
+    # The team's suggestions are cascade-deleted first and adjust the counter themselves
+    if not instance.is_verified:
+        adjust_moderation_stats(team_verification_pending=-1)
+
+
+@receiver(post_save, sender=TeamSeasonKitType)
+def adjust_moderation_stats_on_suggestion_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not {'status', 'team'} & set(update_fields)):
+        return
+    previous_status = instance.__dict__.get('_loaded_status')
+    previous_team_id = instance.__dict__.get('_loaded_team_id')
+    instance._loaded_status = instance.status
+    instance._loaded_team_id = instance.team_id
+    if not created and previous_status is None:
+        refresh_moderation_stats('kit_type_suggestions_pending')
+        return
+    was_counted = not created and is_counted_suggestion(previous_status, previous_team_id)
+    adjust_moderation_stats(
+        kit_type_suggestions_pending=int(is_counted_suggestion(instance.status, instance.team_id)) - int(was_counted),
+    )
+
+
+@receiver(post_delete, sender=TeamSeasonKitType)
+def adjust_moderation_stats_on_suggestion_delete(sender, instance, **kwargs):
+    # Also covers admin deletes and cascades from kit types and teams
+    if is_counted_suggestion(instance.status, instance.team_id):
+        adjust_moderation_stats(kit_type_suggestions_pending=-1)
+
+
+@receiver(post_save, sender=Follow)
+def backfill_following_feed(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        backfill_following_feed_for_follow(instance.follower_id, instance.following_id)
+
+
+@receiver(post_delete, sender=Follow)
+def prune_following_feed(sender, instance, **kwargs):
+    prune_following_feed_for_unfollow(instance.follower_id, instance.following_id)
+
+
+@receiver(post_save, sender=KitComment)
+def increment_userkit_comments_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_userkit_counter([instance.kit_id], 'comments_count', 1)
+
+
+@receiver(post_delete, sender=KitComment)
+def decrement_userkit_comments_count(sender, instance, **kwargs):
+    adjust_userkit_counter([instance.kit_id], 'comments_count', -1)
+
+
+@receiver(post_delete, sender=Message)
+def decrement_unread_message_counters(sender, instance, **kwargs):
+    if instance.read_at is not None:
+        return
+    try:
+        recipient_id = instance.get_recipient_id()
+    except Conversation.DoesNotExist:
+        return
+    adjust_unread_message_counters(recipient_id, instance.conversation_id, -1)
+
+
+@receiver(post_save, sender=Notification)
+def increment_unread_notification_counter(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.read_at is None:
+        adjust_unread_notification_counter(instance.recipient_id, 1)
+
+
+@receiver(post_delete, sender=Notification)
+def decrement_unread_notification_counter(sender, instance, **kwargs):
+    if instance.read_at is None:
+        adjust_unread_notification_counter(instance.recipient_id, -1)
+
+
+@receiver(post_delete, sender=CollectionExportJob)
+def delete_collection_export_artifact(sender, instance, **kwargs):
+    # Also covers cascades from account deletion
+    transaction.on_commit(instance.delete_artifact)
+
+
+# Image and owner edits do not touch KitRanking, so version public kit cards separately
+@receiver(post_save, sender=UserKitImage)
+@receiver(post_delete, sender=UserKitImage)
+@receiver(post_save, sender=Profile)
+def bump_public_kits_version(sender, raw=False, **kwargs):
+    if not raw:
+        bump_catalog_versions(CATALOG_PUBLIC_KITS)
+
+
+@receiver(post_save, sender=User)
+def bump_public_kits_version_on_user_save(sender, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    bump_catalog_versions(CATALOG_PUBLIC_KITS)
+
+
+@receiver(post_delete, sender=UserKitImage)
+def delete_userkit_image_variants(sender, instance, **kwargs):
+    # django-cleanup only removes the original file; also covers kit, team and account deletes
+    if instance.variants:
+        transaction.on_commit(lambda: delete_image_variants(instance))
+
+
+@receiver(post_save, sender=Kit)
+def revalue_userkits_for_kit_price_change(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'estimated_price' not in update_fields):
+        return
+    previous_price = instance.__dict__.get('_loaded_estimated_price')
+    instance._loaded_estimated_price = instance.estimated_price
+    if created or previous_price is None or previous_price == instance.estimated_price:
+        return
+
+    from .jobs import enqueue_userkit_revaluation
+
+    enqueue_userkit_revaluation(kit_ids=[instance.pk])
+
+
+@receiver(post_save, sender=ShirtVersion)
+def revalue_userkits_for_shirt_version_change(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'valuation_multiplier' not in update_fields):
+        return
+    previous_multiplier = instance.__dict__.get('_loaded_valuation_multiplier')
+    instance._loaded_valuation_multiplier = instance.valuation_multiplier
+    if created or previous_multiplier is None or previous_multiplier == instance.valuation_multiplier:
+        return
+
+    from .jobs import enqueue_userkit_revaluation
+
+    enqueue_userkit_revaluation(shirt_version_ids=[instance.pk])
@@ -0,0 +1,209 @@
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+
+# Maximum SQL queries per request for every route in kits/urls.py, keyed by URL
+# name. Budgets are for the seeded dataset in the query budget tests and must
+# not depend on page size; list routes are also checked for constant counts.
+# Authenticated budgets include the JWT cookie user and profile lookups.
+QUERY_BUDGETS = {
+    # Collection
+    'api-my-collection': 4,
+    'api-my-collection-detail': 8,
+    'removed-kit-detail': 3,
+    'api-catalog': 2,
+    'explore-kits': 6,
+    'following-feed': 4,
+    'api-user-collection': 4,
+    'kit-detail': 5,
+    'kit-variants': 6,
+    'top-kits-by-team': 4,
+    'kit-likers': 3,
+    'my-collection-value-history': 5,
+    'my-collection-export': 2,
+    'my-collection-export-jobs': 11,
+    'my-collection-export-job-detail': 2,
+    'my-collection-export-job-download': 2,
+
+    # Catalog and search
+    'kit-options': 2,
+    'team-search': 2,
+    'team-resolve': 1,
+    'kit-search-suggestions': 2,
+    'league-list': 1,
+    'teams-by-league': 1,
+    'approved-team-season-kit-types': 1,
+    'country-list': 1,
+
+    # Social
+    'user-stats': 6,
+    'user-search': 1,
+    'toggle-follow': 18,
+    'user-followers': 3,
+    'user-following': 3,
+    'toggle-like': 13,
+    'kit-report': 14,
+    'kit-comments': 9,
+    'comment-reply': 22,
+    'comment-like': 11,
+    'comment-delete': 18,
+
+    # Wishlist
+    'my-wishlist': 3,
+    'user-wishlist': 3,
+    'wishlist-toggle': 9,
+    'wishlist-detail': 3,
+
+    # Messaging and notifications
+    'conversation-list': 2,
+    'conversation-start': 10,
+    'conversation-unread-count': 2,
+    'conversation-detail': 2,
+    'conversation-messages': 7,
+    'notification-list': 3,
+    'notification-unread-count': 2,
+    'notification-mark-read': 3,
+    'unread-counts-stream': 1,
+
+    # Account
+    'google_login': 2,
+    'update-profile': 2,
+    'current-user': 2,
+    'check-username': 2,
+
+    # Moderation
+    'admin-kit-type-suggestions': 3,
+    'admin-moderation-summary': 2,
+    'admin-kit-type-moderation-actions': 2,
+    'admin-kit-type-moderation-action-undo': 13,
+    'admin-kit-reports': 6,
+    'admin-kit-report-detail': 5,
+    'admin-kit-report-dismiss': 15,
+    'admin-kit-report-remove-kit': 33,
+    'admin-kit-report-bulk-dismiss': 15,
+    'admin-kit-report-bulk-remove-kit': 31,
+    'admin-team-season-kit-type-approve': 11,
+    'admin-team-season-kit-type-reject': 10,
+    'admin-team-season-kit-type-bulk-approve': 9,
+    'admin-team-season-kit-type-bulk-reject': 8,
+    'admin-team-season-kit-type-merge': 21,
+    'admin-unverified-teams': 7,
+    'admin-countries': 2,
+    'admin-leagues': 2,
+    'admin-catalog-countries': 2,
+    'admin-catalog-country-detail': 2,
+    'admin-catalog-leagues': 2,
+    'admin-catalog-league-detail': 2,
+    'admin-catalog-teams': 2,
+    'admin-catalog-team-detail': 2,
+    'admin-team-approve': 22,
+    'admin-team-merge': 36,
+    'admin-team-reject': 19,
+    'admin-team-delete-content': 18,
+    'admin-team-deletion-detail': 2,
+}
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration_ms(self):
+        return sum(duration for _sql, duration in self.queries) * 1000
+
+
+@contextmanager
+def record_queries(aliases=None):
+    # execute_wrapper works without DEBUG, unlike connection.queries
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for alias in aliases or connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
+
+
+def get_query_budget(url_name):
+    return QUERY_BUDGETS.get(url_name)
+
+
+class QueryBudgetMiddleware:
+    """Report SQL count/time per request and log views that exceed their budget."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+
+        response['X-Query-Count'] = str(recorder.count)
+        response['X-Query-Time-Ms'] = f'{recorder.duration_ms:.1f}'
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        url_name = resolver_match.url_name if resolver_match else None
+        budget = get_query_budget(url_name)
+        if budget is not None and recorder.count > budget:
+            logger.warning(
+                'Query budget exceeded for %s %s (%s): %s queries, budget %s, %.1f ms',
+                request.method,
+                request.path,
+                url_name,
+                recorder.count,
+                budget,
+                recorder.duration_ms,
+            )
+        return response
+
+
+class QueryBudgetTestMixin:
+    def assertWithinQueryBudget(self, url_name, make_request, budget=None):
+        budget = QUERY_BUDGETS[url_name] if budget is None else budget
+        with record_queries() as recorder:
+            response = make_request()
+
+        if recorder.count > budget:
+            queries = '\n'.join(f'{index}. {sql}' for index, (sql, _duration) in enumerate(recorder.queries, start=1))
+            self.fail(f'{url_name} ran {recorder.count} queries, budget is {budget}:\n{queries}')
+        return response, recorder
+
+    def assertConstantQueryCount(self, url_name, build_request, seed_sizes, seed, queries_per_item=0):
+        # seed(size) must leave size items in the response, and build_request
+        # runs after each seed so per-size setup is not counted.
+        counts = {}
+        for size in seed_sizes:
+            seed(size)
+            make_request = build_request()
+            with record_queries() as recorder:
+                make_request()
+            counts[size] = recorder.count
+
+        first_size = seed_sizes[0]
+        expected = {
+            size: counts[first_size] + queries_per_item * (size - first_size)
+            for size in seed_sizes
+        }
+        if counts != expected:
+            self.fail(f'{url_name} query count grows with the dataset: {counts}')
+        return counts
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+UNREAD_COUNTER_MESSAGES = 'messages'
+UNREAD_COUNTER_NOTIFICATIONS = 'notifications'
+
+UNREAD_EVENT_SNAPSHOT = 'snapshot'
+UNREAD_EVENT_DELTA = 'delta'
+UNREAD_EVENT_RESYNC = 'resync'
+
+
+class InProcessUnreadEventBroker:
+    # Fans events out to streams served by this process only; deployments with
+    # several ASGI workers need a shared backend behind the same interface.
+    queue_size = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, user_id):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        subscription = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id, subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(user_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+
+        # Writers run in sync worker threads, so hand events to each stream's own loop
+        for loop, queue in subscriptions:
+            try:
+                loop.call_soon_threadsafe(_deliver_unread_event, queue, event)
+            except RuntimeError:
+                # Loop already closed; the stream is going away
+                continue
+
+
+def _deliver_unread_event(queue, event):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        # A slow client missed deltas; drop them and make it re-read the counts
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait({'type': UNREAD_EVENT_RESYNC})
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_unread_event_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                backend = getattr(
+                    settings,
+                    'UNREAD_EVENTS_BACKEND',
+                    'kits.realtime.InProcessUnreadEventBroker',
+                )
+                _broker = import_string(backend)()
+    return _broker
+
+
+def publish_unread_delta(user_id, counter, delta):
+    if not user_id or not delta:
+        return
+
+    event = {'type': UNREAD_EVENT_DELTA, 'counter': counter, 'delta': delta}
+    # Only announce changes other connections can already read back
+    transaction.on_commit(lambda: get_unread_event_broker().publish(user_id, event))
+
+
+def format_server_sent_event(event_name, payload):
+    return f'event: {event_name}\ndata: {json.dumps(payload)}\n\n'
+
+
+async def load_settled_snapshot(queue, load_snapshot, *, max_attempts=3):
+    # Deltas delivered while the snapshot loads may or may not be counted in it,
+    # so drop them and read again until a load completes without any arriving.
+    snapshot = None
+    for _attempt in range(max_attempts):
+        while not queue.empty():
+            queue.get_nowait()
+        snapshot = await load_snapshot()
+        if queue.empty():
+            break
+    return snapshot
+
+
+async def stream_unread_events(user_id, load_snapshot, *, heartbeat_seconds=None, broker=None):
+    broker = broker or get_unread_event_broker()
+    if heartbeat_seconds is None:
+        heartbeat_seconds = getattr(settings, 'UNREAD_EVENTS_HEARTBEAT_SECONDS', 15)
+
+    subscription = broker.subscribe(user_id)
+    _loop, queue = subscription
+    try:
+        yield format_server_sent_event(UNREAD_EVENT_SNAPSHOT, await load_settled_snapshot(queue, load_snapshot))
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+
+            if event['type'] == UNREAD_EVENT_RESYNC:
+                yield format_server_sent_event(UNREAD_EVENT_SNAPSHOT, await load_settled_snapshot(queue, load_snapshot))
+            else:
+                yield format_server_sent_event(
+                    UNREAD_EVENT_DELTA,
+                    {'counter': event['counter'], 'delta': event['delta']},
+                )
+    finally:
+        broker.unsubscribe(user_id, subscription)
@@ -1,13 +1,16 @@
 from rest_framework import serializers
 from datetime import timedelta
-from .models import Country, League, Team, Kit, KitType, KitTypeAlias, TeamSeasonKitType, KitTypeModerationAction, TeamModerationAction, UserKit, UserKitImage, WishlistItem, User, Profile, KitComment, KitReport, KitReportModerationAction, Conversation, Message, Notification, CollectionValueSnapshot, ShirtVersion, CANONICAL_WISHLIST_KIT_TYPES, build_team_slug, normalize_wishlist_kit_type
+from .models import Country, League, Team, Kit, KitType, KitTypeAlias, TeamSeasonKitType, KitTypeModerationAction, TeamModerationAction, TeamDeletionJob, UserKit, UserKitImage, WishlistItem, User, Profile, KitComment, KitReport, KitReportModerationAction, Conversation, Message, Notification, CollectionValueSnapshot, CollectionExportJob, ShirtVersion, CANONICAL_WISHLIST_KIT_TYPES, get_team_slug, normalize_wishlist_kit_type
 from django.contrib.auth.models import User
+from django.urls import reverse
 from dj_rest_auth.serializers import UserDetailsSerializer
 from django.utils.text import slugify
 from django.utils import timezone
 import re
 import json
 from urllib.parse import urlencode
+from .image_variants import build_absolute_image_variant_urls, get_image_variant_urls
+from .jobs import JOB_PROCESS_USERKIT_IMAGE, enqueue_job
 from .permissions import can_undo_moderation_action, can_view_collection_value, has_pro_access, moderation_action_is_currently_undoable, is_staff_or_moderator
 from .team_season_suggestions import ensure_team_season_suggestion
 
@@ -222,6 +225,24 @@ class AdminKitReportDecisionSerializer(serializers.Serializer):
         return (value or '').strip()
 
 
+ADMIN_BULK_MODERATION_MAX_IDS = 100
+
+
+class AdminBulkModerationSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=ADMIN_BULK_MODERATION_MAX_IDS,
+    )
+
+    def validate_ids(self, value):
+        return sorted(set(value))
+
+
+class AdminKitReportBulkDecisionSerializer(AdminBulkModerationSerializer, AdminKitReportDecisionSerializer):
+    pass
+
+
 class AdminKitReportReporterSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -269,6 +290,7 @@ class AdminKitReportGroupListSerializer(serializers.ModelSerializer):
     season = serializers.CharField(source='kit.season', read_only=True)
     kit_type = serializers.CharField(source='kit.kit_type', read_only=True)
     preview_image = serializers.SerializerMethodField()
+    preview_image_variants = serializers.SerializerMethodField()
     report_count = serializers.SerializerMethodField()
     pending_report_count = serializers.SerializerMethodField()
     latest_report_at = serializers.SerializerMethodField()
@@ -287,6 +309,7 @@ class AdminKitReportGroupListSerializer(serializers.ModelSerializer):
             'season',
             'kit_type',
             'preview_image',
+            'preview_image_variants',
             'is_hidden_by_moderation',
             'report_count',
             'pending_report_count',
@@ -300,8 +323,12 @@ class AdminKitReportGroupListSerializer(serializers.ModelSerializer):
     def _get_reports(self, obj):
         return list(getattr(obj, 'prefetched_report_group_reports', []))
 
+    def _get_preview_image(self, obj):
+        # The group queryset prefetches images in preview order
+        return next(iter(obj.images.all()), None)
+
     def get_preview_image(self, obj):
-        first_image = obj.images.order_by('order', 'created_at', 'id').first()
+        first_image = self._get_preview_image(obj)
         if first_image is None:
             return None
         request = self.context.get('request')
@@ -310,6 +337,12 @@ class AdminKitReportGroupListSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(image_url)
         return image_url
 
+    def get_preview_image_variants(self, obj):
+        first_image = self._get_preview_image(obj)
+        if first_image is None:
+            return {}
+        return get_image_variant_urls(first_image, self.context.get('request'))
+
     def get_report_count(self, obj):
         return len(self._get_reports(obj))
 
@@ -461,6 +494,10 @@ class ConversationListSerializer(serializers.ModelSerializer):
         if not request or not request.user.is_authenticated:
             return 0
 
+        unread_count = getattr(obj, 'unread_count', None)
+        if unread_count is not None:
+            return unread_count
+
         unread_queryset = getattr(obj, 'unread_messages', None)
         if unread_queryset is not None:
             return len(unread_queryset)
@@ -501,23 +538,23 @@ class NotificationKitSerializer(serializers.ModelSerializer):
     kit_type = serializers.CharField(source='kit.kit_type', read_only=True)
     title = serializers.SerializerMethodField()
     preview_image = serializers.SerializerMethodField()
+    preview_image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = UserKit
-        fields = ['id', 'owner_username', 'team_name', 'season', 'kit_type', 'title', 'preview_image']
+        fields = ['id', 'owner_username', 'team_name', 'season', 'kit_type', 'title', 'preview_image', 'preview_image_variants']
 
     def get_title(self, obj):
         return build_userkit_title(obj)
 
-    def get_preview_image(self, obj):
-        preview_image = None
+    def _get_preview_image(self, obj):
         prefetched_images = getattr(obj, 'prefetched_notification_images', None)
         if prefetched_images is not None:
-            if prefetched_images:
-                preview_image = prefetched_images[0]
-        else:
-            preview_image = obj.images.order_by('order', 'created_at', 'id').first()
+            return prefetched_images[0] if prefetched_images else None
+        return obj.images.order_by('order', 'created_at', 'id').first()
 
+    def get_preview_image(self, obj):
+        preview_image = self._get_preview_image(obj)
         if not preview_image:
             return None
 
@@ -527,6 +564,12 @@ class NotificationKitSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(image_url)
         return image_url
 
+    def get_preview_image_variants(self, obj):
+        preview_image = self._get_preview_image(obj)
+        if not preview_image:
+            return {}
+        return get_image_variant_urls(preview_image, self.context.get('request'))
+
 
 class NotificationCommentSerializer(serializers.ModelSerializer):
     body_preview = serializers.SerializerMethodField()
@@ -629,6 +672,39 @@ class CollectionValueSnapshotSerializer(serializers.ModelSerializer):
         model = CollectionValueSnapshot
         fields = ['id', 'created_at', 'total_value', 'kits_count', 'reason']
 
+class CollectionValueHistoryBucketSerializer(serializers.Serializer):
+    bucket_start = serializers.DateField()
+    created_at = serializers.DateTimeField()
+    total_value = serializers.DecimalField(max_digits=12, decimal_places=2)
+    kits_count = serializers.IntegerField()
+
+class CollectionExportJobSerializer(serializers.ModelSerializer):
+    format = serializers.CharField(source='export_format', read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CollectionExportJob
+        fields = [
+            'id',
+            'format',
+            'include_sold',
+            'status',
+            'filename',
+            'row_count',
+            'error',
+            'created_at',
+            'finished_at',
+            'expires_at',
+            'download_url',
+        ]
+
+    def get_download_url(self, obj):
+        if obj.status != CollectionExportJob.STATUS_SUCCEEDED or obj.is_expired:
+            return None
+        url = reverse('my-collection-export-job-download', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
 # Team Serializer
 class TeamSerializer(serializers.ModelSerializer):
     slug = serializers.SerializerMethodField()
@@ -654,7 +730,7 @@ class TeamSerializer(serializers.ModelSerializer):
         ]
 
     def get_slug(self, obj):
-        return build_team_slug(obj.name)
+        return get_team_slug(obj)
 
 # Country Serializer
 class CountrySerializer(serializers.ModelSerializer):
@@ -726,6 +802,7 @@ class KitSearchSuggestionSerializer(serializers.Serializer):
     label = serializers.CharField(read_only=True)
     url = serializers.CharField(read_only=True)
     preview_image = serializers.CharField(read_only=True, allow_null=True)
+    preview_image_variants = serializers.JSONField(read_only=True)
     has_uploads = serializers.BooleanField(read_only=True)
 
 
@@ -741,6 +818,7 @@ class AdminKitTypeSuggestionSerializer(serializers.ModelSerializer):
     created_by_username = serializers.CharField(source='created_by.username', read_only=True, allow_null=True)
     upload_count = serializers.IntegerField(read_only=True)
     preview_image = serializers.SerializerMethodField()
+    preview_image_variants = serializers.SerializerMethodField()
     museum_url = serializers.SerializerMethodField()
     example_source_userkit_id = serializers.IntegerField(read_only=True, allow_null=True)
 
@@ -762,12 +840,13 @@ class AdminKitTypeSuggestionSerializer(serializers.ModelSerializer):
             'created_at',
             'upload_count',
             'preview_image',
+            'preview_image_variants',
             'museum_url',
             'example_source_userkit_id',
         ]
 
     def get_team_slug(self, obj):
-        return build_team_slug(obj.team.name)
+        return get_team_slug(obj.team)
 
     def get_preview_image(self, obj):
         request = self.context.get('request')
@@ -776,9 +855,15 @@ class AdminKitTypeSuggestionSerializer(serializers.ModelSerializer):
             return None
         return request.build_absolute_uri(preview_image) if request else preview_image
 
+    def get_preview_image_variants(self, obj):
+        return build_absolute_image_variant_urls(
+            getattr(obj, 'preview_image_variants', None),
+            self.context.get('request'),
+        )
+
     def get_museum_url(self, obj):
         query_string = urlencode({'season': obj.season, 'type': obj.kit_type.name})
-        return f"/history/team/{build_team_slug(obj.team.name)}/variants?{query_string}"
+        return f"/history/team/{get_team_slug(obj.team)}/variants?{query_string}"
 
 
 class AdminKitTypeMergeSerializer(serializers.Serializer):
@@ -803,7 +888,7 @@ class SimilarVerifiedTeamSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug', 'logo']
 
     def get_slug(self, obj):
-        return build_team_slug(obj.name)
+        return get_team_slug(obj)
 
 
 class TeamModerationListSerializer(serializers.ModelSerializer):
@@ -816,6 +901,7 @@ class TeamModerationListSerializer(serializers.ModelSerializer):
     league_id = serializers.IntegerField(read_only=True, allow_null=True)
     league_name = serializers.CharField(source='league.name', read_only=True, allow_null=True)
     preview_image = serializers.SerializerMethodField()
+    preview_image_variants = serializers.SerializerMethodField()
     similar_verified_teams = serializers.SerializerMethodField()
     seasons = serializers.SerializerMethodField()
     kits_count = serializers.IntegerField(read_only=True)
@@ -848,13 +934,14 @@ class TeamModerationListSerializer(serializers.ModelSerializer):
             'favorite_team_count',
             'seasons',
             'preview_image',
+            'preview_image_variants',
             'can_reject',
             'reject_block_reason',
             'similar_verified_teams',
         ]
 
     def get_slug(self, obj):
-        return build_team_slug(obj.name)
+        return get_team_slug(obj)
 
     def get_league(self, obj):
         if obj.league_id is None:
@@ -871,6 +958,12 @@ class TeamModerationListSerializer(serializers.ModelSerializer):
             return None
         return request.build_absolute_uri(preview_image) if request else preview_image
 
+    def get_preview_image_variants(self, obj):
+        return build_absolute_image_variant_urls(
+            getattr(obj, 'preview_image_variants', None),
+            self.context.get('request'),
+        )
+
     def get_similar_verified_teams(self, obj):
         serializer = SimilarVerifiedTeamSerializer(
             getattr(obj, 'similar_verified_teams', []),
@@ -1072,7 +1165,7 @@ class CatalogTeamSerializer(serializers.ModelSerializer):
         ]
 
     def get_slug(self, obj):
-        return build_team_slug(obj.name)
+        return get_team_slug(obj)
 
 
 class CatalogTeamWriteSerializer(serializers.ModelSerializer):
@@ -1164,6 +1257,37 @@ class TeamModerationApproveSerializer(serializers.Serializer):
         return attrs
 
 
+class TeamDeletionJobSerializer(serializers.ModelSerializer):
+    team_id = serializers.IntegerField(source='team_id_snapshot', read_only=True)
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TeamDeletionJob
+        fields = [
+            'id',
+            'team_id',
+            'team_name',
+            'status',
+            'reason',
+            'note',
+            'progress',
+            'moderation_action_id',
+            'error',
+            'created_at',
+            'updated_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, obj):
+        # Counts only; the id lists and report snapshots live on the moderation action
+        return {
+            key: value
+            for key, value in obj.summary.items()
+            if isinstance(value, int) and not isinstance(value, bool)
+        }
+
+
 class TeamModerationDeleteContentSerializer(serializers.Serializer):
     REASON_SPAM = 'spam'
     REASON_OFFENSIVE_NAME = 'offensive_name'
@@ -1181,6 +1305,7 @@ class TeamModerationDeleteContentSerializer(serializers.Serializer):
     confirmation = serializers.CharField(allow_blank=True)
     reason = serializers.CharField()
     note = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    chunked = serializers.BooleanField(required=False, default=False)
 
     def validate_confirmation(self, value):
         return (value or '').strip()
@@ -1353,6 +1478,7 @@ class WishlistItemSerializer(serializers.ModelSerializer):
     team_slug = serializers.SerializerMethodField()
     source_userkit_id = serializers.IntegerField(source='source_userkit.id', read_only=True)
     preview_image = serializers.SerializerMethodField()
+    preview_image_variants = serializers.SerializerMethodField()
     has_uploads = serializers.SerializerMethodField()
     owner_username = serializers.CharField(source='user.username', read_only=True)
     url = serializers.SerializerMethodField()
@@ -1376,6 +1502,7 @@ class WishlistItemSerializer(serializers.ModelSerializer):
             'kit_type_canonical_code',
             'source_userkit_id',
             'preview_image',
+            'preview_image_variants',
             'has_uploads',
             'created_at',
             'owner_username',
@@ -1383,7 +1510,7 @@ class WishlistItemSerializer(serializers.ModelSerializer):
         ]
 
     def get_team_slug(self, obj):
-        return build_team_slug(obj.team.name)
+        return get_team_slug(obj.team)
 
     def get_kit_type_slug(self, obj):
         return obj.kit_type_ref.slug if obj.kit_type_ref_id else None
@@ -1396,20 +1523,55 @@ class WishlistItemSerializer(serializers.ModelSerializer):
 
     def get_preview_image(self, obj):
         preview_map = self.context.get('wishlist_preview_map', {})
-        return preview_map.get((obj.team_id, obj.season, obj.kit_type))
+        preview = preview_map.get((obj.team_id, obj.season, obj.kit_type))
+        return preview['url'] if preview else None
+
+    def get_preview_image_variants(self, obj):
+        preview_map = self.context.get('wishlist_preview_map', {})
+        preview = preview_map.get((obj.team_id, obj.season, obj.kit_type))
+        return preview['variants'] if preview else {}
 
     def get_has_uploads(self, obj):
         preview_map = self.context.get('wishlist_preview_map', {})
         return (obj.team_id, obj.season, obj.kit_type) in preview_map
 
     def get_url(self, obj):
-        return f"/history/team/{build_team_slug(obj.team.name)}/variants?{urlencode({'season': obj.season, 'type': obj.kit_type})}"
+        return f"/history/team/{get_team_slug(obj.team)}/variants?{urlencode({'season': obj.season, 'type': obj.kit_type})}"
 
 # UserKit Image Serializer
 class UserKitImageSerializer(serializers.ModelSerializer):
+    variants = serializers.SerializerMethodField()
+
     class Meta:
         model = UserKitImage
-        fields = ['id', 'image', 'created_at']
+        fields = ['id', 'image', 'variants', 'created_at']
+
+    def get_variants(self, obj):
+        return get_image_variant_urls(obj, self.context.get('request'))
+
+def get_userkit_like_map(user, userkit_ids):
+    if not user or not user.is_authenticated or not userkit_ids:
+        return {}
+
+    liked_ids = set(
+        UserKit.likes.through.objects.filter(
+            user_id=user.id,
+            userkit_id__in=userkit_ids,
+        ).values_list('userkit_id', flat=True)
+    )
+    return {userkit_id: userkit_id in liked_ids for userkit_id in userkit_ids}
+
+
+class UserKitListSerializer(serializers.ListSerializer):
+    # Resolve is_liked for the whole page in one query instead of one per kit
+    def to_representation(self, data):
+        userkits = list(data.all() if hasattr(data, 'all') else data)
+        request = self.context.get('request')
+        if request is not None:
+            like_map = self.context.setdefault('userkit_is_liked', {})
+            like_map.update(get_userkit_like_map(request.user, [userkit.id for userkit in userkits]))
+        return super().to_representation(userkits)
+
 
 # UserKit Serializer
 class UserKitSerializer(serializers.ModelSerializer):
@@ -1433,7 +1595,7 @@ class UserKitSerializer(serializers.ModelSerializer):
     shirt_version_valuation_note = serializers.SerializerMethodField()
 
     likes_count = serializers.IntegerField(read_only=True)
-    comments_count = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(read_only=True)
     is_liked = serializers.SerializerMethodField() # To check if the current user liked this UserKit
     valuation_warning = serializers.SerializerMethodField()
     has_private_note = serializers.SerializerMethodField()
@@ -1477,6 +1639,7 @@ class UserKitSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'shirt_technology': {'required': False},
         }
+        list_serializer_class = UserKitListSerializer
     
     # Getting is_owner field
     def get_is_owner(self, obj):
@@ -1489,6 +1652,9 @@ class UserKitSerializer(serializers.ModelSerializer):
     def get_is_liked(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            like_map = self.context.get('userkit_is_liked', {})
+            if obj.id in like_map:
+                return like_map[obj.id]
             return obj.likes.filter(id=request.user.id).exists()
         return False
 
@@ -1496,9 +1662,6 @@ class UserKitSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         return can_view_collection_value(getattr(request, 'user', None), obj.user)
 
-    def get_comments_count(self, obj):
-        return getattr(obj, 'comments_count', obj.comments.count())
-
     def get_valuation_warning(self, obj):
         return obj.get_valuation_warning()
 
@@ -1731,7 +1894,8 @@ class UserKitSerializer(serializers.ModelSerializer):
             images_list = request.FILES.getlist('images')
             if images_list:
                 for image_data in images_list:
-                    UserKitImage.objects.create(user_kit=user_kit, image=image_data)
+                    userkit_image = UserKitImage.objects.create(user_kit=user_kit, image=image_data)
+                    enqueue_job(JOB_PROCESS_USERKIT_IMAGE, {'image_id': userkit_image.id})
 
         return user_kit
     
@@ -1791,6 +1955,7 @@ class UserKitSerializer(serializers.ModelSerializer):
         created_new_images = [] 
         for image in new_images:
             img_obj = UserKitImage.objects.create(user_kit=instance, image=image)
+            enqueue_job(JOB_PROCESS_USERKIT_IMAGE, {'image_id': img_obj.id})
             created_new_images.append(img_obj)
         
         # UPDATING ORDER OF IMAGES
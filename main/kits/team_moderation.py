@@ -1,11 +1,16 @@
 from dataclasses import dataclass
+from decimal import Decimal
 import re
 
+from django.conf import settings
+from django.contrib.auth.models import User
 from django.db import transaction
-from django.db.models import Count, Q
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.exceptions import APIException, ValidationError
 
+from .catalog_cache import CATALOG_TEAM_SEASON_KIT_TYPES, bump_catalog_versions
 from .models import (
     CollectionValueSnapshot,
     Country,
@@ -17,15 +22,21 @@ from .models import (
     Notification,
     Profile,
     Team,
+    TeamDeletionJob,
+    TeamDeletionJobItem,
     TeamModerationAction,
     TeamSeasonKitType,
     UserKit,
     UserKitImage,
     record_collection_value_snapshot,
     WishlistItem,
-    build_team_slug,
+    get_collection_value_contribution,
+    get_team_slug,
     normalize_wishlist_kit_type,
+    refresh_kit_report_summaries_matching,
+    refresh_moderation_stats,
 )
+from .jobs import enqueue_collection_value_snapshot, enqueue_team_deletion, enqueue_userkit_revaluation, heartbeat_running_job
 from .team_season_suggestions import create_team_season_suggestions_from_existing_kits
 
 
@@ -33,6 +44,10 @@ TEAM_MERGE_UNDO_BLOCK_REASON = 'Team merge undo requires manual review.'
 TEAM_REJECT_UNDO_BLOCK_REASON = 'Deleted teams cannot be restored automatically.'
 TEAM_DELETE_CONTENT_UNDO_BLOCK_REASON = 'Destructive team deletion cannot be automatically undone.'
 
+# Rows per UPDATE/DELETE statement while merging teams, so lock time grows with
+# batches rather than with round trips per kit
+TEAM_MERGE_BATCH_SIZE = 500
+
 _PUNCTUATION_PATTERN = re.compile(r'[^a-z0-9\s]+')
 _WHITESPACE_PATTERN = re.compile(r'\s+')
 
@@ -96,41 +111,32 @@ def team_name_tokens(name):
     }
 
 
-def get_team_usage(team):
-    usage = Team.objects.filter(pk=team.pk).annotate(
-        kits_count=Count('kits', distinct=True),
-        orphan_kits_count=Count('kits', filter=Q(kits__owned_by__isnull=True), distinct=True),
-        userkits_count=Count('kits__owned_by', distinct=True),
-        wishlist_count=Count('wishlist_items', distinct=True),
-        favorite_team_count=Count('fans', distinct=True),
-        team_season_count=Count('season_kit_types', distinct=True),
-        approved_team_season_count=Count(
-            'season_kit_types',
-            filter=Q(season_kit_types__status=TeamSeasonKitType.STATUS_APPROVED),
-            distinct=True,
-        ),
-        pending_team_season_count=Count(
-            'season_kit_types',
-            filter=Q(season_kit_types__status=TeamSeasonKitType.STATUS_PENDING),
-            distinct=True,
-        ),
-        rejected_team_season_count=Count(
-            'season_kit_types',
-            filter=Q(season_kit_types__status=TeamSeasonKitType.STATUS_REJECTED),
-            distinct=True,
-        ),
-    ).values(
-        'kits_count',
-        'orphan_kits_count',
-        'userkits_count',
-        'wishlist_count',
-        'favorite_team_count',
-        'team_season_count',
-        'approved_team_season_count',
-        'pending_team_season_count',
-        'rejected_team_season_count',
-    ).first()
-
+TEAM_USAGE_ANNOTATIONS = {
+    'kits_count': Count('kits', distinct=True),
+    'orphan_kits_count': Count('kits', filter=Q(kits__owned_by__isnull=True), distinct=True),
+    'userkits_count': Count('kits__owned_by', distinct=True),
+    'wishlist_count': Count('wishlist_items', distinct=True),
+    'favorite_team_count': Count('fans', distinct=True),
+    'team_season_count': Count('season_kit_types', distinct=True),
+    'approved_team_season_count': Count(
+        'season_kit_types',
+        filter=Q(season_kit_types__status=TeamSeasonKitType.STATUS_APPROVED),
+        distinct=True,
+    ),
+    'pending_team_season_count': Count(
+        'season_kit_types',
+        filter=Q(season_kit_types__status=TeamSeasonKitType.STATUS_PENDING),
+        distinct=True,
+    ),
+    'rejected_team_season_count': Count(
+        'season_kit_types',
+        filter=Q(season_kit_types__status=TeamSeasonKitType.STATUS_REJECTED),
+        distinct=True,
+    ),
+}
+
+
+def build_team_usage(usage):
     if usage is None:
         return TeamUsage(0, 0, 0, 0, 0, 0, 0, 0, 0)
 
@@ -147,6 +153,25 @@ def get_team_usage(team):
     )
 
 
+def get_team_usage(team):
+    usage = Team.objects.filter(pk=team.pk).annotate(
+        **TEAM_USAGE_ANNOTATIONS,
+    ).values(*TEAM_USAGE_ANNOTATIONS).first()
+    return build_team_usage(usage)
+
+
+def get_team_usage_map(teams):
+    team_ids = [team.id for team in teams]
+    if not team_ids:
+        return {}
+
+    rows = Team.objects.filter(pk__in=team_ids).annotate(
+        **TEAM_USAGE_ANNOTATIONS,
+    ).values('id', *TEAM_USAGE_ANNOTATIONS)
+    usage_map = {row['id']: build_team_usage(row) for row in rows}
+    return {team_id: usage_map.get(team_id, build_team_usage(None)) for team_id in team_ids}
+
+
 def build_team_reject_block_reason(usage):
     if usage.userkits:
         return (
@@ -226,7 +251,7 @@ def snapshot_team(team):
     return {
         'id': team.id,
         'name': team.name,
-        'slug': build_team_slug(team.name),
+        'slug': get_team_slug(team),
         'is_verified': team.is_verified,
         'country_id': team.country_id,
         'country_name': team.country.name if team.country_id else None,
@@ -284,10 +309,11 @@ def get_kit_duplicate_key(kit):
 
 
 def merge_kit_metadata(source_kit, target_kit):
+    # Fills gaps on target_kit in memory; returns the changed fields for a bulk_update
     update_fields = []
 
     if target_kit.kit_type_ref_id is None and source_kit.kit_type_ref_id is not None:
-        target_kit.kit_type_ref = source_kit.kit_type_ref
+        target_kit.kit_type_ref_id = source_kit.kit_type_ref_id
         target_kit.kit_type = source_kit.kit_type_ref.name
         update_fields.extend(['kit_type_ref', 'kit_type'])
 
@@ -299,64 +325,128 @@ def merge_kit_metadata(source_kit, target_kit):
         target_kit.main_image = source_kit.main_image
         update_fields.append('main_image')
 
-    if update_fields:
-        target_kit.save(update_fields=update_fields)
+    return update_fields
 
 
-def reconcile_wishlist_items(source_team, target_team):
-    moved_wishlist_items = 0
-    deduplicated_wishlist_items = 0
+def _chunks(values, size=TEAM_MERGE_BATCH_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _move_rows_to_team(model, row_ids, team):
+    for chunk in _chunks(row_ids):
+        model.objects.filter(pk__in=chunk).update(team=team)
 
-    target_items = list(
-        WishlistItem.objects.select_for_update().filter(team=target_team).order_by('id')
+
+def _delete_rows(model, row_ids):
+    for chunk in _chunks(row_ids):
+        model.objects.filter(pk__in=chunk).delete()
+
+
+def _bulk_update_changed(model, rows_with_fields):
+    # rows_with_fields maps row -> changed fields; one UPDATE per batch covering their union
+    fields = list(dict.fromkeys(
+        field
+        for update_fields in rows_with_fields.values()
+        for field in update_fields
+    ))
+    if fields:
+        model.objects.bulk_update(list(rows_with_fields), fields, batch_size=TEAM_MERGE_BATCH_SIZE)
+
+
+def merge_team_kits(source_team, target_team):
+    target_lookup = {
+        get_kit_duplicate_key(kit): kit
+        for kit in Kit.objects.select_for_update().filter(team=target_team).order_by('id')
+    }
+    source_kits = list(
+        Kit.objects.select_for_update().select_related('kit_type_ref').filter(team=source_team).order_by('id')
     )
+
+    moved_kit_ids = []
+    duplicate_kit_targets = {}
+    changed_kits = {}
+    for source_kit in source_kits:
+        key = get_kit_duplicate_key(source_kit)
+        canonical_target_kit = target_lookup.get(key)
+
+        if canonical_target_kit is None:
+            target_lookup[key] = source_kit
+            moved_kit_ids.append(source_kit.id)
+            continue
+
+        update_fields = merge_kit_metadata(source_kit, canonical_target_kit)
+        if update_fields:
+            changed_kits.setdefault(canonical_target_kit, []).extend(update_fields)
+        duplicate_kit_targets[source_kit.id] = canonical_target_kit.id
+
+    _move_rows_to_team(Kit, moved_kit_ids, target_team)
+    _bulk_update_changed(Kit, changed_kits)
+    repriced_kit_ids = [kit.id for kit, update_fields in changed_kits.items() if 'estimated_price' in update_fields]
+    if repriced_kit_ids:
+        # bulk_update skips the post_save repricing signal; run it before uploads move over
+        enqueue_userkit_revaluation(kit_ids=repriced_kit_ids)
+
+    moved_userkits = 0
+    for chunk in _chunks(duplicate_kit_targets.items()):
+        moved_userkits += UserKit.objects.filter(kit_id__in=[source_kit_id for source_kit_id, _target_kit_id in chunk]).update(
+            kit_id=Case(
+                *[When(kit_id=source_kit_id, then=Value(target_kit_id)) for source_kit_id, target_kit_id in chunk],
+                output_field=IntegerField(),
+            ),
+        )
+    _delete_rows(Kit, duplicate_kit_targets)
+    # The queryset updates skip the Kit post_save signal, so reported uploads are reindexed here
+    refresh_kit_report_summaries_matching(Q(userkit__kit__team=target_team))
+
+    return len(moved_kit_ids), len(duplicate_kit_targets), moved_userkits
+
+
+def reconcile_wishlist_items(source_team, target_team):
     target_lookup = {
         (item.user_id, item.season, item.kit_type): item
-        for item in target_items
+        for item in WishlistItem.objects.select_for_update().filter(team=target_team).order_by('id')
     }
-
     source_items = list(
         WishlistItem.objects.select_for_update().filter(team=source_team).order_by('id')
     )
+
+    moved_item_ids = []
+    duplicate_item_ids = []
+    changed_items = {}
     for item in source_items:
         key = (item.user_id, item.season, item.kit_type)
         duplicate = target_lookup.get(key)
 
         if duplicate is None:
-            item.team = target_team
-            item.save(update_fields=['team'])
             target_lookup[key] = item
-            moved_wishlist_items += 1
+            moved_item_ids.append(item.id)
             continue
 
         duplicate_update_fields = []
         if duplicate.kit_type_ref_id is None and item.kit_type_ref_id is not None:
-            duplicate.kit_type_ref = item.kit_type_ref
+            duplicate.kit_type_ref_id = item.kit_type_ref_id
             duplicate_update_fields.append('kit_type_ref')
         if duplicate.source_userkit_id is None and item.source_userkit_id is not None:
-            duplicate.source_userkit = item.source_userkit
+            duplicate.source_userkit_id = item.source_userkit_id
             duplicate_update_fields.append('source_userkit')
         if duplicate_update_fields:
-            duplicate.save(update_fields=duplicate_update_fields)
+            changed_items.setdefault(duplicate, []).extend(duplicate_update_fields)
+        duplicate_item_ids.append(item.id)
 
-        item.delete()
-        deduplicated_wishlist_items += 1
+    _delete_rows(WishlistItem, duplicate_item_ids)
+    _bulk_update_changed(WishlistItem, changed_items)
+    _move_rows_to_team(WishlistItem, moved_item_ids, target_team)
 
-    return moved_wishlist_items, deduplicated_wishlist_items
+    return len(moved_item_ids), len(duplicate_item_ids)
 
 
 def reconcile_team_season_rows(source_team, target_team):
-    moved_team_season_types = 0
-    reconciled_team_season_types = 0
-
-    target_rows = list(
-        TeamSeasonKitType.objects.select_for_update().filter(team=target_team).order_by('id')
-    )
     target_lookup = {
         (row.season, row.kit_type_id): row
-        for row in target_rows
+        for row in TeamSeasonKitType.objects.select_for_update().filter(team=target_team).order_by('id')
     }
-
     source_rows = list(
         TeamSeasonKitType.objects.select_for_update().filter(team=source_team).order_by('id')
     )
@@ -366,33 +456,34 @@ def reconcile_team_season_rows(source_team, target_team):
         TeamSeasonKitType.SOURCE_UPLOAD: 1,
     }
 
+    moved_row_ids = []
+    duplicate_row_ids = []
+    changed_rows = {}
     for row in source_rows:
         key = (row.season, row.kit_type_id)
         duplicate = target_lookup.get(key)
 
         if duplicate is None:
-            row.team = target_team
-            row.save(update_fields=['team'])
             target_lookup[key] = row
-            moved_team_season_types += 1
+            moved_row_ids.append(row.id)
             continue
 
         update_fields = []
         if row.status == TeamSeasonKitType.STATUS_APPROVED and duplicate.status != TeamSeasonKitType.STATUS_APPROVED:
             duplicate.status = TeamSeasonKitType.STATUS_APPROVED
-            duplicate.approved_by = row.approved_by
+            duplicate.approved_by_id = row.approved_by_id
             duplicate.approved_at = row.approved_at
             update_fields.extend(['status', 'approved_by', 'approved_at'])
         elif duplicate.status == TeamSeasonKitType.STATUS_APPROVED and row.status == TeamSeasonKitType.STATUS_APPROVED:
             if duplicate.approved_by_id is None and row.approved_by_id is not None:
-                duplicate.approved_by = row.approved_by
+                duplicate.approved_by_id = row.approved_by_id
                 update_fields.append('approved_by')
             if duplicate.approved_at is None and row.approved_at is not None:
                 duplicate.approved_at = row.approved_at
                 update_fields.append('approved_at')
 
         if duplicate.created_by_id is None and row.created_by_id is not None:
-            duplicate.created_by = row.created_by
+            duplicate.created_by_id = row.created_by_id
             update_fields.append('created_by')
 
         if source_priority.get(row.source, 0) > source_priority.get(duplicate.source, 0):
@@ -400,12 +491,14 @@ def reconcile_team_season_rows(source_team, target_team):
             update_fields.append('source')
 
         if update_fields:
-            duplicate.save(update_fields=list(dict.fromkeys(update_fields)))
+            changed_rows.setdefault(duplicate, []).extend(update_fields)
+        duplicate_row_ids.append(row.id)
 
-        row.delete()
-        reconciled_team_season_types += 1
+    _delete_rows(TeamSeasonKitType, duplicate_row_ids)
+    _bulk_update_changed(TeamSeasonKitType, changed_rows)
+    _move_rows_to_team(TeamSeasonKitType, moved_row_ids, target_team)
 
-    return moved_team_season_types, reconciled_team_season_types
+    return len(moved_row_ids), len(duplicate_row_ids)
 
 
 def validate_team_merge(source_team, target_team):
@@ -495,37 +588,7 @@ def merge_teams_safely(*, source_team_id, target_team_id, actor):
             'target_team': snapshot_team(target_team),
         }
 
-        moved_kits = 0
-        merged_duplicate_kits = 0
-        moved_userkits = 0
-
-        target_kits = list(
-            Kit.objects.select_for_update().filter(team=target_team).order_by('id')
-        )
-        target_lookup = {
-            get_kit_duplicate_key(kit): kit
-            for kit in target_kits
-        }
-
-        source_kits = list(
-            Kit.objects.select_for_update().filter(team=source_team).order_by('id')
-        )
-        for source_kit in source_kits:
-            key = get_kit_duplicate_key(source_kit)
-            canonical_target_kit = target_lookup.get(key)
-
-            if canonical_target_kit is None:
-                source_kit.team = target_team
-                source_kit.save(update_fields=['team'])
-                target_lookup[key] = source_kit
-                moved_kits += 1
-                continue
-
-            merge_kit_metadata(source_kit, canonical_target_kit)
-            moved_userkits += UserKit.objects.filter(kit=source_kit).update(kit=canonical_target_kit)
-            source_kit.delete()
-            merged_duplicate_kits += 1
-
+        moved_kits, merged_duplicate_kits, moved_userkits = merge_team_kits(source_team, target_team)
         moved_wishlist_items, deduplicated_wishlist_items = reconcile_wishlist_items(
             source_team,
             target_team,
@@ -537,6 +600,10 @@ def merge_teams_safely(*, source_team_id, target_team_id, actor):
             source_team,
             target_team,
         )
+        if moved_team_season_types or reconciled_team_season_types:
+            # Rows are moved with queryset writes, which skip the catalog cache and counter receivers
+            bump_catalog_versions(CATALOG_TEAM_SEASON_KIT_TYPES)
+            refresh_moderation_stats('kit_type_suggestions_pending')
         suggestion_summary = create_team_season_suggestions_from_existing_kits(target_team)
 
         source_team_snapshot = snapshot_team(source_team)
@@ -621,22 +688,41 @@ def reject_unused_team(*, team_id, actor):
         return source_team_snapshot, action
 
 
+def validate_team_deletion(team, confirmation):
+    if team.is_verified:
+        raise TeamModerationConflict({
+            'detail': 'Verified teams cannot be deleted through this moderation flow.',
+            'code': 'verified_team_delete_forbidden',
+        })
+
+    expected_confirmation = (team.name or '').strip()
+    if (confirmation or '').strip() != expected_confirmation:
+        raise ValidationError({
+            'detail': 'Confirmation must exactly match the current team name.',
+            'code': 'delete_confirmation_required',
+        })
+
+
+def snapshot_kit_report(report):
+    return {
+        'id': report.id,
+        'kit_id': report.kit_id,
+        'reporter_id': report.reporter_id,
+        'reporter_username': report.reporter.username,
+        'reason': report.reason,
+        'description': report.description,
+        'status': report.status,
+        'resolved_by_id': report.resolved_by_id,
+        'resolved_by_username': report.resolved_by.username if report.resolved_by_id else None,
+        'resolution_note': report.resolution_note,
+    }
+
+
 def delete_team_and_associated_content(*, team_id, actor, confirmation, reason, note=''):
     with transaction.atomic():
         team = Team.objects.select_for_update().select_related('country', 'league').get(pk=team_id)
 
-        if team.is_verified:
-            raise TeamModerationConflict({
-                'detail': 'Verified teams cannot be deleted through this moderation flow.',
-                'code': 'verified_team_delete_forbidden',
-            })
-
-        expected_confirmation = (team.name or '').strip()
-        if (confirmation or '').strip() != expected_confirmation:
-            raise ValidationError({
-                'detail': 'Confirmation must exactly match the current team name.',
-                'code': 'delete_confirmation_required',
-            })
+        validate_team_deletion(team, confirmation)
 
         previous_state = {
             'source_team': snapshot_team(team),
@@ -654,6 +740,12 @@ def delete_team_and_associated_content(*, team_id, actor, confirmation, reason,
             for userkit in userkits
         }
         affected_usernames = sorted({user.username for user in affected_users.values()})
+        removed_values = {user_id: Decimal('0.00') for user_id in affected_user_ids}
+        removed_counts = {user_id: 0 for user_id in affected_user_ids}
+        for userkit in userkits:
+            value, count = get_collection_value_contribution(userkit)
+            removed_values[userkit.user_id] += value
+            removed_counts[userkit.user_id] += count
 
         comments = list(
             KitComment.objects.select_for_update().filter(kit_id__in=userkit_ids).select_related('user').order_by('id')
@@ -662,21 +754,7 @@ def delete_team_and_associated_content(*, team_id, actor, confirmation, reason,
         reports = list(
             KitReport.objects.select_for_update().filter(kit_id__in=userkit_ids).select_related('reporter', 'resolved_by').order_by('id')
         )
-        report_snapshots = [
-            {
-                'id': report.id,
-                'kit_id': report.kit_id,
-                'reporter_id': report.reporter_id,
-                'reporter_username': report.reporter.username,
-                'reason': report.reason,
-                'description': report.description,
-                'status': report.status,
-                'resolved_by_id': report.resolved_by_id,
-                'resolved_by_username': report.resolved_by.username if report.resolved_by_id else None,
-                'resolution_note': report.resolution_note,
-            }
-            for report in reports
-        ]
+        report_snapshots = [snapshot_kit_report(report) for report in reports]
 
         deleted_wishlist_items = WishlistItem.objects.select_for_update().filter(team=team).count()
         cleared_favorite_profiles = Profile.objects.select_for_update().filter(favorite_team=team).count()
@@ -688,7 +766,7 @@ def delete_team_and_associated_content(*, team_id, actor, confirmation, reason,
         deleted_notifications = Notification.objects.filter(
             Q(kit_id__in=userkit_ids) | Q(comment_id__in=comment_ids)
         ).distinct().count()
-        deleted_kit_likes = sum(userkit.likes.count() for userkit in userkits)
+        deleted_kit_likes = UserKit.likes.through.objects.filter(userkit_id__in=userkit_ids).count()
         deleted_userkits = len(userkits)
         deleted_kits = len(kits)
 
@@ -713,6 +791,8 @@ def delete_team_and_associated_content(*, team_id, actor, confirmation, reason,
             record_collection_value_snapshot(
                 user=affected_users[user_id],
                 reason=CollectionValueSnapshot.REASON_KIT_REMOVED,
+                value_delta=-removed_values[user_id],
+                count_delta=-removed_counts[user_id],
             )
 
         source_team_snapshot = previous_state['source_team']
@@ -752,3 +832,225 @@ def delete_team_and_associated_content(*, team_id, actor, confirmation, reason,
         )
 
         return source_team_snapshot, action, summary
+
+
+def build_team_deletion_progress():
+    return {
+        'deleted_kits': 0,
+        'deleted_userkits': 0,
+        'deleted_images': 0,
+        'deleted_comments': 0,
+        'deleted_comment_likes': 0,
+        'deleted_kit_likes': 0,
+        'deleted_reports': 0,
+        'deleted_notifications': 0,
+    }
+
+
+def record_team_deletion_items(deletion_job, kind, object_ids, payloads=None):
+    payloads = payloads or {}
+    TeamDeletionJobItem.objects.bulk_create([
+        TeamDeletionJobItem(
+            deletion_job=deletion_job,
+            kind=kind,
+            object_id=object_id,
+            payload=payloads.get(object_id, {}),
+        )
+        for object_id in object_ids
+    ], ignore_conflicts=True)
+
+
+def collect_team_deletion_items(deletion_job):
+    items = {kind: [] for kind, _label in TeamDeletionJobItem.KIND_CHOICES}
+    for kind, object_id, payload in deletion_job.items.order_by('kind', 'object_id').values_list(
+        'kind',
+        'object_id',
+        'payload',
+    ):
+        items[kind].append(payload if kind == TeamDeletionJobItem.KIND_REPORT else object_id)
+    return items
+
+
+def start_chunked_team_deletion(*, team_id, actor, confirmation, reason, note=''):
+    with transaction.atomic():
+        team = Team.objects.select_for_update().select_related('country', 'league').get(pk=team_id)
+        validate_team_deletion(team, confirmation)
+
+        active_job = TeamDeletionJob.objects.filter(
+            team=team,
+            status__in=TeamDeletionJob.ACTIVE_STATUSES,
+        ).first()
+        if active_job is not None:
+            raise TeamModerationConflict({
+                'detail': 'This team is already being deleted.',
+                'code': 'team_deletion_in_progress',
+                'deletion_job_id': active_job.id,
+            })
+
+        deletion_job = TeamDeletionJob.objects.create(
+            team=team,
+            team_id_snapshot=team.id,
+            team_name=team.name,
+            actor=actor,
+            reason=reason,
+            note=note or '',
+            previous_state={'source_team': snapshot_team(team)},
+            summary=build_team_deletion_progress(),
+        )
+
+    # Outside the transaction so each batch commits on its own when run eagerly
+    enqueue_team_deletion(deletion_job)
+    deletion_job.refresh_from_db()
+    return deletion_job
+
+
+def run_team_deletion(deletion_job_id, *, batch_size=None):
+    """Delete a team's content in short transactions, resuming from the saved cursors."""
+    batch_size = batch_size or getattr(settings, 'TEAM_DELETION_BATCH_SIZE', 200)
+    deletion_job = TeamDeletionJob.objects.filter(pk=deletion_job_id).first()
+    if deletion_job is None or deletion_job.status not in TeamDeletionJob.ACTIVE_STATUSES:
+        return None
+
+    TeamDeletionJob.objects.filter(pk=deletion_job.pk).update(status=TeamDeletionJob.STATUS_RUNNING)
+    try:
+        while True:
+            heartbeat_running_job()
+            if delete_team_userkit_batch(deletion_job.pk, batch_size):
+                continue
+            if delete_team_kit_batch(deletion_job.pk, batch_size):
+                continue
+            # Uploads added to the team while deleting send us back to the batches
+            if finish_team_deletion(deletion_job.pk):
+                break
+    except Exception as exc:
+        # Committed batches stay deleted; the job stays running so a retry resumes it
+        TeamDeletionJob.objects.filter(pk=deletion_job.pk).update(error=str(exc) or exc.__class__.__name__)
+        raise
+
+    deletion_job.refresh_from_db()
+    for user in User.objects.filter(pk__in=deletion_job.summary['affected_user_ids']).order_by('id'):
+        # No delta: other snapshots may have been recorded between batches
+        enqueue_collection_value_snapshot(user, CollectionValueSnapshot.REASON_KIT_REMOVED)
+    return deletion_job
+
+
+def delete_team_userkit_batch(deletion_job_id, batch_size):
+    with transaction.atomic():
+        deletion_job = TeamDeletionJob.objects.select_for_update().get(pk=deletion_job_id)
+        batch = list(
+            UserKit.objects.select_for_update().filter(
+                kit__team_id=deletion_job.team_id_snapshot,
+                id__gt=deletion_job.last_userkit_id,
+            ).order_by('id').values_list('id', 'user_id')[:batch_size]
+        )
+        if not batch:
+            return False
+
+        userkit_ids = [userkit_id for userkit_id, _user_id in batch]
+        comment_ids = list(KitComment.objects.filter(kit_id__in=userkit_ids).values_list('id', flat=True))
+        reports = KitReport.objects.filter(kit_id__in=userkit_ids).select_related('reporter', 'resolved_by').order_by('id')
+
+        progress = deletion_job.summary
+        progress['deleted_images'] += UserKitImage.objects.filter(user_kit_id__in=userkit_ids).count()
+        progress['deleted_comments'] += len(comment_ids)
+        progress['deleted_comment_likes'] += KitCommentLike.objects.filter(comment_id__in=comment_ids).count()
+        progress['deleted_kit_likes'] += UserKit.likes.through.objects.filter(userkit_id__in=userkit_ids).count()
+        progress['deleted_notifications'] += Notification.objects.filter(
+            Q(kit_id__in=userkit_ids) | Q(comment_id__in=comment_ids)
+        ).count()
+        report_snapshots = {report.id: snapshot_kit_report(report) for report in reports}
+        progress['deleted_reports'] += len(report_snapshots)
+        progress['deleted_userkits'] += len(userkit_ids)
+        record_team_deletion_items(deletion_job, TeamDeletionJobItem.KIND_USERKIT, userkit_ids)
+        record_team_deletion_items(deletion_job, TeamDeletionJobItem.KIND_REPORT, report_snapshots, report_snapshots)
+        record_team_deletion_items(
+            deletion_job,
+            TeamDeletionJobItem.KIND_AFFECTED_USER,
+            {user_id for _userkit_id, user_id in batch},
+        )
+
+        UserKit.objects.filter(pk__in=userkit_ids).delete()
+        deletion_job.last_userkit_id = userkit_ids[-1]
+        deletion_job.save(update_fields=['summary', 'last_userkit_id', 'updated_at'])
+        return True
+
+
+def delete_team_kit_batch(deletion_job_id, batch_size):
+    with transaction.atomic():
+        deletion_job = TeamDeletionJob.objects.select_for_update().get(pk=deletion_job_id)
+        kit_ids = list(
+            Kit.objects.select_for_update().filter(
+                team_id=deletion_job.team_id_snapshot,
+                id__gt=deletion_job.last_kit_id,
+                owned_by__isnull=True,
+            ).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not kit_ids:
+            return False
+
+        Kit.objects.filter(pk__in=kit_ids).delete()
+        record_team_deletion_items(deletion_job, TeamDeletionJobItem.KIND_KIT, kit_ids)
+        deletion_job.summary['deleted_kits'] += len(kit_ids)
+        deletion_job.last_kit_id = kit_ids[-1]
+        deletion_job.save(update_fields=['summary', 'last_kit_id', 'updated_at'])
+        return True
+
+
+def finish_team_deletion(deletion_job_id):
+    with transaction.atomic():
+        deletion_job = TeamDeletionJob.objects.select_for_update().get(pk=deletion_job_id)
+        team = Team.objects.select_for_update().filter(pk=deletion_job.team_id_snapshot).first()
+        if team is not None and Kit.objects.filter(team=team).exists():
+            # A kit skipped while it had an upload sits below the cursor, so rescan from the start
+            deletion_job.last_userkit_id = 0
+            deletion_job.last_kit_id = 0
+            deletion_job.save(update_fields=['last_userkit_id', 'last_kit_id', 'updated_at'])
+            return False
+
+        items = collect_team_deletion_items(deletion_job)
+        summary = deletion_job.summary
+        summary['affected_user_ids'] = items[TeamDeletionJobItem.KIND_AFFECTED_USER]
+        summary['deleted_userkit_ids'] = items[TeamDeletionJobItem.KIND_USERKIT]
+        summary['deleted_kit_ids'] = items[TeamDeletionJobItem.KIND_KIT]
+        summary['report_snapshots'] = items[TeamDeletionJobItem.KIND_REPORT]
+        summary['deleted_wishlist_items'] = 0
+        summary['cleared_favorite_profiles'] = 0
+        summary['deleted_team_season_types'] = 0
+        if team is not None:
+            summary['deleted_wishlist_items'] = WishlistItem.objects.filter(team=team).count()
+            summary['deleted_team_season_types'] = TeamSeasonKitType.objects.filter(team=team).count()
+            WishlistItem.objects.filter(team=team).delete()
+            summary['cleared_favorite_profiles'] = Profile.objects.filter(favorite_team=team).update(favorite_team=None)
+            TeamSeasonKitType.objects.filter(team=team).delete()
+            team.delete()
+
+        summary.update({
+            'deleted': True,
+            'reason': deletion_job.reason,
+            'note': deletion_job.note,
+            'affected_users': len(summary['affected_user_ids']),
+            'affected_usernames': sorted(
+                User.objects.filter(pk__in=summary['affected_user_ids']).values_list('username', flat=True)
+            ),
+            'collection_snapshot_reason': CollectionValueSnapshot.REASON_KIT_REMOVED,
+            'deletion_job_id': deletion_job.id,
+        })
+
+        action = build_team_moderation_action(
+            actor=deletion_job.actor,
+            action_type=TeamModerationAction.ACTION_DELETE_CONTENT,
+            source_team=Team(id=deletion_job.team_id_snapshot, name=deletion_job.team_name),
+            previous_state=deletion_job.previous_state,
+            resulting_state={'deleted': True},
+            summary=summary,
+            is_reversible=False,
+            undo_block_reason=TEAM_DELETE_CONTENT_UNDO_BLOCK_REASON,
+        )
+
+        deletion_job.status = TeamDeletionJob.STATUS_SUCCEEDED
+        deletion_job.moderation_action = action
+        deletion_job.finished_at = timezone.now()
+        deletion_job.error = ''
+        deletion_job.save(update_fields=['summary', 'status', 'moderation_action', 'finished_at', 'error', 'updated_at'])
+        deletion_job.items.all().delete()
+        return True
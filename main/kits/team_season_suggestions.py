@@ -80,10 +80,18 @@ def create_team_season_suggestions_from_existing_kits(team):
     created = 0
     reused = 0
     seen_keys = set()
+    # Legacy kits are resolved by name, so look each distinct name up once
+    resolved_legacy_kit_types = {}
 
     kits = Kit.objects.select_related('kit_type_ref').filter(team=team).order_by('id')
     for kit in kits:
-        resolved_kit_type = resolve_kit_type_for_existing_kit(kit)
+        if kit.kit_type_ref_id is not None:
+            resolved_kit_type = kit.kit_type_ref
+        else:
+            legacy_name = normalize_catalog_name(kit.kit_type)
+            if legacy_name not in resolved_legacy_kit_types:
+                resolved_legacy_kit_types[legacy_name] = resolve_kit_type_for_existing_kit(kit)
+            resolved_kit_type = resolved_legacy_kit_types[legacy_name]
         if not kit_type_requires_team_season_suggestion(resolved_kit_type):
             continue
 
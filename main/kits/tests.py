@@ -1,24 +1,43 @@
 import csv
+import os
+import tempfile
 from decimal import Decimal
 from datetime import datetime, timedelta
 from importlib import import_module
 from io import BytesIO, StringIO
 import xml.etree.ElementTree as ET
 from urllib.parse import urlencode
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 from zipfile import ZipFile
 
+from PIL import Image
+
+from asgiref.sync import async_to_sync
 from django.apps import apps as django_apps
 from django.contrib.auth.models import User
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.db import IntegrityError, transaction
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APIClient, APITestCase
-
-from .models import Country, League, Kit, KitType, KitTypeAlias, TeamSeasonKitType, KitTypeModerationAction, TeamModerationAction, ShirtVersion, Team, UserKit, UserKitImage, WishlistItem, KitComment, KitCommentLike, KitReport, KitReportModerationAction, Conversation, Message, Follow, Notification, CollectionValueSnapshot, AUTOMATED_VALUATION_UNAVAILABLE_MESSAGE, TECHNOLOGIE_MULTIPLIERS, calculate_collection_total_value
-from .views import _sanitize_export_filename_username
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import BackgroundJob, CollectionExportJob, CollectionValueRollup, Country, League, Kit, KitRanking, KitType, TeamSearchTrigram, KitTypeAlias, TeamSeasonKitType, KitTypeModerationAction, TeamModerationAction, TeamDeletionJob, TeamDeletionJobItem, ShirtVersion, Team, UserKit, UserKitImage, WishlistItem, KitComment, KitCommentLike, KitReport, KitReportModerationAction, KitReportSummary, ModerationStats, Conversation, Message, Follow, Notification, ConversationUnreadCounter, UserUnreadCounter, FollowingFeedEntry, CollectionValueSnapshot, Profile, AUTOMATED_VALUATION_UNAVAILABLE_MESSAGE, TECHNOLOGIE_MULTIPLIERS, calculate_collection_total_value, collection_value_history_is_stale, generate_unique_team_slug, get_actual_moderation_stats, get_unread_counts, rebuild_collection_value_history, record_collection_value_snapshot, revalue_userkits
+from . import jobs, team_moderation
+from .catalog_cache import CATALOG_TEAM_SEASON_KIT_TYPES, get_catalog_versions
+from .image_variants import generate_image_variants, strip_image_metadata
+from .management.commands.benchmark_team_merge import seed_team_merge_benchmark
+from .query_budget import QUERY_BUDGETS, QueryBudgetTestMixin, record_queries
+from .realtime import InProcessUnreadEventBroker, stream_unread_events
+from .team_moderation import merge_teams_safely
+from .views import _sanitize_export_filename_username, unread_counts_stream
 from .serializers import KitSerializer, TeamSerializer, UserKitSerializer, WishlistItemSerializer
 
 
@@ -1053,6 +1072,107 @@ class AdminKitTypeModerationAPITests(APITestCase):
 
         self.assertEqual(response.status_code, 403)
 
+    def test_bulk_approve_records_states_as_if_approved_one_by_one(self):
+        sibling = TeamSeasonKitType.objects.create(
+            team=self.team,
+            season='2023/2024',
+            kit_type=self.pending_type,
+            status=TeamSeasonKitType.STATUS_PENDING,
+            source=TeamSeasonKitType.SOURCE_UPLOAD,
+            created_by=self.creator,
+        )
+        self.client.force_authenticate(user=self.moderator_user)
+
+        response = self.client.post(
+            reverse('admin-team-season-kit-type-bulk-approve'),
+            {'ids': [sibling.id, self.pending_suggestion.id, 999999]},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['ids'], [self.pending_suggestion.id, sibling.id])
+        self.assertEqual(response.data['skipped_ids'], [999999])
+        self.assertEqual(response.data['approved_kit_type_ids'], [self.pending_type.id])
+        self.pending_type.refresh_from_db()
+        self.assertEqual(self.pending_type.status, KitType.STATUS_APPROVED)
+        self.assertEqual(
+            set(TeamSeasonKitType.objects.filter(pk__in=[sibling.id, self.pending_suggestion.id]).values_list('status', flat=True)),
+            {TeamSeasonKitType.STATUS_APPROVED},
+        )
+        first_action_id, second_action_id = response.data['moderation_action_ids']
+        first_action = KitTypeModerationAction.objects.get(pk=first_action_id)
+        second_action = KitTypeModerationAction.objects.get(pk=second_action_id)
+        self.assertEqual(first_action.previous_state['source_kit_type']['status'], KitType.STATUS_PENDING)
+        self.assertEqual(second_action.previous_state['source_kit_type']['status'], KitType.STATUS_APPROVED)
+
+        undo_response = self.undo_action(second_action_id, user=self.moderator_user)
+
+        self.assertEqual(undo_response.status_code, 200)
+        sibling.refresh_from_db()
+        self.assertEqual(sibling.status, TeamSeasonKitType.STATUS_PENDING)
+
+    def test_bulk_approve_invalidates_the_cached_approved_kit_types(self):
+        cache.clear()
+        url = reverse('approved-team-season-kit-types', args=[self.team.id])
+        self.assertEqual(self.client.get(url).data, [])
+
+        self.client.force_authenticate(user=self.moderator_user)
+        response = self.client.post(
+            reverse('admin-team-season-kit-type-bulk-approve'),
+            {'ids': [self.pending_suggestion.id]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+        approved = self.client.get(url).data
+        self.assertEqual([row['id'] for row in approved], [self.pending_suggestion.id])
+
+    def test_bulk_reject_skips_suggestions_that_are_no_longer_pending(self):
+        self.approve()
+        other_suggestion = TeamSeasonKitType.objects.create(
+            team=self.team,
+            season='2023/2024',
+            kit_type=self.home_type,
+            status=TeamSeasonKitType.STATUS_PENDING,
+            source=TeamSeasonKitType.SOURCE_UPLOAD,
+            created_by=self.creator,
+        )
+        self.client.force_authenticate(user=self.staff_user)
+
+        response = self.client.post(
+            reverse('admin-team-season-kit-type-bulk-reject'),
+            {'ids': [self.pending_suggestion.id, other_suggestion.id]},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['ids'], [other_suggestion.id])
+        self.assertEqual(response.data['skipped_ids'], [self.pending_suggestion.id])
+        self.pending_suggestion.refresh_from_db()
+        other_suggestion.refresh_from_db()
+        self.assertEqual(self.pending_suggestion.status, TeamSeasonKitType.STATUS_APPROVED)
+        self.assertEqual(other_suggestion.status, TeamSeasonKitType.STATUS_REJECTED)
+        self.assertTrue(
+            KitTypeModerationAction.objects.filter(
+                pk__in=response.data['moderation_action_ids'],
+                action_type=KitTypeModerationAction.ACTION_REJECT,
+                team_season_kit_type=other_suggestion,
+            ).exists()
+        )
+
+    def test_normal_user_cannot_bulk_approve_suggestions(self):
+        self.client.force_authenticate(user=self.regular_user)
+
+        response = self.client.post(
+            reverse('admin-team-season-kit-type-bulk-approve'),
+            {'ids': [self.pending_suggestion.id]},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.pending_suggestion.refresh_from_db()
+        self.assertEqual(self.pending_suggestion.status, TeamSeasonKitType.STATUS_PENDING)
+
     def test_staff_can_merge_pending_type_into_approved_type(self):
         existing_target = TeamSeasonKitType.objects.create(
             team=self.team,
@@ -1925,6 +2045,139 @@ class AdminModerationSummaryAPITests(APITestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
 
+    def assertSummaryMatchesActualCounts(self, **expected):
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, get_actual_moderation_stats())
+        for field_name, value in expected.items():
+            self.assertEqual(response.data[field_name], value)
+
+    def test_summary_reads_the_stored_counters(self):
+        ModerationStats.objects.filter(pk=ModerationStats.SINGLETON_ID).update(kit_report_groups_pending=7)
+        self.client.force_authenticate(user=self.staff_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['kit_report_groups_pending'], 7)
+        self.assertEqual(
+            [query['sql'] for query in queries.captured_queries if 'kits_moderationstats' in query['sql']],
+            [queries.captured_queries[-1]['sql']],
+        )
+
+    def test_summary_recreates_a_missing_counter_row(self):
+        ModerationStats.objects.all().delete()
+
+        self.assertSummaryMatchesActualCounts(
+            kit_type_suggestions_pending=1,
+            team_verification_pending=1,
+            kit_report_groups_pending=1,
+        )
+        self.assertTrue(ModerationStats.objects.filter(pk=ModerationStats.SINGLETON_ID).exists())
+
+    def test_counters_follow_report_submission_and_resolution(self):
+        other_kit = UserKit.objects.create(
+            user=self.report_owner,
+            kit=self.report_kit_type,
+            shirt_technology='REPLICA',
+            shirt_version=ShirtVersion.objects.get(code='REPLICA'),
+            condition='VERY_GOOD',
+            size='M',
+        )
+        self.client.force_authenticate(user=self.regular_user)
+        response = self.client.post(
+            reverse('kit-report', args=[other_kit.id]),
+            {'reason': 'spam', 'description': 'Spam listing.'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertSummaryMatchesActualCounts(kit_report_groups_pending=2)
+
+        response = self.client.post(
+            reverse('admin-kit-report-dismiss', args=[self.reported_kit.id]),
+            {'note': 'Fine.'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertSummaryMatchesActualCounts(kit_report_groups_pending=1)
+
+        other_kit.delete()
+        self.assertSummaryMatchesActualCounts(kit_report_groups_pending=0)
+
+    def test_counters_follow_team_verification_and_suggestion_moderation(self):
+        self.unverified_team.is_verified = True
+        self.unverified_team.save(update_fields=['is_verified'])
+        self.assertSummaryMatchesActualCounts(kit_type_suggestions_pending=2, team_verification_pending=0)
+
+        response = self.client.post(
+            reverse('admin-team-season-kit-type-bulk-approve'),
+            {'ids': list(TeamSeasonKitType.objects.filter(team=self.unverified_team).values_list('id', flat=True))},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertSummaryMatchesActualCounts(kit_type_suggestions_pending=1)
+
+        self.verified_team.delete()
+        Team.objects.create(name='Summary Another Pending FC', is_verified=False)
+        self.assertSummaryMatchesActualCounts(kit_type_suggestions_pending=0, team_verification_pending=1)
+
+    def test_counters_follow_direct_suggestion_and_kit_type_deletes(self):
+        self.unverified_team.is_verified = True
+        self.unverified_team.save()
+        self.assertSummaryMatchesActualCounts(kit_type_suggestions_pending=2)
+
+        TeamSeasonKitType.objects.get(team=self.verified_team).delete()
+        self.assertSummaryMatchesActualCounts(kit_type_suggestions_pending=1)
+
+        self.approved_kit_type.delete()
+        self.assertSummaryMatchesActualCounts(kit_type_suggestions_pending=0)
+
+    def test_two_first_reports_on_a_kit_count_one_group(self):
+        other_kit = UserKit.objects.create(
+            user=self.report_owner,
+            kit=self.report_kit_type,
+            shirt_technology='REPLICA',
+            shirt_version=ShirtVersion.objects.get(code='REPLICA'),
+            condition='VERY_GOOD',
+            size='M',
+        )
+
+        with transaction.atomic():
+            KitReport.objects.create(kit=other_kit, reporter=self.regular_user, reason='spam')
+            KitReport.objects.create(kit=other_kit, reporter=self.moderator_user, reason='prohibited_content')
+
+        self.assertSummaryMatchesActualCounts(kit_report_groups_pending=2)
+
+    def test_report_on_an_already_pending_kit_leaves_the_counters_alone(self):
+        with CaptureQueriesContext(connection) as queries:
+            KitReport.objects.create(
+                kit=self.reported_kit,
+                reporter=self.regular_user,
+                reason='spam',
+                description='Third pending report.',
+            )
+
+        self.assertFalse(any('kits_moderationstats' in query['sql'] for query in queries.captured_queries))
+        self.assertSummaryMatchesActualCounts(kit_report_groups_pending=1)
+
+    def test_reconcile_command_repairs_drifted_counters(self):
+        ModerationStats.objects.filter(pk=ModerationStats.SINGLETON_ID).update(
+            team_verification_pending=5,
+            kit_report_groups_pending=0,
+        )
+
+        dry_run_output = StringIO()
+        call_command('reconcile_moderation_stats', '--dry-run', stdout=dry_run_output)
+        self.assertIn('2 moderation counter(s) have drifted.', dry_run_output.getvalue())
+        self.assertEqual(ModerationStats.objects.get().team_verification_pending, 5)
+
+        output = StringIO()
+        call_command('reconcile_moderation_stats', stdout=output)
+        self.assertIn('Reconciled 2 moderation counter(s).', output.getvalue())
+        self.assertSummaryMatchesActualCounts(team_verification_pending=1, kit_report_groups_pending=1)
+
 
 class AdminTeamModerationAPITests(APITestCase):
     def setUp(self):
@@ -2853,6 +3106,21 @@ class AdminTeamModerationAPITests(APITestCase):
         self.assertEqual(response.data['target_team']['country_id'], self.england.id)
         self.assertEqual(response.data['target_team']['league_id'], self.premier_league.id)
 
+    def test_merge_invalidates_cached_approved_kit_types_of_the_target(self):
+        self.source_duplicate_team_season.delete()
+        self.source_unique_team_season.status = TeamSeasonKitType.STATUS_APPROVED
+        self.source_unique_team_season.save(update_fields=['status'])
+        cache.clear()
+        url = reverse('approved-team-season-kit-types', args=[self.target_team.id])
+        self.assertEqual(self.client.get(url).data, [])
+        versions_before = get_catalog_versions([CATALOG_TEAM_SEASON_KIT_TYPES])
+
+        response = self.merge_team(self.source_team.id, self.target_team.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(get_catalog_versions([CATALOG_TEAM_SEASON_KIT_TYPES]), versions_before)
+        self.assertEqual([row['id'] for row in self.client.get(url).data], [self.source_unique_team_season.id])
+
     def test_team_merge_is_atomic_when_a_later_step_fails(self):
         with patch('kits.team_moderation.reconcile_wishlist_items', side_effect=RuntimeError('boom')):
             with self.assertRaises(RuntimeError):
@@ -2867,6 +3135,80 @@ class AdminTeamModerationAPITests(APITestCase):
         self.assertEqual(self.duplicate_userkit.kit_id, self.source_duplicate_kit.id)
         self.assertFalse(TeamModerationAction.objects.filter(action_type=TeamModerationAction.ACTION_MERGE).exists())
 
+    def test_merge_collapses_source_duplicates_into_the_first_moved_kit(self):
+        source_team = Team.objects.create(name='Collapse Source FC', is_verified=False)
+        first_kit = Kit.objects.create(team=source_team, season='2019/2020', kit_type='Home')
+        second_kit = Kit.objects.create(
+            team=source_team,
+            season='2019/2020',
+            kit_type='home',
+            estimated_price=Decimal('75.00'),
+        )
+        userkit = UserKit.objects.create(
+            user=self.other_owner,
+            kit=second_kit,
+            shirt_technology='REPLICA',
+            size='L',
+            condition='VERY_GOOD',
+        )
+
+        response = self.merge_team(source_team.id, self.target_team.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['moved_kits'], 1)
+        self.assertEqual(response.data['merged_duplicate_kits'], 1)
+        self.assertEqual(response.data['moved_userkits'], 1)
+        first_kit.refresh_from_db()
+        userkit.refresh_from_db()
+        self.assertEqual(first_kit.team_id, self.target_team.id)
+        self.assertEqual(first_kit.estimated_price, Decimal('75.00'))
+        self.assertEqual(userkit.kit_id, first_kit.id)
+        self.assertFalse(Kit.objects.filter(pk=second_kit.id).exists())
+
+    def test_merge_reindexes_report_summaries_under_the_target_team(self):
+        source_team = Team.objects.create(name='Reported Source FC', is_verified=False)
+        userkit = UserKit.objects.create(
+            user=self.other_owner,
+            kit=Kit.objects.create(team=source_team, season='2018/2019', kit_type='Away'),
+            shirt_technology='REPLICA',
+            size='L',
+            condition='VERY_GOOD',
+        )
+        KitReport.objects.create(kit=userkit, reporter=self.reporter, reason='wrong_team')
+
+        response = self.merge_team(source_team.id, self.target_team.id)
+
+        self.assertEqual(response.status_code, 200)
+        search_text = KitReportSummary.objects.get(userkit=userkit).search_text
+        self.assertIn(self.target_team.name.lower(), search_text)
+        self.assertNotIn('reported source fc', search_text)
+
+    def test_merge_query_count_does_not_grow_with_uploads(self):
+        counts = {}
+        for kit_count in (10, 60):
+            source_team, target_team, actor = seed_team_merge_benchmark(kit_count, label=f'size{kit_count}')
+            with record_queries() as recorder:
+                _team, _action, summary = merge_teams_safely(
+                    source_team_id=source_team.id,
+                    target_team_id=target_team.id,
+                    actor=actor,
+                )
+            counts[kit_count] = recorder.count
+            self.assertEqual(summary['moved_kits'] + summary['merged_duplicate_kits'], kit_count)
+            self.assertEqual(summary['moved_userkits'], kit_count // 2)
+
+        self.assertEqual(counts[10], counts[60])
+
+    def test_benchmark_team_merge_command_rolls_back(self):
+        teams_before = Team.objects.count()
+        output = StringIO()
+
+        call_command('benchmark_team_merge', '--kits', '20', stdout=output)
+
+        self.assertIn('20 kits:', output.getvalue())
+        self.assertIn('10 moved, 10 merged', output.getvalue())
+        self.assertEqual(Team.objects.count(), teams_before)
+
     def test_team_approval_is_atomic_when_suggestion_backfill_fails(self):
         team = Team.objects.create(name='Atomic Approval FC', is_verified=False)
 
@@ -3097,6 +3439,146 @@ class AdminTeamModerationAPITests(APITestCase):
         self.assertTrue(TeamSeasonKitType.objects.filter(pk=self.source_duplicate_team_season.id).exists())
         self.assertFalse(TeamModerationAction.objects.filter(action_type=TeamModerationAction.ACTION_DELETE_CONTENT).exists())
 
+    @override_settings(TEAM_DELETION_BATCH_SIZE=1)
+    def test_chunked_delete_team_content_matches_the_single_transaction_summary(self):
+        comment_like = KitCommentLike.objects.create(comment=self.comment, user=self.owner)
+        Notification.objects.create(recipient=self.owner, actor=self.liker, type='kit_like', kit=self.duplicate_userkit)
+
+        response = self.delete_team_content(
+            self.source_team.id,
+            payload={'reason': 'spam', 'note': 'Batch purge.', 'chunked': True},
+            user=self.moderator_user,
+        )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], TeamDeletionJob.STATUS_SUCCEEDED)
+        self.assertEqual(response.data['progress']['deleted_userkits'], 2)
+        self.assertFalse(Team.objects.filter(pk=self.source_team.id).exists())
+        self.assertFalse(UserKit.objects.filter(pk__in=[self.duplicate_userkit.id, self.unique_userkit.id]).exists())
+        self.assertFalse(KitCommentLike.objects.filter(pk=comment_like.id).exists())
+        self.favorite_user.profile.refresh_from_db()
+        self.assertIsNone(self.favorite_user.profile.favorite_team_id)
+
+        action = TeamModerationAction.objects.get(pk=response.data['moderation_action_id'])
+        self.assertEqual(action.action_type, TeamModerationAction.ACTION_DELETE_CONTENT)
+        self.assertEqual(action.source_team_id_snapshot, self.source_team.id)
+        self.assertEqual(action.summary['note'], 'Batch purge.')
+        self.assertEqual(action.summary['deleted_kits'], 2)
+        self.assertEqual(action.summary['affected_users'], 2)
+        self.assertEqual(action.summary['deleted_images'], 1)
+        self.assertEqual(action.summary['deleted_comments'], 1)
+        self.assertEqual(action.summary['deleted_comment_likes'], 1)
+        self.assertEqual(action.summary['deleted_kit_likes'], 1)
+        self.assertEqual(action.summary['deleted_reports'], 1)
+        self.assertEqual(action.summary['deleted_notifications'], 1)
+        self.assertEqual(action.summary['deleted_wishlist_items'], 2)
+        self.assertEqual(action.summary['cleared_favorite_profiles'], 1)
+        self.assertEqual(action.summary['report_snapshots'][0]['id'], self.report.id)
+        self.assertEqual(self.owner.collection_value_snapshots.order_by('-id').first().kits_count, 0)
+        self.assertEqual(
+            self.owner.collection_value_snapshots.order_by('-id').first().reason,
+            CollectionValueSnapshot.REASON_KIT_REMOVED,
+        )
+
+    @override_settings(TEAM_DELETION_BATCH_SIZE=1)
+    def test_chunked_delete_team_content_rescans_kits_skipped_for_a_late_upload(self):
+        first_kit = min([self.source_duplicate_kit, self.source_unique_kit], key=lambda kit: kit.id)
+        delete_kit_batch = team_moderation.delete_team_kit_batch
+        finish_deletion = team_moderation.finish_team_deletion
+        kit_batch_calls = []
+        finish_calls = []
+
+        def upload_during_first_kit_batch(deletion_job_id, batch_size):
+            kit_batch_calls.append(deletion_job_id)
+            if len(kit_batch_calls) == 1:
+                UserKit.objects.create(
+                    user=self.owner,
+                    kit=first_kit,
+                    shirt_technology='REPLICA',
+                    condition='VERY_GOOD',
+                    size='S',
+                )
+            return delete_kit_batch(deletion_job_id, batch_size)
+
+        def guarded_finish(deletion_job_id):
+            finish_calls.append(deletion_job_id)
+            if len(finish_calls) > 3:
+                raise AssertionError('Team deletion did not converge.')
+            return finish_deletion(deletion_job_id)
+
+        with patch('kits.team_moderation.delete_team_kit_batch', side_effect=upload_during_first_kit_batch), \
+                patch('kits.team_moderation.finish_team_deletion', side_effect=guarded_finish):
+            response = self.delete_team_content(
+                self.source_team.id,
+                payload={'reason': 'spam', 'chunked': True},
+                user=self.moderator_user,
+            )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], TeamDeletionJob.STATUS_SUCCEEDED)
+        self.assertEqual(len(finish_calls), 2)
+        self.assertFalse(Kit.objects.filter(pk=first_kit.id).exists())
+        self.assertFalse(Team.objects.filter(pk=self.source_team.id).exists())
+        self.assertEqual(response.data['progress']['deleted_userkits'], 3)
+
+    @override_settings(BACKGROUND_JOBS_EAGER=False, TEAM_DELETION_BATCH_SIZE=1)
+    def test_chunked_delete_team_content_resumes_after_a_crash(self):
+        response = self.delete_team_content(
+            self.source_team.id,
+            payload={'reason': 'spam', 'chunked': True},
+            user=self.moderator_user,
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], TeamDeletionJob.STATUS_PENDING)
+        deletion_job_id = response.data['id']
+
+        with patch('kits.team_moderation.delete_team_kit_batch', side_effect=RuntimeError('worker died')):
+            with self.assertLogs('kits.jobs', level='WARNING'):
+                jobs.run_pending_jobs('test-worker')
+
+        deletion_job = TeamDeletionJob.objects.get(pk=deletion_job_id)
+        self.assertEqual(deletion_job.status, TeamDeletionJob.STATUS_RUNNING)
+        self.assertEqual(deletion_job.error, 'worker died')
+        self.assertEqual(deletion_job.summary['deleted_userkits'], 2)
+        self.assertNotIn('deleted_userkit_ids', deletion_job.summary)
+        self.assertNotIn('report_snapshots', deletion_job.summary)
+        self.assertEqual(
+            sorted(deletion_job.items.filter(kind=TeamDeletionJobItem.KIND_USERKIT).values_list('object_id', flat=True)),
+            sorted([self.duplicate_userkit.id, self.unique_userkit.id]),
+        )
+        self.assertFalse(UserKit.objects.filter(pk=self.unique_userkit.id).exists())
+        self.assertTrue(Team.objects.filter(pk=self.source_team.id).exists())
+
+        self.client.force_authenticate(user=self.moderator_user)
+        conflict = self.client.post(
+            reverse('admin-team-delete-content', args=[self.source_team.id]),
+            {'confirmation': self.source_team.name, 'reason': 'spam', 'chunked': True},
+            format='json',
+        )
+        self.assertEqual(conflict.status_code, 409)
+        self.assertEqual(conflict.data['deletion_job_id'], deletion_job_id)
+
+        output = StringIO()
+        call_command('resume_team_deletions', stdout=output)
+
+        self.assertIn('Resumed 1 team deletion(s).', output.getvalue())
+        detail = self.client.get(reverse('admin-team-deletion-detail', args=[deletion_job_id]))
+        self.assertEqual(detail.data['status'], TeamDeletionJob.STATUS_SUCCEEDED)
+        self.assertEqual(detail.data['progress']['deleted_userkits'], 2)
+        self.assertEqual(detail.data['progress']['deleted_kits'], 2)
+        self.assertFalse(Team.objects.filter(pk=self.source_team.id).exists())
+        self.assertEqual(
+            TeamModerationAction.objects.filter(action_type=TeamModerationAction.ACTION_DELETE_CONTENT).count(),
+            1,
+        )
+        action = TeamModerationAction.objects.get(action_type=TeamModerationAction.ACTION_DELETE_CONTENT)
+        self.assertEqual(
+            action.summary['deleted_userkit_ids'],
+            sorted([self.duplicate_userkit.id, self.unique_userkit.id]),
+        )
+        self.assertEqual(action.summary['report_snapshots'][0]['id'], self.report.id)
+        self.assertFalse(TeamDeletionJobItem.objects.filter(deletion_job_id=deletion_job_id).exists())
+
     def test_reject_blocks_used_team_with_usage_counts_and_preserves_content(self):
         response = self.reject_team(self.source_team.id)
 
@@ -3583,6 +4065,43 @@ class AdminCatalogAPITests(APITestCase):
         self.assertEqual(self.league.order, 7)
         self.assertFalse(self.league.is_active)
 
+    def test_public_league_list_is_cached_until_admin_edit(self):
+        cache.clear()
+        first_response = self.client.get(reverse('league-list'))
+        self.assertEqual(first_response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(reverse('league-list'))
+        self.assertEqual(cached_response.data, first_response.data)
+
+        self.catalog_patch(
+            'admin-catalog-league-detail',
+            {'name': 'Premier League Elite', 'country_id': self.country.id},
+            user=self.staff_user,
+            args=[self.league.id],
+        )
+        self.client.force_authenticate(user=None)
+
+        refreshed_response = self.client.get(reverse('league-list'))
+        league_names = [league['name'] for league in refreshed_response.data]
+        self.assertIn('Premier League Elite', league_names)
+
+    def test_kit_options_cache_follows_shirt_version_changes(self):
+        cache.clear()
+        version = ShirtVersion.objects.create(code='CACHED', name='Cached Version', sort_order=99)
+        self.client.get(reverse('kit-options'))
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse('kit-options'))
+
+        version.name = 'Renamed Version'
+        version.save()
+
+        response = self.client.get(reverse('kit-options'))
+        names = [item['name'] for item in response.data['shirt_versions']]
+        self.assertIn('Renamed Version', names)
+        self.assertNotIn('Cached Version', names)
+
     def test_league_country_required_on_create(self):
         response = self.catalog_post(
             'admin-catalog-leagues',
@@ -4170,6 +4689,35 @@ class CollectionValueSnapshotTests(APITestCase):
         self.assertTrue(response.data["can_view_collection_value"])
         self.assertTrue(response.data["show_collection_value_publicly"])
 
+    def test_stats_return_not_modified_until_collection_or_profile_changes(self):
+        self.create_user_kit(manual_value=Decimal("220.00"))
+        stats_url = reverse("user-stats", args=[self.user.username])
+        etag = self.client.get(stats_url)["ETag"]
+
+        cached_response = self.client.get(stats_url, HTTP_IF_NONE_MATCH=etag)
+        self.create_user_kit(manual_value=Decimal("30.00"))
+        kit_added_response = self.client.get(stats_url, HTTP_IF_NONE_MATCH=etag)
+        self.user.profile.bio = "Updated bio"
+        self.user.profile.save(update_fields=["bio"])
+        bio_response = self.client.get(stats_url, HTTP_IF_NONE_MATCH=kit_added_response["ETag"])
+
+        self.assertEqual(cached_response.status_code, 304)
+        self.assertEqual(kit_added_response.status_code, 200)
+        self.assertEqual(kit_added_response.data["total_kits"], 2)
+        self.assertEqual(bio_response.status_code, 200)
+        self.assertEqual(bio_response.data["bio"], "Updated bio")
+
+    def test_stats_etag_differs_between_owner_and_other_viewers(self):
+        self.create_user_kit(manual_value=Decimal("220.00"))
+        stats_url = reverse("user-stats", args=[self.user.username])
+        owner_etag = self.client.get(stats_url)["ETag"]
+        self.client.force_authenticate(user=self.other_user)
+
+        response = self.client.get(stats_url, HTTP_IF_NONE_MATCH=owner_etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data["total_value"])
+
     def test_owner_can_update_collection_value_visibility_setting(self):
         response = self.client.put(
             reverse("update-profile"),
@@ -4414,21 +4962,301 @@ class CollectionValueSnapshotTests(APITestCase):
         self.assertFalse(response.data["in_the_collection"])
 
 
-class UserKitPrivateNoteTests(APITestCase):
-    def setUp(self):
-        self.client = APIClient()
-        self.owner = User.objects.create_user(username="note_owner", password="password123")
-        self.other_user = User.objects.create_user(username="note_other", password="password123")
-        self.team = Team.objects.create(name="Private Note FC", is_verified=True)
-        self.kit = Kit.objects.create(
-            team=self.team,
-            season="2024/2025",
-            kit_type="Home",
-            estimated_price=Decimal("90.00"),
-        )
-        self.user_kit = UserKit.objects.create(
-            user=self.owner,
-            kit=self.kit,
+    def test_snapshots_after_the_first_are_derived_from_the_previous_one(self):
+        kept_kit = self.create_user_kit()
+        record_collection_value_snapshot(self.user, CollectionValueSnapshot.REASON_INITIAL)
+        url = reverse("api-my-collection")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                url,
+                {
+                    "team_name": self.team.name,
+                    "season": self.kit.season,
+                    "kit_type": self.kit.kit_type,
+                    "size": "S",
+                    "condition": "VERY_GOOD",
+                    "shirt_technology": "REPLICA",
+                },
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(
+            any('SUM("kits_userkit"."final_value")' in query["sql"] for query in queries.captured_queries)
+        )
+
+        added_kit_id = response.data["id"]
+        self.client.patch(reverse("api-my-collection-detail", args=[added_kit_id]), {"manual_value": "80.00"}, format="multipart")
+        self.client.patch(reverse("api-my-collection-detail", args=[kept_kit.id]), {"in_the_collection": False}, format="multipart")
+        self.client.delete(reverse("api-my-collection-detail", args=[added_kit_id]))
+
+        history = list(
+            CollectionValueSnapshot.objects.filter(user=self.user).order_by("id").values_list("reason", "total_value", "kits_count")
+        )
+        self.assertEqual(history, [
+            (CollectionValueSnapshot.REASON_INITIAL, Decimal("100.00"), 1),
+            (CollectionValueSnapshot.REASON_KIT_ADDED, Decimal("160.00"), 2),
+            (CollectionValueSnapshot.REASON_VALUE_UPDATED, Decimal("180.00"), 2),
+            (CollectionValueSnapshot.REASON_COLLECTION_STATUS_CHANGED, Decimal("80.00"), 1),
+            (CollectionValueSnapshot.REASON_KIT_REMOVED, Decimal("0.00"), 0),
+        ])
+
+    def test_drifted_baseline_falls_back_to_a_full_aggregate(self):
+        self.create_user_kit()
+        self.create_user_kit(size="M")
+        CollectionValueSnapshot.objects.create(
+            user=self.user,
+            total_value=Decimal("0.00"),
+            kits_count=0,
+            reason=CollectionValueSnapshot.REASON_INITIAL,
+        )
+
+        snapshot = record_collection_value_snapshot(
+            self.user,
+            CollectionValueSnapshot.REASON_KIT_REMOVED,
+            value_delta=Decimal("-100.00"),
+            count_delta=-1,
+        )
+
+        self.assertEqual((snapshot.total_value, snapshot.kits_count), (Decimal("190.00"), 2))
+
+    @override_settings(COLLECTION_VALUE_RECOUNT_EVERY=2)
+    def test_derived_snapshots_are_periodically_checked_against_a_full_aggregate(self):
+        self.create_user_kit()
+        # Plausible but wrong baseline that the impossible-totals guard cannot catch
+        CollectionValueSnapshot.objects.create(
+            user=self.user,
+            total_value=Decimal("70.00"),
+            kits_count=1,
+            reason=CollectionValueSnapshot.REASON_INITIAL,
+        )
+
+        first = record_collection_value_snapshot(
+            self.user,
+            CollectionValueSnapshot.REASON_VALUE_UPDATED,
+            value_delta=Decimal("0.00"),
+            count_delta=0,
+        )
+        with self.assertLogs("kits.models", level="WARNING"):
+            second = record_collection_value_snapshot(
+                self.user,
+                CollectionValueSnapshot.REASON_VALUE_UPDATED,
+                value_delta=Decimal("0.00"),
+                count_delta=0,
+            )
+
+        self.assertEqual((first.total_value, first.incremental_streak), (Decimal("70.00"), 1))
+        self.assertEqual((second.total_value, second.incremental_streak), (Decimal("100.00"), 0))
+
+    def test_snapshot_locks_the_users_profile(self):
+        record_collection_value_snapshot(self.user, CollectionValueSnapshot.REASON_INITIAL)
+
+        with patch("django.db.models.query.QuerySet.select_for_update", autospec=True, side_effect=lambda qs, *args, **kwargs: qs) as select_for_update:
+            record_collection_value_snapshot(
+                self.user,
+                CollectionValueSnapshot.REASON_KIT_ADDED,
+                value_delta=Decimal("10.00"),
+                count_delta=1,
+            )
+
+        self.assertIn(Profile, [call.args[0].model for call in select_for_update.call_args_list])
+
+    def test_rebuild_inserts_backdated_history_in_one_query(self):
+        first = self.create_user_kit()
+        second = self.create_user_kit(size="M")
+        third = self.create_user_kit(size="S")
+        added_at = timezone.now() - timedelta(days=10)
+        UserKit.objects.filter(pk=first.pk).update(added_at=added_at)
+        UserKit.objects.filter(pk=second.pk).update(added_at=added_at)
+        UserKit.objects.filter(pk=third.pk).update(added_at=added_at + timedelta(days=3))
+        record_collection_value_snapshot(self.user, CollectionValueSnapshot.REASON_INITIAL)
+
+        # visible kits, delete old history and rollups, one bulk insert, stamp the rebuilt version
+        with self.assertNumQueries(5):
+            rebuild_collection_value_history(self.user)
+
+        history = list(
+            CollectionValueSnapshot.objects.filter(user=self.user).values_list(
+                "created_at", "reason", "total_value", "kits_count", "related_userkit_id"
+            )
+        )
+        self.assertEqual(history, [
+            (added_at, CollectionValueSnapshot.REASON_INITIAL, Decimal("190.00"), 2, second.id),
+            (added_at + timedelta(days=3), CollectionValueSnapshot.REASON_KIT_ADDED, Decimal("250.00"), 3, third.id),
+        ])
+
+    def test_history_staleness_check_reads_only_the_profile(self):
+        self.create_user_kit(is_hidden_by_moderation=True)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(collection_value_history_is_stale(self.user))
+
+        rebuild_collection_value_history(self.user)
+        self.assertFalse(collection_value_history_is_stale(self.user))
+
+    def test_ordinary_kit_edits_do_not_invalidate_the_history(self):
+        user_kit = self.create_user_kit()
+        self.client.get(reverse("my-collection-value-history"))
+        snapshot_ids = set(CollectionValueSnapshot.objects.filter(user=self.user).values_list("id", flat=True))
+
+        response = self.client.patch(
+            reverse("api-my-collection-detail", args=[user_kit.id]),
+            {"condition": "GOOD"},
+            format="multipart",
+        )
+        self.client.get(reverse("my-collection-value-history"))
+
+        self.assertEqual(response.status_code, 200)
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.collection_history_version, 0)
+        self.assertTrue(snapshot_ids <= set(
+            CollectionValueSnapshot.objects.filter(user=self.user).values_list("id", flat=True)
+        ))
+
+    def test_moderation_hide_and_restore_bump_the_history_version(self):
+        user_kit = self.create_user_kit(manual_value=Decimal("150.00"))
+        self.create_user_kit(manual_value=Decimal("50.00"))
+        self.client.get(reverse("my-collection-value-history"))
+
+        user_kit = UserKit.objects.get(pk=user_kit.pk)
+        user_kit.is_hidden_by_moderation = True
+        user_kit.save(update_fields=["is_hidden_by_moderation"])
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.collection_history_version, 1)
+
+        response = self.client.get(reverse("my-collection-value-history"))
+
+        self.assertEqual(response.data["results"][-1]["total_value"], "50.00")
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.collection_history_rebuilt_version, 1)
+
+        user_kit.is_hidden_by_moderation = False
+        user_kit.save()
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.collection_history_version, 2)
+
+    def test_profile_save_does_not_overwrite_history_versions(self):
+        profile = self.user.profile
+        self.create_user_kit(is_hidden_by_moderation=True)
+
+        profile.bio = "Collector"
+        profile.save()
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.bio, "Collector")
+        self.assertEqual(profile.collection_history_version, 1)
+
+    def create_history_point(self, created_at, total_value, kits_count=1):
+        snapshot = CollectionValueSnapshot.objects.create(
+            user=self.user,
+            total_value=Decimal(total_value),
+            kits_count=kits_count,
+            reason=CollectionValueSnapshot.REASON_KIT_UPDATED,
+        )
+        CollectionValueSnapshot.objects.filter(pk=snapshot.pk).update(created_at=created_at)
+        return snapshot
+
+    def test_history_resolution_keeps_the_last_value_per_bucket(self):
+        self.create_history_point(timezone.make_aware(datetime(2026, 3, 2, 9, 0)), "100.00")
+        self.create_history_point(timezone.make_aware(datetime(2026, 3, 2, 18, 0)), "120.00", 2)
+        self.create_history_point(timezone.make_aware(datetime(2026, 3, 20, 9, 0)), "150.00", 3)
+        self.create_history_point(timezone.make_aware(datetime(2026, 4, 1, 9, 0)), "90.00", 2)
+
+        daily = self.client.get(reverse("my-collection-value-history"), {"resolution": "daily"})
+        monthly = self.client.get(reverse("my-collection-value-history"), {"resolution": "monthly"})
+
+        self.assertEqual(daily.status_code, 200)
+        self.assertEqual(
+            [(point["bucket_start"], point["total_value"]) for point in daily.data["results"]],
+            [("2026-03-02", "120.00"), ("2026-03-20", "150.00"), ("2026-04-01", "90.00")],
+        )
+        self.assertEqual(
+            [(point["bucket_start"], point["total_value"], point["kits_count"]) for point in monthly.data["results"]],
+            [("2026-03-01", "150.00", 3), ("2026-04-01", "90.00", 2)],
+        )
+
+    def test_history_since_filters_raw_and_bucketed_points(self):
+        self.create_history_point(timezone.make_aware(datetime(2026, 3, 2, 9, 0)), "100.00")
+        self.create_history_point(timezone.make_aware(datetime(2026, 3, 9, 9, 0)), "120.00")
+        self.create_history_point(timezone.make_aware(datetime(2026, 3, 16, 9, 0)), "140.00")
+        url = reverse("my-collection-value-history")
+
+        raw = self.client.get(url, {"since": "2026-03-09"})
+        weekly = self.client.get(url, {"resolution": "weekly", "since": "2026-03-10T00:00:00"})
+
+        self.assertEqual([point["total_value"] for point in raw.data["results"]], ["120.00", "140.00"])
+        self.assertEqual([point["bucket_start"] for point in weekly.data["results"]], ["2026-03-16"])
+
+    def test_history_rejects_unknown_resolution_and_since(self):
+        url = reverse("my-collection-value-history")
+
+        self.assertEqual(self.client.get(url, {"resolution": "hourly"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"since": "last week"}).status_code, 400)
+
+    def test_compaction_folds_old_snapshots_into_rollups(self):
+        now = timezone.now()
+        for days_ago, total_value in [(200, "100.00"), (199, "110.00"), (150, "130.00"), (10, "160.00")]:
+            self.create_history_point(now - timedelta(days=days_ago), total_value)
+        url = reverse("my-collection-value-history")
+        weekly_before = self.client.get(url, {"resolution": "weekly"}).data["results"]
+        other_snapshot = CollectionValueSnapshot.objects.create(
+            user=self.other_user,
+            total_value=Decimal("10.00"),
+            kits_count=1,
+            reason=CollectionValueSnapshot.REASON_INITIAL,
+        )
+        CollectionValueSnapshot.objects.filter(pk=other_snapshot.pk).update(created_at=now - timedelta(days=300))
+
+        output = StringIO()
+        call_command("compact_collection_value_history", "--user-id", str(self.user.id), stdout=output)
+
+        self.assertIn("Compacted 3 snapshot(s) of 1 user(s).", output.getvalue())
+        self.assertEqual(CollectionValueSnapshot.objects.filter(user=self.user).count(), 1)
+        self.assertTrue(CollectionValueSnapshot.objects.filter(pk=other_snapshot.pk).exists())
+        self.assertEqual(
+            CollectionValueRollup.objects.filter(user=self.user, resolution=CollectionValueRollup.RESOLUTION_DAILY).count(),
+            3,
+        )
+        self.assertEqual(self.client.get(url, {"resolution": "weekly"}).data["results"], weekly_before)
+
+    def test_compaction_keeps_the_latest_snapshot_for_incremental_updates(self):
+        user_kit = self.create_user_kit()
+        record_collection_value_snapshot(self.user, CollectionValueSnapshot.REASON_INITIAL)
+        CollectionValueSnapshot.objects.filter(user=self.user).update(created_at=timezone.now() - timedelta(days=365))
+
+        dry_run = StringIO()
+        call_command("compact_collection_value_history", "--dry-run", stdout=dry_run)
+        self.client.delete(reverse("api-my-collection-detail", args=[user_kit.id]))
+
+        self.assertIn("0 snapshot(s) of 0 user(s) would be compacted.", dry_run.getvalue())
+        latest = CollectionValueSnapshot.objects.filter(user=self.user).order_by("-created_at", "-id").first()
+        self.assertEqual(latest.kits_count, 0)
+        self.assertEqual(latest.total_value, Decimal("0.00"))
+
+    @override_settings(BACKGROUND_JOBS_EAGER=False)
+    def test_deferred_snapshot_jobs_do_not_carry_deltas(self):
+        user_kit = self.create_user_kit()
+
+        self.client.delete(reverse("api-my-collection-detail", args=[user_kit.id]))
+
+        self.assertNotIn("value_delta", BackgroundJob.objects.get().payload)
+
+
+class UserKitPrivateNoteTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = User.objects.create_user(username="note_owner", password="password123")
+        self.other_user = User.objects.create_user(username="note_other", password="password123")
+        self.team = Team.objects.create(name="Private Note FC", is_verified=True)
+        self.kit = Kit.objects.create(
+            team=self.team,
+            season="2024/2025",
+            kit_type="Home",
+            estimated_price=Decimal("90.00"),
+        )
+        self.user_kit = UserKit.objects.create(
+            user=self.owner,
+            kit=self.kit,
             shirt_technology="REPLICA",
             condition="VERY_GOOD",
             size="L",
@@ -5748,6 +6576,115 @@ class KitCommentAPITests(APITestCase):
             )
 
 
+class UserKitCounterTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = User.objects.create_user(username="counter-owner", password="password123")
+        self.fan = User.objects.create_user(username="counter-fan", password="password123")
+        self.other_fan = User.objects.create_user(username="counter-fan-two", password="password123")
+
+        self.team = Team.objects.create(name="Counter FC", is_verified=True)
+        self.kit = Kit.objects.create(
+            team=self.team,
+            season="2024/2025",
+            kit_type="Home",
+            estimated_price=Decimal("75.00"),
+        )
+        self.user_kit = UserKit.objects.create(
+            user=self.owner,
+            kit=self.kit,
+            shirt_technology="REPLICA",
+            condition="VERY_GOOD",
+            size="L",
+        )
+
+    def test_toggle_like_updates_stored_likes_count(self):
+        self.client.force_authenticate(user=self.fan)
+
+        like_response = self.client.post(reverse("toggle-like", args=[self.user_kit.id]))
+        self.user_kit.refresh_from_db()
+        self.assertEqual(like_response.data["likes_count"], 1)
+        self.assertEqual(self.user_kit.likes_count, 1)
+
+        unlike_response = self.client.post(reverse("toggle-like", args=[self.user_kit.id]))
+        self.user_kit.refresh_from_db()
+        self.assertEqual(unlike_response.data["likes_count"], 0)
+        self.assertEqual(self.user_kit.likes_count, 0)
+
+    def test_comment_reply_and_delete_update_stored_comments_count(self):
+        self.client.force_authenticate(user=self.fan)
+        comment_response = self.client.post(
+            reverse("kit-comments", args=[self.user_kit.id]),
+            {"body": "Lovely"},
+            format="json",
+        )
+        self.client.post(
+            reverse("comment-reply", args=[comment_response.data["id"]]),
+            {"body": "Agreed"},
+            format="json",
+        )
+        self.user_kit.refresh_from_db()
+        self.assertEqual(self.user_kit.comments_count, 2)
+
+        delete_response = self.client.delete(reverse("comment-delete", args=[comment_response.data["id"]]))
+
+        self.assertEqual(delete_response.status_code, 204)
+        self.user_kit.refresh_from_db()
+        self.assertEqual(self.user_kit.comments_count, 0)
+
+    def test_orm_like_changes_and_user_deletion_keep_counter_in_sync(self):
+        self.user_kit.likes.add(self.fan, self.other_fan)
+        self.user_kit.refresh_from_db()
+        self.assertEqual(self.user_kit.likes_count, 2)
+
+        self.other_fan.liked_kits.remove(self.user_kit)
+        self.user_kit.refresh_from_db()
+        self.assertEqual(self.user_kit.likes_count, 1)
+
+        self.fan.delete()
+        self.user_kit.refresh_from_db()
+        self.assertEqual(self.user_kit.likes_count, 0)
+
+    def test_saving_stale_instance_does_not_overwrite_counters(self):
+        stale_instance = UserKit.objects.get(pk=self.user_kit.pk)
+        self.user_kit.likes.add(self.fan)
+
+        stale_instance.size = "M"
+        stale_instance.save()
+
+        self.user_kit.refresh_from_db()
+        self.assertEqual(self.user_kit.size, "M")
+        self.assertEqual(self.user_kit.likes_count, 1)
+
+    def test_public_detail_serves_stored_counters(self):
+        self.user_kit.likes.add(self.fan)
+        KitComment.objects.create(kit=self.user_kit, user=self.fan, body="Nice")
+
+        response = self.client.get(reverse("kit-detail", args=[self.user_kit.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["likes_count"], 1)
+        self.assertEqual(response.data["comments_count"], 1)
+
+    def test_reconcile_command_repairs_drifted_counters(self):
+        self.user_kit.likes.add(self.fan)
+        KitComment.objects.create(kit=self.user_kit, user=self.fan, body="Nice")
+        UserKit.objects.filter(pk=self.user_kit.pk).update(likes_count=9, comments_count=0)
+
+        dry_run_output = StringIO()
+        call_command("reconcile_userkit_counters", "--dry-run", stdout=dry_run_output)
+        self.user_kit.refresh_from_db()
+        self.assertIn("1 kit(s) have drifted counters.", dry_run_output.getvalue())
+        self.assertEqual(self.user_kit.likes_count, 9)
+
+        output = StringIO()
+        call_command("reconcile_userkit_counters", stdout=output)
+        self.user_kit.refresh_from_db()
+        self.assertIn("Reconciled counters on 1 kit(s).", output.getvalue())
+        self.assertEqual(self.user_kit.likes_count, 1)
+        self.assertEqual(self.user_kit.comments_count, 1)
+
+
 class KitReportAPITests(APITestCase):
     def setUp(self):
         self.client = APIClient()
@@ -5973,11 +6910,33 @@ class MyCollectionExportAPITests(APITestCase):
     def authenticate(self, user):
         self.client.force_authenticate(user=user)
 
+    def _csv_text(self, response):
+        return response.getvalue().decode("utf-8")
+
+    def _inline_shared_strings(self, sheet_xml, shared_strings):
+        namespace = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+        ET.register_namespace("", namespace)
+        root = ET.fromstring(sheet_xml)
+        for cell in root.iter(f"{{{namespace}}}c"):
+            if cell.get("t") != "s":
+                continue
+            value = cell.find(f"{{{namespace}}}v")
+            cell.remove(value)
+            cell.set("t", "inlineStr")
+            inline = ET.SubElement(cell, f"{{{namespace}}}is")
+            ET.SubElement(inline, f"{{{namespace}}}t").text = shared_strings[int(value.text)]
+        return ET.tostring(root, encoding="unicode")
+
     def _workbook_xml_strings(self, response):
-        with ZipFile(BytesIO(response.content)) as workbook:
+        namespace = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+        with ZipFile(BytesIO(response.getvalue())) as workbook:
             workbook_xml = workbook.read("xl/workbook.xml").decode("utf-8")
-            sheet1_xml = workbook.read("xl/worksheets/sheet1.xml").decode("utf-8")
-            sheet2_xml = workbook.read("xl/worksheets/sheet2.xml").decode("utf-8")
+            shared_strings = [
+                item.find("x:t", namespace).text
+                for item in ET.fromstring(workbook.read("xl/sharedStrings.xml")).findall("x:si", namespace)
+            ]
+            sheet1_xml = self._inline_shared_strings(workbook.read("xl/worksheets/sheet1.xml"), shared_strings)
+            sheet2_xml = self._inline_shared_strings(workbook.read("xl/worksheets/sheet2.xml"), shared_strings)
         return workbook_xml, sheet1_xml, sheet2_xml
 
     def test_anonymous_cannot_export(self):
@@ -5999,7 +6958,7 @@ class MyCollectionExportAPITests(APITestCase):
         self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
         self.assertIn(f'attachment; filename="export_owner-worn11-collection-{timezone.localdate().isoformat()}.csv"', response["Content-Disposition"])
         self.assertNotIn('attachment; filename="worn11-collection-', response["Content-Disposition"])
-        rows = list(csv.DictReader(StringIO(response.content.decode("utf-8"))))
+        rows = list(csv.DictReader(StringIO(self._csv_text(response))))
         self.assertEqual(len(rows), 2)
         export_row = next(row for row in rows if row["Season"] == "2024/2025")
         self.assertEqual(export_row["Team"], "Export FC")
@@ -6015,7 +6974,7 @@ class MyCollectionExportAPITests(APITestCase):
         self.assertEqual(export_row["Profit / loss"], "30.00")
         self.assertEqual(export_row["ROI %"], "37.50")
         self.assertEqual(export_row["Added at"], str(timezone.localdate()))
-        csv_text = response.content.decode("utf-8")
+        csv_text = self._csv_text(response)
         self.assertNotIn("2022/2023", csv_text)
         self.assertNotIn("2021/2022", csv_text)
         self.assertNotIn("Estimated value", csv_text)
@@ -6047,7 +7006,7 @@ class MyCollectionExportAPITests(APITestCase):
         self.authenticate(self.owner)
         response = self.client.get(self.url, {"format": "csv"})
 
-        rows = list(csv.DictReader(StringIO(response.content.decode("utf-8"))))
+        rows = list(csv.DictReader(StringIO(self._csv_text(response))))
         export_row = next(row for row in rows if row["Season"] == "2025/2026")
         self.assertEqual(export_row["Value"], "89.99")
         self.assertEqual(export_row["Purchase price"], "50.00")
@@ -6058,10 +7017,36 @@ class MyCollectionExportAPITests(APITestCase):
         self.authenticate(self.owner)
         response = self.client.get(self.url, {"format": "csv", "include_sold": "false"})
 
-        rows = list(csv.DictReader(StringIO(response.content.decode("utf-8"))))
+        rows = list(csv.DictReader(StringIO(self._csv_text(response))))
         self.assertEqual(len(rows), 1)
         self.assertEqual(rows[0]["Status"], "In collection")
 
+    def test_csv_export_streams_kits_in_chunks(self):
+        for index in range(3):
+            UserKit.objects.create(
+                user=self.owner,
+                kit=Kit.objects.create(team=self.team, season=f"201{index}/201{index + 1}", kit_type="Home"),
+                condition="VERY_GOOD",
+                size="L",
+            )
+        self.authenticate(self.owner)
+
+        with patch("kits.views.EXPORT_ITERATOR_CHUNK_SIZE", 2):
+            with CaptureQueriesContext(connection) as request_queries:
+                response = self.client.get(self.url, {"format": "csv"})
+            self.assertTrue(response.streaming)
+            self.assertFalse(any("kits_userkit" in query["sql"] for query in request_queries.captured_queries))
+
+            with CaptureQueriesContext(connection) as stream_queries:
+                rows = list(csv.DictReader(StringIO(self._csv_text(response))))
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(
+            [row["Season"] for row in rows[:3]],
+            ["2012/2013", "2011/2012", "2010/2011"],
+        )
+        self.assertFalse(any("kits_userkitimage" in query["sql"] for query in stream_queries.captured_queries))
+
     def test_pro_user_can_export_xlsx_with_collection_and_summary_sheets(self):
         self.authenticate(self.owner)
         response = self.client.get(self.url, {"format": "xlsx"})
@@ -6134,6 +7119,60 @@ class MyCollectionExportAPITests(APITestCase):
         self.assertIn('s="5"', sheet1_xml)
         self.assertIn("0.40", sheet2_xml)
 
+    def test_xlsx_export_deduplicates_repeated_strings(self):
+        for index in range(3):
+            UserKit.objects.create(
+                user=self.owner,
+                kit=Kit.objects.create(team=self.team, season="2019/2020", kit_type=f"Third {index}"),
+                condition="VERY_GOOD",
+                size="L",
+            )
+        self.authenticate(self.owner)
+
+        response = self.client.get(self.url, {"format": "xlsx"})
+
+        namespace = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+        with ZipFile(BytesIO(response.getvalue())) as workbook:
+            shared_strings_root = ET.fromstring(workbook.read("xl/sharedStrings.xml"))
+            raw_sheet1_xml = workbook.read("xl/worksheets/sheet1.xml").decode("utf-8")
+        shared_strings = [item.find("x:t", namespace).text for item in shared_strings_root.findall("x:si", namespace)]
+
+        self.assertEqual(shared_strings.count("Export FC"), 1)
+        self.assertEqual(shared_strings.count("2019/2020"), 1)
+        self.assertGreater(int(shared_strings_root.get("count")), int(shared_strings_root.get("uniqueCount")))
+        self.assertEqual(int(shared_strings_root.get("uniqueCount")), len(shared_strings))
+        self.assertNotIn("Export FC", raw_sheet1_xml)
+        self.assertIn('<autoFilter ref="A1:P6"/>', raw_sheet1_xml)
+
+    def test_xlsx_export_keeps_offer_links_out_of_shared_strings(self):
+        UserKit.objects.create(
+            user=self.owner,
+            kit=Kit.objects.create(team=self.team, season="2019/2020", kit_type="Third"),
+            condition="VERY_GOOD",
+            size="L",
+            offer_link="https://example.com/offers/unique-link",
+        )
+        self.authenticate(self.owner)
+
+        response = self.client.get(self.url, {"format": "xlsx"})
+
+        with ZipFile(BytesIO(response.getvalue())) as workbook:
+            shared_strings_xml = workbook.read("xl/sharedStrings.xml").decode("utf-8")
+            raw_sheet1_xml = workbook.read("xl/worksheets/sheet1.xml").decode("utf-8")
+        self.assertNotIn("unique-link", shared_strings_xml)
+        self.assertIn("https://example.com/offers/unique-link", raw_sheet1_xml)
+        self.assertIn("2019/2020", shared_strings_xml)
+
+    def test_export_benchmark_command_reports_each_format(self):
+        stdout = StringIO()
+
+        call_command("benchmark_collection_export", "--rows", "50", "--trace-memory", stdout=stdout)
+
+        output = stdout.getvalue()
+        self.assertIn("csv 50 rows:", output)
+        self.assertIn("xlsx 50 rows:", output)
+        self.assertIn("peak Python memory", output)
+
     def test_invalid_format_is_rejected(self):
         self.authenticate(self.owner)
         response = self.client.get(self.url, {"format": "pdf"})
@@ -6146,6 +7185,172 @@ class MyCollectionExportAPITests(APITestCase):
         self.assertEqual(_sanitize_export_filename_username(""), "user")
 
 
+@override_settings(BACKGROUND_JOBS_EAGER=False)
+class CollectionExportJobAPITests(APITestCase):
+    def setUp(self):
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.client = APIClient()
+        self.owner = User.objects.create_user(username="export_job_owner", password="password123")
+        self.owner.profile.is_pro = True
+        self.owner.profile.save(update_fields=["is_pro"])
+        self.other_user = User.objects.create_user(username="export_job_other", password="password123")
+        team = Team.objects.create(name="Export Job FC", is_verified=True)
+        for season, in_the_collection in (("2024/2025", True), ("2023/2024", False)):
+            UserKit.objects.create(
+                user=self.owner,
+                kit=Kit.objects.create(team=team, season=season, kit_type="Home", estimated_price=Decimal("90.00")),
+                condition="VERY_GOOD",
+                size="L",
+                in_the_collection=in_the_collection,
+            )
+        self.url = reverse("my-collection-export-jobs")
+        self.client.force_authenticate(user=self.owner)
+
+    def run_jobs(self):
+        call_command("run_jobs", "--once", stdout=StringIO())
+
+    def test_export_is_built_by_the_worker_and_downloadable(self):
+        response = self.client.post(self.url, {"format": "csv"}, format="json")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], CollectionExportJob.STATUS_PENDING)
+        self.assertIsNone(response.data["download_url"])
+        job_id = response.data["id"]
+        download_url = reverse("my-collection-export-job-download", args=[job_id])
+        self.assertEqual(self.client.get(download_url).status_code, 409)
+
+        self.run_jobs()
+
+        response = self.client.get(reverse("my-collection-export-job-detail", args=[job_id]))
+        self.assertEqual(response.data["status"], CollectionExportJob.STATUS_SUCCEEDED)
+        self.assertEqual(response.data["row_count"], 2)
+        self.assertTrue(response.data["download_url"].endswith(download_url))
+        self.assertIsNotNone(response.data["expires_at"])
+
+        response = self.client.get(download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertEqual(
+            response["Content-Disposition"],
+            f'attachment; filename="export_job_owner-worn11-collection-{timezone.localdate().isoformat()}.csv"',
+        )
+        rows = list(csv.DictReader(StringIO(response.getvalue().decode("utf-8"))))
+        self.assertEqual(sorted(row["Season"] for row in rows), ["2023/2024", "2024/2025"])
+
+    def test_identical_requests_share_the_active_job(self):
+        first = self.client.post(self.url, {"format": "xlsx", "include_sold": False}, format="json")
+        duplicate = self.client.post(self.url, {"format": "xlsx", "include_sold": "false"}, format="json")
+        other_format = self.client.post(self.url, {"format": "csv", "include_sold": False}, format="json")
+
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(duplicate.status_code, 200)
+        self.assertEqual(duplicate.data["id"], first.data["id"])
+        self.assertEqual(other_format.status_code, 202)
+        self.assertNotEqual(other_format.data["id"], first.data["id"])
+        self.assertEqual(BackgroundJob.objects.filter(name=jobs.JOB_BUILD_COLLECTION_EXPORT).count(), 2)
+
+        self.run_jobs()
+
+        response = self.client.get(reverse("my-collection-export-job-download", args=[first.data["id"]]))
+        with ZipFile(BytesIO(response.getvalue())) as workbook:
+            self.assertIn("xl/sharedStrings.xml", workbook.namelist())
+        self.assertEqual(CollectionExportJob.objects.get(pk=first.data["id"]).row_count, 1)
+
+        again = self.client.post(self.url, {"format": "xlsx", "include_sold": False}, format="json")
+        self.assertEqual(again.status_code, 202)
+        self.assertNotEqual(again.data["id"], first.data["id"])
+
+    def test_expired_exports_are_gone_and_purged(self):
+        job_id = self.client.post(self.url, {"format": "csv"}, format="json").data["id"]
+        self.run_jobs()
+        export_job = CollectionExportJob.objects.get(pk=job_id)
+        artifact_path = export_job.file.path
+        self.assertTrue(os.path.exists(artifact_path))
+
+        CollectionExportJob.objects.filter(pk=job_id).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        self.assertEqual(self.client.get(reverse("my-collection-export-job-download", args=[job_id])).status_code, 410)
+        self.assertIsNone(self.client.get(reverse("my-collection-export-job-detail", args=[job_id])).data["download_url"])
+
+        stdout = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("purge_collection_exports", stdout=stdout)
+
+        self.assertIn("Purged 1 collection export(s).", stdout.getvalue())
+        self.assertFalse(CollectionExportJob.objects.filter(pk=job_id).exists())
+        self.assertFalse(os.path.exists(artifact_path))
+
+    def test_failed_builds_are_reported_on_the_job(self):
+        job_id = self.client.post(self.url, {"format": "csv"}, format="json").data["id"]
+
+        with patch("kits.views.build_collection_export_artifact", side_effect=RuntimeError("disk full")):
+            with self.assertLogs("kits.jobs", level="ERROR"):
+                self.run_jobs()
+
+        response = self.client.get(reverse("my-collection-export-job-detail", args=[job_id]))
+        self.assertEqual(response.data["status"], CollectionExportJob.STATUS_FAILED)
+        self.assertEqual(response.data["error"], "The export could not be generated.")
+        self.assertEqual(BackgroundJob.objects.get().status, BackgroundJob.STATUS_SUCCEEDED)
+
+    def test_worker_reports_running_and_heartbeats_while_building(self):
+        job_id = self.client.post(self.url, {"format": "csv"}, format="json").data["id"]
+        seen = []
+
+        def build(export_job, on_progress=None):
+            seen.append(CollectionExportJob.objects.get(pk=export_job.pk).status)
+            BackgroundJob.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+            seen.append(on_progress())
+            return 0
+
+        with patch("kits.views.build_collection_export_artifact", side_effect=build):
+            self.run_jobs()
+
+        self.assertEqual(seen, [CollectionExportJob.STATUS_RUNNING, True])
+        self.assertEqual(CollectionExportJob.objects.get(pk=job_id).status, CollectionExportJob.STATUS_SUCCEEDED)
+        self.assertEqual(jobs.requeue_stale_jobs(), 0)
+
+    def test_abandoned_exports_are_failed_and_purged(self):
+        stuck_id = self.client.post(self.url, {"format": "csv"}, format="json").data["id"]
+        BackgroundJob.objects.update(status=BackgroundJob.STATUS_FAILED)
+        CollectionExportJob.objects.filter(pk=stuck_id).update(created_at=timezone.now() - timedelta(hours=3))
+
+        response = self.client.post(self.url, {"format": "csv"}, format="json")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertNotEqual(response.data["id"], stuck_id)
+        stuck = CollectionExportJob.objects.get(pk=stuck_id)
+        self.assertEqual(stuck.status, CollectionExportJob.STATUS_FAILED)
+        self.assertTrue(stuck.is_expired)
+
+        stdout = StringIO()
+        call_command("purge_collection_exports", stdout=stdout)
+        self.assertIn("Purged 1 collection export(s).", stdout.getvalue())
+        self.assertFalse(CollectionExportJob.objects.filter(pk=stuck_id).exists())
+
+    @override_settings(BACKGROUND_JOBS_EAGER=True)
+    def test_eager_exports_are_built_after_the_request_commits(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(self.url, {"format": "csv"}, format="json")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], CollectionExportJob.STATUS_PENDING)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertEqual(CollectionExportJob.objects.get(pk=response.data["id"]).status, CollectionExportJob.STATUS_SUCCEEDED)
+        self.assertFalse(BackgroundJob.objects.exists())
+
+    def test_exports_are_pro_only_and_private(self):
+        job_id = self.client.post(self.url, {"format": "csv"}, format="json").data["id"]
+        self.assertEqual(self.client.post(self.url, {"format": "pdf"}, format="json").status_code, 400)
+
+        self.client.force_authenticate(user=self.other_user)
+        self.assertEqual(self.client.post(self.url, {"format": "csv"}, format="json").status_code, 403)
+        self.assertEqual(self.client.get(reverse("my-collection-export-job-detail", args=[job_id])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("my-collection-export-job-download", args=[job_id])).status_code, 404)
+        self.assertEqual(self.client.get(self.url).data, [])
+
+
 class AdminKitReportModerationAPITests(APITestCase):
     def setUp(self):
         self.client = APIClient()
@@ -6219,8 +7424,9 @@ class AdminKitReportModerationAPITests(APITestCase):
         response = self.client.get(self.list_url)
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
-        payload = response.data[0]
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertFalse(response.data["has_more"])
+        payload = response.data["results"][0]
         self.assertEqual(payload["id"], self.user_kit.id)
         self.assertEqual(payload["report_count"], 2)
         self.assertTrue(payload["has_pending_reports"])
@@ -6430,27 +7636,111 @@ class AdminKitReportModerationAPITests(APITestCase):
             ).exists()
         )
 
-    def test_owner_normal_collection_excludes_hidden_kit_and_removed_detail_allows_owner(self):
-        self.user_kit.is_hidden_by_moderation = True
-        self.user_kit.hidden_by_moderation_at = timezone.now()
-        self.user_kit.hidden_by_moderation_by = self.moderator
-        self.user_kit.moderation_hidden_reason = "Removed for review"
-        self.user_kit.save(
-            update_fields=[
-                "is_hidden_by_moderation",
-                "hidden_by_moderation_at",
-                "hidden_by_moderation_by",
-                "moderation_hidden_reason",
-            ]
+    def create_reported_kit(self, user, size="M"):
+        userkit = UserKit.objects.create(
+            user=user,
+            kit=self.kit,
+            shirt_technology="REPLICA",
+            shirt_version=ShirtVersion.objects.get(code="REPLICA"),
+            condition="VERY_GOOD",
+            size=size,
+            in_the_collection=True,
         )
+        KitReport.objects.create(kit=userkit, reporter=self.reporter, reason="spam")
+        return userkit
 
-        self.client.force_authenticate(user=self.owner)
-        my_collection_response = self.client.get(reverse("api-my-collection"))
-        self.assertEqual(my_collection_response.status_code, 200)
-        self.assertEqual(my_collection_response.data["results"] if isinstance(my_collection_response.data, dict) and "results" in my_collection_response.data else my_collection_response.data, [])
+    def test_bulk_dismiss_resolves_every_kit_and_skips_kits_without_pending_reports(self):
+        second_kit = self.create_reported_kit(self.owner)
+        unreported_kit = self.create_reported_kit(self.owner, size="S")
+        KitReport.objects.filter(kit=unreported_kit).update(status="dismissed")
+        self.authenticate(self.moderator)
 
-        collection_response = self.client.get(reverse("api-user-collection", args=[self.owner.username]))
-        self.assertEqual(collection_response.status_code, 200)
+        response = self.client.post(
+            reverse("admin-kit-report-bulk-dismiss"),
+            {"ids": [second_kit.id, unreported_kit.id, self.user_kit.id, 999999], "note": "No violation found."},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["kit_ids"], [self.user_kit.id, second_kit.id])
+        self.assertEqual(response.data["skipped_kit_ids"], [unreported_kit.id, 999999])
+        self.assertEqual(response.data["dismissed_report_count"], 3)
+        self.assertFalse(KitReport.objects.filter(status="pending").exists())
+        actions = KitReportModerationAction.objects.filter(action_type=KitReportModerationAction.ACTION_DISMISS)
+        self.assertEqual(sorted(response.data["moderation_action_ids"]), sorted(actions.values_list("id", flat=True)))
+        self.assertEqual(
+            sorted(actions.get(userkit=self.user_kit).report_ids),
+            sorted([self.report_one.id, self.report_two.id]),
+        )
+        self.assertFalse(UserKit.objects.filter(is_hidden_by_moderation=True).exists())
+
+    def test_bulk_remove_kit_rebuilds_each_owner_history_once(self):
+        second_kit = self.create_reported_kit(self.owner)
+        other_owner = User.objects.create_user(username="second-reported-owner", password="password123")
+        other_kit = self.create_reported_kit(other_owner)
+        self.authenticate(self.moderator)
+
+        with patch("kits.views.rebuild_collection_value_history", wraps=rebuild_collection_value_history) as rebuild:
+            response = self.client.post(
+                reverse("admin-kit-report-bulk-remove-kit"),
+                {"ids": [self.user_kit.id, second_kit.id, other_kit.id], "note": "Offensive uploads."},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(call.args[0].id for call in rebuild.call_args_list), sorted([self.owner.id, other_owner.id]))
+        self.assertEqual(
+            set(UserKit.objects.filter(is_hidden_by_moderation=True).values_list("id", flat=True)),
+            {self.user_kit.id, second_kit.id, other_kit.id},
+        )
+        self.assertEqual(set(KitReport.objects.values_list("status", flat=True)), {"resolved"})
+        self.assertEqual(
+            KitReportModerationAction.objects.filter(action_type=KitReportModerationAction.ACTION_REMOVE_KIT).count(),
+            3,
+        )
+        self.assertFalse(FollowingFeedEntry.objects.filter(userkit__in=[self.user_kit, second_kit]).exists())
+        self.assertFalse(KitRanking.objects.filter(userkit__in=[self.user_kit, second_kit, other_kit]).exists())
+        self.assertEqual(get_unread_counts(self.owner)["notifications_unread_count"], 2)
+        self.assertEqual(get_unread_counts(other_owner)["notifications_unread_count"], 1)
+        self.assertFalse(collection_value_history_is_stale(self.owner))
+        snapshot = CollectionValueSnapshot.objects.get(user=self.owner)
+        self.assertEqual(snapshot.kits_count, 0)
+
+        action = KitReportModerationAction.objects.get(userkit=second_kit)
+        self.assertFalse(action.previous_state["is_hidden_by_moderation"])
+        self.assertTrue(action.resulting_state["is_hidden_by_moderation"])
+
+    def test_bulk_remove_kit_requires_note_and_ids(self):
+        self.authenticate(self.moderator)
+        url = reverse("admin-kit-report-bulk-remove-kit")
+
+        self.assertEqual(self.client.post(url, {"ids": [self.user_kit.id]}, format="json").status_code, 400)
+        self.assertEqual(self.client.post(url, {"ids": [], "note": "Removed."}, format="json").status_code, 400)
+        self.assertEqual(self.client.post(url, {"ids": list(range(1, 102)), "note": "Removed."}, format="json").status_code, 400)
+        self.user_kit.refresh_from_db()
+        self.assertFalse(self.user_kit.is_hidden_by_moderation)
+
+    def test_owner_normal_collection_excludes_hidden_kit_and_removed_detail_allows_owner(self):
+        self.user_kit.is_hidden_by_moderation = True
+        self.user_kit.hidden_by_moderation_at = timezone.now()
+        self.user_kit.hidden_by_moderation_by = self.moderator
+        self.user_kit.moderation_hidden_reason = "Removed for review"
+        self.user_kit.save(
+            update_fields=[
+                "is_hidden_by_moderation",
+                "hidden_by_moderation_at",
+                "hidden_by_moderation_by",
+                "moderation_hidden_reason",
+            ]
+        )
+
+        self.client.force_authenticate(user=self.owner)
+        my_collection_response = self.client.get(reverse("api-my-collection"))
+        self.assertEqual(my_collection_response.status_code, 200)
+        self.assertEqual(my_collection_response.data["results"] if isinstance(my_collection_response.data, dict) and "results" in my_collection_response.data else my_collection_response.data, [])
+
+        collection_response = self.client.get(reverse("api-user-collection", args=[self.owner.username]))
+        self.assertEqual(collection_response.status_code, 200)
         self.assertEqual(collection_response.data, [])
 
         detail_response = self.client.get(reverse("kit-detail", args=[self.user_kit.id]))
@@ -6530,9 +7820,110 @@ class AdminKitReportModerationAPITests(APITestCase):
         dismissed_response = self.client.get(self.list_url, {"status": "dismissed"})
 
         self.assertEqual(pending_response.status_code, 200)
-        self.assertEqual(pending_response.data, [])
+        self.assertEqual(pending_response.data["results"], [])
         self.assertEqual(dismissed_response.status_code, 200)
-        self.assertEqual(len(dismissed_response.data), 1)
+        self.assertEqual(len(dismissed_response.data["results"]), 1)
+
+    def test_report_queue_pages_by_latest_report_with_a_cursor(self):
+        reported_kits = [self.create_reported_kit(self.owner) for _index in range(4)]
+        self.authenticate(self.moderator)
+
+        first_page = self.client.get(self.list_url, {"limit": 3})
+        second_page = self.client.get(self.list_url, {"limit": 3, "cursor": first_page.data["next_cursor"]})
+
+        self.assertEqual(first_page.status_code, 200)
+        self.assertTrue(first_page.data["has_more"])
+        self.assertEqual(
+            [group["id"] for group in first_page.data["results"]],
+            [reported_kits[3].id, reported_kits[2].id, reported_kits[1].id],
+        )
+        self.assertFalse(second_page.data["has_more"])
+        self.assertIsNone(second_page.data["next_cursor"])
+        self.assertEqual(
+            [group["id"] for group in second_page.data["results"]],
+            [reported_kits[0].id, self.user_kit.id],
+        )
+        self.assertEqual(self.client.get(self.list_url, {"cursor": "not-a-cursor"}).status_code, 400)
+
+    def test_report_queue_filters_by_reason_and_searches_the_summary_index(self):
+        other_owner = User.objects.create_user(username="searchable-owner", password="password123")
+        other_kit = self.create_reported_kit(other_owner)
+        self.authenticate(self.moderator)
+
+        def listed_ids(params):
+            response = self.client.get(self.list_url, params)
+            self.assertEqual(response.status_code, 200)
+            return [group["id"] for group in response.data["results"]]
+
+        self.assertEqual(listed_ids({"reason": "prohibited_content"}), [self.user_kit.id])
+        self.assertEqual(listed_ids({"reason": "spam"}), [other_kit.id, self.user_kit.id])
+        self.assertEqual(listed_ids({"q": "PROHIBITED content"}), [self.user_kit.id])
+        self.assertEqual(listed_ids({"q": "searchable-own"}), [other_kit.id])
+        self.assertEqual(listed_ids({"q": "reporter-two"}), [self.user_kit.id])
+        self.assertEqual(listed_ids({"q": "Reports United"}), [other_kit.id, self.user_kit.id])
+        self.assertEqual(listed_ids({"q": "ab"}), [other_kit.id])
+
+        self.team.name = "Renamed Rovers"
+        self.team.save()
+        self.assertEqual(listed_ids({"q": "renamed rovers"}), [other_kit.id, self.user_kit.id])
+        self.assertEqual(listed_ids({"q": "Reports United"}), [])
+
+    def test_report_summary_follows_report_submission_and_resolution(self):
+        summary = KitReportSummary.objects.get(userkit=self.user_kit)
+        self.assertEqual((summary.report_count, summary.pending_count), (2, 2))
+        self.assertEqual(summary.reasons, ",prohibited_content,spam,")
+        self.assertEqual(summary.latest_report_at, self.report_two.created_at)
+
+        self.authenticate(self.moderator)
+        self.client.post(self.dismiss_url, {"note": "No violation found."}, format="json")
+        summary.refresh_from_db()
+        self.assertEqual((summary.pending_count, summary.dismissed_count), (0, 2))
+
+        self.authenticate(self.viewer)
+        response = self.client.post(
+            reverse("kit-report", args=[self.user_kit.id]),
+            {"reason": "wrong_team", "description": "Not this club."},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        summary.refresh_from_db()
+        self.assertEqual((summary.report_count, summary.pending_count), (3, 1))
+        self.assertIn(",wrong_team,", summary.reasons)
+        self.assertIn("not this club.", summary.search_text)
+
+        self.reporter.delete()
+        self.other_reporter.delete()
+        summary.refresh_from_db()
+        self.assertEqual(summary.report_count, 1)
+        KitReport.objects.filter(kit=self.user_kit).delete()
+        self.assertFalse(KitReportSummary.objects.filter(userkit=self.user_kit).exists())
+
+    def test_first_reports_lock_the_kit_before_building_its_summary(self):
+        KitReport.objects.filter(kit=self.user_kit).delete()
+        self.assertFalse(KitReportSummary.objects.filter(userkit=self.user_kit).exists())
+
+        with patch("django.db.models.query.QuerySet.select_for_update", autospec=True, side_effect=lambda qs, *args, **kwargs: qs) as select_for_update:
+            with transaction.atomic():
+                KitReport.objects.create(kit=self.user_kit, reporter=self.reporter, reason="spam")
+                KitReport.objects.create(kit=self.user_kit, reporter=self.other_reporter, reason="wrong_team")
+
+        kit_locks = [call for call in select_for_update.call_args_list if call.args[0].model is UserKit]
+        self.assertEqual(len(kit_locks), 2)
+        self.assertTrue(all(call.kwargs == {"no_key": True} for call in kit_locks))
+        summary = KitReportSummary.objects.get(userkit=self.user_kit)
+        self.assertEqual((summary.report_count, summary.pending_count), (2, 2))
+        self.assertEqual(summary.reasons, ",wrong_team,spam,")
+
+    def test_rebuild_kit_report_summaries_command_restores_the_index(self):
+        KitReportSummary.objects.all().delete()
+        output = StringIO()
+
+        call_command("rebuild_kit_report_summaries", stdout=output)
+
+        self.assertIn("Summarized reports for 1 kit(s).", output.getvalue())
+        self.authenticate(self.moderator)
+        response = self.client.get(self.list_url, {"q": "looks like spam"})
+        self.assertEqual([group["id"] for group in response.data["results"]], [self.user_kit.id])
 
 
 class PublicUserKitDetailAPITests(APITestCase):
@@ -6733,6 +8124,114 @@ class ExploreKitsAPITests(APITestCase):
         self.assertIn("likes_count", item)
         self.assertIn("comments_count", item)
 
+    def test_trending_decays_older_engagement(self):
+        stale_kit = self.create_user_kit(
+            season="2019/2020",
+            kit_type="Home",
+            added_at=timezone.now() - timedelta(days=30),
+            likes=[self.liker_one, self.liker_two],
+            comments=2,
+        )
+
+        trending_response = self.client.get(reverse("explore-kits"), {"sort": "trending"})
+        most_liked_response = self.client.get(reverse("explore-kits"), {"sort": "most_liked"})
+
+        trending_ids = [item["id"] for item in trending_response.data]
+        self.assertEqual(trending_ids[0], self.most_liked_kit.id)
+        self.assertEqual(trending_ids[-1], stale_kit.id)
+        self.assertEqual(most_liked_response.data[0]["id"], stale_kit.id)
+
+    def test_ranking_rows_follow_kit_visibility(self):
+        self.assertTrue(KitRanking.objects.filter(userkit=self.most_liked_kit).exists())
+        self.assertFalse(KitRanking.objects.filter(userkit=self.hidden_kit).exists())
+
+        self.most_liked_kit.is_hidden_by_moderation = True
+        self.most_liked_kit.save(update_fields=["is_hidden_by_moderation"])
+
+        response = self.client.get(reverse("explore-kits"), {"sort": "trending"})
+
+        self.assertFalse(KitRanking.objects.filter(userkit=self.most_liked_kit).exists())
+        self.assertNotIn(self.most_liked_kit.id, [item["id"] for item in response.data])
+
+    def test_refresh_command_rebuilds_rankings(self):
+        KitRanking.objects.all().delete()
+        KitRanking.objects.create(
+            userkit=self.hidden_kit,
+            added_at=self.hidden_kit.added_at,
+            trending_score=1000,
+        )
+
+        output = StringIO()
+        call_command("refresh_kit_rankings", stdout=output)
+
+        self.assertIn("Refreshed 3 kit ranking(s).", output.getvalue())
+        self.assertEqual(
+            set(KitRanking.objects.values_list("userkit_id", flat=True)),
+            {self.latest_kit.id, self.most_liked_kit.id, self.for_sale_kit.id},
+        )
+        ranking = KitRanking.objects.get(userkit=self.most_liked_kit)
+        self.assertEqual(ranking.likes_count, 2)
+        self.assertEqual(ranking.comments_count, 1)
+
+    def test_unchanged_feed_returns_not_modified_without_serializing(self):
+        first_response = self.client.get(reverse("explore-kits"), {"sort": "latest"})
+
+        with patch("kits.views.UserKitSerializer") as serializer_class:
+            cached_response = self.client.get(
+                reverse("explore-kits"),
+                {"sort": "latest"},
+                HTTP_IF_NONE_MATCH=first_response["ETag"],
+            )
+
+        serializer_class.assert_not_called()
+        self.assertEqual(first_response.status_code, 200)
+        self.assertEqual(cached_response.status_code, 304)
+        self.assertEqual(cached_response["ETag"], first_response["ETag"])
+
+    def test_feed_etag_changes_with_sort_and_ranking_updates(self):
+        latest_etag = self.client.get(reverse("explore-kits"), {"sort": "latest"})["ETag"]
+
+        other_sort_response = self.client.get(
+            reverse("explore-kits"),
+            {"sort": "most_liked"},
+            HTTP_IF_NONE_MATCH=latest_etag,
+        )
+        self.latest_kit.likes.add(self.liker_two)
+        liked_response = self.client.get(
+            reverse("explore-kits"),
+            {"sort": "latest"},
+            HTTP_IF_NONE_MATCH=latest_etag,
+        )
+
+        self.assertEqual(other_sort_response.status_code, 200)
+        self.assertEqual(liked_response.status_code, 200)
+        self.assertEqual(liked_response.data[0]["likes_count"], 1)
+
+    def test_feed_etag_changes_with_card_edits_outside_the_ranking(self):
+        def reorder_image():
+            image = self.latest_kit.images.get()
+            image.order = 1
+            image.save()
+
+        def rename_owner():
+            self.owner.username = "explore-owner-renamed"
+            self.owner.save()
+
+        def rename_team():
+            self.team.name = "Renamed Explore FC"
+            self.team.save()
+
+        def revalue():
+            Kit.objects.filter(pk=self.latest_kit.kit_id).update(estimated_price=Decimal("321.00"))
+            revalue_userkits(UserKit.objects.filter(pk=self.latest_kit.pk))
+
+        for write in (reorder_image, rename_owner, rename_team, revalue):
+            with self.subTest(write.__name__):
+                etag = self.client.get(reverse("explore-kits"), {"sort": "latest"})["ETag"]
+                write()
+                response = self.client.get(reverse("explore-kits"), {"sort": "latest"}, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
 
 class MessagingAPITests(APITestCase):
     def setUp(self):
@@ -7133,6 +8632,24 @@ class MessagingAPITests(APITestCase):
         self.assertEqual(before_response.data["unread_count"], 1)
         self.assertEqual(after_response.data["unread_count"], 0)
 
+    def test_unread_count_etag_is_scoped_to_the_requesting_user(self):
+        conversation = Conversation.get_or_create_between(self.user, self.other_user)
+        Message.objects.create(
+            conversation=conversation,
+            sender=self.other_user,
+            body="Unread for you",
+        )
+        self.client.force_authenticate(user=self.user)
+        etag = self.client.get(reverse("conversation-unread-count"))["ETag"]
+
+        cached_response = self.client.get(reverse("conversation-unread-count"), HTTP_IF_NONE_MATCH=etag)
+        self.client.force_authenticate(user=self.other_user)
+        other_response = self.client.get(reverse("conversation-unread-count"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(cached_response.status_code, 304)
+        self.assertEqual(other_response.status_code, 200)
+        self.assertEqual(other_response.data["unread_count"], 0)
+
     def test_conversation_list_includes_unread_count(self):
         conversation = Conversation.get_or_create_between(self.user, self.other_user)
         Message.objects.create(
@@ -7780,6 +9297,7 @@ class KitSearchSuggestionsAPITests(APITestCase):
                     "label": "Arsenal F.C. 2018/2019 Away",
                     "url": "/history/team/arsenal-fc/variants?season=2018%2F2019&type=Away",
                     "preview_image": None,
+                    "preview_image_variants": {},
                     "has_uploads": False,
                 }
             ],
@@ -7845,6 +9363,60 @@ class KitSearchSuggestionsAPITests(APITestCase):
         self.assertEqual(response.data["name"], "Arsenal F.C.")
         self.assertEqual(response.data["slug"], "arsenal-fc")
 
+    def test_team_slug_is_persisted_and_disambiguated(self):
+        self.assertEqual(self.arsenal.slug, "arsenal-fc")
+
+        colliding_team = Team.objects.create(name="Arsenal FC", is_verified=True)
+
+        self.assertEqual(colliding_team.slug, "arsenal-fc-2")
+        response = self.client.get(reverse("team-resolve", args=["arsenal-fc-2"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["id"], colliding_team.id)
+        self.assertEqual(response.data["slug"], "arsenal-fc-2")
+
+    def test_team_slug_follows_rename(self):
+        self.barcelona.name = "FC Barcelona"
+        self.barcelona.save(update_fields=["name"])
+        self.barcelona.refresh_from_db()
+
+        self.assertEqual(self.barcelona.slug, "fc-barcelona")
+        self.assertEqual(self.client.get(reverse("team-resolve", args=["barcelona"])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("team-resolve", args=["fc-barcelona"])).status_code, 200)
+
+    def test_team_slug_drops_a_suffix_that_is_no_longer_needed(self):
+        team = Team.objects.create(name="Chelsea 3")
+        self.assertEqual(team.slug, "chelsea-3")
+
+        team.name = "Chelsea"
+        team.save(update_fields=["name"])
+        team.refresh_from_db()
+
+        self.assertEqual(team.slug, "chelsea")
+
+    def test_team_slug_only_changes_when_the_name_changes(self):
+        holder = Team.objects.create(name="Chelsea")
+        team = Team.objects.create(name="Chelsea!")
+        self.assertEqual(team.slug, "chelsea-2")
+        Team.objects.create(name="Chelsea Women")
+
+        holder.delete()
+        team = Team.objects.get(pk=team.pk)
+        team.is_verified = True
+        team.save(update_fields=["is_verified"])
+
+        self.assertEqual(Team.objects.get(pk=team.pk).slug, "chelsea-2")
+        self.assertEqual(generate_unique_team_slug("Chelsea"), "chelsea")
+
+    def test_team_slug_collision_from_a_concurrent_writer_retries_with_the_next_suffix(self):
+        # The first read misses the slug a concurrent writer just committed
+        next_free_slug = generate_unique_team_slug("Arsenal FC")
+        with patch("kits.models.generate_unique_team_slug", side_effect=[self.arsenal.slug, next_free_slug]) as generate:
+            team = Team.objects.create(name="Arsenal FC")
+
+        self.assertEqual(generate.call_count, 2)
+        self.assertEqual(team.slug, "arsenal-fc-2")
+        self.assertEqual(Team.objects.get(pk=team.pk).slug, "arsenal-fc-2")
+
     def test_team_resolve_accepts_numeric_id(self):
         response = self.client.get(reverse("team-resolve", args=[str(self.arsenal.id)]))
 
@@ -7886,6 +9458,40 @@ class KitSearchSuggestionsAPITests(APITestCase):
         self.assertEqual(response.data["results"][0]["kit"]["team"]["name"], "Barcelona")
 
 
+    def test_trigram_index_tracks_verified_team_names(self):
+        self.assertTrue(TeamSearchTrigram.objects.filter(team=self.barcelona, trigram="bar").exists())
+        self.assertFalse(TeamSearchTrigram.objects.filter(team=self.unverified_team).exists())
+
+        self.barcelona.name = "FC Porto"
+        self.barcelona.save()
+
+        self.assertFalse(TeamSearchTrigram.objects.filter(team=self.barcelona, trigram="bar").exists())
+        response = self.client.get(self.url, {"q": "Porto"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(item["team_name"] == "FC Porto" for item in response.data))
+
+        self.unverified_team.is_verified = True
+        self.unverified_team.save(update_fields=["is_verified"])
+        self.assertTrue(TeamSearchTrigram.objects.filter(team=self.unverified_team, trigram="leg").exists())
+
+    def test_ranked_suggestions_match_full_sort_across_many_teams(self):
+        for index in range(12):
+            Team.objects.create(name=f"United {index:02d}", is_verified=True)
+        Team.objects.create(name="Manchester United", is_verified=True)
+        Team.objects.create(name="United", is_verified=True)
+
+        response = self.client.get(self.url, {"q": "Unit 1999/2000", "limit": "30"})
+
+        self.assertEqual(response.status_code, 200)
+        prefix_team_names = ["United"] + [f"United {index:02d}" for index in range(12)]
+        expected_labels = [
+            f"{team_name} 1999/2000 {kit_type}"
+            for kit_type in ["Home", "Away", "Third"]
+            for team_name in prefix_team_names
+        ][:30]
+        self.assertEqual([item["label"] for item in response.data], expected_labels)
+
+
 class FollowingFeedAPITests(APITestCase):
     def setUp(self):
         self.client = APIClient()
@@ -8043,6 +9649,67 @@ class FollowingFeedAPITests(APITestCase):
         self.assertEqual(missing_response.status_code, 400)
         self.assertEqual(missing_response.data["before"], ["Kit not found in feed."])
 
+    def test_cursor_pages_through_feed_without_overlap(self):
+        self.client.force_authenticate(user=self.viewer)
+
+        first_page = self.client.get(self.url, {"limit": 2})
+        second_page = self.client.get(self.url, {"limit": 2, "cursor": first_page.data["next_cursor"]})
+
+        self.assertEqual(
+            [item["id"] for item in first_page.data["results"]],
+            [self.newest_followed_kit.id, self.middle_followed_kit.id],
+        )
+        self.assertTrue(first_page.data["has_more"])
+        self.assertEqual(
+            [item["id"] for item in second_page.data["results"]],
+            [self.oldest_followed_kit.id],
+        )
+        self.assertFalse(second_page.data["has_more"])
+        self.assertIsNone(second_page.data["next_cursor"])
+
+    def test_invalid_cursor_is_rejected(self):
+        self.client.force_authenticate(user=self.viewer)
+
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["cursor"], ["cursor is invalid."])
+
+    def test_feed_entries_follow_unfollow_and_moderation(self):
+        self.newest_followed_kit.is_hidden_by_moderation = True
+        self.newest_followed_kit.save(update_fields=["is_hidden_by_moderation"])
+        self.assertFalse(FollowingFeedEntry.objects.filter(userkit=self.newest_followed_kit).exists())
+
+        self.newest_followed_kit.is_hidden_by_moderation = False
+        self.newest_followed_kit.save(update_fields=["is_hidden_by_moderation"])
+        self.assertTrue(
+            FollowingFeedEntry.objects.filter(follower=self.viewer, userkit=self.newest_followed_kit).exists()
+        )
+
+        Follow.objects.filter(follower=self.viewer, following=self.followed_one).delete()
+        Follow.objects.create(follower=self.viewer, following=self.other_user)
+        self.middle_followed_kit.delete()
+        self.client.force_authenticate(user=self.viewer)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [self.non_followed_kit.id],
+        )
+
+    def test_rebuild_command_restores_missing_entries(self):
+        FollowingFeedEntry.objects.all().delete()
+
+        output = StringIO()
+        call_command("rebuild_following_feed", "--follower-id", str(self.viewer.id), stdout=output)
+
+        self.assertIn("Rebuilt 3 following feed entries.", output.getvalue())
+        self.assertEqual(
+            set(FollowingFeedEntry.objects.filter(follower=self.viewer).values_list("userkit_id", flat=True)),
+            {self.oldest_followed_kit.id, self.middle_followed_kit.id, self.newest_followed_kit.id},
+        )
+
 
 class NotificationAPITests(APITestCase):
     def setUp(self):
@@ -8472,6 +10139,26 @@ class NotificationAPITests(APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["unread_count"], 3)
 
+    def test_unread_count_returns_not_modified_until_notifications_change(self):
+        Notification.objects.create(recipient=self.owner, actor=self.actor, type="follow")
+        self.client.force_authenticate(user=self.owner)
+
+        first_response = self.client.get(self.unread_count_url)
+        etag = first_response["ETag"]
+        cached_response = self.client.get(self.unread_count_url, HTTP_IF_NONE_MATCH=etag)
+        Notification.objects.create(recipient=self.owner, actor=self.other_user, type="follow")
+        changed_response = self.client.get(self.unread_count_url, HTTP_IF_NONE_MATCH=etag)
+        self.client.post(self.mark_read_url, {}, format="json")
+        read_response = self.client.get(self.unread_count_url, HTTP_IF_NONE_MATCH=changed_response["ETag"])
+
+        self.assertEqual(first_response.status_code, 200)
+        self.assertEqual(cached_response.status_code, 304)
+        self.assertEqual(cached_response["ETag"], etag)
+        self.assertEqual(changed_response.status_code, 200)
+        self.assertEqual(changed_response.data["unread_count"], 2)
+        self.assertEqual(read_response.status_code, 200)
+        self.assertEqual(read_response.data["unread_count"], 0)
+
     def test_mark_read_sets_read_at(self):
         first = Notification.objects.create(recipient=self.owner, actor=self.actor, type="follow")
         second = Notification.objects.create(recipient=self.owner, actor=self.other_user, type="follow")
@@ -8654,3 +10341,1081 @@ class NotificationAPITests(APITestCase):
         self.assertEqual(invalid_response.data["before"], ["before must be a valid notification id."])
         self.assertEqual(missing_response.status_code, 400)
         self.assertEqual(missing_response.data["before"], ["Notification not found."])
+
+
+class UnreadCountStreamTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="stream-user", password="password123")
+        self.other_user = User.objects.create_user(username="stream-other", password="password123")
+        self.conversation = Conversation.get_or_create_between(self.user, self.other_user)
+
+    def read_stream_chunks(self, request, count):
+        async def read():
+            response = await unread_counts_stream(request)
+            chunks = []
+            async for chunk in response.streaming_content:
+                chunks.append(chunk.decode())
+                if len(chunks) == count:
+                    break
+            await response.streaming_content.aclose()
+            return response, chunks
+
+        return async_to_sync(read)()
+
+    def test_unauthenticated_stream_is_rejected(self):
+        response = self.client.get(reverse("unread-counts-stream"))
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_stream_starts_with_current_unread_counts(self):
+        Message.objects.create(conversation=self.conversation, sender=self.other_user, body="Unread")
+        Notification.objects.create(recipient=self.user, actor=self.other_user, type="follow")
+        request = RequestFactory().get(reverse("unread-counts-stream"))
+        request._force_auth_user = self.user
+
+        response, chunks = self.read_stream_chunks(request, 1)
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(
+            chunks[0],
+            'event: snapshot\ndata: {"messages_unread_count": 1, "notifications_unread_count": 1}\n\n',
+        )
+
+    def test_stream_forwards_published_deltas_and_unsubscribes_on_close(self):
+        broker = InProcessUnreadEventBroker()
+
+        async def load_snapshot():
+            return {"messages_unread_count": 0, "notifications_unread_count": 0}
+
+        async def read():
+            stream = stream_unread_events(self.user.id, load_snapshot, broker=broker, heartbeat_seconds=5)
+            snapshot = await stream.__anext__()
+            broker.publish(self.other_user.id, {"type": "delta", "counter": "messages", "delta": 1})
+            broker.publish(self.user.id, {"type": "delta", "counter": "notifications", "delta": 2})
+            delta = await stream.__anext__()
+            await stream.aclose()
+            return snapshot, delta
+
+        snapshot, delta = async_to_sync(read)()
+
+        self.assertTrue(snapshot.startswith("event: snapshot\n"))
+        self.assertEqual(delta, 'event: delta\ndata: {"counter": "notifications", "delta": 2}\n\n')
+        self.assertEqual(broker._subscribers, {})
+
+    def test_writes_publish_unread_deltas_after_commit(self):
+        broker = Mock(spec=InProcessUnreadEventBroker)
+        self.client.force_authenticate(user=self.user)
+
+        with patch("kits.realtime._broker", broker):
+            with self.captureOnCommitCallbacks(execute=True):
+                Message.objects.create(conversation=self.conversation, sender=self.other_user, body="Hi")
+                Message.objects.create(conversation=self.conversation, sender=self.user, body="Hello")
+                Notification.objects.create(recipient=self.user, actor=self.other_user, type="follow")
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.get(reverse("conversation-messages", args=[self.conversation.id]))
+                self.client.post(reverse("notification-mark-read"), {}, format="json")
+
+        published = [(call.args[0], call.args[1]["counter"], call.args[1]["delta"]) for call in broker.publish.call_args_list]
+        self.assertEqual(
+            published,
+            [
+                (self.user.id, "messages", 1),
+                (self.other_user.id, "messages", 1),
+                (self.user.id, "notifications", 1),
+                (self.user.id, "messages", -1),
+                (self.user.id, "notifications", -1),
+            ],
+        )
+
+
+class UnreadCounterTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="counter-user", password="password123")
+        self.other_user = User.objects.create_user(username="counter-other", password="password123")
+        self.third_user = User.objects.create_user(username="counter-third", password="password123")
+        self.conversation = Conversation.get_or_create_between(self.user, self.other_user)
+        self.other_conversation = Conversation.get_or_create_between(self.user, self.third_user)
+
+    def get_counter(self, user):
+        return UserUnreadCounter.objects.filter(user=user).first()
+
+    def test_incoming_messages_increment_recipient_counters_only(self):
+        Message.objects.create(conversation=self.conversation, sender=self.other_user, body="One")
+        Message.objects.create(conversation=self.conversation, sender=self.other_user, body="Two")
+        Message.objects.create(conversation=self.other_conversation, sender=self.third_user, body="Three")
+        Message.objects.create(conversation=self.conversation, sender=self.user, body="Reply")
+
+        counter = self.get_counter(self.user)
+        self.assertEqual(counter.messages_unread_count, 3)
+        self.assertEqual(
+            ConversationUnreadCounter.objects.get(user=self.user, conversation=self.conversation).unread_count,
+            2,
+        )
+        self.assertEqual(self.get_counter(self.other_user).messages_unread_count, 1)
+
+    def test_opening_conversation_clears_only_that_conversation(self):
+        Message.objects.create(conversation=self.conversation, sender=self.other_user, body="One")
+        Message.objects.create(conversation=self.other_conversation, sender=self.third_user, body="Two")
+        self.client.force_authenticate(user=self.user)
+
+        self.client.get(reverse("conversation-messages", args=[self.conversation.id]))
+        count_response = self.client.get(reverse("conversation-unread-count"))
+        list_response = self.client.get(reverse("conversation-list"))
+
+        self.assertEqual(count_response.data["unread_count"], 1)
+        unread_by_conversation = {item["id"]: item["unread_count"] for item in list_response.data}
+        self.assertEqual(unread_by_conversation[self.conversation.id], 0)
+        self.assertEqual(unread_by_conversation[self.other_conversation.id], 1)
+
+    def test_unread_count_endpoints_read_a_single_counter_row(self):
+        Message.objects.create(conversation=self.conversation, sender=self.other_user, body="One")
+        Notification.objects.create(recipient=self.user, actor=self.other_user, type="follow")
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertNumQueries(1):
+            message_response = self.client.get(reverse("conversation-unread-count"))
+        with self.assertNumQueries(1):
+            notification_response = self.client.get(reverse("notification-unread-count"))
+
+        self.assertEqual(message_response.data["unread_count"], 1)
+        self.assertEqual(notification_response.data["unread_count"], 1)
+
+    def test_notification_counter_follows_create_delete_and_mark_read(self):
+        follow = Notification.objects.create(recipient=self.user, actor=self.other_user, type="follow")
+        Notification.objects.create(recipient=self.user, actor=self.third_user, type="follow")
+        follow.delete()
+        self.assertEqual(self.get_counter(self.user).notifications_unread_count, 1)
+
+        self.client.force_authenticate(user=self.user)
+        self.client.post(reverse("notification-mark-read"), {}, format="json")
+        response = self.client.get(reverse("notification-unread-count"))
+
+        self.assertEqual(self.get_counter(self.user).notifications_unread_count, 0)
+        self.assertEqual(response.data["unread_count"], 0)
+
+    def test_reconcile_command_repairs_drifted_counters(self):
+        Message.objects.create(conversation=self.conversation, sender=self.other_user, body="One")
+        Notification.objects.create(recipient=self.user, actor=self.other_user, type="follow")
+        UserUnreadCounter.objects.filter(user=self.user).update(
+            messages_unread_count=7,
+            notifications_unread_count=0,
+        )
+        ConversationUnreadCounter.objects.all().delete()
+
+        dry_run_output = StringIO()
+        call_command("reconcile_unread_counters", "--dry-run", stdout=dry_run_output)
+        self.assertIn("2 unread counter(s) have drifted.", dry_run_output.getvalue())
+        self.assertEqual(self.get_counter(self.user).messages_unread_count, 7)
+
+        output = StringIO()
+        call_command("reconcile_unread_counters", "--user-id", str(self.user.id), stdout=output)
+
+        self.assertIn("Reconciled 2 unread counter(s).", output.getvalue())
+        counter = self.get_counter(self.user)
+        self.assertEqual(counter.messages_unread_count, 1)
+        self.assertEqual(counter.notifications_unread_count, 1)
+        self.assertEqual(
+            ConversationUnreadCounter.objects.get(user=self.user, conversation=self.conversation).unread_count,
+            1,
+        )
+
+    def test_deleting_a_user_cleans_up_counters_without_errors(self):
+        Message.objects.create(conversation=self.conversation, sender=self.other_user, body="One")
+        Notification.objects.create(recipient=self.user, actor=self.other_user, type="follow")
+
+        self.other_user.delete()
+
+        counter = self.get_counter(self.user)
+        self.assertEqual(counter.messages_unread_count, 0)
+        self.assertEqual(counter.notifications_unread_count, 0)
+        self.assertFalse(ConversationUnreadCounter.objects.filter(conversation_id=self.conversation.id).exists())
+
+
+def build_test_image_file(name, size, *, mode="RGB", image_format="PNG"):
+    buffer = BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30)).save(buffer, format=image_format)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f"image/{image_format.lower()}")
+
+
+class UserKitImageVariantTests(APITestCase):
+    def setUp(self):
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="variant-owner", password="password123")
+        self.viewer = User.objects.create_user(username="variant-viewer", password="password123")
+        self.team = Team.objects.create(name="Variant FC", is_verified=True)
+        self.kit = Kit.objects.create(team=self.team, season="2024/2025", kit_type="Home", estimated_price=Decimal("100.00"))
+        self.userkit = UserKit.objects.create(user=self.user, kit=self.kit, condition="VERY_GOOD", size="L")
+
+    def test_upload_generates_webp_and_jpeg_variants_without_upscaling(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(
+            reverse("api-my-collection"),
+            {
+                "team_name": self.team.name,
+                "season": "2023/2024",
+                "kit_type": "Away",
+                "shirt_version_code": "REPLICA",
+                "size": "L",
+                "condition": "VERY_GOOD",
+                "images": [build_test_image_file("variant.png", (800, 400), mode="RGBA")],
+            },
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 201, response.data)
+        image = UserKitImage.objects.get(user_kit_id=response.data["id"])
+        self.assertEqual(set(image.variants), {"320", "640"})
+        self.assertEqual(set(image.variants["320"]), {"webp", "jpeg"})
+
+        original_stem = os.path.splitext(image.image.name)[0]
+        self.assertEqual(image.variants["320"]["webp"], f"{original_stem}-320w.webp")
+        with image.image.storage.open(image.variants["640"]["jpeg"]) as variant_file:
+            with Image.open(variant_file) as variant:
+                self.assertEqual(variant.format, "JPEG")
+                self.assertEqual(variant.size, (640, 320))
+
+        variants = response.data["images"][0]["variants"]
+        self.assertTrue(variants["320"]["webp"].startswith("http://testserver/media/"))
+        self.assertTrue(variants["320"]["webp"].endswith("-320w.webp"))
+
+    def test_unreadable_upload_keeps_original_without_variants(self):
+        image = UserKitImage.objects.create(
+            user_kit=self.userkit,
+            image=SimpleUploadedFile("broken.jpg", b"not-an-image", content_type="image/jpeg"),
+        )
+
+        with self.assertLogs("kits.image_variants", level="WARNING"):
+            self.assertEqual(generate_image_variants(image), {})
+
+        image.refresh_from_db()
+        self.assertEqual(image.variants, {})
+
+    def test_command_backfills_missing_variants_and_previews_expose_them(self):
+        image = UserKitImage.objects.create(
+            user_kit=self.userkit,
+            image=build_test_image_file("legacy.jpg", (1600, 900), image_format="JPEG"),
+        )
+        stdout = StringIO()
+
+        call_command("generate_image_variants", "--dry-run", stdout=stdout)
+        self.assertIn("1 image(s) need variants.", stdout.getvalue())
+        image.refresh_from_db()
+        self.assertEqual(image.variants, {})
+
+        call_command("generate_image_variants", stdout=StringIO())
+        image.refresh_from_db()
+        self.assertEqual(set(image.variants), {"320", "640", "1280"})
+
+        self.userkit.likes.add(self.viewer)
+        Notification.objects.create(recipient=self.user, actor=self.viewer, type="kit_like", kit=self.userkit)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("notification-list"))
+
+        kit_payload = response.data["results"][0]["kit"]
+        self.assertTrue(kit_payload["preview_image_variants"]["1280"]["jpeg"].endswith("-1280w.jpg"))
+
+        stdout = StringIO()
+        call_command("generate_image_variants", "--dry-run", stdout=stdout)
+        self.assertIn("0 image(s) need variants.", stdout.getvalue())
+
+    def test_stripping_metadata_keeps_the_original_until_the_clean_copy_is_saved(self):
+        image = UserKitImage.objects.create(
+            user_kit=self.userkit,
+            image=build_test_jpeg_with_exif("exif.jpg", (800, 400)),
+        )
+        storage = image.image.storage
+        original_name = image.image.name
+
+        with patch("django.core.files.storage.FileSystemStorage.save", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                strip_image_metadata(image)
+        image.refresh_from_db()
+        self.assertEqual(image.image.name, original_name)
+        self.assertTrue(storage.exists(original_name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(strip_image_metadata(image))
+
+        image.refresh_from_db()
+        self.assertNotEqual(image.image.name, original_name)
+        self.assertFalse(storage.exists(original_name))
+        with image.image.open("rb"):
+            with Image.open(image.image) as cleaned:
+                self.assertEqual(len(cleaned.getexif()), 0)
+
+    def test_deleting_the_kit_removes_variant_files(self):
+        image = UserKitImage.objects.create(
+            user_kit=self.userkit,
+            image=build_test_image_file("removed.png", (800, 400)),
+        )
+        generate_image_variants(image)
+        variant_names = [name for formats in image.variants.values() for name in formats.values()]
+        storage = image.image.storage
+        self.assertEqual(len(variant_names), 4)
+        self.assertTrue(all(storage.exists(name) for name in variant_names))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.userkit.delete()
+
+        self.assertFalse(any(storage.exists(name) for name in variant_names))
+
+
+def build_test_jpeg_with_exif(name, size):
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+    exif[0x010F] = "Budget Camera Co"  # Make
+    buffer = BytesIO()
+    Image.new("RGB", size, (30, 120, 200)).save(buffer, format="JPEG", exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+@override_settings(BACKGROUND_JOBS_EAGER=False)
+class BackgroundJobTests(APITestCase):
+    def setUp(self):
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="job-owner", password="password123")
+        self.user.profile.is_pro = True
+        self.user.profile.save(update_fields=["is_pro"])
+        self.fan = User.objects.create_user(username="job-fan", password="password123")
+        self.team = Team.objects.create(name="Job Town", is_verified=True)
+        Kit.objects.create(team=self.team, season="2022/2023", kit_type="Home", estimated_price=Decimal("80.00"))
+
+    def run_jobs(self):
+        stdout = StringIO()
+        call_command("run_jobs", "--once", stdout=stdout)
+        return stdout.getvalue()
+
+    def test_upload_side_effects_wait_for_the_worker(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(
+            reverse("api-my-collection"),
+            {
+                "team_name": self.team.name,
+                "season": "2022/2023",
+                "kit_type": "Home",
+                "shirt_version_code": "REPLICA",
+                "size": "L",
+                "condition": "VERY_GOOD",
+                "images": [build_test_jpeg_with_exif("exif.jpg", (800, 400))],
+            },
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(
+            sorted(BackgroundJob.objects.values_list("name", flat=True)),
+            [jobs.JOB_PROCESS_USERKIT_IMAGE, jobs.JOB_RECORD_COLLECTION_VALUE_SNAPSHOT],
+        )
+        self.assertEqual(response.data["images"][0]["variants"], {})
+        self.assertFalse(CollectionValueSnapshot.objects.filter(user=self.user).exists())
+
+        self.assertIn("Processed 2 job(s).", self.run_jobs())
+
+        self.assertFalse(BackgroundJob.objects.exclude(status=BackgroundJob.STATUS_SUCCEEDED).exists())
+        snapshot = CollectionValueSnapshot.objects.get(user=self.user)
+        self.assertEqual(snapshot.reason, CollectionValueSnapshot.REASON_KIT_ADDED)
+        self.assertEqual(snapshot.related_userkit_id, response.data["id"])
+
+        image = UserKitImage.objects.get(user_kit_id=response.data["id"])
+        self.assertEqual(set(image.variants), {"320"})
+        with image.image.open("rb"):
+            with Image.open(image.image) as original:
+                self.assertEqual(original.size, (400, 800))
+                self.assertEqual(len(original.getexif()), 0)
+
+    def test_queued_like_notification_is_dropped_if_the_like_is_undone_first(self):
+        userkit = UserKit.objects.create(user=self.user, kit=Kit.objects.get(team=self.team), condition="VERY_GOOD", size="L")
+        self.client.force_authenticate(user=self.fan)
+
+        self.client.post(reverse("toggle-like", args=[userkit.id]))
+        self.client.post(reverse("toggle-like", args=[userkit.id]))
+        self.client.post(reverse("toggle-follow", args=[self.user.username]))
+        self.assertFalse(Notification.objects.exists())
+
+        self.assertIn("Processed 2 job(s).", self.run_jobs())
+
+        self.assertEqual(list(Notification.objects.values_list("type", flat=True)), ["follow"])
+        self.assertEqual(get_unread_counts(self.user)["notifications_unread_count"], 1)
+
+    def test_failed_jobs_retry_with_backoff_until_max_attempts(self):
+        handler = Mock(side_effect=[RuntimeError("boom"), None])
+
+        with patch.dict(jobs._job_handlers, {"flaky": handler}):
+            job = jobs.enqueue_job("flaky", {"value": 1}, max_attempts=2)
+            before = timezone.now()
+            with self.assertLogs("kits.jobs", level="WARNING"):
+                self.assertEqual(jobs.run_pending_jobs("test-worker"), 1)
+
+            job.refresh_from_db()
+            self.assertEqual(job.status, BackgroundJob.STATUS_PENDING)
+            self.assertEqual(job.attempts, 1)
+            self.assertIn("RuntimeError: boom", job.last_error)
+            self.assertGreaterEqual(job.run_after, before + timedelta(seconds=30))
+            self.assertEqual(jobs.run_pending_jobs("test-worker"), 0)
+
+            BackgroundJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            self.assertEqual(jobs.run_pending_jobs("test-worker"), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.attempts, 2)
+        handler.assert_called_with(value=1)
+
+        with patch.dict(jobs._job_handlers, {"broken": Mock(side_effect=RuntimeError("still broken"))}):
+            failing = jobs.enqueue_job("broken", max_attempts=1)
+            with self.assertLogs("kits.jobs", level="ERROR"):
+                jobs.run_pending_jobs("test-worker")
+
+        failing.refresh_from_db()
+        self.assertEqual(failing.status, BackgroundJob.STATUS_FAILED)
+        self.assertIsNotNone(failing.finished_at)
+
+    def test_jobs_left_running_by_a_dead_worker_are_requeued(self):
+        with patch.dict(jobs._job_handlers, {"noop": Mock()}):
+            job = jobs.enqueue_job("noop")
+            BackgroundJob.objects.filter(pk=job.pk).update(
+                status=BackgroundJob.STATUS_RUNNING,
+                attempts=1,
+                locked_at=timezone.now() - timedelta(hours=1),
+                locked_by="dead-worker",
+            )
+
+            self.assertEqual(jobs.run_pending_jobs("test-worker"), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_slow_jobs_use_their_own_stale_window(self):
+        with patch.dict(jobs._job_handlers), patch.dict(jobs._job_stale_windows):
+            jobs.register_job("slow_job", stale_after_seconds=60 * 60)(Mock())
+            slow_job = jobs.enqueue_job("slow_job")
+            BackgroundJob.objects.filter(pk=slow_job.pk).update(
+                status=BackgroundJob.STATUS_RUNNING,
+                attempts=1,
+                locked_at=timezone.now() - timedelta(minutes=30),
+                locked_by="busy-worker",
+            )
+
+            self.assertEqual(jobs.requeue_stale_jobs(), 0)
+            self.assertEqual(jobs.requeue_stale_jobs(now=timezone.now() + timedelta(hours=1)), 1)
+
+    def test_non_atomic_jobs_heartbeat_between_batches(self):
+        heartbeats = []
+
+        def long_job():
+            BackgroundJob.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+            heartbeats.append(jobs.heartbeat_running_job())
+            heartbeats.append(jobs.requeue_stale_jobs())
+
+        with patch.dict(jobs._job_handlers):
+            jobs.register_job("long_job", atomic=False)(long_job)
+            job = jobs.enqueue_job("long_job")
+            self.assertEqual(jobs.run_pending_jobs("test-worker"), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(heartbeats, [True, 0])
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.attempts, 1)
+        self.assertFalse(jobs.heartbeat_running_job())
+
+    @override_settings(BACKGROUND_JOBS_EAGER=True)
+    def test_eager_mode_runs_jobs_inline(self):
+        handler = Mock()
+
+        with patch.dict(jobs._job_handlers, {"inline": handler}):
+            self.assertIsNone(jobs.enqueue_job("inline", {"value": 2}))
+
+        handler.assert_called_once_with(value=2)
+        self.assertFalse(BackgroundJob.objects.exists())
+        with self.assertRaises(ValueError):
+            jobs.enqueue_job("missing")
+
+
+class UserKitRevaluationTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="revalue-owner", password="password123")
+        self.seller = User.objects.create_user(username="revalue-seller", password="password123")
+        self.team = Team.objects.create(name="Revalue FC", is_verified=True)
+        self.kit = Kit.objects.create(team=self.team, season="2020/2021", kit_type="Home", estimated_price=Decimal("100.00"))
+        self.replica = ShirtVersion.objects.get(code="REPLICA")
+        self.player_issue = ShirtVersion.objects.create(
+            code="REVALUE_PLAYER",
+            name="Revalue Player",
+            valuation_multiplier=Decimal("1.500"),
+        )
+
+    def add_userkit(self, user, **overrides):
+        values = {
+            "user": user,
+            "kit": self.kit,
+            "shirt_technology": "REPLICA",
+            "shirt_version": self.replica,
+            "condition": "VERY_GOOD",
+            "size": "L",
+        }
+        values.update(overrides)
+        return UserKit.objects.create(**values)
+
+    def test_kit_price_change_reprices_owned_kits_and_snapshots_each_owner_once(self):
+        large = self.add_userkit(self.owner)
+        small_mint = self.add_userkit(self.owner, size="S", condition="MINT", shirt_version=self.player_issue)
+        legacy = self.add_userkit(self.owner, size="XL", shirt_version=None, shirt_technology="MATCH_WORN")
+        manual = self.add_userkit(self.owner, manual_value=Decimal("42.00"))
+        sold = self.add_userkit(self.seller, condition="GOOD", in_the_collection=False)
+        other_kit = self.add_userkit(
+            self.owner,
+            kit=Kit.objects.create(team=self.team, season="2021/2022", kit_type="Away", estimated_price=Decimal("50.00")),
+        )
+
+        kit = Kit.objects.get(pk=self.kit.pk)
+        kit.estimated_price = Decimal("133.33")
+        kit.save()
+
+        expected = {}
+        for userkit in (large, small_mint, legacy, manual, sold, other_kit):
+            expected[userkit.pk] = UserKit.objects.get(pk=userkit.pk)
+            expected[userkit.pk].save()
+        for userkit in (large, small_mint, legacy, sold):
+            userkit.refresh_from_db()
+            self.assertEqual(userkit.final_value, expected[userkit.pk].final_value)
+        self.assertEqual(large.final_value, Decimal("133.33"))
+        self.assertEqual(small_mint.final_value, Decimal("180.00"))
+        self.assertEqual(legacy.final_value, Decimal("599.98"))
+        manual.refresh_from_db()
+        self.assertEqual(manual.final_value, Decimal("42.00"))
+
+        snapshots = CollectionValueSnapshot.objects.filter(reason=CollectionValueSnapshot.REASON_VALUE_UPDATED)
+        self.assertEqual(list(snapshots.values_list("user__username", flat=True)), ["revalue-owner"])
+        snapshot = snapshots.get()
+        self.assertEqual((snapshot.total_value, snapshot.kits_count), calculate_collection_total_value(self.owner))
+
+    def test_shirt_version_multiplier_change_reprices_its_kits(self):
+        player_kit = self.add_userkit(self.owner, shirt_version=self.player_issue)
+        replica_kit = self.add_userkit(self.owner)
+
+        self.player_issue.valuation_multiplier = Decimal("2.250")
+        self.player_issue.save(update_fields=["valuation_multiplier"])
+
+        player_kit.refresh_from_db()
+        replica_kit.refresh_from_db()
+        self.assertEqual(player_kit.final_value, Decimal("225.00"))
+        self.assertEqual(replica_kit.final_value, Decimal("100.00"))
+
+        self.player_issue.name = "Renamed"
+        self.player_issue.save(update_fields=["name"])
+        self.assertEqual(CollectionValueSnapshot.objects.filter(reason=CollectionValueSnapshot.REASON_VALUE_UPDATED).count(), 1)
+
+    def test_revaluation_runs_a_fixed_number_of_queries_per_batch(self):
+        owners = [User.objects.create_user(username=f"revalue-{index}", password="password123") for index in range(3)]
+        for index in range(30):
+            self.add_userkit(owners[index % 3], size=["S", "M", "L"][index % 3])
+        Kit.objects.filter(pk=self.kit.pk).update(estimated_price=Decimal("80.00"))
+
+        # 3 batch reads + 3 bulk updates + the final empty read, then one aggregate and one insert for snapshots
+        with self.assertNumQueries(9):
+            repriced = revalue_userkits(UserKit.objects.filter(kit=self.kit), batch_size=10)
+
+        self.assertEqual(repriced, 30)
+        self.assertEqual(CollectionValueSnapshot.objects.filter(reason=CollectionValueSnapshot.REASON_VALUE_UPDATED).count(), 3)
+        self.assertEqual(revalue_userkits(UserKit.objects.filter(kit=self.kit), batch_size=10), 0)
+
+    @override_settings(BACKGROUND_JOBS_EAGER=False)
+    def test_price_changes_are_repriced_by_the_worker(self):
+        userkit = self.add_userkit(self.owner)
+
+        kit = Kit.objects.get(pk=self.kit.pk)
+        kit.estimated_price = Decimal("70.00")
+        kit.save(update_fields=["estimated_price"])
+        kit.season = "2020-21"
+        kit.save(update_fields=["season"])
+
+        self.assertEqual(BackgroundJob.objects.get().payload, {"kit_ids": [self.kit.pk], "shirt_version_ids": []})
+        userkit.refresh_from_db()
+        self.assertEqual(userkit.final_value, Decimal("100.00"))
+
+        call_command("run_jobs", "--once", stdout=StringIO())
+
+        userkit.refresh_from_db()
+        self.assertEqual(userkit.final_value, Decimal("70.00"))
+
+    def test_revalue_command_repairs_stale_values(self):
+        userkit = self.add_userkit(self.owner)
+        UserKit.objects.filter(pk=userkit.pk).update(final_value=Decimal("1.00"))
+
+        stdout = StringIO()
+        call_command("revalue_userkits", "--dry-run", stdout=stdout)
+        self.assertIn("1 kit value(s) are out of date.", stdout.getvalue())
+        userkit.refresh_from_db()
+        self.assertEqual(userkit.final_value, Decimal("1.00"))
+
+        stdout = StringIO()
+        call_command("revalue_userkits", "--kit-id", str(self.kit.pk), stdout=stdout)
+        self.assertIn("Repriced 1 kit value(s).", stdout.getvalue())
+        userkit.refresh_from_db()
+        self.assertEqual(userkit.final_value, Decimal("100.00"))
+
+
+class QueryBudgetAPITests(QueryBudgetTestMixin, APITestCase):
+    GROWTH_SIZES = (2, 6)
+    GROWTH_ROUTES = (
+        'api-my-collection',
+        'api-catalog',
+        'explore-kits',
+        'following-feed',
+        'api-user-collection',
+        'kit-variants',
+        'top-kits-by-team',
+        'kit-likers',
+        'kit-comments',
+        'my-collection-value-history',
+        'my-collection-export',
+        'team-search',
+        'kit-search-suggestions',
+        'league-list',
+        'teams-by-league',
+        'approved-team-season-kit-types',
+        'country-list',
+        'user-stats',
+        'user-search',
+        'user-followers',
+        'user-following',
+        'my-wishlist',
+        'user-wishlist',
+        'conversation-list',
+        'conversation-messages',
+        'notification-list',
+        'admin-kit-type-suggestions',
+        'admin-moderation-summary',
+        'admin-kit-type-moderation-actions',
+        'admin-kit-reports',
+        'admin-kit-report-detail',
+        'admin-unverified-teams',
+        'admin-countries',
+        'admin-leagues',
+        'admin-catalog-countries',
+        'admin-catalog-leagues',
+        'admin-catalog-teams',
+    )
+
+    EXPECTED_ERROR_STATUSES = {}
+
+    def setUp(self):
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.client = APIClient()
+        self.owner = User.objects.create_user(username="budget-owner", password="password123")
+        self.owner.profile.is_pro = True
+        self.owner.profile.show_collection_value_publicly = True
+        self.owner.profile.save(update_fields=["is_pro", "show_collection_value_publicly"])
+        self.viewer = User.objects.create_user(username="budget-viewer", password="password123")
+        self.staff = User.objects.create_user(username="budget-staff", password="password123", is_staff=True)
+
+        self.country = Country.objects.create(name="Budgetland", code="BGL")
+        self.league = League.objects.create(name="Budget League", country=self.country)
+        self.team = Team.objects.create(name="Budget FC", country=self.country, league=self.league, is_verified=True)
+        self.target_team = Team.objects.create(name="Budget United", country=self.country, is_verified=True)
+        self.unverified_team = Team.objects.create(name="Budget Rovers", country=self.country)
+        self.home_type = KitType.objects.get(canonical_code="HOME")
+        self.pending_type = KitType.objects.create(
+            name="Budget Tribute",
+            slug="budget-tribute",
+            category=KitType.CATEGORY_OTHER,
+            status=KitType.STATUS_PENDING,
+            default_visibility=KitType.VISIBILITY_NONE,
+            created_by=self.owner,
+        )
+        self.pending_suggestion = TeamSeasonKitType.objects.create(
+            team=self.team,
+            season="2024/2025",
+            kit_type=self.pending_type,
+            status=TeamSeasonKitType.STATUS_PENDING,
+            source=TeamSeasonKitType.SOURCE_UPLOAD,
+            created_by=self.owner,
+        )
+
+        Follow.objects.create(follower=self.viewer, following=self.owner)
+        self.conversation = Conversation.get_or_create_between(self.viewer, self.owner)
+        self.userkits = []
+        self.followers = []
+        self.seed(1)
+        self.first_kit = self.userkits[0]
+        self.comment = KitComment.objects.get(kit=self.first_kit, user=self.viewer)
+        self.report = KitReport.objects.get(kit=self.first_kit, reporter=self.viewer)
+
+    def seed(self, size):
+        for index in range(len(self.userkits), size):
+            kit = Kit.objects.create(
+                team=self.team,
+                season=f"20{10 + index}/20{11 + index}",
+                kit_type="Home",
+                kit_type_ref=self.home_type,
+                estimated_price=Decimal("100.00"),
+            )
+            userkit = UserKit.objects.create(
+                user=self.owner,
+                kit=kit,
+                shirt_technology="REPLICA",
+                shirt_version=ShirtVersion.objects.get(code="REPLICA"),
+                condition="VERY_GOOD",
+                size="L",
+                for_sale=True,
+            )
+            UserKitImage.objects.create(
+                user_kit=userkit,
+                image=SimpleUploadedFile(f"budget-{index}.jpg", b"budget", content_type="image/jpeg"),
+                order=0,
+            )
+            userkit.likes.add(self.viewer, self.staff)
+            comment = KitComment.objects.create(kit=userkit, user=self.viewer, body=f"Comment {index}")
+            KitComment.objects.create(kit=userkit, user=self.owner, parent=comment, body=f"Reply {index}")
+            KitReport.objects.create(kit=userkit, reporter=self.viewer, reason="spam")
+            self.userkits.append(userkit)
+
+            follower = User.objects.create_user(username=f"budget-follower-{index}", password="password123")
+            Follow.objects.create(follower=follower, following=self.owner)
+            Follow.objects.create(follower=self.owner, following=follower)
+            Conversation.get_or_create_between(follower, self.viewer)
+            self.followers.append(follower)
+
+            for user in (self.owner, self.viewer):
+                WishlistItem.objects.create(user=user, team=self.team, season=kit.season, kit_type="Away")
+            Message.objects.create(conversation=self.conversation, sender=self.owner, body=f"Message {index}")
+            Notification.objects.create(recipient=self.viewer, actor=follower, type="follow")
+            Country.objects.create(name=f"Budget Country {index}", code=f"B{index:02d}")
+            League.objects.create(name=f"Budget League {index}", country=self.country)
+            Team.objects.create(name=f"Budget Town {index}", country=self.country, league=self.league, is_verified=index % 2 == 0)
+            pending_type = KitType.objects.create(
+                name=f"Budget Special {index}",
+                slug=f"budget-special-{index}",
+                category=KitType.CATEGORY_OTHER,
+                status=KitType.STATUS_PENDING,
+                default_visibility=KitType.VISIBILITY_NONE,
+                created_by=self.owner,
+            )
+            TeamSeasonKitType.objects.create(
+                team=self.team,
+                season=kit.season,
+                kit_type=pending_type,
+                status=TeamSeasonKitType.STATUS_PENDING,
+                source=TeamSeasonKitType.SOURCE_UPLOAD,
+                created_by=self.owner,
+            )
+            TeamSeasonKitType.objects.create(
+                team=self.team,
+                season=kit.season,
+                kit_type=self.home_type,
+                status=TeamSeasonKitType.STATUS_APPROVED,
+                source=TeamSeasonKitType.SOURCE_UPLOAD,
+                created_by=self.owner,
+            )
+            CollectionValueSnapshot.objects.create(
+                user=self.owner,
+                total_value=Decimal("100.00") * (index + 1),
+                kits_count=index + 1,
+                reason=CollectionValueSnapshot.REASON_KIT_ADDED,
+            )
+
+    def hide_first_kit(self):
+        UserKit.objects.filter(pk=self.first_kit.pk).update(is_hidden_by_moderation=True)
+        return self.first_kit.id
+
+    def approve_pending_suggestion(self):
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.post(reverse("admin-team-season-kit-type-approve", args=[self.pending_suggestion.id]))
+        return response.data["moderation_action_id"]
+
+    def route_requests(self):
+        owner = self.owner.username
+        return {
+            "api-my-collection": lambda: (self.owner, "get", reverse("api-my-collection"), None),
+            "api-my-collection-detail": lambda: (self.owner, "get", reverse("api-my-collection-detail", args=[self.first_kit.id]), None),
+            "removed-kit-detail": lambda: (self.owner, "get", reverse("removed-kit-detail", args=[self.hide_first_kit()]), None),
+            "api-catalog": lambda: (self.viewer, "get", reverse("api-catalog"), None),
+            "explore-kits": lambda: (self.viewer, "get", reverse("explore-kits"), None),
+            "following-feed": lambda: (self.viewer, "get", reverse("following-feed"), None),
+            "api-user-collection": lambda: (self.viewer, "get", reverse("api-user-collection", args=[owner]), None),
+            # Google credentials are not configured in tests, so skip the token exchange
+            "google_login": lambda: (None, "get", reverse("google_login"), None),
+            "kit-options": lambda: (None, "get", reverse("kit-options"), None),
+            "team-search": lambda: (self.viewer, "get", reverse("team-search"), {"q": "Budget"}),
+            "team-resolve": lambda: (None, "get", reverse("team-resolve", args=[self.team.slug]), None),
+            "admin-kit-type-suggestions": lambda: (self.staff, "get", reverse("admin-kit-type-suggestions"), None),
+            "admin-moderation-summary": lambda: (self.staff, "get", reverse("admin-moderation-summary"), None),
+            "admin-kit-type-moderation-actions": lambda: (self.staff, "get", reverse("admin-kit-type-moderation-actions"), None),
+            "admin-kit-type-moderation-action-undo": lambda: (
+                self.staff,
+                "post",
+                reverse("admin-kit-type-moderation-action-undo", args=[self.approve_pending_suggestion()]),
+                {},
+            ),
+            "admin-kit-reports": lambda: (self.staff, "get", reverse("admin-kit-reports"), None),
+            "admin-kit-report-detail": lambda: (self.staff, "get", reverse("admin-kit-report-detail", args=[self.first_kit.id]), None),
+            "admin-kit-report-dismiss": lambda: (self.staff, "post", reverse("admin-kit-report-dismiss", args=[self.first_kit.id]), {"note": "Fine."}),
+            "admin-kit-report-remove-kit": lambda: (self.staff, "post", reverse("admin-kit-report-remove-kit", args=[self.first_kit.id]), {"note": "Removed."}),
+            "admin-kit-report-bulk-dismiss": lambda: (
+                self.staff,
+                "post",
+                reverse("admin-kit-report-bulk-dismiss"),
+                {"ids": [userkit.id for userkit in self.userkits], "note": "Fine."},
+            ),
+            "admin-kit-report-bulk-remove-kit": lambda: (
+                self.staff,
+                "post",
+                reverse("admin-kit-report-bulk-remove-kit"),
+                {"ids": [userkit.id for userkit in self.userkits], "note": "Removed."},
+            ),
+            "admin-team-season-kit-type-approve": lambda: (self.staff, "post", reverse("admin-team-season-kit-type-approve", args=[self.pending_suggestion.id]), {}),
+            "admin-team-season-kit-type-reject": lambda: (self.staff, "post", reverse("admin-team-season-kit-type-reject", args=[self.pending_suggestion.id]), {}),
+            "admin-team-season-kit-type-bulk-approve": lambda: (
+                self.staff,
+                "post",
+                reverse("admin-team-season-kit-type-bulk-approve"),
+                {"ids": list(TeamSeasonKitType.objects.filter(status=TeamSeasonKitType.STATUS_PENDING).values_list("id", flat=True))},
+            ),
+            "admin-team-season-kit-type-bulk-reject": lambda: (
+                self.staff,
+                "post",
+                reverse("admin-team-season-kit-type-bulk-reject"),
+                {"ids": list(TeamSeasonKitType.objects.filter(status=TeamSeasonKitType.STATUS_PENDING).values_list("id", flat=True))},
+            ),
+            "admin-team-season-kit-type-merge": lambda: (
+                self.staff,
+                "post",
+                reverse("admin-team-season-kit-type-merge", args=[self.pending_suggestion.id]),
+                {"target_kit_type_id": self.home_type.id},
+            ),
+            "admin-unverified-teams": lambda: (self.staff, "get", reverse("admin-unverified-teams"), None),
+            "admin-countries": lambda: (self.staff, "get", reverse("admin-countries"), None),
+            "admin-leagues": lambda: (self.staff, "get", reverse("admin-leagues"), None),
+            "admin-catalog-countries": lambda: (self.staff, "get", reverse("admin-catalog-countries"), None),
+            "admin-catalog-country-detail": lambda: (self.staff, "get", reverse("admin-catalog-country-detail", args=[self.country.id]), None),
+            "admin-catalog-leagues": lambda: (self.staff, "get", reverse("admin-catalog-leagues"), None),
+            "admin-catalog-league-detail": lambda: (self.staff, "get", reverse("admin-catalog-league-detail", args=[self.league.id]), None),
+            "admin-catalog-teams": lambda: (self.staff, "get", reverse("admin-catalog-teams"), None),
+            "admin-catalog-team-detail": lambda: (self.staff, "get", reverse("admin-catalog-team-detail", args=[self.team.id]), None),
+            "admin-team-approve": lambda: (
+                self.staff,
+                "post",
+                reverse("admin-team-approve", args=[self.unverified_team.id]),
+                {"name": self.unverified_team.name, "country_id": self.country.id},
+            ),
+            "admin-team-merge": lambda: (
+                self.staff,
+                "post",
+                reverse("admin-team-merge", args=[self.unverified_team.id]),
+                {"target_team_id": self.target_team.id},
+            ),
+            "admin-team-reject": lambda: (self.staff, "post", reverse("admin-team-reject", args=[self.unverified_team.id]), {}),
+            "admin-team-delete-content": lambda: (
+                self.staff,
+                "post",
+                reverse("admin-team-delete-content", args=[self.unverified_team.id]),
+                {"confirmation": self.unverified_team.name, "reason": "spam", "note": ""},
+            ),
+            "admin-team-deletion-detail": lambda: (
+                self.staff,
+                "get",
+                reverse("admin-team-deletion-detail", args=[self.build_team_deletion_job().id]),
+                None,
+            ),
+            "kit-search-suggestions": lambda: (None, "get", reverse("kit-search-suggestions"), {"q": "Budget"}),
+            "user-stats": lambda: (self.viewer, "get", reverse("user-stats", args=[owner]), None),
+            "my-collection-value-history": lambda: (self.owner, "get", reverse("my-collection-value-history"), None),
+            "my-collection-export": lambda: (self.owner, "get", reverse("my-collection-export"), None),
+            "my-collection-export-jobs": lambda: (self.owner, "post", reverse("my-collection-export-jobs"), {"format": "xlsx"}),
+            "my-collection-export-job-detail": lambda: (
+                self.owner,
+                "get",
+                reverse("my-collection-export-job-detail", args=[self.build_finished_export_job().id]),
+                None,
+            ),
+            "my-collection-export-job-download": lambda: (
+                self.owner,
+                "get",
+                reverse("my-collection-export-job-download", args=[self.build_finished_export_job().id]),
+                None,
+            ),
+            "my-wishlist": lambda: (self.owner, "get", reverse("my-wishlist"), None),
+            "user-wishlist": lambda: (self.viewer, "get", reverse("user-wishlist", args=[owner]), None),
+            "wishlist-toggle": lambda: (
+                self.viewer,
+                "post",
+                reverse("wishlist-toggle"),
+                {"team_id": self.target_team.id, "season": "1999/2000", "kit_type": "Away"},
+            ),
+            "wishlist-detail": lambda: (
+                self.viewer,
+                "delete",
+                reverse("wishlist-detail", args=[WishlistItem.objects.filter(user=self.viewer).first().id]),
+                None,
+            ),
+            "user-search": lambda: (None, "get", reverse("user-search"), {"q": "budget"}),
+            "conversation-list": lambda: (self.viewer, "get", reverse("conversation-list"), None),
+            "conversation-start": lambda: (self.viewer, "post", reverse("conversation-start"), {"username": self.staff.username}),
+            "conversation-unread-count": lambda: (self.viewer, "get", reverse("conversation-unread-count"), None),
+            "conversation-detail": lambda: (self.viewer, "get", reverse("conversation-detail", args=[self.conversation.id]), None),
+            "conversation-messages": lambda: (self.viewer, "get", reverse("conversation-messages", args=[self.conversation.id]), None),
+            "notification-list": lambda: (self.viewer, "get", reverse("notification-list"), None),
+            "notification-unread-count": lambda: (self.viewer, "get", reverse("notification-unread-count"), None),
+            "notification-mark-read": lambda: (self.viewer, "post", reverse("notification-mark-read"), {}),
+            "unread-counts-stream": lambda: (self.viewer, "get", reverse("unread-counts-stream"), None),
+            "update-profile": lambda: (self.viewer, "get", reverse("update-profile"), None),
+            "current-user": lambda: (self.viewer, "get", reverse("current-user"), None),
+            "kit-detail": lambda: (self.viewer, "get", reverse("kit-detail", args=[self.first_kit.id]), None),
+            "toggle-like": lambda: (self.owner, "post", reverse("toggle-like", args=[self.first_kit.id]), {}),
+            "kit-report": lambda: (self.staff, "post", reverse("kit-report", args=[self.first_kit.id]), {"reason": "spam"}),
+            "kit-comments": lambda: (self.viewer, "get", reverse("kit-comments", args=[self.first_kit.id]), None),
+            "comment-reply": lambda: (self.owner, "post", reverse("comment-reply", args=[self.comment.id]), {"body": "Thanks"}),
+            "comment-like": lambda: (self.owner, "post", reverse("comment-like", args=[self.comment.id]), {}),
+            "comment-delete": lambda: (self.viewer, "delete", reverse("comment-delete", args=[self.comment.id]), None),
+            "league-list": lambda: (None, "get", reverse("league-list"), None),
+            "teams-by-league": lambda: (None, "get", reverse("teams-by-league", args=[self.league.id]), None),
+            "top-kits-by-team": lambda: (self.viewer, "get", reverse("top-kits-by-team", args=[self.team.id]), None),
+            "approved-team-season-kit-types": lambda: (None, "get", reverse("approved-team-season-kit-types", args=[self.team.id]), None),
+            "check-username": lambda: (self.viewer, "get", reverse("check-username"), {"q": "budget-owner"}),
+            "country-list": lambda: (None, "get", reverse("country-list"), None),
+            "toggle-follow": lambda: (self.staff, "post", reverse("toggle-follow", args=[owner]), {}),
+            "kit-variants": lambda: (self.viewer, "get", reverse("kit-variants", args=[self.team.slug]), None),
+            "user-followers": lambda: (self.viewer, "get", reverse("user-followers", args=[owner]), None),
+            "user-following": lambda: (self.viewer, "get", reverse("user-following", args=[owner]), None),
+            "kit-likers": lambda: (self.viewer, "get", reverse("kit-likers", args=[self.first_kit.id]), None),
+        }
+
+    def authenticate_with_cookie(self, user):
+        # Real JWT cookie auth, so budgets include the user lookup the middleware sees
+        self.client.force_authenticate(user=None)
+        cookie_name = settings.REST_AUTH["JWT_AUTH_COOKIE"]
+        self.client.cookies.pop(cookie_name, None)
+        if user is not None:
+            self.client.cookies[cookie_name] = str(AccessToken.for_user(user))
+
+    def build_finished_export_job(self):
+        export_job = CollectionExportJob.objects.create(user=self.owner, export_format=CollectionExportJob.FORMAT_CSV)
+        jobs.build_collection_export(export_job.id)
+        return export_job
+
+    def build_team_deletion_job(self):
+        return TeamDeletionJob.objects.create(
+            team=self.unverified_team,
+            team_id_snapshot=self.unverified_team.id,
+            team_name=self.unverified_team.name,
+            actor=self.staff,
+            reason="spam",
+        )
+
+    def build_route_request(self, url_name):
+        user, method, url, data = self.route_requests()[url_name]()
+        self.authenticate_with_cookie(user)
+        cache.clear()
+        if method == "get":
+            return lambda: self.client.get(url, data)
+        return lambda: getattr(self.client, method)(url, data, format="json")
+
+    def test_budget_table_covers_every_kits_route(self):
+        route_names = {
+            pattern.name
+            for pattern in get_resolver("kits.urls").url_patterns
+            if getattr(pattern, "name", None)
+        }
+
+        self.assertEqual(set(QUERY_BUDGETS), route_names)
+        self.assertEqual(set(self.route_requests()), route_names)
+        self.assertTrue(set(self.GROWTH_ROUTES) <= route_names)
+
+    def test_every_route_stays_within_its_query_budget(self):
+        self.seed(3)
+
+        for url_name in sorted(self.route_requests()):
+            with self.subTest(route=url_name):
+                with transaction.atomic():
+                    make_request = self.build_route_request(url_name)
+                    response, _recorder = self.assertWithinQueryBudget(url_name, make_request)
+                    expected_status = self.EXPECTED_ERROR_STATUSES.get(url_name)
+                    if expected_status is None:
+                        self.assertLess(response.status_code, 400, getattr(response, "data", None))
+                    else:
+                        self.assertEqual(response.status_code, expected_status)
+                    transaction.set_rollback(True)
+
+    def test_list_routes_keep_constant_query_counts_as_data_grows(self):
+        seeded_userkits = list(self.userkits)
+        seeded_followers = list(self.followers)
+
+        for url_name in self.GROWTH_ROUTES:
+            with self.subTest(route=url_name):
+                # Each route grows its own dataset from the same starting point
+                with transaction.atomic():
+                    self.assertConstantQueryCount(
+                        url_name,
+                        lambda: self.build_route_request(url_name),
+                        self.GROWTH_SIZES,
+                        self.seed,
+                    )
+                    transaction.set_rollback(True)
+            self.userkits = list(seeded_userkits)
+            self.followers = list(seeded_followers)
+
+    def test_kit_lists_resolve_is_liked_for_the_viewer_in_one_page_query(self):
+        self.seed(3)
+        self.userkits[1].likes.remove(self.viewer)
+        url = reverse("api-user-collection", args=[self.owner.username])
+
+        self.client.force_authenticate(user=self.viewer)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        liked = {item["id"]: item["is_liked"] for item in response.data}
+        self.assertEqual(liked, {
+            self.userkits[0].id: True,
+            self.userkits[1].id: False,
+            self.userkits[2].id: True,
+        })
+        like_queries = [query["sql"] for query in queries.captured_queries if "kits_userkit_likes" in query["sql"]]
+        self.assertEqual(len(like_queries), 1)
+
+        self.client.force_authenticate(user=None)
+        response = self.client.get(url)
+        self.assertFalse(any(item["is_liked"] for item in response.data))
+
+    @override_settings(QUERY_BUDGET_ENABLED=True)
+    def test_middleware_reports_query_count_and_logs_over_budget_views(self):
+        client = APIClient()
+        client.force_authenticate(user=self.viewer)
+
+        with patch.dict(QUERY_BUDGETS, {"user-stats": 1}):
+            with self.assertLogs("kits.query_budget", level="WARNING") as logs:
+                response = client.get(reverse("user-stats", args=[self.owner.username]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response["X-Query-Count"]), 1)
+        self.assertIn("X-Query-Time-Ms", response)
+        self.assertIn("Query budget exceeded", logs.output[0])
+        self.assertIn("(user-stats)", logs.output[0])
+
+    @override_settings(QUERY_BUDGET_ENABLED=True)
+    def test_middleware_counts_the_cookie_authentication_lookup(self):
+        client = APIClient()
+        client.cookies[settings.REST_AUTH["JWT_AUTH_COOKIE"]] = str(AccessToken.for_user(self.viewer))
+
+        with self.assertNoLogs("kits.query_budget", level="WARNING"):
+            response = client.get(reverse("current-user"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["username"], self.viewer.username)
+        self.assertEqual(int(response["X-Query-Count"]), QUERY_BUDGETS["current-user"])
+
+    def test_middleware_is_disabled_by_default(self):
+        response = self.client.get(reverse("country-list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Query-Count", response)
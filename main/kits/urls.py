@@ -22,8 +22,12 @@ from .views import (
     AdminKitReportDetailAPI,
     AdminKitReportDismissAPI,
     AdminKitReportRemoveKitAPI,
+    AdminKitReportBulkDismissAPI,
+    AdminKitReportBulkRemoveKitAPI,
     AdminTeamSeasonKitTypeApproveAPI,
     AdminTeamSeasonKitTypeRejectAPI,
+    AdminTeamSeasonKitTypeBulkApproveAPI,
+    AdminTeamSeasonKitTypeBulkRejectAPI,
     AdminTeamSeasonKitTypeMergeAPI,
     AdminUnverifiedTeamsAPI,
     AdminCountriesAPI,
@@ -38,9 +42,13 @@ from .views import (
     AdminTeamMergeAPI,
     AdminTeamRejectAPI,
     AdminTeamDeleteContentAPI,
+    AdminTeamDeletionJobDetailAPI,
     UserCollectionStatsAPI,
     MyCollectionValueHistoryAPI,
     MyCollectionExportAPI,
+    MyCollectionExportJobListAPI,
+    MyCollectionExportJobDetailAPI,
+    MyCollectionExportJobDownloadAPI,
     MyWishlistAPI,
     UserWishlistAPI,
     WishlistDetailAPI,
@@ -55,6 +63,7 @@ from .views import (
     NotificationListAPI,
     NotificationUnreadCountAPI,
     MarkNotificationsReadAPI,
+    unread_counts_stream,
     UpdateProfileView,
     CurrentUserAPI,
     ToggleLikeAPI,
@@ -94,9 +103,13 @@ urlpatterns = [
     path('admin/kit-type-moderation-actions/', AdminKitTypeModerationActionsAPI.as_view(), name='admin-kit-type-moderation-actions'),
     path('admin/kit-type-moderation-actions/<int:pk>/undo/', AdminKitTypeModerationActionUndoAPI.as_view(), name='admin-kit-type-moderation-action-undo'),
     path('admin/reports/', AdminKitReportsAPI.as_view(), name='admin-kit-reports'),
+    path('admin/reports/bulk/dismiss/', AdminKitReportBulkDismissAPI.as_view(), name='admin-kit-report-bulk-dismiss'),
+    path('admin/reports/bulk/remove-kit/', AdminKitReportBulkRemoveKitAPI.as_view(), name='admin-kit-report-bulk-remove-kit'),
     path('admin/reports/<int:pk>/', AdminKitReportDetailAPI.as_view(), name='admin-kit-report-detail'),
     path('admin/reports/<int:pk>/dismiss/', AdminKitReportDismissAPI.as_view(), name='admin-kit-report-dismiss'),
     path('admin/reports/<int:pk>/remove-kit/', AdminKitReportRemoveKitAPI.as_view(), name='admin-kit-report-remove-kit'),
+    path('admin/team-season-kit-types/bulk/approve/', AdminTeamSeasonKitTypeBulkApproveAPI.as_view(), name='admin-team-season-kit-type-bulk-approve'),
+    path('admin/team-season-kit-types/bulk/reject/', AdminTeamSeasonKitTypeBulkRejectAPI.as_view(), name='admin-team-season-kit-type-bulk-reject'),
     path('admin/team-season-kit-types/<int:pk>/approve/', AdminTeamSeasonKitTypeApproveAPI.as_view(), name='admin-team-season-kit-type-approve'),
     path('admin/team-season-kit-types/<int:pk>/reject/', AdminTeamSeasonKitTypeRejectAPI.as_view(), name='admin-team-season-kit-type-reject'),
     path('admin/team-season-kit-types/<int:pk>/merge/', AdminTeamSeasonKitTypeMergeAPI.as_view(), name='admin-team-season-kit-type-merge'),
@@ -113,10 +126,14 @@ urlpatterns = [
     path('admin/teams/<int:team_id>/merge/', AdminTeamMergeAPI.as_view(), name='admin-team-merge'),
     path('admin/teams/<int:team_id>/reject/', AdminTeamRejectAPI.as_view(), name='admin-team-reject'),
     path('admin/teams/<int:team_id>/delete-content/', AdminTeamDeleteContentAPI.as_view(), name='admin-team-delete-content'),
+    path('admin/team-deletions/<int:deletion_job_id>/', AdminTeamDeletionJobDetailAPI.as_view(), name='admin-team-deletion-detail'),
     path('search/kits/', KitSearchSuggestionsAPI.as_view(), name='kit-search-suggestions'),
     path('user-stats/<str:username>/', UserCollectionStatsAPI.as_view(), name='user-stats'),
     path('me/collection-value-history/', MyCollectionValueHistoryAPI.as_view(), name='my-collection-value-history'),
     path('me/collection/export/', MyCollectionExportAPI.as_view(), name='my-collection-export'),
+    path('me/collection/export/jobs/', MyCollectionExportJobListAPI.as_view(), name='my-collection-export-jobs'),
+    path('me/collection/export/jobs/<int:pk>/', MyCollectionExportJobDetailAPI.as_view(), name='my-collection-export-job-detail'),
+    path('me/collection/export/jobs/<int:pk>/download/', MyCollectionExportJobDownloadAPI.as_view(), name='my-collection-export-job-download'),
     path('me/wishlist/', MyWishlistAPI.as_view(), name='my-wishlist'),
     path('users/<str:username>/wishlist/', UserWishlistAPI.as_view(), name='user-wishlist'),
     path('wishlist/toggle/', WishlistToggleAPI.as_view(), name='wishlist-toggle'),
@@ -130,6 +147,7 @@ urlpatterns = [
     path('notifications/', NotificationListAPI.as_view(), name='notification-list'),
     path('notifications/unread-count/', NotificationUnreadCountAPI.as_view(), name='notification-unread-count'),
     path('notifications/mark-read/', MarkNotificationsReadAPI.as_view(), name='notification-mark-read'),
+    path('unread-counts/stream/', unread_counts_stream, name='unread-counts-stream'),
     path('profile/update/', UpdateProfileView.as_view(), name='update-profile'),
     path('auth/user/', CurrentUserAPI.as_view(), name='current-user'),
     path('kits/<int:userkit_id>/', PublicUserKitDetailAPI.as_view(), name='kit-detail'),
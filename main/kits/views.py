@@ -4,33 +4,46 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.parsers import JSONParser
-from rest_framework.exceptions import ValidationError, PermissionDenied
+from rest_framework.exceptions import APIException, ValidationError, PermissionDenied
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
 
 from rest_framework.throttling import ScopedRateThrottle
 from .throttles import KitCreationThrottle
+from .catalog_cache import CATALOG_COUNTRIES, CATALOG_KIT_TYPES, CATALOG_LEAGUES, CATALOG_PUBLIC_KITS, CATALOG_SHIRT_VERSIONS, CATALOG_TEAM_SEASON_KIT_TYPES, CATALOG_TEAMS, CatalogCacheMixin, bump_catalog_versions, get_cached_catalog_payload, get_catalog_versions
+from .conditional import get_conditional_response
+from .image_variants import get_image_variant_urls
+from .jobs import enqueue_collection_export, enqueue_collection_value_snapshot, enqueue_notification
+from .realtime import stream_unread_events
 
 import csv
+import heapq
 import re
+import tempfile
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from datetime import date, datetime
 from decimal import Decimal, ROUND_HALF_UP
-from io import BytesIO
+from itertools import islice
 from xml.sax.saxutils import escape
 from zipfile import ZIP_DEFLATED, ZipFile
 from django.shortcuts import get_object_or_404
 from django.db import IntegrityError, transaction
 from django.db.models import Sum, Count, Exists, OuterRef, Value, BooleanField, Prefetch, Q, Subquery, Max
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
-from django.http import HttpResponse
+from django.core.files import File
+from asgiref.sync import sync_to_async
+from django.http import FileResponse, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-from django.utils.dateparse import parse_datetime
+from django.utils.dateparse import parse_date, parse_datetime
 from urllib.parse import urlencode
 
-from .models import League, UserKit, UserKitImage, WishlistItem, Kit, KitType, KitTypeAlias, TeamSeasonKitType, KitTypeModerationAction, TeamModerationAction, ShirtVersion, SIZE_CHOICES, CONDITION_CHOICES, SHIRT_TECHNOLOGIES, SHIRT_TYPES, Team, Profile, Country, Follow, KitComment, KitCommentLike, KitReport, KitReportModerationAction, Conversation, Message, Notification, CollectionValueSnapshot, calculate_collection_total_value, collection_value_history_needs_hidden_kit_rebuild, record_collection_value_snapshot, rebuild_collection_value_history, build_team_slug, normalize_wishlist_kit_type
+from .models import League, UserKit, KitRanking, UserKitImage, WishlistItem, Kit, KitType, KitTypeAlias, TeamSeasonKitType, KitTypeModerationAction, TeamModerationAction, TeamDeletionJob, ShirtVersion, SIZE_CHOICES, CONDITION_CHOICES, SHIRT_TECHNOLOGIES, SHIRT_TYPES, Team, Profile, Country, Follow, KitComment, KitCommentLike, KitReport, KitReportModerationAction, Conversation, Message, Notification, ConversationUnreadCounter, FollowingFeedEntry, KitReportSummary, CollectionValueSnapshot, CollectionValueRollup, CollectionExportJob, adjust_unread_message_counters, fail_abandoned_collection_exports, adjust_unread_notification_counter, get_unread_counts, calculate_collection_total_value, collection_value_history_is_stale, get_collection_value_contribution, get_collection_value_history_buckets, adjust_moderation_stats, get_kit_report_search_candidate_ids, get_moderation_stats, mark_collection_value_history_stale, record_collection_value_snapshot, rebuild_collection_value_history, refresh_kit_rankings, refresh_kit_report_summaries, sync_following_feed_entries, get_team_search_candidate_ids, get_team_slug, normalize_wishlist_kit_type
 from .permissions import IsStaffOrModerator, IsStaffOrSuperuser, can_undo_moderation_action, has_pro_access, moderation_action_is_currently_undoable, is_staff_or_moderator
-from .serializers import LeagueSerializer, UserKitSerializer, WishlistItemSerializer, WishlistToggleSerializer, KitSerializer, TeamSerializer, UserSearchSerializer, ProfileSerializer, UserSerializer, UserStatsProfileSerializer, CountrySerializer, KitCommentSerializer, KitCommentWriteSerializer, KitReportSerializer, AdminKitReportDecisionSerializer, AdminKitReportGroupListSerializer, AdminKitReportGroupDetailSerializer, ConversationListSerializer, ConversationDetailSerializer, ConversationStartSerializer, MessageSerializer, MessageWriteSerializer, KitSearchSuggestionSerializer, NotificationSerializer, RemovedKitDetailSerializer, CollectionValueSnapshotSerializer, AdminKitTypeSuggestionSerializer, AdminKitTypeMergeSerializer, TeamModerationListSerializer, TeamModerationMergeSerializer, TeamModerationActionSerializer, KitTypeModerationActionSerializer, ApprovedTeamSeasonKitTypeSerializer, normalize_catalog_name, AdminCountryCreateSerializer, AdminLeagueCreateSerializer, TeamModerationApproveSerializer, TeamModerationDeleteContentSerializer, CatalogCountrySerializer, CatalogCountryWriteSerializer, CatalogLeagueSerializer, CatalogLeagueWriteSerializer, CatalogTeamSerializer, CatalogTeamWriteSerializer
-from .team_moderation import TeamModerationConflict, TEAM_MERGE_UNDO_BLOCK_REASON, TEAM_REJECT_UNDO_BLOCK_REASON, approve_team, build_team_reject_block_reason, delete_team_and_associated_content, get_team_usage, merge_teams_safely, normalize_team_name_for_matching, reject_unused_team, team_name_tokens
+from .serializers import LeagueSerializer, UserKitSerializer, WishlistItemSerializer, WishlistToggleSerializer, KitSerializer, TeamSerializer, UserSearchSerializer, ProfileSerializer, UserSerializer, UserStatsProfileSerializer, CountrySerializer, KitCommentSerializer, KitCommentWriteSerializer, KitReportSerializer, AdminKitReportDecisionSerializer, AdminKitReportBulkDecisionSerializer, AdminBulkModerationSerializer, AdminKitReportGroupListSerializer, AdminKitReportGroupDetailSerializer, ConversationListSerializer, ConversationDetailSerializer, ConversationStartSerializer, MessageSerializer, MessageWriteSerializer, KitSearchSuggestionSerializer, NotificationSerializer, RemovedKitDetailSerializer, CollectionValueSnapshotSerializer, CollectionValueHistoryBucketSerializer, CollectionExportJobSerializer, AdminKitTypeSuggestionSerializer, AdminKitTypeMergeSerializer, TeamModerationListSerializer, TeamModerationMergeSerializer, TeamModerationActionSerializer, KitTypeModerationActionSerializer, ApprovedTeamSeasonKitTypeSerializer, normalize_catalog_name, AdminCountryCreateSerializer, AdminLeagueCreateSerializer, TeamModerationApproveSerializer, TeamModerationDeleteContentSerializer, TeamDeletionJobSerializer, CatalogCountrySerializer, CatalogCountryWriteSerializer, CatalogLeagueSerializer, CatalogLeagueWriteSerializer, CatalogTeamSerializer, CatalogTeamWriteSerializer
+from .team_moderation import TeamModerationConflict, TEAM_MERGE_UNDO_BLOCK_REASON, TEAM_REJECT_UNDO_BLOCK_REASON, approve_team, build_team_reject_block_reason, delete_team_and_associated_content, get_team_usage, get_team_usage_map, merge_teams_safely, normalize_team_name_for_matching, reject_unused_team, start_chunked_team_deletion, team_name_tokens
 
 
 SUPPORTED_KIT_TYPES = [
@@ -379,8 +392,14 @@ def apply_kit_type_snapshot(kit_type, snapshot):
     kit_type.save(update_fields=['status', 'approved_by', 'approved_at', 'merged_into'])
 
 
-def build_moderation_action_record(*, actor, action_type, suggestion=None, source_kit_type=None, target_kit_type=None, team_name=None, season=None, previous_state=None, resulting_state=None, is_reversible=True, undo_block_reason=''):
-    return KitTypeModerationAction.objects.create(
+def build_moderation_action_record(**kwargs):
+    action = new_moderation_action_record(**kwargs)
+    action.save(force_insert=True)
+    return action
+
+
+def new_moderation_action_record(*, actor, action_type, suggestion=None, source_kit_type=None, target_kit_type=None, team_name=None, season=None, previous_state=None, resulting_state=None, is_reversible=True, undo_block_reason=''):
+    return KitTypeModerationAction(
         actor=actor,
         action_type=action_type,
         team_season_kit_type=suggestion,
@@ -461,7 +480,7 @@ def get_generated_seasons():
 
 
 def get_generated_suggestion(team, season, kit_type):
-    team_slug = build_team_slug(team.name)
+    team_slug = get_team_slug(team)
     query_string = urlencode({
         'season': season,
         'type': kit_type,
@@ -475,6 +494,7 @@ def get_generated_suggestion(team, season, kit_type):
         'label': f"{team.name} {season} {kit_type}",
         'url': f"/history/team/{team_slug}/variants?{query_string}",
         'preview_image': None,
+        'preview_image_variants': {},
         'has_uploads': False,
     }
 
@@ -495,6 +515,31 @@ def get_generated_season_match_rank(season, parsed_query):
     return 0
 
 
+def iter_ranked_generated_suggestions(teams, seasons, kit_types, parsed_query, limit):
+    # Yields suggestions already in ranking order (team rank, season rank, newest season,
+    # kit type, team name) so callers never materialize the full team x season x type product.
+    teams_by_rank = {}
+    for team in teams:
+        teams_by_rank.setdefault(get_team_match_rank(team.name, parsed_query['team_text']), []).append(team)
+
+    ordered_seasons = sorted(
+        seasons,
+        key=lambda season: (
+            get_generated_season_match_rank(season, parsed_query),
+            -get_season_sort_year(season),
+        ),
+    )
+    ordered_kit_types = sorted(kit_types, key=get_kit_type_order)
+
+    for team_rank in sorted(teams_by_rank):
+        # At most `limit` teams of one rank can appear before the next season starts
+        rank_teams = heapq.nsmallest(limit, teams_by_rank[team_rank], key=lambda team: team.name.lower())
+        for season in ordered_seasons:
+            for kit_type in ordered_kit_types:
+                for team in rank_teams:
+                    yield get_generated_suggestion(team, season, kit_type)
+
+
 def get_history_type_filter(kit_type):
     normalized_type = normalize_search_query(kit_type)
 
@@ -568,8 +613,6 @@ def build_wishlist_preview_map(items, request=None):
         'kit__team',
     ).prefetch_related(
         Prefetch('images', queryset=UserKitImage.objects.order_by('order', 'created_at', 'id'), to_attr='ordered_preview_images')
-    ).annotate(
-        likes_count=Count('likes', distinct=True),
     ).order_by(
         'kit__team_id',
         'kit__season',
@@ -596,7 +639,10 @@ def build_wishlist_preview_map(items, request=None):
         if request is not None:
             preview_url = request.build_absolute_uri(preview_url)
 
-        preview_map[preview_key] = preview_url
+        preview_map[preview_key] = {
+            'url': preview_url,
+            'variants': get_image_variant_urls(preview_image, request),
+        }
 
     return preview_map
 
@@ -609,11 +655,7 @@ def get_team_by_identifier(team_identifier):
     if normalized_identifier.isdigit():
         return Team.objects.select_related('country', 'league').filter(pk=int(normalized_identifier)).first()
 
-    for team in Team.objects.select_related('country', 'league').all().order_by('id'):
-        if build_team_slug(team.name) == normalized_identifier:
-            return team
-
-    return None
+    return Team.objects.select_related('country', 'league').filter(slug=normalized_identifier).first()
 
 
 def get_comment_like_annotation(user):
@@ -653,11 +695,9 @@ def get_user_conversations_queryset(user):
     latest_message_queryset = Message.objects.filter(
         conversation_id=OuterRef('pk')
     ).order_by('-created_at')
-    unread_messages_queryset = Message.objects.filter(
+    unread_counter_queryset = ConversationUnreadCounter.objects.filter(
         conversation_id=OuterRef('pk'),
-        read_at__isnull=True,
-    ).exclude(
-        sender=user,
+        user=user,
     )
 
     return Conversation.objects.filter(
@@ -670,7 +710,7 @@ def get_user_conversations_queryset(user):
     ).annotate(
         last_message_preview=Subquery(latest_message_queryset.values('body')[:1]),
         last_message_created_at=Subquery(latest_message_queryset.values('created_at')[:1]),
-        unread_count=Count('messages', filter=Q(messages__read_at__isnull=True) & ~Q(messages__sender=user), distinct=True),
+        unread_count=Coalesce(Subquery(unread_counter_queryset.values('unread_count')[:1]), Value(0)),
     )
 
 
@@ -700,16 +740,14 @@ def get_public_user_kits_queryset():
     ).select_related(
         'kit',
         'kit__team',
+        'kit__team__country',
+        'kit__team__league',
         'kit__kit_type_ref',
         'shirt_version',
         'user',
         'user__profile',
     ).prefetch_related(
         'images',
-        'likes',
-    ).annotate(
-        likes_count=Count('likes', distinct=True),
-        comments_count=Count('comments', distinct=True),
     )
 
 
@@ -722,15 +760,14 @@ def get_profile_collection_queryset(username, viewer):
     return queryset.select_related(
         'kit',
         'kit__team',
+        'kit__team__country',
+        'kit__team__league',
         'kit__kit_type_ref',
         'shirt_version',
         'user',
         'user__profile',
     ).prefetch_related(
         'images',
-    ).annotate(
-        likes_count=Count('likes', distinct=True),
-        comments_count=Count('comments', distinct=True),
     ).order_by('-added_at')
 
 
@@ -781,37 +818,48 @@ def calculate_collection_total_value_for_viewer(owner, viewer):
 
 
 def get_following_feed_queryset(user):
-    followed_user_ids = Follow.objects.filter(
-        follower=user
-    ).values_list(
-        'following_id',
-        flat=True,
-    )
-
-    return UserKit.objects.filter(
-        user_id__in=followed_user_ids,
-        is_hidden_by_moderation=False,
-    ).exclude(
-        user=user,
+    return FollowingFeedEntry.objects.filter(
+        follower=user,
     ).select_related(
-        'kit',
-        'kit__team',
-        'kit__kit_type_ref',
-        'shirt_version',
-        'user',
-        'user__profile',
+        'userkit',
+        'userkit__kit',
+        'userkit__kit__team',
+        'userkit__kit__team__country',
+        'userkit__kit__team__league',
+        'userkit__kit__kit_type_ref',
+        'userkit__shirt_version',
+        'userkit__user',
+        'userkit__user__profile',
     ).prefetch_related(
-        'images',
-        'likes',
-    ).annotate(
-        likes_count=Count('likes', distinct=True),
-        comments_count=Count('comments', distinct=True),
+        'userkit__images',
     ).order_by(
         '-added_at',
-        '-id',
+        '-userkit_id',
     )
 
 
+def encode_keyset_cursor(timestamp, object_id):
+    raw = f'{timestamp.isoformat()}|{object_id}'
+    return urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_keyset_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw_timestamp, raw_object_id = urlsafe_b64decode(padded.encode()).decode().split('|')
+        timestamp = parse_datetime(raw_timestamp)
+        object_id = int(raw_object_id)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        return None
+    if timestamp is None:
+        return None
+    return timestamp, object_id
+
+
+def encode_following_feed_cursor(entry):
+    return encode_keyset_cursor(entry.added_at, entry.userkit_id)
+
+
 def get_owner_export_queryset(user, *, include_sold=True):
     queryset = UserKit.objects.filter(
         user=user,
@@ -822,8 +870,6 @@ def get_owner_export_queryset(user, *, include_sold=True):
         'kit__kit_type_ref',
         'shirt_version',
         'user',
-    ).prefetch_related(
-        'images',
     ).order_by('-added_at', '-id')
 
     if not include_sold:
@@ -898,6 +944,7 @@ EXPORT_COLUMNS = [
 
 EXPORT_DECIMAL_ZERO = Decimal('0.00')
 EXPORT_PERCENT_ZERO = Decimal('0.00')
+EXPORT_ITERATOR_CHUNK_SIZE = 500
 
 
 def _parse_bool_query_param(value, default=True):
@@ -906,47 +953,82 @@ def _parse_bool_query_param(value, default=True):
     return str(value).strip().lower() not in {'0', 'false', 'no', 'off'}
 
 
-def _sum_decimal(values):
-    total = Decimal('0')
-    for value in values:
-        if value is not None:
-            total += Decimal(value)
-    return total.quantize(Decimal('0.01'))
+class CollectionExportSummary:
+    """Accumulates the export summary sheet one kit at a time."""
+
+    def __init__(self):
+        self.total_kits = 0
+        self.owned_kits = 0
+        self.owned_value_total = Decimal('0')
+        self.owned_value_count = 0
+        self.purchase_cost_total = Decimal('0')
+        self.purchase_cost_count = 0
+        self.profit_loss_total = Decimal('0')
+        self.profit_loss_count = 0
+        self.roi_ratio_total = Decimal('0')
+        self.roi_ratio_count = 0
+
+    def add(self, userkit):
+        self.total_kits += 1
+        if userkit.in_the_collection:
+            self.owned_kits += 1
+            if userkit.final_value is not None:
+                self.owned_value_total += Decimal(userkit.final_value)
+                self.owned_value_count += 1
+        if userkit.purchase_price is not None:
+            self.purchase_cost_total += Decimal(userkit.purchase_price)
+            self.purchase_cost_count += 1
+
+        profit_loss = userkit.get_profit_loss()
+        if profit_loss is None:
+            return
+        self.profit_loss_total += Decimal(profit_loss)
+        self.profit_loss_count += 1
+        if userkit.purchase_price is not None and userkit.purchase_price > 0:
+            self.roi_ratio_total += (profit_loss / userkit.purchase_price).quantize(Decimal('0.0001'))
+            self.roi_ratio_count += 1
+
+    @staticmethod
+    def _total(total, count):
+        return total.quantize(Decimal('0.01')) if count else EXPORT_DECIMAL_ZERO
+
+    @staticmethod
+    def _average(total, count):
+        if not count:
+            return None
+        return (total / Decimal(count)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+    def as_rows(self):
+        return [
+            ('Total kits', self.total_kits),
+            ('Owned kits', self.owned_kits),
+            ('Sold / no longer owned kits', self.total_kits - self.owned_kits),
+            ('Total collection value', self._total(self.owned_value_total, self.owned_value_count)),
+            ('Average kit value', self._average(self.owned_value_total, self.owned_value_count)),
+            ('Total purchase cost', self._total(self.purchase_cost_total, self.purchase_cost_count)),
+            ('Total profit/loss', self._total(self.profit_loss_total, self.profit_loss_count)),
+            ('Average ROI %', self._average(self.roi_ratio_total, self.roi_ratio_count)),
+        ]
 
 
-def _average_decimal(values):
-    normalized = [Decimal(value) for value in values if value is not None]
-    if not normalized:
-        return None
-    return (sum(normalized) / Decimal(len(normalized))).quantize(
-        Decimal('0.01'),
-        rounding=ROUND_HALF_UP,
-    )
+def iter_collection_export_rows(queryset, summary=None):
+    # One pass over a server-side cursor; only a chunk of kits is in memory at a time
+    for userkit in queryset.iterator(chunk_size=EXPORT_ITERATOR_CHUNK_SIZE):
+        if summary is not None:
+            summary.add(userkit)
+        yield _build_export_row(userkit)
 
 
-def _build_export_summary(userkits):
-    owned_kits = [item for item in userkits if item.in_the_collection]
-    sold_kits = [item for item in userkits if not item.in_the_collection]
-    owned_final_values = [item.final_value for item in owned_kits if item.final_value is not None]
-    purchase_prices = [item.purchase_price for item in userkits if item.purchase_price is not None]
-    profit_losses = [item.get_profit_loss() for item in userkits if item.get_profit_loss() is not None]
-    roi_ratios = []
-    for item in userkits:
-        profit_loss = item.get_profit_loss()
-        if profit_loss is None or item.purchase_price is None or item.purchase_price <= 0:
-            continue
-        roi_ratios.append((profit_loss / item.purchase_price).quantize(Decimal('0.0001')))
+class _CSVEchoBuffer:
+    def write(self, value):
+        return value
 
-    return [
-        ('Total kits', len(userkits)),
-        ('Owned kits', len(owned_kits)),
-        ('Sold / no longer owned kits', len(sold_kits)),
-        ('Total collection value', _sum_decimal(owned_final_values) if owned_final_values else EXPORT_DECIMAL_ZERO),
-        ('Average kit value', _average_decimal(owned_final_values) if owned_final_values else None),
-        ('Total purchase cost', _sum_decimal(purchase_prices) if purchase_prices else EXPORT_DECIMAL_ZERO),
-        ('Total profit/loss', _sum_decimal(profit_losses) if profit_losses else EXPORT_DECIMAL_ZERO),
-        ('Average ROI %', _average_decimal(roi_ratios) if roi_ratios else None),
-    ]
+
+def iter_collection_export_csv(export_rows):
+    writer = csv.DictWriter(_CSVEchoBuffer(), fieldnames=EXPORT_COLUMNS)
+    yield writer.writeheader()
+    for row in export_rows:
+        yield writer.writerow({column: row.get(column) for column in EXPORT_COLUMNS})
 
 
 def _excel_serial_for_date(value):
@@ -960,7 +1042,47 @@ def _excel_serial_for_date(value):
     return None
 
 
-def _xml_cell(value, *, style_index=0):
+# Repeated per-row text goes to the shared string table; free text such as
+# offer links stays inline so the table only grows with distinct values.
+XLSX_SHARED_STRING_COLUMNS = {
+    'Team',
+    'Season',
+    'Kit type',
+    'Size',
+    'Condition',
+    'Technology',
+    'Status',
+    'In collection',
+    'For sale',
+}
+XLSX_TEXT_COLUMNS = EXPORT_COLUMNS[:EXPORT_COLUMNS.index('External URL') + 1]
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+# Exports larger than this spill from memory to a temporary file
+EXPORT_XLSX_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+EXPORT_XLSX_WRITE_BATCH_ROWS = 500
+
+
+class XlsxSharedStrings:
+    def __init__(self):
+        self.indexes = {}
+        self.reference_count = 0
+
+    def index(self, value):
+        self.reference_count += 1
+        return self.indexes.setdefault(value, len(self.indexes))
+
+    def write(self, stream):
+        stream.write((
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            f'count="{self.reference_count}" uniqueCount="{len(self.indexes)}">'
+        ).encode())
+        for value in self.indexes:
+            stream.write(f'<si><t xml:space="preserve">{escape(value)}</t></si>'.encode())
+        stream.write(b'</sst>')
+
+
+def _xml_cell(value, *, style_index=0, shared_strings=None):
     style_attr = f' s="{style_index}"' if style_index else ''
     if value in (None, ''):
         return f'<c{style_attr}/>'
@@ -974,10 +1096,13 @@ def _xml_cell(value, *, style_index=0):
     if isinstance(value, date):
         serial = _excel_serial_for_date(value)
         return f'<c{style_attr}><v>{serial}</v></c>'
+    if shared_strings is not None:
+        return f'<c{style_attr} t="s"><v>{shared_strings.index(str(value))}</v></c>'
     return f'<c{style_attr} t="inlineStr"><is><t>{escape(str(value))}</t></is></c>'
 
 
-def _build_sheet_xml(rows, *, column_widths=None, freeze_top_row=False, autofilter_range=None):
+def _write_sheet_xml(stream, rows, shared_strings, *, column_widths=None, freeze_top_row=False, autofilter_columns=None):
+    # Rows are encoded and compressed in batches, never held as one document
     cols_xml = ''
     if column_widths:
         cols_xml = '<cols>' + ''.join(
@@ -998,59 +1123,62 @@ def _build_sheet_xml(rows, *, column_widths=None, freeze_top_row=False, autofilt
     else:
         sheet_views += '</sheetViews>'
 
-    row_xml = []
-    for row_index, row in enumerate(rows, start=1):
+    stream.write((
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        f'{sheet_views}'
+        f'{cols_xml}'
+        '<sheetData>'
+    ).encode())
+
+    row_count = 0
+    batch = []
+    for row_count, row in enumerate(rows, start=1):
         cells_xml = ''.join(
-            _xml_cell(cell.get('value'), style_index=cell.get('style', 0))
+            _xml_cell(
+                cell.get('value'),
+                style_index=cell.get('style', 0),
+                shared_strings=shared_strings if cell.get('shared') else None,
+            )
             for cell in row
         )
-        row_xml.append(f'<row r="{row_index}">{cells_xml}</row>')
+        batch.append(f'<row r="{row_count}">{cells_xml}</row>')
+        if len(batch) >= EXPORT_XLSX_WRITE_BATCH_ROWS:
+            stream.write(''.join(batch).encode())
+            batch = []
+    if batch:
+        stream.write(''.join(batch).encode())
 
     autofilter_xml = (
-        f'<autoFilter ref="{autofilter_range}"/>'
-        if autofilter_range
+        f'<autoFilter ref="{autofilter_columns[0]}1:{autofilter_columns[1]}{max(row_count, 1)}"/>'
+        if autofilter_columns
         else ''
     )
-
-    return (
-        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
-        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
-        f'{sheet_views}'
-        f'{cols_xml}'
-        f'<sheetData>{"".join(row_xml)}</sheetData>'
-        f'{autofilter_xml}'
-        '</worksheet>'
-    )
+    stream.write(f'</sheetData>{autofilter_xml}</worksheet>'.encode())
+    return row_count
 
 
-def _build_collection_sheet_rows(export_rows):
-    rows = [[{'value': column, 'style': 1} for column in EXPORT_COLUMNS]]
+def _iter_collection_sheet_rows(export_rows):
+    yield [{'value': column, 'style': 1, 'shared': True} for column in EXPORT_COLUMNS]
 
     for row in export_rows:
         roi_ratio = row.get('ROI ratio')
-        rows.append([
-            {'value': row['Team']},
-            {'value': row['Season']},
-            {'value': row['Kit type']},
-            {'value': row['Size']},
-            {'value': row['Condition']},
-            {'value': row['Technology']},
-            {'value': row['Status']},
-            {'value': row['In collection']},
-            {'value': row['For sale']},
-            {'value': row['External URL']},
+        yield [
+            *[
+                {'value': row[column], 'shared': column in XLSX_SHARED_STRING_COLUMNS}
+                for column in XLSX_TEXT_COLUMNS
+            ],
             {'value': row['Value'], 'style': 4 if row['Value'] is not None else 0},
             {'value': row['Purchase price'], 'style': 4 if row['Purchase price'] is not None else 0},
             {'value': row['Purchase date'], 'style': 2 if row['Purchase date'] is not None else 0},
             {'value': row['Profit / loss'], 'style': 4 if row['Profit / loss'] is not None else 0},
             {'value': roi_ratio, 'style': 5 if roi_ratio is not None else 0},
             {'value': row['Added at'], 'style': 2 if row['Added at'] is not None else 0},
-        ])
-    return rows
+        ]
 
 
-def _build_summary_sheet_rows(summary_rows):
-    rows = [[{'value': 'Metric', 'style': 1}, {'value': 'Value', 'style': 1}]]
+def _iter_summary_sheet_rows(summary_rows):
+    yield [{'value': 'Metric', 'style': 1, 'shared': True}, {'value': 'Value', 'style': 1, 'shared': True}]
     currency_metrics = {'Total collection value', 'Average kit value', 'Total purchase cost', 'Total profit/loss'}
     percent_metrics = {'Average ROI %'}
 
@@ -1060,28 +1188,13 @@ def _build_summary_sheet_rows(summary_rows):
             style = 4
         elif label in percent_metrics and value is not None:
             style = 5
-        rows.append([
-            {'value': label},
+        yield [
+            {'value': label, 'shared': True},
             {'value': value, 'style': style},
-        ])
-    return rows
-
-
-def build_collection_export_xlsx(export_rows, summary_rows):
-    collection_rows = _build_collection_sheet_rows(export_rows)
-    summary_sheet_rows = _build_summary_sheet_rows(summary_rows)
+        ]
 
-    collection_sheet_xml = _build_sheet_xml(
-        collection_rows,
-        column_widths=[22, 14, 20, 10, 16, 18, 14, 14, 12, 34, 16, 16, 16, 16, 14, 16],
-        freeze_top_row=True,
-        autofilter_range=f'A1:P{max(len(collection_rows), 1)}',
-    )
-    summary_sheet_xml = _build_sheet_xml(
-        summary_sheet_rows,
-        column_widths=[28, 18],
-    )
 
+def _build_collection_export_xlsx_parts():
     workbook_xml = (
         '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
         '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
@@ -1098,6 +1211,7 @@ def build_collection_export_xlsx(export_rows, summary_rows):
         '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
         '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet2.xml"/>'
         '<Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '<Relationship Id="rId4" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
         '</Relationships>'
     )
     root_rels_xml = (
@@ -1117,6 +1231,7 @@ def build_collection_export_xlsx(export_rows, summary_rows):
         '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
         '<Override PartName="/xl/worksheets/sheet2.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
         '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
         '<Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
         '<Override PartName="/docProps/app.xml" ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/>'
         '</Types>'
@@ -1174,18 +1289,83 @@ def build_collection_export_xlsx(export_rows, summary_rows):
         '</Properties>'
     )
 
-    output = BytesIO()
+    return [
+        ('[Content_Types].xml', content_types_xml),
+        ('_rels/.rels', root_rels_xml),
+        ('docProps/core.xml', core_xml),
+        ('docProps/app.xml', app_xml),
+        ('xl/workbook.xml', workbook_xml),
+        ('xl/_rels/workbook.xml.rels', workbook_rels_xml),
+        ('xl/styles.xml', styles_xml),
+    ]
+
+
+def write_collection_export_xlsx(output, export_rows, summary):
+    """Write the export workbook into ``output`` in a single pass over ``export_rows``.
+
+    ``summary`` is read only after the collection sheet is written, so it can
+    be the CollectionExportSummary that ``export_rows`` fills as it is consumed.
+    """
+    shared_strings = XlsxSharedStrings()
     with ZipFile(output, 'w', ZIP_DEFLATED) as workbook:
-        workbook.writestr('[Content_Types].xml', content_types_xml)
-        workbook.writestr('_rels/.rels', root_rels_xml)
-        workbook.writestr('docProps/core.xml', core_xml)
-        workbook.writestr('docProps/app.xml', app_xml)
-        workbook.writestr('xl/workbook.xml', workbook_xml)
-        workbook.writestr('xl/_rels/workbook.xml.rels', workbook_rels_xml)
-        workbook.writestr('xl/styles.xml', styles_xml)
-        workbook.writestr('xl/worksheets/sheet1.xml', collection_sheet_xml)
-        workbook.writestr('xl/worksheets/sheet2.xml', summary_sheet_xml)
-    return output.getvalue()
+        for name, xml in _build_collection_export_xlsx_parts():
+            workbook.writestr(name, xml)
+        with workbook.open('xl/worksheets/sheet1.xml', 'w') as stream:
+            _write_sheet_xml(
+                stream,
+                _iter_collection_sheet_rows(export_rows),
+                shared_strings,
+                column_widths=[22, 14, 20, 10, 16, 18, 14, 14, 12, 34, 16, 16, 16, 16, 14, 16],
+                freeze_top_row=True,
+                autofilter_columns=('A', 'P'),
+            )
+        with workbook.open('xl/worksheets/sheet2.xml', 'w') as stream:
+            _write_sheet_xml(
+                stream,
+                _iter_summary_sheet_rows(summary.as_rows()),
+                shared_strings,
+                column_widths=[28, 18],
+            )
+        with workbook.open('xl/sharedStrings.xml', 'w') as stream:
+            shared_strings.write(stream)
+    return output
+
+
+def _iter_with_progress(rows, on_progress, every=EXPORT_ITERATOR_CHUNK_SIZE):
+    for index, row in enumerate(rows, start=1):
+        if index % every == 0:
+            on_progress()
+        yield row
+
+
+def build_collection_export_artifact(export_job, on_progress=None):
+    """Write the export file for ``export_job`` to storage and return its row count.
+
+    ``on_progress`` is called once per fetched chunk of kits, e.g. to heartbeat
+    the background job that is building the file.
+    """
+    queryset = get_owner_export_queryset(export_job.user, include_sold=export_job.include_sold)
+    summary = CollectionExportSummary()
+    export_rows = iter_collection_export_rows(queryset, summary)
+    if on_progress is not None:
+        export_rows = _iter_with_progress(export_rows, on_progress)
+    export_job.filename = _build_export_filename(
+        export_job.user,
+        timezone.localdate().isoformat(),
+        export_job.export_format,
+    )
+
+    with tempfile.TemporaryFile() as output:
+        if export_job.export_format == CollectionExportJob.FORMAT_XLSX:
+            write_collection_export_xlsx(output, export_rows, summary)
+        else:
+            for chunk in iter_collection_export_csv(export_rows):
+                output.write(chunk.encode('utf-8'))
+        output.seek(0)
+        export_job.file.save(export_job.filename, File(output), save=False)
+
+    return summary.total_kits
+
 
 # Current user
 class CurrentUserAPI(generics.RetrieveAPIView):
@@ -1220,8 +1400,8 @@ class MyCollectionAPI(generics.ListCreateAPIView):
             user=self.request.user,
             is_hidden_by_moderation=False,
         )\
-            .select_related('kit', 'kit__team', 'kit__kit_type_ref', 'shirt_version', 'user', 'user__profile')\
-            .annotate(likes_count=Count('likes', distinct=True), comments_count=Count('comments', distinct=True))\
+            .select_related('kit', 'kit__team', 'kit__team__country', 'kit__team__league', 'kit__kit_type_ref', 'shirt_version', 'user', 'user__profile')\
+            .prefetch_related('images')\
             .order_by('-added_at')
     
     # Override to check pro limits and file uploads safety
@@ -1265,10 +1445,11 @@ class MyCollectionAPI(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         # Automatically assign the logged-in user on save
         user_kit = serializer.save(user=self.request.user)
-        record_collection_value_snapshot(
+        enqueue_collection_value_snapshot(
             self.request.user,
             CollectionValueSnapshot.REASON_KIT_ADDED,
             related_userkit=user_kit,
+            delta=get_collection_value_contribution(user_kit),
         )
 
 # Endpoint: Detail, update, delete for a specific kit in collection
@@ -1283,7 +1464,6 @@ class MyCollectionDetailAPI(generics.RetrieveUpdateDestroyAPIView):
         )\
             .select_related('kit', 'kit__team', 'kit__kit_type_ref', 'shirt_version')\
             .prefetch_related('images')\
-            .annotate(likes_count=Count('likes', distinct=True), comments_count=Count('comments', distinct=True))\
             .order_by('-added_at')
 
     def perform_update(self, serializer):
@@ -1300,6 +1480,7 @@ class MyCollectionDetailAPI(generics.RetrieveUpdateDestroyAPIView):
             'shirt_technology': instance.shirt_technology,
             'shirt_version_id': instance.shirt_version_id,
         }
+        previous_value, previous_count = get_collection_value_contribution(instance)
 
         updated_instance = serializer.save()
 
@@ -1320,18 +1501,22 @@ class MyCollectionDetailAPI(generics.RetrieveUpdateDestroyAPIView):
             reason = None
 
         if reason is not None:
-            record_collection_value_snapshot(
+            updated_value, updated_count = get_collection_value_contribution(updated_instance)
+            enqueue_collection_value_snapshot(
                 self.request.user,
                 reason,
                 related_userkit=updated_instance,
+                delta=(updated_value - previous_value, updated_count - previous_count),
             )
 
     def perform_destroy(self, instance):
         user = instance.user
+        removed_value, removed_count = get_collection_value_contribution(instance)
         super().perform_destroy(instance)
-        record_collection_value_snapshot(
+        enqueue_collection_value_snapshot(
             user,
             CollectionValueSnapshot.REASON_KIT_REMOVED,
+            delta=(-removed_value, -removed_count),
         )
 
 # Endpoint: Show other user's collection
@@ -1360,16 +1545,14 @@ class PublicUserKitDetailAPI(generics.RetrieveAPIView):
         ).filter(in_the_collection=True).select_related(
             'kit',
             'kit__team',
+            'kit__team__country',
+            'kit__team__league',
             'kit__kit_type_ref',
             'shirt_version',
             'user',
             'user__profile',
         ).prefetch_related(
             'images',
-            'likes',
-        ).annotate(
-            likes_count=Count('likes', distinct=True),
-            comments_count=Count('comments', distinct=True),
         )
 
 
@@ -1402,6 +1585,38 @@ class ExploreKitsAPI(generics.ListAPIView):
     serializer_class = UserKitSerializer
     permission_classes = [permissions.AllowAny]
     pagination_class = None
+    CARD_VERSION_RESOURCES = (
+        CATALOG_PUBLIC_KITS,
+        CATALOG_COUNTRIES,
+        CATALOG_LEAGUES,
+        CATALOG_TEAMS,
+        CATALOG_KIT_TYPES,
+        CATALOG_SHIRT_VERSIONS,
+    )
+
+    def get_validator_parts(self):
+        # Every public kit has a ranking row, refreshed on save and on counter changes
+        rankings = KitRanking.objects.aggregate(
+            latest_refresh=Max('refreshed_at'),
+            total=Count('userkit_id'),
+        )
+        # Everything else on a card: images, owner, values and catalog names
+        versions = get_catalog_versions(self.CARD_VERSION_RESOURCES)
+        return [
+            self.request.build_absolute_uri('/'),
+            self.request.get_full_path(),
+            self.request.user.pk,
+            rankings['latest_refresh'],
+            rankings['total'],
+            *[versions[resource] for resource in self.CARD_VERSION_RESOURCES],
+        ]
+
+    def list(self, request, *args, **kwargs):
+        return get_conditional_response(
+            request,
+            self.get_validator_parts(),
+            lambda: super(ExploreKitsAPI, self).list(request, *args, **kwargs).data,
+        )
 
     def get_queryset(self):
         sort = self.request.query_params.get('sort', 'trending').strip().lower()
@@ -1417,15 +1632,21 @@ class ExploreKitsAPI(generics.ListAPIView):
         queryset = get_public_user_kits_queryset()
 
         if sort == 'latest':
-            queryset = queryset.order_by('-added_at')
-        elif sort == 'most_liked':
-            queryset = queryset.order_by('-likes_count', '-comments_count', '-added_at')
-        elif sort == 'for_sale':
-            queryset = queryset.filter(for_sale=True).order_by('-added_at')
+            return queryset.order_by('-added_at', '-id')[:limit_value]
+        if sort == 'for_sale':
+            return queryset.filter(for_sale=True).order_by('-added_at', '-id')[:limit_value]
+
+        if sort == 'most_liked':
+            ranking_order = ('-likes_count', '-comments_count', '-added_at')
         else:
-            queryset = queryset.order_by('-likes_count', '-comments_count', '-added_at')
+            ranking_order = ('-trending_score', '-likes_count', '-added_at')
 
-        return queryset[:limit_value]
+        # Read the page ids from the ranking index, then load just those kits
+        ranked_ids = list(
+            KitRanking.objects.order_by(*ranking_order, '-userkit_id').values_list('userkit_id', flat=True)[:limit_value]
+        )
+        kits_by_id = queryset.in_bulk(ranked_ids)
+        return [kits_by_id[kit_id] for kit_id in ranked_ids if kit_id in kits_by_id]
 
 
 class FollowingFeedAPI(APIView):
@@ -1451,9 +1672,19 @@ class FollowingFeedAPI(APIView):
     def get(self, request):
         queryset = get_following_feed_queryset(request.user)
         limit = self._get_limit(request)
+        cursor = request.query_params.get('cursor')
         before = request.query_params.get('before')
 
-        if before is not None:
+        anchor = None
+        if cursor is not None:
+            anchor = decode_keyset_cursor(cursor)
+            if anchor is None:
+                return Response(
+                    {'cursor': ['cursor is invalid.']},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        elif before is not None:
+            # Legacy kit-id anchor; the opaque cursor avoids this extra lookup
             try:
                 before_id = int(before)
             except (TypeError, ValueError):
@@ -1462,76 +1693,90 @@ class FollowingFeedAPI(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            anchor_kit = queryset.filter(pk=before_id).first()
-            if anchor_kit is None:
+            anchor_added_at = FollowingFeedEntry.objects.filter(
+                follower=request.user,
+                userkit_id=before_id,
+            ).values_list('added_at', flat=True).first()
+            if anchor_added_at is None:
                 return Response(
                     {'before': ['Kit not found in feed.']},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
+            anchor = (anchor_added_at, before_id)
 
+        if anchor is not None:
+            anchor_added_at, anchor_userkit_id = anchor
             queryset = queryset.filter(
-                Q(added_at__lt=anchor_kit.added_at) |
-                Q(added_at=anchor_kit.added_at, id__lt=anchor_kit.id)
+                Q(added_at__lt=anchor_added_at) |
+                Q(added_at=anchor_added_at, userkit_id__lt=anchor_userkit_id)
             )
 
-        items = list(queryset[:limit])
-
-        if items:
-            oldest_item = items[-1]
-            has_more = queryset.filter(
-                Q(added_at__lt=oldest_item.added_at) |
-                Q(added_at=oldest_item.added_at, id__lt=oldest_item.id)
-            ).exists()
-        else:
-            has_more = False
+        entries = list(queryset[:limit + 1])
+        has_more = len(entries) > limit
+        entries = entries[:limit]
 
-        serializer = UserKitSerializer(items, many=True, context={'request': request})
+        serializer = UserKitSerializer(
+            [entry.userkit for entry in entries],
+            many=True,
+            context={'request': request},
+        )
         return Response({
             'results': serializer.data,
             'has_more': has_more,
+            'next_cursor': encode_following_feed_cursor(entries[-1]) if has_more else None,
         })
 
 # Endpoint: Catalog of all available kits (e.g., for selection when adding)
 class KitCatalogAPI(generics.ListAPIView):
-    queryset = Kit.objects.select_related('team', 'kit_type_ref').all()
+    queryset = Kit.objects.select_related('team', 'team__country', 'team__league', 'kit_type_ref').all()
     serializer_class = KitSerializer
 
+
+def build_kit_options_payload():
+    kit_types = KitType.objects.filter(status=KitType.STATUS_APPROVED).order_by('sort_order', 'name', 'id')
+    shirt_versions = ShirtVersion.objects.filter(is_active=True).order_by('sort_order', 'name', 'id')
+
+    return {
+        "sizes": [{'value': key, 'label': label} for key, label in SIZE_CHOICES],
+        "conditions": [{'value': key, 'label': label} for key, label in CONDITION_CHOICES],
+        "technologies": [{'value': key, 'label': label} for key, label in SHIRT_TECHNOLOGIES],
+        "types": [{'value': key, 'label': label} for key, label in SHIRT_TYPES],
+        "kit_types": [
+            {
+                'id': kit_type.id,
+                'name': kit_type.name,
+                'slug': kit_type.slug,
+                'canonical_code': kit_type.canonical_code,
+                'category': kit_type.category,
+                'default_visibility': kit_type.default_visibility,
+                'sort_order': kit_type.sort_order,
+            }
+            for kit_type in kit_types
+        ],
+        "shirt_versions": [
+            {
+                'id': version.id,
+                'code': version.code,
+                'name': version.name,
+                'description': version.description,
+                'manual_value_recommended': version.manual_value_recommended,
+                'valuation_note': version.valuation_note,
+                'sort_order': version.sort_order,
+            }
+            for version in shirt_versions
+        ],
+    }
+
+
 # Endpoint: Get options for kit attributes
 class KitOptionsView(APIView):
     def get(self, request):
-        kit_types = KitType.objects.filter(status=KitType.STATUS_APPROVED).order_by('sort_order', 'name', 'id')
-        shirt_versions = ShirtVersion.objects.filter(is_active=True).order_by('sort_order', 'name', 'id')
-
-        return Response({
-            "sizes": [{'value': key, 'label': label} for key, label in SIZE_CHOICES],
-            "conditions": [{'value': key, 'label': label} for key, label in CONDITION_CHOICES],
-            "technologies": [{'value': key, 'label': label} for key, label in SHIRT_TECHNOLOGIES],
-            "types": [{'value': key, 'label': label} for key, label in SHIRT_TYPES],
-            "kit_types": [
-                {
-                    'id': kit_type.id,
-                    'name': kit_type.name,
-                    'slug': kit_type.slug,
-                    'canonical_code': kit_type.canonical_code,
-                    'category': kit_type.category,
-                    'default_visibility': kit_type.default_visibility,
-                    'sort_order': kit_type.sort_order,
-                }
-                for kit_type in kit_types
-            ],
-            "shirt_versions": [
-                {
-                    'id': version.id,
-                    'code': version.code,
-                    'name': version.name,
-                    'description': version.description,
-                    'manual_value_recommended': version.manual_value_recommended,
-                    'valuation_note': version.valuation_note,
-                    'sort_order': version.sort_order,
-                }
-                for version in shirt_versions
-            ],
-        })
+        payload = get_cached_catalog_payload(
+            (CATALOG_KIT_TYPES, CATALOG_SHIRT_VERSIONS),
+            ['kit-options'],
+            build_kit_options_payload,
+        )
+        return Response(payload)
 
 
 class TeamSearchAPI(generics.ListAPIView):
@@ -1622,11 +1867,17 @@ def get_unverified_team_preview_map(teams):
         team_id = image.user_kit.kit.team_id
         if team_id in preview_map:
             continue
-        preview_map[team_id] = image.image.url
+        preview_map[team_id] = image
 
     return preview_map
 
 
+def apply_preview_image(obj, image):
+    # Serializers turn both into absolute URLs
+    obj.preview_image = image.image.url if image is not None else None
+    obj.preview_image_variants = get_image_variant_urls(image) if image is not None else {}
+
+
 class AdminUnverifiedTeamsAPI(APIView):
     permission_classes = [IsAuthenticated, IsStaffOrModerator]
     DEFAULT_LIMIT = 20
@@ -1662,6 +1913,7 @@ class AdminUnverifiedTeamsAPI(APIView):
         has_more = len(teams) > limit
         teams = teams[:limit]
         preview_map = get_unverified_team_preview_map(teams)
+        usage_map = get_team_usage_map(teams)
         verified_teams = list(
             Team.objects.filter(is_verified=True).select_related(
                 'country',
@@ -1671,7 +1923,7 @@ class AdminUnverifiedTeamsAPI(APIView):
         )
 
         for team in teams:
-            usage = get_team_usage(team)
+            usage = usage_map[team.id]
             seasons = {
                 kit.season
                 for kit in team.kits.all()
@@ -1683,7 +1935,7 @@ class AdminUnverifiedTeamsAPI(APIView):
                 if (row.season or '').strip()
             )
             team.seasons = sorted(seasons, key=get_season_sort_year, reverse=True)
-            team.preview_image = preview_map.get(team.id)
+            apply_preview_image(team, preview_map.get(team.id))
             team.usage = usage.as_dict()
             team.can_reject = usage.is_unused()
             team.reject_block_reason = '' if team.can_reject else build_team_reject_block_reason(usage)
@@ -1734,7 +1986,7 @@ class AdminTeamApproveAPI(APIView):
             *updated_team.kits.values_list('season', flat=True),
             *updated_team.season_kit_types.values_list('season', flat=True),
         }, key=get_season_sort_year, reverse=True)
-        updated_team.preview_image = get_unverified_team_preview_map([updated_team]).get(updated_team.id)
+        apply_preview_image(updated_team, get_unverified_team_preview_map([updated_team]).get(updated_team.id))
         updated_team.can_reject = usage.is_unused()
         updated_team.reject_block_reason = '' if updated_team.can_reject else build_team_reject_block_reason(usage)
         updated_team.similar_verified_teams = []
@@ -2202,7 +2454,7 @@ class AdminTeamMergeAPI(APIView):
             *merged_target_team.kits.values_list('season', flat=True),
             *merged_target_team.season_kit_types.values_list('season', flat=True),
         }, key=get_season_sort_year, reverse=True)
-        merged_target_team.preview_image = get_unverified_team_preview_map([merged_target_team]).get(merged_target_team.id)
+        apply_preview_image(merged_target_team, get_unverified_team_preview_map([merged_target_team]).get(merged_target_team.id))
         merged_target_team.can_reject = False
         merged_target_team.reject_block_reason = 'Verified teams cannot be rejected through this moderation flow.'
         merged_target_team.similar_verified_teams = []
@@ -2246,6 +2498,16 @@ class AdminTeamDeleteContentAPI(APIView):
         serializer.is_valid(raise_exception=True)
 
         try:
+            if serializer.validated_data['chunked']:
+                deletion_job = start_chunked_team_deletion(
+                    team_id=team_id,
+                    actor=request.user,
+                    confirmation=serializer.validated_data['confirmation'],
+                    reason=serializer.validated_data['reason'],
+                    note=serializer.validated_data.get('note', ''),
+                )
+                return Response(TeamDeletionJobSerializer(deletion_job).data, status=status.HTTP_202_ACCEPTED)
+
             deleted_team, action, summary = delete_team_and_associated_content(
                 team_id=team_id,
                 actor=request.user,
@@ -2271,6 +2533,13 @@ class AdminTeamDeleteContentAPI(APIView):
         })
 
 
+class AdminTeamDeletionJobDetailAPI(generics.RetrieveAPIView):
+    permission_classes = [IsAuthenticated, IsStaffOrModerator]
+    serializer_class = TeamDeletionJobSerializer
+    queryset = TeamDeletionJob.objects.all()
+    lookup_url_kwarg = 'deletion_job_id'
+
+
 class AdminKitTypeSuggestionsAPI(APIView):
     permission_classes = [IsAuthenticated, IsStaffOrModerator]
 
@@ -2318,12 +2587,12 @@ class AdminKitTypeSuggestionsAPI(APIView):
                 if key not in preview_map:
                     first_image = next(iter(user_kit.images.all()), None)
                     if first_image is not None:
-                        preview_map[key] = first_image.image.url
+                        preview_map[key] = first_image
 
             for suggestion in suggestions:
                 key = (suggestion.team_id, suggestion.season, suggestion.kit_type_id)
                 suggestion.upload_count = upload_count_map.get(key, 0)
-                suggestion.preview_image = preview_map.get(key)
+                apply_preview_image(suggestion, preview_map.get(key))
                 suggestion.example_source_userkit_id = example_userkit_map.get(key)
 
         serializer = AdminKitTypeSuggestionSerializer(
@@ -2338,20 +2607,7 @@ class AdminModerationSummaryAPI(APIView):
     permission_classes = [IsAuthenticated, IsStaffOrModerator]
 
     def get(self, request):
-        kit_type_suggestions_pending = TeamSeasonKitType.objects.filter(
-            status=TeamSeasonKitType.STATUS_PENDING,
-            team__is_verified=True,
-        ).count()
-        team_verification_pending = Team.objects.filter(is_verified=False).count()
-        kit_report_groups_pending = UserKit.objects.filter(
-            reports__status='pending',
-        ).distinct().count()
-
-        return Response({
-            'kit_type_suggestions_pending': kit_type_suggestions_pending,
-            'team_verification_pending': team_verification_pending,
-            'kit_report_groups_pending': kit_report_groups_pending,
-        })
+        return Response(get_moderation_stats())
 
 
 class AdminTeamSeasonKitTypeApproveAPI(APIView):
@@ -2442,6 +2698,148 @@ class AdminTeamSeasonKitTypeRejectAPI(APIView):
         })
 
 
+def lock_pending_team_season_kit_types(suggestion_ids):
+    suggestions = list(
+        TeamSeasonKitType.objects.select_for_update().select_related('team').filter(
+            pk__in=suggestion_ids,
+            status=TeamSeasonKitType.STATUS_PENDING,
+        ).order_by('id')
+    )
+    kit_types = {
+        kit_type.id: kit_type
+        for kit_type in KitType.objects.select_for_update().filter(
+            pk__in={suggestion.kit_type_id for suggestion in suggestions},
+        ).order_by('id')
+    }
+    processed_ids = {suggestion.id for suggestion in suggestions}
+    skipped_ids = [suggestion_id for suggestion_id in suggestion_ids if suggestion_id not in processed_ids]
+    return suggestions, kit_types, skipped_ids
+
+
+class AdminTeamSeasonKitTypeBulkApproveAPI(APIView):
+    permission_classes = [IsAuthenticated, IsStaffOrModerator]
+
+    def post(self, request):
+        serializer = AdminBulkModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            suggestions, kit_types, skipped_ids = lock_pending_team_season_kit_types(serializer.validated_data['ids'])
+            if not suggestions:
+                return Response({'detail': 'No pending suggestions found.'}, status=status.HTTP_400_BAD_REQUEST)
+
+            now = timezone.now()
+            approved_kit_type_ids = []
+            actions = []
+            # Snapshots are taken in order, so suggestions sharing a kit type
+            # record the same states as approving them one by one
+            for suggestion in suggestions:
+                source_kit_type = kit_types[suggestion.kit_type_id]
+                previous_state = {
+                    'team_season_kit_type': snapshot_team_season_kit_type(suggestion),
+                    'source_kit_type': snapshot_kit_type(source_kit_type),
+                }
+                suggestion.status = TeamSeasonKitType.STATUS_APPROVED
+                suggestion.approved_by = request.user
+                suggestion.approved_at = now
+                if source_kit_type.status == KitType.STATUS_PENDING:
+                    source_kit_type.status = KitType.STATUS_APPROVED
+                    source_kit_type.approved_by = request.user
+                    source_kit_type.approved_at = now
+                    approved_kit_type_ids.append(source_kit_type.id)
+
+                actions.append(new_moderation_action_record(
+                    actor=request.user,
+                    action_type=KitTypeModerationAction.ACTION_APPROVE,
+                    suggestion=suggestion,
+                    source_kit_type=source_kit_type,
+                    previous_state=previous_state,
+                    resulting_state={
+                        'team_season_kit_type': snapshot_team_season_kit_type(suggestion),
+                        'source_kit_type': snapshot_kit_type(source_kit_type),
+                    },
+                ))
+
+            TeamSeasonKitType.objects.filter(pk__in=[suggestion.id for suggestion in suggestions]).update(
+                status=TeamSeasonKitType.STATUS_APPROVED,
+                approved_by=request.user,
+                approved_at=now,
+            )
+            adjust_moderation_stats(
+                kit_type_suggestions_pending=-sum(suggestion.team.is_verified for suggestion in suggestions),
+            )
+            if approved_kit_type_ids:
+                KitType.objects.filter(pk__in=approved_kit_type_ids).update(
+                    status=KitType.STATUS_APPROVED,
+                    approved_by=request.user,
+                    approved_at=now,
+                )
+            # Queryset updates skip the post_save receivers that invalidate the catalog cache
+            bump_catalog_versions(CATALOG_TEAM_SEASON_KIT_TYPES, CATALOG_KIT_TYPES)
+            actions = KitTypeModerationAction.objects.bulk_create(actions)
+
+        return Response({
+            'status': TeamSeasonKitType.STATUS_APPROVED,
+            'ids': [suggestion.id for suggestion in suggestions],
+            'skipped_ids': skipped_ids,
+            'approved_kit_type_ids': approved_kit_type_ids,
+            'moderation_action_ids': [action.id for action in actions],
+        })
+
+
+class AdminTeamSeasonKitTypeBulkRejectAPI(APIView):
+    permission_classes = [IsAuthenticated, IsStaffOrModerator]
+
+    def post(self, request):
+        serializer = AdminBulkModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            suggestions, kit_types, skipped_ids = lock_pending_team_season_kit_types(serializer.validated_data['ids'])
+            if not suggestions:
+                return Response({'detail': 'No pending suggestions found.'}, status=status.HTTP_400_BAD_REQUEST)
+
+            actions = []
+            for suggestion in suggestions:
+                source_kit_type = kit_types[suggestion.kit_type_id]
+                previous_state = {
+                    'team_season_kit_type': snapshot_team_season_kit_type(suggestion),
+                    'source_kit_type': snapshot_kit_type(source_kit_type),
+                }
+                suggestion.status = TeamSeasonKitType.STATUS_REJECTED
+                suggestion.approved_by = None
+                suggestion.approved_at = None
+                actions.append(new_moderation_action_record(
+                    actor=request.user,
+                    action_type=KitTypeModerationAction.ACTION_REJECT,
+                    suggestion=suggestion,
+                    source_kit_type=source_kit_type,
+                    previous_state=previous_state,
+                    resulting_state={
+                        'team_season_kit_type': snapshot_team_season_kit_type(suggestion),
+                        'source_kit_type': snapshot_kit_type(source_kit_type),
+                    },
+                ))
+
+            TeamSeasonKitType.objects.filter(pk__in=[suggestion.id for suggestion in suggestions]).update(
+                status=TeamSeasonKitType.STATUS_REJECTED,
+                approved_by=None,
+                approved_at=None,
+            )
+            adjust_moderation_stats(
+                kit_type_suggestions_pending=-sum(suggestion.team.is_verified for suggestion in suggestions),
+            )
+            bump_catalog_versions(CATALOG_TEAM_SEASON_KIT_TYPES)
+            actions = KitTypeModerationAction.objects.bulk_create(actions)
+
+        return Response({
+            'status': TeamSeasonKitType.STATUS_REJECTED,
+            'ids': [suggestion.id for suggestion in suggestions],
+            'skipped_ids': skipped_ids,
+            'moderation_action_ids': [action.id for action in actions],
+        })
+
+
 class AdminTeamSeasonKitTypeMergeAPI(APIView):
     permission_classes = [IsAuthenticated, IsStaffOrModerator]
 
@@ -2654,8 +3052,14 @@ def snapshot_userkit_moderation_state(userkit):
     }
 
 
-def build_kit_report_moderation_action(*, actor, action_type, userkit, reports, note, previous_state, resulting_state):
-    return KitReportModerationAction.objects.create(
+def build_kit_report_moderation_action(**kwargs):
+    action = new_kit_report_moderation_action(**kwargs)
+    action.save(force_insert=True)
+    return action
+
+
+def new_kit_report_moderation_action(*, actor, action_type, userkit, reports, note, previous_state, resulting_state):
+    return KitReportModerationAction(
         actor=actor,
         action_type=action_type,
         userkit=userkit,
@@ -2676,27 +3080,42 @@ def notify_kit_owner_about_moderation_removal(*, actor, userkit):
     )
 
 
-def get_admin_report_group_queryset(*, status_filter='pending', reason=None, search_query=''):
-    queryset = UserKit.objects.filter(reports__isnull=False)
+def notify_kit_owners_about_moderation_removals(*, actor, userkits):
+    # bulk_create skips post_save, so the unread counters are adjusted here
+    Notification.objects.bulk_create([
+        Notification(recipient_id=userkit.user_id, actor=actor, type='moderation_kit_removed', kit=userkit)
+        for userkit in userkits
+    ])
+    unread_by_recipient = {}
+    for userkit in userkits:
+        unread_by_recipient[userkit.user_id] = unread_by_recipient.get(userkit.user_id, 0) + 1
+    for recipient_id, delta in unread_by_recipient.items():
+        adjust_unread_notification_counter(recipient_id, delta)
+
+
+def get_admin_report_summary_queryset(*, status_filter='pending', reason=None, search_query=''):
+    queryset = KitReportSummary.objects.all()
 
-    if status_filter != 'all':
-        queryset = queryset.filter(reports__status=status_filter)
+    count_field = KitReportSummary.STATUS_COUNT_FIELDS.get(status_filter)
+    if count_field is not None:
+        queryset = queryset.filter(**{f'{count_field}__gt': 0})
     if reason:
-        queryset = queryset.filter(reports__reason=reason)
+        queryset = queryset.filter(reasons__contains=f',{reason},')
     if search_query:
-        queryset = queryset.filter(
-            Q(kit__team__name__icontains=search_query) |
-            Q(kit__season__icontains=search_query) |
-            Q(kit__kit_type__icontains=search_query) |
-            Q(user__username__icontains=search_query) |
-            Q(reports__reporter__username__icontains=search_query) |
-            Q(reports__description__icontains=search_query)
-        )
+        search_text = search_query.lower()
+        candidate_ids = get_kit_report_search_candidate_ids(search_text)
+        if candidate_ids is not None:
+            queryset = queryset.filter(userkit_id__in=candidate_ids)
+        queryset = queryset.filter(search_text__contains=search_text)
+
+    return queryset.order_by('-latest_report_at', '-userkit_id')
+
 
+def get_admin_report_group_queryset():
     reports_queryset = KitReport.objects.select_related('reporter', 'resolved_by').order_by('-created_at', '-id')
     actions_queryset = KitReportModerationAction.objects.select_related('actor').order_by('-created_at', '-id')
 
-    return queryset.select_related(
+    return UserKit.objects.select_related(
         'kit',
         'kit__team',
         'user',
@@ -2704,13 +3123,28 @@ def get_admin_report_group_queryset(*, status_filter='pending', reason=None, sea
         Prefetch('images', queryset=UserKitImage.objects.order_by('order', 'created_at', 'id')),
         Prefetch('reports', queryset=reports_queryset, to_attr='prefetched_report_group_reports'),
         Prefetch('report_moderation_actions', queryset=actions_queryset, to_attr='prefetched_report_moderation_actions'),
-    ).annotate(
-        latest_report_sort=Max('reports__created_at'),
-    ).distinct().order_by('-latest_report_sort', '-id')
+    )
 
 
 class AdminKitReportsAPI(APIView):
     permission_classes = [IsAuthenticated, IsStaffOrModerator]
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+
+    def _get_limit(self, request):
+        raw_limit = request.query_params.get('limit')
+        if raw_limit is None:
+            return self.DEFAULT_LIMIT
+
+        try:
+            limit = int(raw_limit)
+        except (TypeError, ValueError):
+            return self.DEFAULT_LIMIT
+
+        if limit <= 0:
+            return self.DEFAULT_LIMIT
+
+        return min(limit, self.MAX_LIMIT)
 
     def get(self, request):
         status_filter = (request.query_params.get('status') or 'pending').strip().lower()
@@ -2720,13 +3154,38 @@ class AdminKitReportsAPI(APIView):
         reason = (request.query_params.get('reason') or '').strip()
         search_query = (request.query_params.get('q') or '').strip()
 
-        queryset = get_admin_report_group_queryset(
+        summaries = get_admin_report_summary_queryset(
             status_filter=status_filter,
             reason=reason or None,
             search_query=search_query,
         )
-        serializer = AdminKitReportGroupListSerializer(queryset, many=True, context={'request': request})
-        return Response(serializer.data)
+        cursor = request.query_params.get('cursor')
+        if cursor is not None:
+            anchor = decode_keyset_cursor(cursor)
+            if anchor is None:
+                return Response({'cursor': ['cursor is invalid.']}, status=status.HTTP_400_BAD_REQUEST)
+            anchor_latest_report_at, anchor_userkit_id = anchor
+            summaries = summaries.filter(
+                Q(latest_report_at__lt=anchor_latest_report_at) |
+                Q(latest_report_at=anchor_latest_report_at, userkit_id__lt=anchor_userkit_id)
+            )
+
+        limit = self._get_limit(request)
+        page = list(summaries.values_list('userkit_id', 'latest_report_at')[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+
+        userkits = get_admin_report_group_queryset().in_bulk([userkit_id for userkit_id, _latest in page])
+        serializer = AdminKitReportGroupListSerializer(
+            [userkits[userkit_id] for userkit_id, _latest in page if userkit_id in userkits],
+            many=True,
+            context={'request': request},
+        )
+        return Response({
+            'results': serializer.data,
+            'has_more': has_more,
+            'next_cursor': encode_keyset_cursor(page[-1][1], page[-1][0]) if has_more else None,
+        })
 
 
 class AdminKitReportDetailAPI(APIView):
@@ -2734,7 +3193,7 @@ class AdminKitReportDetailAPI(APIView):
 
     def get(self, request, pk):
         userkit = get_object_or_404(
-            get_admin_report_group_queryset(status_filter='all'),
+            get_admin_report_group_queryset().filter(report_summary__isnull=False),
             pk=pk,
         )
         serializer = AdminKitReportGroupDetailSerializer(userkit, context={'request': request})
@@ -2770,6 +3229,7 @@ class AdminKitReportDismissAPI(APIView):
                 resolution_note=note,
                 updated_at=now,
             )
+            refresh_kit_report_summaries([userkit.id])
 
             action = build_kit_report_moderation_action(
                 actor=request.user,
@@ -2834,6 +3294,7 @@ class AdminKitReportRemoveKitAPI(APIView):
                 resolution_note=note,
                 updated_at=now,
             )
+            refresh_kit_report_summaries([userkit.id])
 
             action = build_kit_report_moderation_action(
                 actor=request.user,
@@ -2855,13 +3316,147 @@ class AdminKitReportRemoveKitAPI(APIView):
             'moderation_action_id': action.id,
         })
 
+
+def lock_pending_report_groups(userkit_ids):
+    # One ordered lock per table keeps concurrent bulk requests from deadlocking
+    userkits = list(
+        UserKit.objects.select_for_update().select_related('user').filter(pk__in=userkit_ids).order_by('id')
+    )
+    reports_by_kit = {}
+    for report in KitReport.objects.select_for_update().filter(
+        kit_id__in=[userkit.id for userkit in userkits],
+        status='pending',
+    ).order_by('-created_at', '-id'):
+        reports_by_kit.setdefault(report.kit_id, []).append(report)
+
+    groups = [(userkit, reports_by_kit[userkit.id]) for userkit in userkits if userkit.id in reports_by_kit]
+    processed_ids = {userkit.id for userkit, _reports in groups}
+    skipped_ids = [userkit_id for userkit_id in userkit_ids if userkit_id not in processed_ids]
+    return groups, skipped_ids
+
+
+def resolve_report_groups(groups, *, actor, report_status, note, now):
+    KitReport.objects.filter(id__in=[report.id for _userkit, reports in groups for report in reports]).update(
+        status=report_status,
+        resolved_by=actor,
+        resolution_note=note,
+        updated_at=now,
+    )
+    refresh_kit_report_summaries([userkit.id for userkit, _reports in groups])
+
+
+class AdminKitReportBulkDismissAPI(APIView):
+    permission_classes = [IsAuthenticated, IsStaffOrModerator]
+
+    def post(self, request):
+        serializer = AdminKitReportBulkDecisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        userkit_ids = serializer.validated_data['ids']
+        note = serializer.validated_data.get('note', '')
+
+        with transaction.atomic():
+            groups, skipped_ids = lock_pending_report_groups(userkit_ids)
+            if not groups:
+                return Response({'detail': 'No pending reports found for these kits.'}, status=status.HTTP_400_BAD_REQUEST)
+
+            resolve_report_groups(groups, actor=request.user, report_status='dismissed', note=note, now=timezone.now())
+            actions = KitReportModerationAction.objects.bulk_create([
+                new_kit_report_moderation_action(
+                    actor=request.user,
+                    action_type=KitReportModerationAction.ACTION_DISMISS,
+                    userkit=userkit,
+                    reports=reports,
+                    note=note,
+                    previous_state=snapshot_userkit_moderation_state(userkit),
+                    resulting_state=snapshot_userkit_moderation_state(userkit),
+                )
+                for userkit, reports in groups
+            ])
+
+        return Response({
+            'status': 'dismissed',
+            'kit_ids': [userkit.id for userkit, _reports in groups],
+            'skipped_kit_ids': skipped_ids,
+            'dismissed_report_count': sum(len(reports) for _userkit, reports in groups),
+            'moderation_action_ids': [action.id for action in actions],
+        })
+
+
+class AdminKitReportBulkRemoveKitAPI(APIView):
+    permission_classes = [IsAuthenticated, IsStaffOrModerator]
+
+    def post(self, request):
+        serializer = AdminKitReportBulkDecisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        userkit_ids = serializer.validated_data['ids']
+        note = serializer.validated_data.get('note', '')
+        if not note:
+            return Response({'note': ['Moderator note is required.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            groups, skipped_ids = lock_pending_report_groups(userkit_ids)
+            if not groups:
+                return Response({'detail': 'No pending reports found for these kits.'}, status=status.HTTP_400_BAD_REQUEST)
+
+            now = timezone.now()
+            previous_states = {userkit.id: snapshot_userkit_moderation_state(userkit) for userkit, _reports in groups}
+            hidden_ids = [userkit.id for userkit, _reports in groups]
+            UserKit.objects.filter(pk__in=hidden_ids).update(
+                is_hidden_by_moderation=True,
+                hidden_by_moderation_at=now,
+                hidden_by_moderation_by=request.user,
+                moderation_hidden_reason=note,
+            )
+            owners = {}
+            for userkit, _reports in groups:
+                userkit.is_hidden_by_moderation = True
+                userkit.hidden_by_moderation_at = now
+                userkit.hidden_by_moderation_by = request.user
+                userkit.moderation_hidden_reason = note
+                owners[userkit.user_id] = userkit.user
+
+            # A queryset update skips the UserKit post_save signals, so run their work once per batch
+            refresh_kit_rankings(hidden_ids)
+            sync_following_feed_entries(hidden_ids)
+            mark_collection_value_history_stale(list(owners))
+
+            resolve_report_groups(groups, actor=request.user, report_status='resolved', note=note, now=now)
+            actions = KitReportModerationAction.objects.bulk_create([
+                new_kit_report_moderation_action(
+                    actor=request.user,
+                    action_type=KitReportModerationAction.ACTION_REMOVE_KIT,
+                    userkit=userkit,
+                    reports=reports,
+                    note=note,
+                    previous_state=previous_states[userkit.id],
+                    resulting_state=snapshot_userkit_moderation_state(userkit),
+                )
+                for userkit, reports in groups
+            ])
+            for owner in owners.values():
+                rebuild_collection_value_history(owner)
+            notify_kit_owners_about_moderation_removals(
+                actor=request.user,
+                userkits=[userkit for userkit, _reports in groups],
+            )
+
+        return Response({
+            'status': 'resolved',
+            'hidden': True,
+            'kit_ids': hidden_ids,
+            'skipped_kit_ids': skipped_ids,
+            'resolved_report_count': sum(len(reports) for _userkit, reports in groups),
+            'moderation_action_ids': [action.id for action in actions],
+        })
+
+
 # Endpoint: User collection statistics
 class UserCollectionStatsAPI(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request, username):
         # Get user if exists or return 404
-        user = get_object_or_404(User, username=username)
+        user = get_object_or_404(User.objects.select_related('profile'), username=username)
 
         # Calculate stats
         total_value, total_kits = calculate_collection_total_value_for_viewer(user, request.user)
@@ -2882,10 +3477,32 @@ class UserCollectionStatsAPI(APIView):
                 following=user
             ).exists()
 
-        # Pass the user to the new serializer
-        serializer = UserStatsProfileSerializer(user, context={'request': request})
+        profile = getattr(user, 'profile', None)
+        profile_values = (
+            [getattr(profile, field.attname) for field in Profile._meta.concrete_fields]
+            if profile is not None else None
+        )
+        validator_parts = [
+            request.build_absolute_uri('/'),
+            request.user.pk,
+            user.pk,
+            user.username,
+            total_value,
+            total_kits,
+            user.followers_count,
+            user.following_count,
+            user.is_followed_by_me,
+            profile_values,
+            # Nested country/team info is rendered from the catalog
+            get_catalog_versions([CATALOG_COUNTRIES, CATALOG_LEAGUES, CATALOG_TEAMS]),
+        ]
 
-        return Response(serializer.data)
+        # Pass the user to the new serializer
+        return get_conditional_response(
+            request,
+            validator_parts,
+            lambda: UserStatsProfileSerializer(user, context={'request': request}).data,
+        )
 
 # Endpoint: User search
 class UserSearchAPI(generics.ListAPIView):
@@ -2899,11 +3516,33 @@ class UserSearchAPI(generics.ListAPIView):
 
         return User.objects.filter(
             username__icontains=query # Search for username fragment (case-insensitive)
-        ).annotate(
+        ).select_related('profile').annotate(
             kits_count=Count('collection') # Count kits for each user
         ).order_by('-kits_count')[:10] # Limit to top 10 results
 
 
+COLLECTION_VALUE_HISTORY_RAW_RESOLUTION = 'raw'
+
+
+def parse_collection_value_history_since(value):
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        since = parse_datetime(value)
+        if since is None:
+            since_date = parse_date(value)
+            if since_date is not None:
+                since = datetime.combine(since_date, datetime.min.time())
+    except ValueError:
+        since = None
+    if since is None:
+        raise ValidationError({'since': 'Use an ISO 8601 date or date-time.'})
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
 class MyCollectionValueHistoryAPI(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -2911,7 +3550,7 @@ class MyCollectionValueHistoryAPI(APIView):
         if not getattr(request.user.profile, 'is_pro', False):
             raise PermissionDenied('Collection value history is available for Pro members only.')
 
-        if collection_value_history_needs_hidden_kit_rebuild(request.user):
+        if collection_value_history_is_stale(request.user):
             rebuild_collection_value_history(request.user)
 
         if not request.user.collection_value_snapshots.exists():
@@ -2920,9 +3559,21 @@ class MyCollectionValueHistoryAPI(APIView):
                 CollectionValueSnapshot.REASON_INITIAL,
             )
 
+        resolution = (request.query_params.get('resolution') or COLLECTION_VALUE_HISTORY_RAW_RESOLUTION).strip().lower()
+        if resolution != COLLECTION_VALUE_HISTORY_RAW_RESOLUTION and resolution not in CollectionValueRollup.RESOLUTIONS:
+            raise ValidationError({'resolution': 'Unsupported resolution. Use raw, daily, weekly or monthly.'})
+        since = parse_collection_value_history_since(request.query_params.get('since'))
+
+        if resolution != COLLECTION_VALUE_HISTORY_RAW_RESOLUTION:
+            buckets = get_collection_value_history_buckets(request.user, resolution, since=since)
+            serializer = CollectionValueHistoryBucketSerializer(buckets, many=True)
+            return Response({'resolution': resolution, 'results': serializer.data})
+
         snapshots = request.user.collection_value_snapshots.order_by('created_at', 'id')
+        if since is not None:
+            snapshots = snapshots.filter(created_at__gte=since)
         serializer = CollectionValueSnapshotSerializer(snapshots, many=True)
-        return Response({'results': serializer.data})
+        return Response({'resolution': resolution, 'results': serializer.data})
 
 
 class MyCollectionExportAPI(APIView):
@@ -2941,30 +3592,118 @@ class MyCollectionExportAPI(APIView):
             request.query_params.get('include_sold'),
             default=True,
         )
-        userkits = list(get_owner_export_queryset(request.user, include_sold=include_sold))
-        export_rows = [_build_export_row(userkit) for userkit in userkits]
-        summary_rows = _build_export_summary(userkits)
+        queryset = get_owner_export_queryset(request.user, include_sold=include_sold)
         export_date = timezone.localdate().isoformat()
         export_filename_base = _build_export_filename(request.user, export_date, 'csv')
 
         if export_format == 'csv':
-            response = HttpResponse(content_type='text/csv; charset=utf-8')
+            response = StreamingHttpResponse(
+                iter_collection_export_csv(iter_collection_export_rows(queryset)),
+                content_type='text/csv; charset=utf-8',
+            )
             response['Content-Disposition'] = f'attachment; filename="{export_filename_base}"'
-            writer = csv.DictWriter(response, fieldnames=EXPORT_COLUMNS)
-            writer.writeheader()
-            for row in export_rows:
-                writer.writerow({column: row.get(column) for column in EXPORT_COLUMNS})
             return response
 
-        xlsx_bytes = build_collection_export_xlsx(export_rows, summary_rows)
-        response = HttpResponse(
-            xlsx_bytes,
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        )
+        summary = CollectionExportSummary()
+        output = tempfile.SpooledTemporaryFile(max_size=EXPORT_XLSX_SPOOL_MAX_SIZE)
+        write_collection_export_xlsx(output, iter_collection_export_rows(queryset, summary), summary)
+        output.seek(0)
+        response = FileResponse(output, content_type=XLSX_CONTENT_TYPE)
         response['Content-Disposition'] = f'attachment; filename="{_build_export_filename(request.user, export_date, "xlsx")}"'
         return response
 
 
+COLLECTION_EXPORT_CONTENT_TYPES = {
+    CollectionExportJob.FORMAT_CSV: 'text/csv; charset=utf-8',
+    CollectionExportJob.FORMAT_XLSX: XLSX_CONTENT_TYPE,
+}
+COLLECTION_EXPORT_JOB_LIST_LIMIT = 20
+
+
+class MyCollectionExportJobListAPI(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        export_jobs = CollectionExportJob.objects.filter(user=request.user)[:COLLECTION_EXPORT_JOB_LIST_LIMIT]
+        serializer = CollectionExportJobSerializer(export_jobs, many=True, context={'request': request})
+        return Response(serializer.data)
+
+    # Builds run on a `manage.py run_jobs` worker. With BACKGROUND_JOBS_EAGER the
+    # file is still built in this request, after its transaction commits, so the
+    # endpoint only frees web workers during export spikes when a worker is running.
+    def post(self, request):
+        if not has_pro_access(request.user):
+            raise PermissionDenied('Collection export is available for Pro members only.')
+
+        export_format = str(request.data.get('format') or CollectionExportJob.FORMAT_CSV).strip().lower()
+        if export_format not in COLLECTION_EXPORT_CONTENT_TYPES:
+            raise ValidationError({'format': 'Unsupported export format. Use csv or xlsx.'})
+        include_sold = _parse_bool_query_param(request.data.get('include_sold'), default=True)
+
+        # Otherwise a job whose build died for good would be handed out forever
+        fail_abandoned_collection_exports(user=request.user)
+        active_jobs = CollectionExportJob.objects.filter(
+            user=request.user,
+            export_format=export_format,
+            include_sold=include_sold,
+            status__in=CollectionExportJob.ACTIVE_STATUSES,
+        )
+        export_job = active_jobs.first()
+        created = False
+        if export_job is None:
+            try:
+                with transaction.atomic():
+                    export_job = CollectionExportJob.objects.create(
+                        user=request.user,
+                        export_format=export_format,
+                        include_sold=include_sold,
+                    )
+                    enqueue_collection_export(export_job)
+                created = True
+            except IntegrityError:
+                # Lost the race against an identical request
+                export_job = active_jobs.first()
+                if export_job is None:
+                    raise
+            export_job.refresh_from_db()
+
+        serializer = CollectionExportJobSerializer(export_job, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK)
+
+
+class MyCollectionExportJobDetailAPI(generics.RetrieveAPIView):
+    serializer_class = CollectionExportJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return CollectionExportJob.objects.filter(user=self.request.user)
+
+
+class MyCollectionExportJobDownloadAPI(APIView):
+    permission_classes = [IsAuthenticated]
+    content_negotiation_class = IgnoreFormatOverrideContentNegotiation
+
+    def get(self, request, pk):
+        export_job = get_object_or_404(CollectionExportJob, pk=pk, user=request.user)
+        if export_job.status != CollectionExportJob.STATUS_SUCCEEDED or not export_job.file:
+            return Response(
+                {'detail': 'Export is not ready.', 'status': export_job.status},
+                status=status.HTTP_409_CONFLICT,
+            )
+        if export_job.is_expired:
+            return Response(
+                {'detail': 'Export has expired. Start a new export.'},
+                status=status.HTTP_410_GONE,
+            )
+
+        response = FileResponse(
+            export_job.file.open('rb'),
+            content_type=COLLECTION_EXPORT_CONTENT_TYPES[export_job.export_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{export_job.filename}"'
+        return response
+
+
 class WishlistListMixin:
     serializer_class = WishlistItemSerializer
     pagination_class = None
@@ -3090,12 +3829,15 @@ class KitSearchSuggestionsAPI(generics.ListAPIView):
         if not team_text:
             return []
 
-        return list(
-            Team.objects.filter(
-                is_verified=True,
-                name__icontains=team_text,
-            )
+        queryset = Team.objects.filter(
+            is_verified=True,
+            name__icontains=team_text,
         )
+        candidate_ids = get_team_search_candidate_ids(team_text)
+        if candidate_ids is not None:
+            queryset = queryset.filter(pk__in=candidate_ids)
+
+        return list(queryset.only('id', 'name', 'slug').order_by('id'))
 
     def get_matching_seasons(self, parsed_query):
         generated_seasons = get_generated_seasons()
@@ -3169,7 +3911,10 @@ class KitSearchSuggestionsAPI(generics.ListAPIView):
             if self.request is not None:
                 preview_url = self.request.build_absolute_uri(preview_url)
 
-            preview_map[preview_key] = preview_url
+            preview_map[preview_key] = {
+                'url': preview_url,
+                'variants': get_image_variant_urls(preview_image, self.request),
+            }
 
         return preview_map
 
@@ -3190,25 +3935,17 @@ class KitSearchSuggestionsAPI(generics.ListAPIView):
 
         matching_kit_types = self.get_matching_kit_types(parsed_query)
 
-        suggestions = [
-            get_generated_suggestion(team, season, kit_type)
-            for team in matching_teams
-            for season in matching_seasons
-            for kit_type in matching_kit_types
-        ]
-
-        ranked_suggestions = sorted(
-            suggestions,
-            key=lambda suggestion: (
-                get_team_match_rank(suggestion['team_name'], parsed_query['team_text']),
-                get_generated_season_match_rank(suggestion['season'], parsed_query),
-                -get_season_sort_year(suggestion['season']),
-                get_kit_type_order(suggestion['kit_type']),
-                suggestion['team_name'].lower(),
+        limit_value = self.get_limit_value()
+        limited_suggestions = list(islice(
+            iter_ranked_generated_suggestions(
+                matching_teams,
+                matching_seasons,
+                matching_kit_types,
+                parsed_query,
+                limit_value,
             ),
-        )
-
-        limited_suggestions = ranked_suggestions[:self.get_limit_value()]
+            limit_value,
+        ))
         preview_map = self.get_preview_map(limited_suggestions)
 
         for suggestion in limited_suggestions:
@@ -3217,9 +3954,10 @@ class KitSearchSuggestionsAPI(generics.ListAPIView):
                 suggestion['season'],
                 suggestion['kit_type'],
             )
-            preview_image = preview_map.get(preview_key)
-            suggestion['preview_image'] = preview_image
-            suggestion['has_uploads'] = preview_image is not None
+            preview = preview_map.get(preview_key)
+            suggestion['preview_image'] = preview['url'] if preview else None
+            suggestion['preview_image_variants'] = preview['variants'] if preview else {}
+            suggestion['has_uploads'] = preview is not None
 
         return limited_suggestions
 
@@ -3287,13 +4025,14 @@ class ConversationMessagesAPI(APIView):
 
     def get(self, request, conversation_id):
         conversation = self._get_user_conversation(request, conversation_id)
-        conversation.messages.filter(
+        marked_read = conversation.messages.filter(
             read_at__isnull=True
         ).exclude(
             sender=request.user
         ).update(
             read_at=timezone.now()
         )
+        adjust_unread_message_counters(request.user.id, conversation.id, -marked_read)
 
         limit = self._get_limit(request)
         before = request.query_params.get('before')
@@ -3357,16 +4096,49 @@ class UnreadMessagesCountAPI(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        unread_count = Message.objects.filter(
-            read_at__isnull=True,
-        ).exclude(
-            sender=request.user,
-        ).filter(
-            Q(conversation__participant_one=request.user) |
-            Q(conversation__participant_two=request.user)
-        ).count()
+        unread_count = get_unread_counts(request.user)['messages_unread_count']
+
+        return get_conditional_response(
+            request,
+            [request.user.pk, unread_count],
+            lambda: {'unread_count': unread_count},
+        )
+
+
+def authenticate_stream_request(request):
+    # Run the API's own authenticators so the JWT cookie/header works here too
+    drf_request = Request(
+        request,
+        authenticators=[authenticator() for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+    )
+    try:
+        user = drf_request.user
+    except APIException:
+        return None
+    return user if user.is_authenticated else None
+
 
-        return Response({'unread_count': unread_count})
+# Endpoint: Server-sent stream of unread message/notification count changes.
+# Streams a snapshot first, then deltas; serve it through core.asgi so an open
+# stream does not pin a worker thread.
+async def unread_counts_stream(request):
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    user = await sync_to_async(authenticate_stream_request)(request)
+    if user is None:
+        return JsonResponse(
+            {'detail': 'Authentication credentials were not provided.'},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+
+    response = StreamingHttpResponse(
+        stream_unread_events(user.id, sync_to_async(lambda: get_unread_counts(user))),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 class NotificationListAPI(APIView):
@@ -3437,11 +4209,12 @@ class NotificationUnreadCountAPI(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        unread_count = Notification.objects.filter(
-            recipient=request.user,
-            read_at__isnull=True,
-        ).count()
-        return Response({'unread_count': unread_count})
+        unread_count = get_unread_counts(request.user)['notifications_unread_count']
+        return get_conditional_response(
+            request,
+            [request.user.pk, unread_count],
+            lambda: {'unread_count': unread_count},
+        )
 
 
 class MarkNotificationsReadAPI(APIView):
@@ -3452,6 +4225,7 @@ class MarkNotificationsReadAPI(APIView):
             recipient=request.user,
             read_at__isnull=True,
         ).update(read_at=timezone.now())
+        adjust_unread_notification_counter(request.user.id, -updated)
 
         return Response({
             'marked_read_count': updated,
@@ -3481,30 +4255,36 @@ class ToggleLikeAPI(APIView):
         )
         user = request.user
 
-        liked = False
-        if kit.likes.filter(id=user.id).exists():
-            kit.likes.remove(user)
+        with transaction.atomic():
+            # Lock the kit row so concurrent toggles serialize on likes_count
+            kit = UserKit.objects.select_for_update().get(pk=kit.pk)
+
             liked = False
-            Notification.objects.filter(
-                recipient=kit.user,
-                actor=user,
-                type='kit_like',
-                kit=kit,
-            ).delete()
-        else:
-            kit.likes.add(user)
-            liked = True
-            if kit.user_id != user.id:
-                Notification.objects.get_or_create(
+            if kit.likes.filter(id=user.id).exists():
+                kit.likes.remove(user)
+                liked = False
+                Notification.objects.filter(
                     recipient=kit.user,
                     actor=user,
                     type='kit_like',
                     kit=kit,
-                )
-        
+                ).delete()
+            else:
+                kit.likes.add(user)
+                liked = True
+                if kit.user_id != user.id:
+                    enqueue_notification(
+                        recipient=kit.user,
+                        actor=user,
+                        type='kit_like',
+                        kit=kit,
+                    )
+
+            kit.refresh_from_db(fields=['likes_count'])
+
         return Response({
             "liked": liked,
-            "likes_count": kit.likes.count()
+            "likes_count": kit.likes_count
         }, status=status.HTTP_200_OK)
 
 
@@ -3535,15 +4315,17 @@ class KitCommentsAPI(APIView):
         serializer = KitCommentWriteSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        comment = serializer.save(kit=kit, user=request.user)
-        if kit.user_id != request.user.id:
-            Notification.objects.get_or_create(
-                recipient=kit.user,
-                actor=request.user,
-                type='kit_comment',
-                kit=kit,
-                comment=comment,
-            )
+        # comments_count is bumped by the KitComment post_save signal in the same transaction
+        with transaction.atomic():
+            comment = serializer.save(kit=kit, user=request.user)
+            if kit.user_id != request.user.id:
+                enqueue_notification(
+                    recipient=kit.user,
+                    actor=request.user,
+                    type='kit_comment',
+                    kit=kit,
+                    comment=comment,
+                )
         response_serializer = KitCommentSerializer(comment, context={'request': request})
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
@@ -3558,20 +4340,21 @@ class ReplyToCommentAPI(APIView):
         serializer = KitCommentWriteSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        reply = serializer.save(
-            kit=target_comment.kit,
-            user=request.user,
-            parent=thread_parent,
-            reply_to=target_comment,
-        )
-        if target_comment.user_id != request.user.id:
-            Notification.objects.get_or_create(
-                recipient=target_comment.user,
-                actor=request.user,
-                type='comment_reply',
+        with transaction.atomic():
+            reply = serializer.save(
                 kit=target_comment.kit,
-                comment=reply,
+                user=request.user,
+                parent=thread_parent,
+                reply_to=target_comment,
             )
+            if target_comment.user_id != request.user.id:
+                enqueue_notification(
+                    recipient=target_comment.user,
+                    actor=request.user,
+                    type='comment_reply',
+                    kit=target_comment.kit,
+                    comment=reply,
+                )
         response_serializer = KitCommentSerializer(reply, context={'request': request})
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
@@ -3597,7 +4380,7 @@ class ToggleCommentLikeAPI(APIView):
             KitCommentLike.objects.create(comment=comment, user=request.user)
             liked = True
             if comment.user_id != request.user.id:
-                Notification.objects.get_or_create(
+                enqueue_notification(
                     recipient=comment.user,
                     actor=request.user,
                     type='comment_like',
@@ -3627,7 +4410,9 @@ class DeleteCommentAPI(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        comment.delete()
+        # Replies cascade with the comment; each deleted row decrements comments_count
+        with transaction.atomic():
+            comment.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -3658,13 +4443,15 @@ class ReportKitAPI(APIView):
         )
 
 # Endpoint: List of leagues
-class LeagueListAPI(generics.ListAPIView):
+class LeagueListAPI(CatalogCacheMixin, generics.ListAPIView):
+    catalog_cache_resources = (CATALOG_LEAGUES, CATALOG_COUNTRIES)
     queryset = League.objects.all().select_related('country').order_by('order', 'name')
     serializer_class = LeagueSerializer
     permission_classes = [permissions.AllowAny]
 
 # Endpoint: Teams by League
-class TeamsByLeagueAPI(generics.ListAPIView):
+class TeamsByLeagueAPI(CatalogCacheMixin, generics.ListAPIView):
+    catalog_cache_resources = (CATALOG_TEAMS, CATALOG_LEAGUES, CATALOG_COUNTRIES)
     serializer_class = TeamSerializer
     permission_classes = [permissions.AllowAny]
 
@@ -3685,13 +4472,13 @@ class TopKitsByTeamAPI(generics.ListAPIView):
             kit__team_id=team_id,
             is_hidden_by_moderation=False,
         )\
-            .select_related('kit', 'kit__team', 'kit__kit_type_ref', 'shirt_version', 'user')\
-            .prefetch_related('images', 'likes')\
-            .annotate(likes_count=Count('likes', distinct=True), comments_count=Count('comments', distinct=True))\
+            .select_related('kit', 'kit__team', 'kit__team__country', 'kit__team__league', 'kit__kit_type_ref', 'shirt_version', 'user', 'user__profile')\
+            .prefetch_related('images')\
             .order_by('-likes_count', '-added_at')
 
 
-class ApprovedTeamSeasonKitTypesAPI(generics.ListAPIView):
+class ApprovedTeamSeasonKitTypesAPI(CatalogCacheMixin, generics.ListAPIView):
+    catalog_cache_resources = (CATALOG_TEAM_SEASON_KIT_TYPES, CATALOG_KIT_TYPES, CATALOG_TEAMS)
     serializer_class = ApprovedTeamSeasonKitTypeSerializer
     permission_classes = [permissions.AllowAny]
     pagination_class = None
@@ -3720,7 +4507,8 @@ class CheckUsernameAPI(APIView):
         return Response({"available": not exists})
 
 # Endpoint: List of countries
-class CountryListView(generics.ListAPIView):
+class CountryListView(CatalogCacheMixin, generics.ListAPIView):
+    catalog_cache_resources = (CATALOG_COUNTRIES,)
     queryset = Country.objects.all().order_by('name')
     serializer_class = CountrySerializer
     
@@ -3755,7 +4543,7 @@ class ToggleFollowView(APIView):
         else:
             # If it doesn't exist -> Create it (Follow)
             Follow.objects.create(follower=request.user, following=user_to_follow)
-            Notification.objects.get_or_create(
+            enqueue_notification(
                 recipient=user_to_follow,
                 actor=request.user,
                 type='follow',
@@ -3788,9 +4576,8 @@ class KitVariantsAPI(generics.ListAPIView):
             queryset = queryset.filter(get_history_type_filter(kit_type))
 
         return queryset\
-            .select_related('kit', 'kit__team', 'kit__kit_type_ref', 'shirt_version', 'user')\
-            .prefetch_related('images', 'likes')\
-            .annotate(likes_count=Count('likes', distinct=True), comments_count=Count('comments', distinct=True))\
+            .select_related('kit', 'kit__team', 'kit__team__country', 'kit__team__league', 'kit__kit_type_ref', 'shirt_version', 'user', 'user__profile')\
+            .prefetch_related('images')\
             .order_by('-likes_count', '-added_at')
 
 # Endpoint: List of followers for a user
@@ -3806,7 +4593,7 @@ class FollowersListAPI(generics.ListAPIView):
         follower_ids = Follow.objects.filter(following=user).values_list('follower_id', flat=True)
         
         # Return the list of those users, annotating with their kit count
-        return User.objects.filter(id__in=follower_ids).annotate(
+        return User.objects.filter(id__in=follower_ids).select_related('profile').annotate(
             followers_count=Count('followers', distinct=True)
         ).order_by('-followers_count')
 
@@ -3823,7 +4610,7 @@ class FollowingListAPI(generics.ListAPIView):
         following_ids = Follow.objects.filter(follower=user).values_list('following_id', flat=True)
         
         # Return the list of those users
-        return User.objects.filter(id__in=following_ids).annotate(
+        return User.objects.filter(id__in=following_ids).select_related('profile').annotate(
             followers_count=Count('followers', distinct=True)
         ).order_by('-followers_count')
 
@@ -3843,6 +4630,6 @@ class KitLikersListAPI(generics.ListAPIView):
         ).filter(id=kit_id).values_list('likes__id', flat=True)
 
         # Return the list of those users, annotating with their kit count
-        return User.objects.filter(id__in=liker_ids).annotate(
+        return User.objects.filter(id__in=liker_ids).select_related('profile').annotate(
             followers_count=Count('followers', distinct=True)
         ).order_by('-followers_count')